@@ -0,0 +1,41 @@
+"""
+Compares the binary codec generated by asdl2py --codec with pickle on a list of 1M TAC
+instructions: size of the encoding and time for encoding and decoding.
+
+Usage: PYTHONPATH=src python bench/bench_astCodec.py
+"""
+import pickle
+import timeit
+from typing import Any, Callable
+from assembly.tac_ast import *
+
+def mkInstrs(n: int) -> list[instr]:
+    # x = y + i; print(x)
+    x = Ident('x')
+    y = Ident('y')
+    p = Ident('print')
+    l: list[instr] = []
+    for i in range(n // 2):
+        l.append(Assign(x, BinOp(Name(y), Op('ADD'), Const(i))))
+        l.append(Call(None, p, [Name(x)]))
+    return l
+
+def bestOf(f: Callable[[], Any], repeat: int = 3) -> float:
+    return min(timeit.repeat(f, number=1, repeat=repeat))
+
+def main():
+    instrs = mkInstrs(1_000_000)
+    pickled = pickle.dumps(instrs, protocol=pickle.HIGHEST_PROTOCOL)
+    encoded = encodeInstrList(instrs)
+    assert decodeInstrList(encoded) == instrs
+    print(f'{"":>8} {"size (MB)":>10} {"encode (s)":>11} {"decode (s)":>11}')
+    for (name, data, enc, dec) in [
+            ('pickle', pickled, lambda: pickle.dumps(instrs, protocol=pickle.HIGHEST_PROTOCOL),
+             lambda: pickle.loads(pickled)),
+            ('codec', encoded, lambda: encodeInstrList(instrs), lambda: decodeInstrList(encoded))]:
+        tEnc = bestOf(enc)
+        tDec = bestOf(dec)
+        print(f'{name:>8} {len(data) / 1e6:>10.1f} {tEnc:>11.2f} {tDec:>11.2f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Measures memory per AST node for the classes generated by asdl2py, with the
+default options (plain dataclasses and lists) and with --slots --tuples.
+
+Usage: PYTHONPATH=src python bench/bench_astMemory.py
+"""
+import importlib
+import sys
+import types
+import tracemalloc
+from typing import Any, Callable
+
+# The generator is a script in src/asdl and not type-checked, so it is loaded dynamically.
+sys.path.insert(0, 'src/asdl')
+asdl: Any = importlib.import_module('asdl')
+asdl2py: Any = importlib.import_module('asdl2py')
+
+def generateModule(asdlFile: str, opts: Any, name: str) -> Any:
+    out = asdl2py.Output()
+    asdl2py.generateCode(asdl.parse(asdlFile), out, opts)
+    code: str = out.generate(None, opts)
+    m = types.ModuleType(name)
+    sys.modules[name] = m
+    exec(code, m.__dict__)
+    return m
+
+def mkVarNodes(m: Any, n: int) -> list[Any]:
+    # x = f(x + 1, -2), 7 nodes per statement (Ident is shared)
+    x = m.Ident('x')
+    f = m.Ident('f')
+    return [m.Assign(x, m.Call(f, [m.BinOp(m.Name(x), m.Add(), m.IntConst(i)),
+                                   m.UnOp(m.USub(), m.IntConst(2))]))
+            for i in range(n)]
+
+def mkTacNodes(m: Any, n: int) -> list[Any]:
+    # x = y + i; print(x), 7 nodes per pair of instructions
+    x = m.Ident('x')
+    y = m.Ident('y')
+    p = m.Ident('print')
+    l: list[Any] = []
+    for i in range(n):
+        l.append(m.Assign(x, m.BinOp(m.Name(y), m.Op('ADD'), m.Const(i))))
+        l.append(m.Call(None, p, [m.Name(x)]))
+    return l
+
+def measure(mk: Callable[[Any, int], list[Any]], m: Any, n: int, nodesPerItem: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = mk(m, n)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del nodes
+    return (after - before) / (n * nodesPerItem)
+
+def main():
+    n = 100_000
+    print(f'{"module":>8} {"default (bytes/node)":>21} {"slots+tuples (bytes/node)":>26}')
+    for (asdlFile, mk, k) in [('src/lang_var/var_ast.asdl', mkVarNodes, 7),
+                              ('src/assembly/tac_ast.asdl', mkTacNodes, 7)]:
+        res: list[float] = []
+        for opts in [asdl2py.Options(), asdl2py.Options(slots=True, tuples=True)]:
+            m = generateModule(asdlFile, opts, f'bench_{len(res)}')
+            res.append(measure(mk, m, n, k))
+        name = asdlFile.split('/')[-1].removesuffix('.asdl')
+        print(f'{name:>8} {res[0]:>21.1f} {res[1]:>26.1f}')
+
+if __name__ == '__main__':
+    main()
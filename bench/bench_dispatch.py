@@ -0,0 +1,86 @@
+"""
+Compares dispatch through match statements with the tag-indexed visitor classes generated
+by asdl2py, first in isolation and then for some passes over the test corpus.
+
+Usage: PYTHONPATH=src python bench/bench_dispatch.py
+"""
+import glob
+import timeit
+from typing import Any, Callable
+import common.genericParser as genericParser
+import common.compilerSupport as compilerSupport
+import lang_fun.fun_ast as funAst
+import lang_fun.fun_tychecker as fun_tychecker
+import lang_array.array_ast as arrayAst
+import compilers.lang_array.array_compiler as array_compiler
+from lang_fun.fun_ast import *
+
+def matchDispatch(e: exp) -> int:
+    match e:
+        case IntConst(): return 0
+        case BoolConst(): return 1
+        case Name(): return 2
+        case Call(): return 3
+        case UnOp(): return 4
+        case BinOp(): return 5
+        case Subscript(): return 6
+        case ArrayInitDyn(): return 7
+        case ArrayInitStatic(): return 8
+
+class TagDispatch(ExpVisitor[int, None]):
+    def visitIntConst(self, x: IntConst, ctx: None) -> int: return 0
+    def visitBoolConst(self, x: BoolConst, ctx: None) -> int: return 1
+    def visitName(self, x: Name, ctx: None) -> int: return 2
+    def visitCall(self, x: Call, ctx: None) -> int: return 3
+    def visitUnOp(self, x: UnOp, ctx: None) -> int: return 4
+    def visitBinOp(self, x: BinOp, ctx: None) -> int: return 5
+    def visitSubscript(self, x: Subscript, ctx: None) -> int: return 6
+    def visitArrayInitDyn(self, x: ArrayInitDyn, ctx: None) -> int: return 7
+    def visitArrayInitStatic(self, x: ArrayInitStatic, ctx: None) -> int: return 8
+
+def sampleExps(n: int) -> list[exp]:
+    one = IntConst(1)
+    x = Name(Ident('x'))
+    kinds: list[exp] = [one, BoolConst(True), x, Call(x, [one]), UnOp(USub(), one),
+                        BinOp(one, Add(), one), Subscript(x, one), ArrayInitDyn(one, one),
+                        ArrayInitStatic([one])]
+    return [kinds[i % len(kinds)] for i in range(n)]
+
+def bestOf(f: Callable[[], Any], repeat: int = 5) -> float:
+    return min(timeit.repeat(f, number=1, repeat=repeat))
+
+def parseCorpus(pattern: str, m: Any) -> list[Any]:
+    return [genericParser.parseFile(f, m) for f in sorted(glob.glob(pattern))]
+
+def checksOk(f: Callable[[Any], Any], mods: list[Any]) -> list[Any]:
+    ok: list[Any] = []
+    for m in mods:
+        try:
+            f(m)
+            ok.append(m)
+        except Exception:
+            pass
+    return ok
+
+def main():
+    exps = sampleExps(900_000)
+    v = TagDispatch()
+    tMatch = bestOf(lambda: [matchDispatch(e) for e in exps])
+    tTag = bestOf(lambda: [v.visitExp(e, None) for e in exps])
+    print(f'dispatch over {len(exps)} nodes: match {tMatch:.3f}s, tags {tTag:.3f}s')
+
+    funMods = checksOk(fun_tychecker.tycheckModule,
+                       parseCorpus('test_files/lang_fun/*.py', funAst))
+    t = bestOf(lambda: [fun_tychecker.tycheckModule(m) for m in funMods])
+    print(f'fun_tychecker.tycheckModule on {len(funMods)} modules: {t:.3f}s')
+
+    cfg = compilerSupport.CompilerConfig(compilerSupport.CompilerConfig.defaultMaxMemSize,
+                                         compilerSupport.CompilerConfig.defaultMaxArraySize)
+    compile: Callable[[Any], Any] = lambda m: array_compiler.compileModule(m, cfg)
+    arrayFiles = sorted(glob.glob('test_files/lang_array/*.py'))
+    arrayMods = checksOk(compile, parseCorpus('test_files/lang_array/*.py', arrayAst))
+    t = bestOf(lambda: [compile(m) for m in arrayMods])
+    print(f'array_compiler.compileModule on {len(arrayMods)} of {len(arrayFiles)} modules: {t:.3f}s')
+
+if __name__ == '__main__':
+    main()
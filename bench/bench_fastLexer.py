@@ -0,0 +1,30 @@
+"""
+Compares lexing with lark's basic lexer against parsers.fastLexer on large
+tinyJson inputs, and reports the time for parsing the whole document.
+
+Usage: PYTHONPATH=src python bench/bench_fastLexer.py
+"""
+import timeit
+import parsers.common as p
+import parsers.fastLexer as fastLexer
+import parsers.tinyJson.tinyJson_parser as tinyJson
+
+grammarFile = './src/parsers/tinyJson/tinyJson_grammar.lark'
+
+def largeJson(n: int) -> str:
+    entries = [f'"key{i}": {{"name": "value {i}", "n": {i}}}' for i in range(n)]
+    return '{' + ', '.join(entries) + '}'
+
+def main():
+    larkLexer = p.mkLexer(grammarFile)
+    lexer = fastLexer.mkFastLexer(grammarFile)
+    print(f'{"entries":>8} {"lark lex (ms)":>14} {"fast lex (ms)":>14} {"speedup":>8} {"parse (ms)":>11}')
+    for n in [1000, 10000]:
+        code = largeJson(n)
+        tLark = min(timeit.repeat(lambda: list(larkLexer.lex(code)), number=1, repeat=3))
+        tFast = min(timeit.repeat(lambda: list(lexer.lex(code)), number=1, repeat=3))
+        tParse = min(timeit.repeat(lambda: tinyJson.parse(code), number=1, repeat=3))
+        print(f'{n:>8} {tLark*1000:>14.1f} {tFast*1000:>14.1f} {tLark/tFast:>8.2f} {tParse*1000:>11.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Typechecks a generated lang_fun module with 2000 functions: without the cache, with a
+cold cache, with a warm cache, and after editing the body of one function.
+
+Usage: PYTHONPATH=src python bench/bench_funTycheckCache.py
+"""
+import os
+import tempfile
+import time
+import common.astCache as astCache
+import common.genericParser as genericParser
+import lang_fun.fun_ast as fun_ast
+import lang_fun.fun_tychecker as fun_tychecker
+
+def mkSource(n: int, edited: int) -> str:
+    # f<i> calls f<i-1>, each function has a few locals, a loop, and some arithmetic
+    lines: list[str] = []
+    for i in range(n):
+        lines.append(f'def f{i}(x: int) -> int:')
+        lines.append(f'    y = {1 if i != edited else 2}')
+        lines.append(f'    while y < x:')
+        lines.append(f'        y = y + {i}')
+        for k in range(10):
+            lines.append(f'    y = y * {k} + (x - {i}) * (y + {k})')
+        lines.append(f'    z = [y, x, {i}]')
+        lines.append(f'    return z[0] + ' + (f'f{i - 1}(y)' if i > 0 else '0'))
+    lines.append(f'print(f{n - 1}(1))')
+    return '\n'.join(lines) + '\n'
+
+def timeTycheck(path: str, src: str) -> float:
+    with open(path, 'w') as f:
+        f.write(src)
+    m = genericParser.parseFile(path, fun_ast)
+    start = time.perf_counter()
+    fun_tychecker.tycheckModule(m)
+    return time.perf_counter() - start
+
+def main():
+    n = 2000
+    src = mkSource(n, -1)
+    edited = mkSource(n, n // 2)
+    times: dict[str, list[float]] = {'no cache': [], 'cold cache': [], 'warm cache': [],
+                                     'one edit': []}
+    for i in range(3):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'prog.py')
+            times['no cache'].append(timeTycheck(path, src))
+            astCache.configure(os.path.join(d, 'cache'), 1024 * 1024 * 1024)
+            try:
+                times['cold cache'].append(timeTycheck(path, src))
+                times['warm cache'].append(timeTycheck(path, src))
+                times['one edit'].append(timeTycheck(path, edited))
+            finally:
+                astCache.configure(None)
+    print(f'{"":>16} {"tycheck (s)":>12}')
+    for (name, ts) in times.items():
+        print(f'{name:>16} {min(ts):>12.3f}')
+
+if __name__ == '__main__':
+    main()
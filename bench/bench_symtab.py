@@ -0,0 +1,41 @@
+"""
+Typechecks generated array programs with many variables and nested if statements. Every
+if statement copies the symtab twice and merges the copies back, so with symtabs that are
+copied in full the time grows with the number of variables times the number of ifs.
+
+Usage: PYTHONPATH=src python bench/bench_symtab.py
+"""
+import sys
+import timeit
+from lang_array.array_ast import *
+import lang_array.array_tychecker as array_tychecker
+
+def nestedIfs(depth: int, level: int, vars: int) -> list[stmt]:
+    # if x0 < x1: (x<level> = x<level> + 1; t<level> = 1; nested) else: t<level> = 2
+    if depth == 0:
+        return []
+    x = Ident(f'x{level % vars}')
+    t = Ident(f't{level}')
+    cond = BinOp(Name(Ident('x0')), Less(), Name(Ident(f'x{vars - 1}')))
+    then: list[stmt] = [Assign(x, BinOp(Name(x), Add(), IntConst(1))), Assign(t, IntConst(1))]
+    then.extend(nestedIfs(depth - 1, level + 1, vars))
+    return [IfStmt(cond, then, [Assign(t, IntConst(2))])]
+
+def mkModule(vars: int, ifs: int, depth: int) -> mod:
+    stmts: list[stmt] = [Assign(Ident(f'x{i}'), IntConst(i)) for i in range(vars)]
+    for i in range(ifs // depth):
+        stmts.extend(nestedIfs(depth, i * depth, vars))
+    return Module(stmts)
+
+def main():
+    sys.setrecursionlimit(10_000)
+    ifs = 2000
+    depth = 200
+    print(f'{"vars":>8} {"ifs":>8} {"depth":>6} {"tycheck (s)":>12}')
+    for vars in [100, 1000, 10_000, 100_000]:
+        m = mkModule(vars, ifs, depth)
+        t = min(timeit.repeat(lambda: array_tychecker.tycheckModule(m), number=1, repeat=3))
+        print(f'{vars:>8} {ifs:>8} {depth:>6} {t:>12.3f}')
+
+if __name__ == '__main__':
+    main()
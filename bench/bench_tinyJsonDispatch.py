@@ -0,0 +1,47 @@
+"""
+Compares exception-driven backtracking in parsers.common.alternatives with
+FIRST-set based predictive dispatch, using the tinyJson parser on deeply
+nested documents.
+
+Usage: PYTHONPATH=src python bench/bench_tinyJsonDispatch.py
+"""
+import sys
+import timeit
+import parsers.common as p
+import parsers.tinyJson.tinyJson_parser as tinyJson
+
+def nestedJson(depth: int) -> str:
+    # Each level has a few int and string entries, so that the backtracking
+    # parser has to try several alternatives per value.
+    inner = '1'
+    for i in range(depth):
+        inner = f'{{"a{i}": {i}, "b{i}": "s", "c{i}": {inner}}}'
+    return inner
+
+def tokens(code: str):
+    return list(p.mkLexer('./src/parsers/tinyJson/tinyJson_grammar.lark').lex(code))
+
+def parseTokens(toks: list[p.Token]):
+    ts = p.TokenStream(toks)
+    tinyJson.ruleJson(ts)
+    ts.ensureEof('')
+
+def bench(depth: int, repeat: int) -> tuple[float, float]:
+    toks = tokens(nestedJson(depth))
+    res: list[float] = []
+    for predictive in [False, True]:
+        p.PREDICTIVE_DISPATCH = predictive
+        t = min(timeit.repeat(lambda: parseTokens(toks), number=1, repeat=repeat))
+        res.append(t)
+    p.PREDICTIVE_DISPATCH = True
+    return (res[0], res[1])
+
+def main():
+    sys.setrecursionlimit(100_000)
+    print(f'{"depth":>8} {"backtracking (ms)":>18} {"predictive (ms)":>16} {"speedup":>8}')
+    for depth in [10, 100, 500, 1000]:
+        slow, fast = bench(depth, 5)
+        print(f'{depth:>8} {slow*1000:>18.2f} {fast*1000:>16.2f} {slow/fast:>8.2f}')
+
+if __name__ == '__main__':
+    main()
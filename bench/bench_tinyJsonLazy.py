@@ -0,0 +1,33 @@
+"""
+Compares reading a few keys from a large tinyJson document with the full
+parser (tinyJson_stream.parse) and with lazy views (tinyJson_lazy.parseLazy).
+
+Usage: PYTHONPATH=src python bench/bench_tinyJsonLazy.py
+"""
+import timeit
+from typing import Any
+import parsers.tinyJson.tinyJson_stream as tinyJsonStream
+import parsers.tinyJson.tinyJson_lazy as tinyJsonLazy
+
+def largeJson(n: int) -> str:
+    entries = [f'"key{i}": {{"name": "value {i}", "n": {i}}}' for i in range(n)]
+    return '{' + ', '.join(entries) + '}'
+
+def main():
+    print(f'{"entries":>8} {"full parse (ms)":>16} {"lazy (ms)":>10} {"speedup":>8}')
+    for n in [1000, 10000, 50000]:
+        code = largeJson(n)
+        key = f'key{n // 2}'
+        def full() -> Any:
+            doc: Any = tinyJsonStream.parse(code)
+            return doc[key]['n']
+        def lazy() -> Any:
+            doc: Any = tinyJsonLazy.parseLazy(code)
+            return doc[key]['n']
+        assert full() == lazy()
+        tFull = min(timeit.repeat(full, number=1, repeat=3))
+        tLazy = min(timeit.repeat(lazy, number=1, repeat=3))
+        print(f'{n:>8} {tFull*1000:>16.1f} {tLazy*1000:>10.1f} {tFull/tLazy:>8.2f}')
+
+if __name__ == '__main__':
+    main()
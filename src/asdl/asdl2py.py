@@ -1,4 +1,5 @@
 import asdl
+import re
 import sys
 import argparse
 from dataclasses import dataclass
@@ -16,33 +17,114 @@ from dataclasses import dataclass
 PRELUDE = """
 type optional[T] = T | None
 
-@dataclass(frozen=True)
-class Ident:
-    name: str
+{ident}
 
 type ident = Ident
 type string = str
 """
 
+@dataclass(frozen=True)
+class Options:
+    # Generate classes with __slots__ (no per-instance __dict__)
+    slots: bool = False
+    # Store sequence fields as tuples instead of lists
+    tuples: bool = False
+    # Give each constructor an integer tag and generate visitor classes dispatching on it
+    tags: bool = False
+    # Names of the types whose constructors return canonical instances (hash-consing).
+    # Equality and hashing of these instances is by identity. Use 'ident' for Ident.
+    # Instances no longer referenced elsewhere are removed from the table.
+    intern: frozenset[str] = frozenset()
+    # Generate binary encoders and decoders (see common/asdlCodec.py)
+    codec: bool = False
+    # Generate iterative fold and transform functions for recursive sum types (see
+    # common/traversal.py). Requires tags.
+    folds: bool = False
+
+def dataclassDecorator(opts: Options, frozen: bool = False, interned: bool = False) -> str:
+    args = []
+    if frozen or interned:
+        args.append('frozen=True')
+    if interned:
+        # __new__ returns an initialized instance, equality is identity
+        args.extend(['eq=False', 'init=False'])
+    if opts.slots:
+        args.append('slots=True')
+        if interned:
+            # the table of canonical instances holds weak references
+            args.append('weakref_slot=True')
+    if args:
+        return f'@dataclass({", ".join(args)})'
+    else:
+        return '@dataclass'
+
 def abort(msg: str):
     sys.stderr.write(f'ERROR: {msg}\n')
     sys.exit(1)
 
+def tupleExpr(xs: list[str]) -> str:
+    if len(xs) == 1:
+        return f'({xs[0]},)'
+    return f'({", ".join(xs)})'
+
 @dataclass
 class Record:
     name: str
     fields: list[tuple[str, str, Optional[str]]]
+    opts: Options
+    # names of the sequence fields
+    seqFields: list[str]
+    # index of the constructor in its sum type
+    tag: Optional[int]
+    frozen: bool = False
+    interned: bool = False
     def generate(self):
         fs = []
+        if self.opts.tags and self.tag is not None:
+            fs.append(f'    tag: ClassVar[int] = {self.tag}')
+        if self.interned:
+            fs.append(f'    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], {self.name}]] = ' \
+                      'WeakValueDictionary()')
         for (name, ty, default) in self.fields:
             if default is not None:
                 fs.append(f'    {name}: {ty} = {default}')
             else:
                 fs.append(f'    {name}: {ty}')
         fsStr = '\n'.join(fs) if fs else '    pass'
-        return f"""@dataclass
+        postInit = ''
+        if self.interned:
+            postInit = self.generateInterning()
+        elif self.opts.tuples and self.seqFields:
+            # sequences might be passed as lists, we always store tuples
+            convs = '\n'.join([f'        self.{f} = tuple(self.{f})' for f in self.seqFields])
+            postInit = f"""
+    def __post_init__(self):
+{convs}
+"""
+        return f"""{dataclassDecorator(self.opts, self.frozen, self.interned)}
 class {self.name}:
 {fsStr}
+{postInit}"""
+
+    def generateInterning(self) -> str:
+        params = ''.join([f', {name}: {ty}' + (f' = {default}' if default is not None else '')
+                          for (name, ty, default) in self.fields])
+        names = [name for (name, _ty, _default) in self.fields]
+        convs = ''.join([f'        {f} = tuple({f})\n' for f in self.seqFields])
+        key = tupleExpr(names)
+        sets = ''.join([f"            object.__setattr__(x, '{f}', {f})\n" for f in names])
+        args = tupleExpr(['self.' + f for f in names])
+        return f"""
+    def __new__(cls{params}) -> {self.name}:
+{convs}        key = {key}
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+{sets}            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), {args})
 """
 
 @dataclass
@@ -58,28 +140,282 @@ class Union:
         else:
             return f'type {self.name} = {" | ".join(self.alternatives)}'
 
+def capitalize(s: str) -> str:
+    return s[:1].upper() + s[1:]
+
+@dataclass
+class Visitor:
+    """
+    Base class for passes over a sum type. visit{Type} dispatches in constant time through a
+    table indexed by the tag of the node. The table is built for each subclass, so
+    overriding the visit method for a constructor is sufficient. The visit methods of the
+    constructors are abstract, so a pass must handle all constructors.
+    """
+    name: str
+    alternatives: list[str]
+    def generate(self):
+        cls = f'{capitalize(self.name)}Visitor'
+        table = f'_{self.name}Table'
+        entries = ', '.join([f'cls.visit{c}' for c in self.alternatives])
+        methods = [f"""    def visit{capitalize(self.name)}(self, x: {self.name}, ctx: C) -> R:
+        return self.{table}[x.tag](self, x, ctx)"""]
+        for c in self.alternatives:
+            methods.append(f"""    @abstractmethod
+    def visit{c}(self, x: {c}, ctx: C) -> R: ...""")
+        return f"""class {cls}[R, C](ABC):
+    {table}: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls.{table} = ({entries})
+
+""" + '\n\n'.join(methods)
+
+@dataclass
+class Codec:
+    """
+    Binary encoder and decoder for a sum type, using the format and the runtime support
+    of common/asdlCodec.py. Sum types defined in other modules (the --common module) are
+    encoded with their public encode{Type}To and decode{Type}From functions.
+    """
+    name: str
+    constructors: list[asdl.Constructor]
+    attrs: list[asdl.Field]
+    localTypes: set[str]
+    def generate(self):
+        if len(self.constructors) > 127:
+            abort(f'Type {self.name} has more than 127 constructors')
+        cap = capitalize(self.name)
+        encs = []
+        decs = []
+        for i, c in enumerate(self.constructors):
+            lines = [f'    w.buf.append({i})']
+            args = []
+            for f in c.fields + self.attrs:
+                name = f.name if f.name else f.type
+                if f.seq or f.opt:
+                    lines.append(f'    {name} = x.{name}')
+                if f.seq:
+                    lines.append(f'    w.uint(len({name}))')
+                    lines.append(f'    for y in {name}:')
+                    lines.extend(['    ' + l for l in self.encodeValue(f.type, 'y')])
+                    args.append(f'[{self.decodeValue(f.type)} for _ in range(uint(r))]')
+                elif f.opt:
+                    lines.append(f'    if {name} is None:')
+                    lines.append(f'        w.buf.append(0)')
+                    lines.append(f'    else:')
+                    lines.append(f'        w.buf.append(1)')
+                    lines.extend(['    ' + l for l in self.encodeValue(f.type, name)])
+                    args.append(f'{self.decodeValue(f.type)} if r() else None')
+                else:
+                    lines.extend(self.encodeValue(f.type, f'x.{name}'))
+                    args.append(self.decodeValue(f.type))
+            body = '\n'.join(lines)
+            encs.append(f"""def _encode{c.name}(w: Writer, x: {c.name}):
+{body}""")
+            decs.append(f"""def _decode{c.name}(r: Reader, strs: list[str], idents: list[Ident]) -> {c.name}:
+    return {c.name}({', '.join(args)})""")
+        encTable = ''.join([f'\n    {c.name}: _encode{c.name},' for c in self.constructors])
+        decTable = ''.join([f'\n    _decode{c.name},' for c in self.constructors])
+        return '\n\n'.join(encs + decs) + f"""
+
+_{self.name}Encoders: dict[type[Any], Callable[[Writer, Any], None]] = {{{encTable}
+}}
+
+_{self.name}Decoders: tuple[Callable[[Reader, list[str], list[Ident]], {self.name}], ...] = ({decTable}
+)
+
+def encode{cap}To(w: Writer, x: {self.name}):
+    _{self.name}Encoders[type(x)](w, x)
+
+def decode{cap}From(r: Reader, strs: list[str], idents: list[Ident]) -> {self.name}:
+    return _{self.name}Decoders[r()](r, strs, idents)
+
+def encode{cap}(x: {self.name}) -> bytes:
+    return asdlCodec.encode(x, encode{cap}To)
+
+def decode{cap}(data: bytes) -> {self.name}:
+    return asdlCodec.decode(data, decode{cap}From, Ident)
+
+def encode{cap}List(xs: Sequence[{self.name}]) -> bytes:
+    return asdlCodec.encodeList(xs, encode{cap}To)
+
+def decode{cap}List(data: bytes) -> list[{self.name}]:
+    return asdlCodec.decodeList(data, decode{cap}From, Ident)"""
+
+    def encodeValue(self, ty: str, x: str) -> list[str]:
+        match ty:
+            case 'int':
+                return [f'    w.int({x})']
+            case 'bool':
+                return [f'    w.buf.append(1 if {x} else 0)']
+            case 'string' | 'str':
+                return [f'    w.str({x})']
+            case 'ident':
+                return [f'    w.str({x}.name)']
+            case _:
+                return [f'    encode{capitalize(ty)}To(w, {x})']
+
+    def decodeValue(self, ty: str) -> str:
+        match ty:
+            case 'int':
+                # inverse of the zigzag encoding
+                return f'((n := {UINT}) >> 1) ^ -(n & 1)'
+            case 'bool':
+                return 'r() == 1'
+            case 'string' | 'str':
+                return f'strs[{UINT}]'
+            case 'ident':
+                return f'idents[{UINT}]'
+            case _ if ty in self.localTypes:
+                return f'_{ty}Decoders[r()](r, strs, idents)'
+            case _:
+                return f'decode{capitalize(ty)}From(r, strs, idents)'
+
+@dataclass
+class Fold:
+    """
+    Traversals of a recursive sum type without recursion, see common/traversal.py.
+    {type}Children returns the children of a node that have the same type, in the order of
+    the fields. fold{Type} and transform{Type} process the children before the node.
+    """
+    name: str
+    constructors: list[asdl.Constructor]
+    attrs: list[asdl.Field]
+    def generate(self):
+        cap = capitalize(self.name)
+        children = []
+        rebuilds = []
+        for c in self.constructors:
+            parts = []
+            args = []
+            # offset of the next child in the list of new children
+            offset = Offset()
+            for f in c.fields + self.attrs:
+                name = f.name if f.name else f.type
+                if f.type != self.name:
+                    args.append(f'x.{name}')
+                elif f.seq:
+                    parts.append(f'*x.{name}')
+                    args.append(f'cs[{offset}:{offset.add(f"len(x.{name})")}]')
+                elif f.opt:
+                    parts.append(f'*(() if x.{name} is None else (x.{name},))')
+                    args.append(f'None if x.{name} is None else cs[{offset}]')
+                    offset.add(f'(x.{name} is not None)')
+                else:
+                    parts.append(f'x.{name}')
+                    args.append(f'cs[{offset}]')
+                    offset.add('1')
+            if not parts:
+                children.append('lambda x: ()')
+                rebuilds.append('lambda x, cs: x')
+                continue
+            if len(parts) == 1 and parts[0].startswith('*x.'):
+                # a single sequence field
+                children.append(f'lambda x: {parts[0][1:]}')
+            else:
+                children.append(f'lambda x: {tupleExpr(parts)}')
+            rebuilds.append(f'lambda x, cs: {c.name}({", ".join(args)})')
+        childTable = ''.join([f'\n    {l},' for l in children])
+        rebuildTable = ''.join([f'\n    {l},' for l in rebuilds])
+        return f"""_{self.name}Children: tuple[Callable[[Any], Sequence[{self.name}]], ...] = ({childTable}
+)
+
+_{self.name}Rebuild: tuple[Callable[[Any, list[{self.name}]], {self.name}], ...] = ({rebuildTable}
+)
+
+def {self.name}Children(x: {self.name}) -> Sequence[{self.name}]:
+    return _{self.name}Children[x.tag](x)
+
+def _rebuild{cap}(x: {self.name}, cs: list[{self.name}]) -> {self.name}:
+    return _{self.name}Rebuild[x.tag](x, cs)
+
+def fold{cap}[R](x: {self.name}, f: Callable[[{self.name}, list[R]], R]) -> R:
+    return traversal.fold(x, {self.name}Children, f)
+
+def transform{cap}(x: {self.name}, f: Callable[[{self.name}], {self.name}]) -> {self.name}:
+    return traversal.transform(x, {self.name}Children, _rebuild{cap}, f)"""
+
+class Offset:
+    """
+    An offset in the generated code: a constant plus a list of terms.
+    """
+    def __init__(self):
+        self.const = 0
+        self.terms: list[str] = []
+    def add(self, term: str) -> str:
+        if term == '1':
+            self.const += 1
+        else:
+            self.terms.append(term)
+        return str(self)
+    def __str__(self):
+        if not self.terms:
+            return str(self.const)
+        return ' + '.join(([str(self.const)] if self.const else []) + self.terms)
+
+def isRecursive(name: str, constructors: list[asdl.Constructor], attrs: list[asdl.Field]) -> bool:
+    return any([f.type == name for c in constructors for f in c.fields + attrs])
+
 class Output:
     def __init__(self):
         self.defs = []
     def append(self, d):
         self.defs.append(d)
-    def generate(self, commonModule: Optional[str]):
-        l = [IMPORTS.strip()]
+    def generate(self, commonModule: Optional[str], opts: Options):
+        l = []
         if commonModule:
             l.append(f'from {commonModule} import *')
         else:
-            l.append(PRELUDE.strip())
+            ident = Record('Ident', [('name', 'str', None)], opts, [], None, frozen=True,
+                           interned='ident' in opts.intern)
+            l.append(PRELUDE.strip().replace('{ident}', ident.generate().strip()))
         for d in self.defs:
             l.append(d.generate().strip())
-        return '\n\n'.join(l)
+        body = '\n\n'.join(l)
+        imports = IMPORTS.strip() + usedImports(body)
+        if opts.codec:
+            imports += CODEC_IMPORTS
+        if 'traversal.' in body:
+            imports += FOLD_IMPORTS
+        return imports + '\n\n' + body
 
-def generateCodeForConstructor(c: asdl.Constructor, attrs: list[asdl.Field], allTypes: set[str]) -> Record:
+CODEC_IMPORTS = """
+import common.asdlCodec as asdlCodec"""
+
+FOLD_IMPORTS = """
+import common.traversal as traversal"""
+
+# Decoding an unsigned number, readUint is only called for numbers with more than one byte
+UINT = '(b if (b := r()) < 128 else readUint(b, r))'
+
+# Optional imports of the generated code, only emitted if the name is used
+OPTIONAL_IMPORTS = [('abc', ['ABC', 'abstractmethod']),
+                    ('typing', ['Any', 'Callable', 'ClassVar', 'Sequence']),
+                    ('weakref', ['WeakValueDictionary']),
+                    ('common.asdlCodec', ['Reader', 'Writer', 'readUint', 'uint'])]
+
+def usedImports(code: str) -> str:
+    res = ''
+    for mod, names in OPTIONAL_IMPORTS:
+        used = [n for n in names if re.search(rf'(?<![.\w]){n}\b', code)]
+        if used:
+            res += f'\nfrom {mod} import {", ".join(used)}'
+    return res
+
+def generateCodeForConstructor(c: asdl.Constructor, attrs: list[asdl.Field], allTypes: set[str],
+                               opts: Options, tag: int, interned: bool) -> Record:
     fields = []
+    seqFields = []
     inputFields = c.fields + attrs
     for i, f in enumerate(inputFields):
         default = None
         if f.seq:
-            ty = f'list[{f.type}]'
+            if opts.tuples:
+                ty = f'Sequence[{f.type}]'
+                seqFields.append(f.name if f.name else f.type)
+            else:
+                ty = f'list[{f.type}]'
         elif f.opt:
             ty = f'optional[{f.type}]'
             restFields = inputFields[i+1:]
@@ -92,24 +428,41 @@ def generateCodeForConstructor(c: asdl.Constructor, attrs: list[asdl.Field], all
             ty = f.type
         name = f.name if f.name else f.type
         fields.append((name, ty, default))
-    return Record(c.name, fields)
+    return Record(c.name, fields, opts, seqFields, tag, interned=interned)
 
 asdl.Product.__match_args__ = ('fields', 'attributes')
 asdl.Sum.__match_args__ = ('types', 'attributes')
 
-def generateCode(mod: asdl.Module, out: Output):
+def generateCode(mod: asdl.Module, out: Output, opts: Options):
     allTypes = set(mod.types.keys())
+    codecs = []
+    folds = []
     for ty in mod.dfns:
         match ty.value:
             case asdl.Product(fields, _attrs):
                 abort(f'Definition {ty.name} has no constructor, this is not supported')
             case asdl.Sum(constructors, attrs):
                 alternatives = []
-                for c in constructors:
-                    d = generateCodeForConstructor(c, attrs, allTypes)
+                for tag, c in enumerate(constructors):
+                    d = generateCodeForConstructor(c, attrs, allTypes, opts, tag,
+                                                   ty.name in opts.intern)
                     out.append(d)
                     alternatives.append(c.name)
                 out.append(Union(ty.name, alternatives))
+                # no dispatch needed for sum types with a single constructor
+                if opts.tags and len(alternatives) > 1:
+                    if capitalize(ty.name) in alternatives:
+                        abort(f'Constructor {capitalize(ty.name)} clashes with the visit method of {ty.name}')
+                    out.append(Visitor(ty.name, alternatives))
+                if opts.codec:
+                    codecs.append(Codec(ty.name, constructors, attrs, allTypes))
+                if opts.folds and isRecursive(ty.name, constructors, attrs):
+                    folds.append(Fold(ty.name, constructors, attrs))
+    # after all classes, the decoders of a type reference the decoders of later types
+    for c in codecs:
+        out.append(c)
+    for f in folds:
+        out.append(f)
 
 def parseArgs():
     parser = argparse.ArgumentParser(
@@ -119,6 +472,18 @@ def parseArgs():
     parser.add_argument('inputFile')
     parser.add_argument('--out', required=False)
     parser.add_argument('--common', required=False)
+    parser.add_argument('--slots', action='store_true',
+                        help='Generate classes with __slots__')
+    parser.add_argument('--tuples', action='store_true',
+                        help='Represent sequence fields as tuples')
+    parser.add_argument('--tags', action='store_true',
+                        help='Generate constructor tags and visitor classes')
+    parser.add_argument('--codec', action='store_true',
+                        help='Generate binary encoders and decoders')
+    parser.add_argument('--folds', action='store_true',
+                        help='Generate iterative fold and transform functions (requires --tags)')
+    parser.add_argument('--intern', default='',
+                        help='Comma-separated list of types with interned constructors')
     return parser.parse_args()
 
 def writeFile(filename: str, content: str):
@@ -132,14 +497,21 @@ def writeFile(filename: str, content: str):
         ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         f.write(f' ({ts})\n')
         f.write(content)
+        if not content.endswith('\n'):
+            f.write('\n')
 
 def main():
     args = parseArgs()
     print(f'Parsing {args.inputFile}')
     mod = asdl.parse(args.inputFile)
     out = Output()
-    generateCode(mod, out)
-    s = out.generate(args.common)
+    if args.folds and not args.tags:
+        abort('--folds requires --tags')
+    opts = Options(slots=args.slots, tuples=args.tuples, tags=args.tags, codec=args.codec,
+                   folds=args.folds,
+                   intern=frozenset([t for t in args.intern.split(',') if t]))
+    generateCode(mod, out, opts)
+    s = out.generate(args.common, opts)
     if args.out:
         writeFile(args.out, s)
     else:
@@ -1,132 +1,596 @@
-# AUTOMATICALLY GENERATED (2024-04-03 17:32:36)
+# AUTOMATICALLY GENERATED (2026-10-17 08:58:57)
 from __future__ import annotations
 from dataclasses import dataclass
+from abc import ABC, abstractmethod
+from typing import Any, Callable, ClassVar, Sequence
+from weakref import WeakValueDictionary
+from common.asdlCodec import Reader, Writer, readUint
+import common.asdlCodec as asdlCodec
 
 type optional[T] = T | None
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Ident:
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Ident]] = WeakValueDictionary()
     name: str
 
+    def __new__(cls, name: str) -> Ident:
+        key = (name,)
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            object.__setattr__(x, 'name', name)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), (self.name,))
+
 type ident = Ident
 type string = str
 
-@dataclass
+@dataclass(slots=True)
 class Add:
-    pass
+    tag: ClassVar[int] = 0
 
-@dataclass
+@dataclass(slots=True)
 class Sub:
-    pass
+    tag: ClassVar[int] = 1
 
-@dataclass
+@dataclass(slots=True)
 class Mul:
-    pass
+    tag: ClassVar[int] = 2
 
-@dataclass
+@dataclass(slots=True)
 class Less:
-    pass
+    tag: ClassVar[int] = 3
 
-@dataclass
+@dataclass(slots=True)
 class LessEq:
-    pass
+    tag: ClassVar[int] = 4
 
-@dataclass
+@dataclass(slots=True)
 class Greater:
-    pass
+    tag: ClassVar[int] = 5
 
-@dataclass
+@dataclass(slots=True)
 class GreaterEq:
-    pass
+    tag: ClassVar[int] = 6
 
-@dataclass
+@dataclass(slots=True)
 class Eq:
-    pass
+    tag: ClassVar[int] = 7
 
-@dataclass
+@dataclass(slots=True)
 class NotEq:
-    pass
+    tag: ClassVar[int] = 8
 
 type op = Add | Sub | Mul | Less | LessEq | Greater | GreaterEq | Eq | NotEq
 
-@dataclass
+class OpVisitor[R, C](ABC):
+    _opTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._opTable = (cls.visitAdd, cls.visitSub, cls.visitMul, cls.visitLess, cls.visitLessEq, cls.visitGreater, cls.visitGreaterEq, cls.visitEq, cls.visitNotEq)
+
+    def visitOp(self, x: op, ctx: C) -> R:
+        return self._opTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitAdd(self, x: Add, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitSub(self, x: Sub, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitMul(self, x: Mul, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitLess(self, x: Less, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitLessEq(self, x: LessEq, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitGreater(self, x: Greater, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitGreaterEq(self, x: GreaterEq, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitEq(self, x: Eq, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitNotEq(self, x: NotEq, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class AddI:
-    pass
+    tag: ClassVar[int] = 0
 
-@dataclass
+@dataclass(slots=True)
 class LessI:
-    pass
+    tag: ClassVar[int] = 1
 
 type opI = AddI | LessI
 
-@dataclass
+class OpIVisitor[R, C](ABC):
+    _opITable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._opITable = (cls.visitAddI, cls.visitLessI)
+
+    def visitOpI(self, x: opI, ctx: C) -> R:
+        return self._opITable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitAddI(self, x: AddI, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitLessI(self, x: LessI, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class Imm:
+    tag: ClassVar[int] = 0
     value: int
 
 type imm = Imm
 
-@dataclass
+@dataclass(slots=True)
 class Reg:
+    tag: ClassVar[int] = 0
     name: string
 
 type reg = Reg
 
-@dataclass
+@dataclass(slots=True)
 class Op:
+    tag: ClassVar[int] = 0
     op: op
     target: reg
     left: reg
     right: reg
 
-@dataclass
+@dataclass(slots=True)
 class OpI:
+    tag: ClassVar[int] = 1
     opI: opI
     target: reg
     left: reg
     right: imm
 
-@dataclass
+@dataclass(slots=True)
 class LoadWord:
+    tag: ClassVar[int] = 2
     target: reg
     offset: imm
     src: reg
 
-@dataclass
+@dataclass(slots=True)
 class LoadI:
+    tag: ClassVar[int] = 3
     target: reg
     value: imm
 
-@dataclass
+@dataclass(slots=True)
 class LoadA:
+    tag: ClassVar[int] = 4
     target: reg
     label: str
 
-@dataclass
+@dataclass(slots=True)
 class StoreWord:
+    tag: ClassVar[int] = 5
     src: reg
     offset: imm
     baseAddr: reg
 
-@dataclass
+@dataclass(slots=True)
 class BranchNeqZero:
+    tag: ClassVar[int] = 6
     reg: reg
     label: string
 
-@dataclass
+@dataclass(slots=True)
 class Branch:
+    tag: ClassVar[int] = 7
     label: string
 
-@dataclass
+@dataclass(slots=True)
 class Move:
+    tag: ClassVar[int] = 8
     target: reg
     source: reg
 
-@dataclass
+@dataclass(slots=True)
 class Syscall:
-    pass
+    tag: ClassVar[int] = 9
 
-@dataclass
+@dataclass(slots=True)
 class Label:
+    tag: ClassVar[int] = 10
     label: string
 
-type instr = Op | OpI | LoadWord | LoadI | LoadA | StoreWord | BranchNeqZero | Branch | Move | Syscall | Label
\ No newline at end of file
+type instr = Op | OpI | LoadWord | LoadI | LoadA | StoreWord | BranchNeqZero | Branch | Move | Syscall | Label
+
+class InstrVisitor[R, C](ABC):
+    _instrTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._instrTable = (cls.visitOp, cls.visitOpI, cls.visitLoadWord, cls.visitLoadI, cls.visitLoadA, cls.visitStoreWord, cls.visitBranchNeqZero, cls.visitBranch, cls.visitMove, cls.visitSyscall, cls.visitLabel)
+
+    def visitInstr(self, x: instr, ctx: C) -> R:
+        return self._instrTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitOp(self, x: Op, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitOpI(self, x: OpI, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitLoadWord(self, x: LoadWord, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitLoadI(self, x: LoadI, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitLoadA(self, x: LoadA, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitStoreWord(self, x: StoreWord, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitBranchNeqZero(self, x: BranchNeqZero, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitBranch(self, x: Branch, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitMove(self, x: Move, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitSyscall(self, x: Syscall, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitLabel(self, x: Label, ctx: C) -> R: ...
+
+def _encodeAdd(w: Writer, x: Add):
+    w.buf.append(0)
+
+def _encodeSub(w: Writer, x: Sub):
+    w.buf.append(1)
+
+def _encodeMul(w: Writer, x: Mul):
+    w.buf.append(2)
+
+def _encodeLess(w: Writer, x: Less):
+    w.buf.append(3)
+
+def _encodeLessEq(w: Writer, x: LessEq):
+    w.buf.append(4)
+
+def _encodeGreater(w: Writer, x: Greater):
+    w.buf.append(5)
+
+def _encodeGreaterEq(w: Writer, x: GreaterEq):
+    w.buf.append(6)
+
+def _encodeEq(w: Writer, x: Eq):
+    w.buf.append(7)
+
+def _encodeNotEq(w: Writer, x: NotEq):
+    w.buf.append(8)
+
+def _decodeAdd(r: Reader, strs: list[str], idents: list[Ident]) -> Add:
+    return Add()
+
+def _decodeSub(r: Reader, strs: list[str], idents: list[Ident]) -> Sub:
+    return Sub()
+
+def _decodeMul(r: Reader, strs: list[str], idents: list[Ident]) -> Mul:
+    return Mul()
+
+def _decodeLess(r: Reader, strs: list[str], idents: list[Ident]) -> Less:
+    return Less()
+
+def _decodeLessEq(r: Reader, strs: list[str], idents: list[Ident]) -> LessEq:
+    return LessEq()
+
+def _decodeGreater(r: Reader, strs: list[str], idents: list[Ident]) -> Greater:
+    return Greater()
+
+def _decodeGreaterEq(r: Reader, strs: list[str], idents: list[Ident]) -> GreaterEq:
+    return GreaterEq()
+
+def _decodeEq(r: Reader, strs: list[str], idents: list[Ident]) -> Eq:
+    return Eq()
+
+def _decodeNotEq(r: Reader, strs: list[str], idents: list[Ident]) -> NotEq:
+    return NotEq()
+
+_opEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Add: _encodeAdd,
+    Sub: _encodeSub,
+    Mul: _encodeMul,
+    Less: _encodeLess,
+    LessEq: _encodeLessEq,
+    Greater: _encodeGreater,
+    GreaterEq: _encodeGreaterEq,
+    Eq: _encodeEq,
+    NotEq: _encodeNotEq,
+}
+
+_opDecoders: tuple[Callable[[Reader, list[str], list[Ident]], op], ...] = (
+    _decodeAdd,
+    _decodeSub,
+    _decodeMul,
+    _decodeLess,
+    _decodeLessEq,
+    _decodeGreater,
+    _decodeGreaterEq,
+    _decodeEq,
+    _decodeNotEq,
+)
+
+def encodeOpTo(w: Writer, x: op):
+    _opEncoders[type(x)](w, x)
+
+def decodeOpFrom(r: Reader, strs: list[str], idents: list[Ident]) -> op:
+    return _opDecoders[r()](r, strs, idents)
+
+def encodeOp(x: op) -> bytes:
+    return asdlCodec.encode(x, encodeOpTo)
+
+def decodeOp(data: bytes) -> op:
+    return asdlCodec.decode(data, decodeOpFrom, Ident)
+
+def encodeOpList(xs: Sequence[op]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeOpTo)
+
+def decodeOpList(data: bytes) -> list[op]:
+    return asdlCodec.decodeList(data, decodeOpFrom, Ident)
+
+def _encodeAddI(w: Writer, x: AddI):
+    w.buf.append(0)
+
+def _encodeLessI(w: Writer, x: LessI):
+    w.buf.append(1)
+
+def _decodeAddI(r: Reader, strs: list[str], idents: list[Ident]) -> AddI:
+    return AddI()
+
+def _decodeLessI(r: Reader, strs: list[str], idents: list[Ident]) -> LessI:
+    return LessI()
+
+_opIEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    AddI: _encodeAddI,
+    LessI: _encodeLessI,
+}
+
+_opIDecoders: tuple[Callable[[Reader, list[str], list[Ident]], opI], ...] = (
+    _decodeAddI,
+    _decodeLessI,
+)
+
+def encodeOpITo(w: Writer, x: opI):
+    _opIEncoders[type(x)](w, x)
+
+def decodeOpIFrom(r: Reader, strs: list[str], idents: list[Ident]) -> opI:
+    return _opIDecoders[r()](r, strs, idents)
+
+def encodeOpI(x: opI) -> bytes:
+    return asdlCodec.encode(x, encodeOpITo)
+
+def decodeOpI(data: bytes) -> opI:
+    return asdlCodec.decode(data, decodeOpIFrom, Ident)
+
+def encodeOpIList(xs: Sequence[opI]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeOpITo)
+
+def decodeOpIList(data: bytes) -> list[opI]:
+    return asdlCodec.decodeList(data, decodeOpIFrom, Ident)
+
+def _encodeImm(w: Writer, x: Imm):
+    w.buf.append(0)
+    w.int(x.value)
+
+def _decodeImm(r: Reader, strs: list[str], idents: list[Ident]) -> Imm:
+    return Imm(((n := (b if (b := r()) < 128 else readUint(b, r))) >> 1) ^ -(n & 1))
+
+_immEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Imm: _encodeImm,
+}
+
+_immDecoders: tuple[Callable[[Reader, list[str], list[Ident]], imm], ...] = (
+    _decodeImm,
+)
+
+def encodeImmTo(w: Writer, x: imm):
+    _immEncoders[type(x)](w, x)
+
+def decodeImmFrom(r: Reader, strs: list[str], idents: list[Ident]) -> imm:
+    return _immDecoders[r()](r, strs, idents)
+
+def encodeImm(x: imm) -> bytes:
+    return asdlCodec.encode(x, encodeImmTo)
+
+def decodeImm(data: bytes) -> imm:
+    return asdlCodec.decode(data, decodeImmFrom, Ident)
+
+def encodeImmList(xs: Sequence[imm]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeImmTo)
+
+def decodeImmList(data: bytes) -> list[imm]:
+    return asdlCodec.decodeList(data, decodeImmFrom, Ident)
+
+def _encodeReg(w: Writer, x: Reg):
+    w.buf.append(0)
+    w.str(x.name)
+
+def _decodeReg(r: Reader, strs: list[str], idents: list[Ident]) -> Reg:
+    return Reg(strs[(b if (b := r()) < 128 else readUint(b, r))])
+
+_regEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Reg: _encodeReg,
+}
+
+_regDecoders: tuple[Callable[[Reader, list[str], list[Ident]], reg], ...] = (
+    _decodeReg,
+)
+
+def encodeRegTo(w: Writer, x: reg):
+    _regEncoders[type(x)](w, x)
+
+def decodeRegFrom(r: Reader, strs: list[str], idents: list[Ident]) -> reg:
+    return _regDecoders[r()](r, strs, idents)
+
+def encodeReg(x: reg) -> bytes:
+    return asdlCodec.encode(x, encodeRegTo)
+
+def decodeReg(data: bytes) -> reg:
+    return asdlCodec.decode(data, decodeRegFrom, Ident)
+
+def encodeRegList(xs: Sequence[reg]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeRegTo)
+
+def decodeRegList(data: bytes) -> list[reg]:
+    return asdlCodec.decodeList(data, decodeRegFrom, Ident)
+
+def _encodeOp(w: Writer, x: Op):
+    w.buf.append(0)
+    encodeOpTo(w, x.op)
+    encodeRegTo(w, x.target)
+    encodeRegTo(w, x.left)
+    encodeRegTo(w, x.right)
+
+def _encodeOpI(w: Writer, x: OpI):
+    w.buf.append(1)
+    encodeOpITo(w, x.opI)
+    encodeRegTo(w, x.target)
+    encodeRegTo(w, x.left)
+    encodeImmTo(w, x.right)
+
+def _encodeLoadWord(w: Writer, x: LoadWord):
+    w.buf.append(2)
+    encodeRegTo(w, x.target)
+    encodeImmTo(w, x.offset)
+    encodeRegTo(w, x.src)
+
+def _encodeLoadI(w: Writer, x: LoadI):
+    w.buf.append(3)
+    encodeRegTo(w, x.target)
+    encodeImmTo(w, x.value)
+
+def _encodeLoadA(w: Writer, x: LoadA):
+    w.buf.append(4)
+    encodeRegTo(w, x.target)
+    w.str(x.label)
+
+def _encodeStoreWord(w: Writer, x: StoreWord):
+    w.buf.append(5)
+    encodeRegTo(w, x.src)
+    encodeImmTo(w, x.offset)
+    encodeRegTo(w, x.baseAddr)
+
+def _encodeBranchNeqZero(w: Writer, x: BranchNeqZero):
+    w.buf.append(6)
+    encodeRegTo(w, x.reg)
+    w.str(x.label)
+
+def _encodeBranch(w: Writer, x: Branch):
+    w.buf.append(7)
+    w.str(x.label)
+
+def _encodeMove(w: Writer, x: Move):
+    w.buf.append(8)
+    encodeRegTo(w, x.target)
+    encodeRegTo(w, x.source)
+
+def _encodeSyscall(w: Writer, x: Syscall):
+    w.buf.append(9)
+
+def _encodeLabel(w: Writer, x: Label):
+    w.buf.append(10)
+    w.str(x.label)
+
+def _decodeOp(r: Reader, strs: list[str], idents: list[Ident]) -> Op:
+    return Op(_opDecoders[r()](r, strs, idents), _regDecoders[r()](r, strs, idents), _regDecoders[r()](r, strs, idents), _regDecoders[r()](r, strs, idents))
+
+def _decodeOpI(r: Reader, strs: list[str], idents: list[Ident]) -> OpI:
+    return OpI(_opIDecoders[r()](r, strs, idents), _regDecoders[r()](r, strs, idents), _regDecoders[r()](r, strs, idents), _immDecoders[r()](r, strs, idents))
+
+def _decodeLoadWord(r: Reader, strs: list[str], idents: list[Ident]) -> LoadWord:
+    return LoadWord(_regDecoders[r()](r, strs, idents), _immDecoders[r()](r, strs, idents), _regDecoders[r()](r, strs, idents))
+
+def _decodeLoadI(r: Reader, strs: list[str], idents: list[Ident]) -> LoadI:
+    return LoadI(_regDecoders[r()](r, strs, idents), _immDecoders[r()](r, strs, idents))
+
+def _decodeLoadA(r: Reader, strs: list[str], idents: list[Ident]) -> LoadA:
+    return LoadA(_regDecoders[r()](r, strs, idents), strs[(b if (b := r()) < 128 else readUint(b, r))])
+
+def _decodeStoreWord(r: Reader, strs: list[str], idents: list[Ident]) -> StoreWord:
+    return StoreWord(_regDecoders[r()](r, strs, idents), _immDecoders[r()](r, strs, idents), _regDecoders[r()](r, strs, idents))
+
+def _decodeBranchNeqZero(r: Reader, strs: list[str], idents: list[Ident]) -> BranchNeqZero:
+    return BranchNeqZero(_regDecoders[r()](r, strs, idents), strs[(b if (b := r()) < 128 else readUint(b, r))])
+
+def _decodeBranch(r: Reader, strs: list[str], idents: list[Ident]) -> Branch:
+    return Branch(strs[(b if (b := r()) < 128 else readUint(b, r))])
+
+def _decodeMove(r: Reader, strs: list[str], idents: list[Ident]) -> Move:
+    return Move(_regDecoders[r()](r, strs, idents), _regDecoders[r()](r, strs, idents))
+
+def _decodeSyscall(r: Reader, strs: list[str], idents: list[Ident]) -> Syscall:
+    return Syscall()
+
+def _decodeLabel(r: Reader, strs: list[str], idents: list[Ident]) -> Label:
+    return Label(strs[(b if (b := r()) < 128 else readUint(b, r))])
+
+_instrEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Op: _encodeOp,
+    OpI: _encodeOpI,
+    LoadWord: _encodeLoadWord,
+    LoadI: _encodeLoadI,
+    LoadA: _encodeLoadA,
+    StoreWord: _encodeStoreWord,
+    BranchNeqZero: _encodeBranchNeqZero,
+    Branch: _encodeBranch,
+    Move: _encodeMove,
+    Syscall: _encodeSyscall,
+    Label: _encodeLabel,
+}
+
+_instrDecoders: tuple[Callable[[Reader, list[str], list[Ident]], instr], ...] = (
+    _decodeOp,
+    _decodeOpI,
+    _decodeLoadWord,
+    _decodeLoadI,
+    _decodeLoadA,
+    _decodeStoreWord,
+    _decodeBranchNeqZero,
+    _decodeBranch,
+    _decodeMove,
+    _decodeSyscall,
+    _decodeLabel,
+)
+
+def encodeInstrTo(w: Writer, x: instr):
+    _instrEncoders[type(x)](w, x)
+
+def decodeInstrFrom(r: Reader, strs: list[str], idents: list[Ident]) -> instr:
+    return _instrDecoders[r()](r, strs, idents)
+
+def encodeInstr(x: instr) -> bytes:
+    return asdlCodec.encode(x, encodeInstrTo)
+
+def decodeInstr(data: bytes) -> instr:
+    return asdlCodec.decode(data, decodeInstrFrom, Ident)
+
+def encodeInstrList(xs: Sequence[instr]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeInstrTo)
+
+def decodeInstrList(data: bytes) -> list[instr]:
+    return asdlCodec.decodeList(data, decodeInstrFrom, Ident)
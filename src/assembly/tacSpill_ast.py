@@ -1,76 +1,392 @@
-# AUTOMATICALLY GENERATED (2024-06-06 16:09:37)
+# AUTOMATICALLY GENERATED (2026-10-17 08:58:57)
 from __future__ import annotations
 from dataclasses import dataclass
+from abc import ABC, abstractmethod
+from typing import Any, Callable, ClassVar, Sequence
+from weakref import WeakValueDictionary
+from common.asdlCodec import Reader, Writer, readUint, uint
+import common.asdlCodec as asdlCodec
 
 type optional[T] = T | None
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Ident:
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Ident]] = WeakValueDictionary()
     name: str
 
+    def __new__(cls, name: str) -> Ident:
+        key = (name,)
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            object.__setattr__(x, 'name', name)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), (self.name,))
+
 type ident = Ident
 type string = str
 
-@dataclass
+@dataclass(slots=True)
 class Op:
+    tag: ClassVar[int] = 0
     name: string
 
 type op = Op
 
-@dataclass
+@dataclass(slots=True)
 class Const:
+    tag: ClassVar[int] = 0
     value: int
 
-@dataclass
+@dataclass(slots=True)
 class Name:
+    tag: ClassVar[int] = 1
     var: ident
 
 type prim = Const | Name
 
-@dataclass
+class PrimVisitor[R, C](ABC):
+    _primTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._primTable = (cls.visitConst, cls.visitName)
+
+    def visitPrim(self, x: prim, ctx: C) -> R:
+        return self._primTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitConst(self, x: Const, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitName(self, x: Name, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class Prim:
+    tag: ClassVar[int] = 0
     p: prim
 
-@dataclass
+@dataclass(slots=True)
 class BinOp:
+    tag: ClassVar[int] = 1
     left: prim
     op: op
     right: prim
 
 type exp = Prim | BinOp
 
-@dataclass
+class ExpVisitor[R, C](ABC):
+    _expTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._expTable = (cls.visitPrim, cls.visitBinOp)
+
+    def visitExp(self, x: exp, ctx: C) -> R:
+        return self._expTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitPrim(self, x: Prim, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitBinOp(self, x: BinOp, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class Assign:
+    tag: ClassVar[int] = 0
     var: ident
     right: exp
 
-@dataclass
+@dataclass(slots=True)
 class Call:
+    tag: ClassVar[int] = 1
     var: optional[ident]
     name: ident
-    args: list[prim]
+    args: Sequence[prim]
+
+    def __post_init__(self):
+        self.args = tuple(self.args)
 
-@dataclass
+@dataclass(slots=True)
 class GotoIf:
+    tag: ClassVar[int] = 2
     test: prim
     label: string
 
-@dataclass
+@dataclass(slots=True)
 class Goto:
+    tag: ClassVar[int] = 3
     label: string
 
-@dataclass
+@dataclass(slots=True)
 class Label:
+    tag: ClassVar[int] = 4
     label: string
 
-@dataclass
+@dataclass(slots=True)
 class Spill:
+    tag: ClassVar[int] = 5
     var: ident
     origName: string
 
-@dataclass
+@dataclass(slots=True)
 class Unspill:
+    tag: ClassVar[int] = 6
     var: ident
     origName: string
 
-type instr = Assign | Call | GotoIf | Goto | Label | Spill | Unspill
\ No newline at end of file
+type instr = Assign | Call | GotoIf | Goto | Label | Spill | Unspill
+
+class InstrVisitor[R, C](ABC):
+    _instrTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._instrTable = (cls.visitAssign, cls.visitCall, cls.visitGotoIf, cls.visitGoto, cls.visitLabel, cls.visitSpill, cls.visitUnspill)
+
+    def visitInstr(self, x: instr, ctx: C) -> R:
+        return self._instrTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitAssign(self, x: Assign, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitCall(self, x: Call, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitGotoIf(self, x: GotoIf, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitGoto(self, x: Goto, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitLabel(self, x: Label, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitSpill(self, x: Spill, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitUnspill(self, x: Unspill, ctx: C) -> R: ...
+
+def _encodeOp(w: Writer, x: Op):
+    w.buf.append(0)
+    w.str(x.name)
+
+def _decodeOp(r: Reader, strs: list[str], idents: list[Ident]) -> Op:
+    return Op(strs[(b if (b := r()) < 128 else readUint(b, r))])
+
+_opEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Op: _encodeOp,
+}
+
+_opDecoders: tuple[Callable[[Reader, list[str], list[Ident]], op], ...] = (
+    _decodeOp,
+)
+
+def encodeOpTo(w: Writer, x: op):
+    _opEncoders[type(x)](w, x)
+
+def decodeOpFrom(r: Reader, strs: list[str], idents: list[Ident]) -> op:
+    return _opDecoders[r()](r, strs, idents)
+
+def encodeOp(x: op) -> bytes:
+    return asdlCodec.encode(x, encodeOpTo)
+
+def decodeOp(data: bytes) -> op:
+    return asdlCodec.decode(data, decodeOpFrom, Ident)
+
+def encodeOpList(xs: Sequence[op]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeOpTo)
+
+def decodeOpList(data: bytes) -> list[op]:
+    return asdlCodec.decodeList(data, decodeOpFrom, Ident)
+
+def _encodeConst(w: Writer, x: Const):
+    w.buf.append(0)
+    w.int(x.value)
+
+def _encodeName(w: Writer, x: Name):
+    w.buf.append(1)
+    w.str(x.var.name)
+
+def _decodeConst(r: Reader, strs: list[str], idents: list[Ident]) -> Const:
+    return Const(((n := (b if (b := r()) < 128 else readUint(b, r))) >> 1) ^ -(n & 1))
+
+def _decodeName(r: Reader, strs: list[str], idents: list[Ident]) -> Name:
+    return Name(idents[(b if (b := r()) < 128 else readUint(b, r))])
+
+_primEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Const: _encodeConst,
+    Name: _encodeName,
+}
+
+_primDecoders: tuple[Callable[[Reader, list[str], list[Ident]], prim], ...] = (
+    _decodeConst,
+    _decodeName,
+)
+
+def encodePrimTo(w: Writer, x: prim):
+    _primEncoders[type(x)](w, x)
+
+def decodePrimFrom(r: Reader, strs: list[str], idents: list[Ident]) -> prim:
+    return _primDecoders[r()](r, strs, idents)
+
+def encodePrim(x: prim) -> bytes:
+    return asdlCodec.encode(x, encodePrimTo)
+
+def decodePrim(data: bytes) -> prim:
+    return asdlCodec.decode(data, decodePrimFrom, Ident)
+
+def encodePrimList(xs: Sequence[prim]) -> bytes:
+    return asdlCodec.encodeList(xs, encodePrimTo)
+
+def decodePrimList(data: bytes) -> list[prim]:
+    return asdlCodec.decodeList(data, decodePrimFrom, Ident)
+
+def _encodePrim(w: Writer, x: Prim):
+    w.buf.append(0)
+    encodePrimTo(w, x.p)
+
+def _encodeBinOp(w: Writer, x: BinOp):
+    w.buf.append(1)
+    encodePrimTo(w, x.left)
+    encodeOpTo(w, x.op)
+    encodePrimTo(w, x.right)
+
+def _decodePrim(r: Reader, strs: list[str], idents: list[Ident]) -> Prim:
+    return Prim(_primDecoders[r()](r, strs, idents))
+
+def _decodeBinOp(r: Reader, strs: list[str], idents: list[Ident]) -> BinOp:
+    return BinOp(_primDecoders[r()](r, strs, idents), _opDecoders[r()](r, strs, idents), _primDecoders[r()](r, strs, idents))
+
+_expEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Prim: _encodePrim,
+    BinOp: _encodeBinOp,
+}
+
+_expDecoders: tuple[Callable[[Reader, list[str], list[Ident]], exp], ...] = (
+    _decodePrim,
+    _decodeBinOp,
+)
+
+def encodeExpTo(w: Writer, x: exp):
+    _expEncoders[type(x)](w, x)
+
+def decodeExpFrom(r: Reader, strs: list[str], idents: list[Ident]) -> exp:
+    return _expDecoders[r()](r, strs, idents)
+
+def encodeExp(x: exp) -> bytes:
+    return asdlCodec.encode(x, encodeExpTo)
+
+def decodeExp(data: bytes) -> exp:
+    return asdlCodec.decode(data, decodeExpFrom, Ident)
+
+def encodeExpList(xs: Sequence[exp]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeExpTo)
+
+def decodeExpList(data: bytes) -> list[exp]:
+    return asdlCodec.decodeList(data, decodeExpFrom, Ident)
+
+def _encodeAssign(w: Writer, x: Assign):
+    w.buf.append(0)
+    w.str(x.var.name)
+    encodeExpTo(w, x.right)
+
+def _encodeCall(w: Writer, x: Call):
+    w.buf.append(1)
+    var = x.var
+    if var is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        w.str(var.name)
+    w.str(x.name.name)
+    args = x.args
+    w.uint(len(args))
+    for y in args:
+        encodePrimTo(w, y)
+
+def _encodeGotoIf(w: Writer, x: GotoIf):
+    w.buf.append(2)
+    encodePrimTo(w, x.test)
+    w.str(x.label)
+
+def _encodeGoto(w: Writer, x: Goto):
+    w.buf.append(3)
+    w.str(x.label)
+
+def _encodeLabel(w: Writer, x: Label):
+    w.buf.append(4)
+    w.str(x.label)
+
+def _encodeSpill(w: Writer, x: Spill):
+    w.buf.append(5)
+    w.str(x.var.name)
+    w.str(x.origName)
+
+def _encodeUnspill(w: Writer, x: Unspill):
+    w.buf.append(6)
+    w.str(x.var.name)
+    w.str(x.origName)
+
+def _decodeAssign(r: Reader, strs: list[str], idents: list[Ident]) -> Assign:
+    return Assign(idents[(b if (b := r()) < 128 else readUint(b, r))], _expDecoders[r()](r, strs, idents))
+
+def _decodeCall(r: Reader, strs: list[str], idents: list[Ident]) -> Call:
+    return Call(idents[(b if (b := r()) < 128 else readUint(b, r))] if r() else None, idents[(b if (b := r()) < 128 else readUint(b, r))], [_primDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+def _decodeGotoIf(r: Reader, strs: list[str], idents: list[Ident]) -> GotoIf:
+    return GotoIf(_primDecoders[r()](r, strs, idents), strs[(b if (b := r()) < 128 else readUint(b, r))])
+
+def _decodeGoto(r: Reader, strs: list[str], idents: list[Ident]) -> Goto:
+    return Goto(strs[(b if (b := r()) < 128 else readUint(b, r))])
+
+def _decodeLabel(r: Reader, strs: list[str], idents: list[Ident]) -> Label:
+    return Label(strs[(b if (b := r()) < 128 else readUint(b, r))])
+
+def _decodeSpill(r: Reader, strs: list[str], idents: list[Ident]) -> Spill:
+    return Spill(idents[(b if (b := r()) < 128 else readUint(b, r))], strs[(b if (b := r()) < 128 else readUint(b, r))])
+
+def _decodeUnspill(r: Reader, strs: list[str], idents: list[Ident]) -> Unspill:
+    return Unspill(idents[(b if (b := r()) < 128 else readUint(b, r))], strs[(b if (b := r()) < 128 else readUint(b, r))])
+
+_instrEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Assign: _encodeAssign,
+    Call: _encodeCall,
+    GotoIf: _encodeGotoIf,
+    Goto: _encodeGoto,
+    Label: _encodeLabel,
+    Spill: _encodeSpill,
+    Unspill: _encodeUnspill,
+}
+
+_instrDecoders: tuple[Callable[[Reader, list[str], list[Ident]], instr], ...] = (
+    _decodeAssign,
+    _decodeCall,
+    _decodeGotoIf,
+    _decodeGoto,
+    _decodeLabel,
+    _decodeSpill,
+    _decodeUnspill,
+)
+
+def encodeInstrTo(w: Writer, x: instr):
+    _instrEncoders[type(x)](w, x)
+
+def decodeInstrFrom(r: Reader, strs: list[str], idents: list[Ident]) -> instr:
+    return _instrDecoders[r()](r, strs, idents)
+
+def encodeInstr(x: instr) -> bytes:
+    return asdlCodec.encode(x, encodeInstrTo)
+
+def decodeInstr(data: bytes) -> instr:
+    return asdlCodec.decode(data, decodeInstrFrom, Ident)
+
+def encodeInstrList(xs: Sequence[instr]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeInstrTo)
+
+def decodeInstrList(data: bytes) -> list[instr]:
+    return asdlCodec.decodeList(data, decodeInstrFrom, Ident)
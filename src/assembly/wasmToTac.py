@@ -30,13 +30,20 @@ def wasmToTac(instrs: list[WasmInstrL]) -> tuple[Optional[tac.prim], list[tac.in
     return _toTacR(list(reversed(instrs)))
 
 def _toTacR(rInstrs: list[WasmInstrL]) -> tuple[Optional[tac.prim], list[tac.instr]]:
-    e = _Emitter()
-    (val, rest) = _toTacSingle(rInstrs, None, e)
-    if rest:
-        (_, l) = _toTacR(rest)
-    else:
-        l = []
-    return (val, l + e.instrs)
+    # Each call of _toTacSingle translates the instructions computing a single value. The
+    # TAC instructions of the chunks are in reverse order, like rInstrs.
+    chunks: list[list[tac.instr]] = []
+    val: Optional[tac.prim] = None
+    pos = 0
+    while True:
+        e = _Emitter()
+        (v, pos) = _toTacSingle(rInstrs, pos, None, e)
+        if not chunks:
+            val = v
+        chunks.append(e.instrs)
+        if pos >= len(rInstrs):
+            break
+    return (val, [i for c in reversed(chunks) for i in c])
 
 def _callInfo(id: WasmId) -> tuple[int, bool]:
     """
@@ -52,66 +59,104 @@ def _callInfo(id: WasmId) -> tuple[int, bool]:
 def downcast(l: list[WasmInstr]) -> list[WasmInstrL]:
     return cast(list[WasmInstrL], l)
 
-def _toTacSingle(rInstrs: list[WasmInstrL], targetVar: Optional[tac.ident], e: _Emitter) -> tuple[Optional[tac.prim], list[WasmInstrL]]:
-    match rInstrs:
-        case [WasmInstrVarLocal(op, x), *rest]:
-            if op == 'get':
-                return (tac.Name(tac.Ident(x.id)), rest)
-            else:
-                tacVar = tac.Ident(x.id)
-                (val, rest) = _toTacSingleNotNone(rest, tacVar, e)
-                match val:
-                    case tac.Name(v) if v == tacVar:
-                        pass # nothing todo
+def _operandCount(i: WasmInstrL) -> int:
+    """
+    The number of operands that must be translated before the instruction.
+    """
+    match i:
+        case WasmInstrVarLocal(op, _):
+            return 0 if op == 'get' else 1
+        case WasmInstrNumBinOp() | WasmInstrIntRelOp():
+            return 2
+        case WasmInstrCall(name):
+            return _callInfo(name)[0]
+        case WasmInstrBranch(_, True) | WasmInstrIf():
+            return 1
+        case _:
+            return 0
+
+def _toTacSingle(rInstrs: list[WasmInstrL], pos: int, targetVar: Optional[tac.ident],
+                 e: _Emitter) -> tuple[Optional[tac.prim], int]:
+    """
+    Translates the instructions computing a single value, starting at position pos of the
+    reversed instructions rInstrs. Returns the value and the position after the
+    instructions. The operands of an instruction are translated before the instruction,
+    from the last to the first operand. Instructions waiting for their operands are kept
+    on a stack, so deeply nested expressions do not exceed the recursion limit.
+    """
+    # instruction, its target variable, and the values of the operands translated so far
+    pending: list[tuple[WasmInstrL, Optional[tac.ident], list[tac.prim]]] = []
+    while True:
+        if pos == len(rInstrs):
+            val = None
+        else:
+            i = rInstrs[pos]
+            pos += 1
+            if _operandCount(i) > 0:
+                pending.append((i, targetVar, []))
+                match i:
+                    case WasmInstrVarLocal(_, x):
+                        targetVar = tac.Ident(x.id)
                     case _:
-                        e.emit(tac.Assign(tacVar, tac.Prim(val)))
-                if op == 'set':
-                    res = None
-                else:
-                    res = tac.Name(tacVar)
-                return (res, rest)
-        case [WasmInstrNumBinOp(_, op), *rest] | [WasmInstrIntRelOp(_, op), *rest]:
-            (right, rest) = _toTacSingleNotNone(rest, None, e)
-            (left, rest) = _toTacSingleNotNone(rest, None, e)
+                        targetVar = None
+                continue
+            val = _toTacLeaf(i, rInstrs, pos, targetVar, e)
+        # pass the value to the instructions waiting for it
+        while pending:
+            (i, t, operands) = pending[-1]
+            if val is None:
+                raise ValueError(f'toTacSingle returned None for rInstrs={rInstrs[pos:]}')
+            operands.append(val)
+            if len(operands) < _operandCount(i):
+                break
+            pending.pop()
+            val = _toTacOp(i, t, operands, e)
+        else:
+            return (val, pos)
+        targetVar = None
+
+def _toTacOp(i: WasmInstrL, targetVar: Optional[tac.ident], operands: list[tac.prim],
+             e: _Emitter) -> Optional[tac.prim]:
+    """
+    Translates an instruction with operands, given the values of the operands in reverse
+    order.
+    """
+    match i:
+        case WasmInstrVarLocal(op, x):
+            tacVar = tac.Ident(x.id)
+            val = operands[0]
+            match val:
+                case tac.Name(v) if v == tacVar:
+                    pass # nothing todo
+                case _:
+                    e.emit(tac.Assign(tacVar, tac.Prim(val)))
+            if op == 'set':
+                return None
+            else:
+                return tac.Name(tacVar)
+        case WasmInstrNumBinOp(_, op) | WasmInstrIntRelOp(_, op):
+            [right, left] = operands
             # no optimization
             opCode = op.upper()
             targetReg = targetVar or e.freshReg()
             e.emit(tac.Assign(targetReg, tac.BinOp(left, tac.Op(opCode), right)))
-            return (tac.Name(targetReg), rest)
-        case [WasmInstrCall(name), *rest]:
-            (n, hasResult) = _callInfo(name)
-            args = []
-            for _ in range(n):
-                (arg, rest) = _toTacSingleNotNone(rest, None, e)
-                args = [arg] + args
-            if hasResult:
-                targetReg = targetVar or e.freshReg()
-            else:
-                targetReg = None
-            e.emit(tac.Call(targetReg, tac.Ident(name.id), args))
-            return (tac.Name(targetReg) if targetReg else None, rest)
-        case [WasmInstrConst(_, v), *rest]:
-            if isinstance(v, int):
-                return (tac.Const(v), rest)
-            else:
-                raise ValueError(f'float constants not supported in TAC')
-        case [WasmInstrBranch(target, True), *rest]: # conditional branch
-            (val, rest) = _toTacSingleNotNone(rest, None, e)
-            e.emit(tac.GotoIf(val, target.id))
-            return (None, rest)
-        case [WasmInstrBranch(target, False), *rest]: # unconditional branch
-            e.emit(tac.Goto(target.id))
-            return (None, rest)
-        case [WasmInstrIf(_, [], elseInstrs), *rest]:
-            (val, rest) = _toTacSingleNotNone(rest, None, e)
+            return tac.Name(targetReg)
+        case WasmInstrCall(name):
+            (_, hasResult) = _callInfo(name)
+            return _toTacCall(name, list(reversed(operands)), hasResult, targetVar, e)
+        case WasmInstrBranch(target, True): # conditional branch
+            e.emit(tac.GotoIf(operands[0], target.id))
+            return None
+        case WasmInstrIf(_, [], elseInstrs):
+            val = operands[0]
             labelEnd = e.freshLabel('end')
             e.emit(tac.GotoIf(val, labelEnd))
             (_, elseInstrsTac) = wasmToTac(downcast(elseInstrs))
             e.add(elseInstrsTac)
             e.emit(tac.Label(labelEnd))
-            return (None, rest)
-        case [WasmInstrIf(resTy, thenInstrs, elseInstrs), *rest]:
-            (val, rest) = _toTacSingleNotNone(rest, None, e)
+            return None
+        case WasmInstrIf(resTy, thenInstrs, elseInstrs):
+            val = operands[0]
             targetReg = targetVar or e.freshReg()
             (valElse, elseInstrsTac) = wasmToTac(downcast(elseInstrs))
             (valThen, thenInstrsTac) = wasmToTac(downcast(thenInstrs))
@@ -128,32 +173,55 @@ def _toTacSingle(rInstrs: list[WasmInstrL], targetVar: Optional[tac.ident], e: _
                 e.emit(tac.Assign(targetReg, tac.Prim(assertNotNone(valThen))))
             e.emit(tac.Label(labelEnd))
             if resTy is not None:
-                return (tac.Name(targetReg), rest)
+                return tac.Name(targetReg)
+            else:
+                return None
+        case _:
+            raise ValueError(f"Don't know what to do with instruction {i}")
+
+def _toTacCall(name: WasmId, args: list[tac.prim], hasResult: bool,
+               targetVar: Optional[tac.ident], e: _Emitter) -> Optional[tac.prim]:
+    if hasResult:
+        targetReg = targetVar or e.freshReg()
+    else:
+        targetReg = None
+    e.emit(tac.Call(targetReg, tac.Ident(name.id), args))
+    return tac.Name(targetReg) if targetReg else None
+
+def _toTacLeaf(i: WasmInstrL, rInstrs: list[WasmInstrL], pos: int,
+               targetVar: Optional[tac.ident], e: _Emitter) -> Optional[tac.prim]:
+    """
+    Translates an instruction without operands.
+    """
+    match i:
+        case WasmInstrVarLocal(_, x):
+            return tac.Name(tac.Ident(x.id))
+        case WasmInstrCall(name):
+            (_, hasResult) = _callInfo(name)
+            return _toTacCall(name, [], hasResult, targetVar, e)
+        case WasmInstrConst(_, v):
+            if isinstance(v, int):
+                return tac.Const(v)
             else:
-                return (None, rest)
-        case [WasmInstrLoop(label, body), *rest]:
+                raise ValueError(f'float constants not supported in TAC')
+        case WasmInstrBranch(target, False): # unconditional branch
+            e.emit(tac.Goto(target.id))
+            return None
+        case WasmInstrLoop(label, body):
             (_, instrsTac) = wasmToTac(downcast(body))
             e.emit(tac.Label(label.id))
             e.add(instrsTac)
-            return (None, rest)
-        case [WasmInstrBlock(label, resultTy, body), *rest]:
+            return None
+        case WasmInstrBlock(label, resultTy, body):
             (val, instrsTac) = wasmToTac(downcast(body))
             e.add(instrsTac)
             if resultTy is not None:
                 targetReg = targetVar or e.freshReg()
                 e.emit(tac.Assign(targetReg, tac.Prim(assertNotNone(val))))
                 e.emit(tac.Label(label.id))
-                return (tac.Name(targetReg), rest)
+                return tac.Name(targetReg)
             else:
                 e.emit(tac.Label(label.id))
-                return (None, rest)
-        case []:
-            return (None, [])
+                return None
         case _:
-            raise ValueError(f"Don't know what to do with reversed stack {rInstrs}")
-
-def _toTacSingleNotNone(rInstrs: list[WasmInstrL], targetVar: Optional[tac.ident], e: _Emitter) -> tuple[tac.prim, list[WasmInstrL]]:
-    (x, rest) = _toTacSingle(rInstrs, targetVar, e)
-    if x is None:
-        raise ValueError(f'toTacSingle returned None for rInstrs={rInstrs}')
-    return (x, rest)
+            raise ValueError(f"Don't know what to do with reversed stack {rInstrs[pos - 1:]}")
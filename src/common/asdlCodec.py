@@ -0,0 +1,156 @@
+from typing import *
+import gc
+
+# Runtime support for the binary encoders and decoders generated by asdl2py --codec.
+#
+# Format: a magic string, the size of the string table, the string table, and the encoded
+# value. The string table is the number of strings, the lengths of their UTF-8 encodings,
+# and the concatenated encodings. Numbers are unsigned varints (7 bits per byte, least
+# significant group first, high bit set on all but the last byte). The value is encoded as
+# a sequence of numbers:
+#
+# - a node of a sum type is the index of its constructor followed by its fields
+# - an int is zigzag-encoded (0, -1, 1, -2, ... become 0, 1, 2, 3, ...)
+# - a bool is 0 or 1
+# - a string or an identifier is an index into the string table
+# - an optional value is 0 (None) or 1 followed by the value
+# - a sequence is its length followed by its elements
+#
+# The generated decoders read the bytes of the encoded value with a reader and only call
+# readUint for numbers of more than one byte. Constructor indices, bools, and the markers
+# of optional values always fit into a single byte.
+
+MAGIC = b'ASDL\x01'
+
+type Reader = Callable[[], int]
+
+class Writer:
+    def __init__(self):
+        self.buf = bytearray()
+        self.strings: dict[str, int] = {}
+
+    def uint(self, n: int):
+        _writeUint(self.buf, n)
+
+    def int(self, n: int):
+        _writeUint(self.buf, n << 1 if n >= 0 else (-n << 1) - 1)
+
+    def str(self, s: str):
+        i = self.strings.get(s)
+        if i is None:
+            i = len(self.strings)
+            self.strings[s] = i
+        _writeUint(self.buf, i)
+
+    def getvalue(self) -> bytes:
+        encoded = [s.encode('utf-8') for s in self.strings]
+        table = bytearray()
+        _writeUint(table, len(encoded))
+        for b in encoded:
+            _writeUint(table, len(b))
+        table.extend(b''.join(encoded))
+        header = bytearray(MAGIC)
+        _writeUint(header, len(table))
+        return bytes(header + table + self.buf)
+
+def _writeUint(buf: bytearray, n: int):
+    while n > 127:
+        buf.append((n & 127) | 128)
+        n >>= 7
+    buf.append(n)
+
+def _readUint(data: bytes, pos: int) -> tuple[int, int]:
+    n = 0
+    shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 127) << shift
+        if b < 128:
+            return (n, pos)
+        shift += 7
+
+def readUint(first: int, r: Reader) -> int:
+    """
+    Reads the remaining bytes of a number whose first byte is first (>= 128).
+    """
+    n = first & 127
+    shift = 7
+    while True:
+        b = r()
+        n |= (b & 127) << shift
+        if b < 128:
+            return n
+        shift += 7
+
+def uint(r: Reader) -> int:
+    n = r()
+    return n if n < 128 else readUint(n, r)
+
+def strings(data: bytes) -> tuple[list[str], int]:
+    """
+    Checks the header of data and decodes the string table. Returns the strings and the
+    offset of the encoded value.
+    """
+    if not data.startswith(MAGIC):
+        raise ValueError('Not an encoded ASDL value')
+    (size, start) = _readUint(data, len(MAGIC))
+    end = start + size
+    (count, pos) = _readUint(data, start)
+    lengths: list[int] = []
+    for _ in range(count):
+        (n, pos) = _readUint(data, pos)
+        lengths.append(n)
+    strs: list[str] = []
+    for n in lengths:
+        strs.append(data[pos:pos + n].decode('utf-8'))
+        pos += n
+    if pos != end:
+        raise ValueError('Invalid string table')
+    return (strs, end)
+
+def encode[T](x: T, f: Callable[[Writer, T], None]) -> bytes:
+    w = Writer()
+    f(w, x)
+    return w.getvalue()
+
+def encodeList[T](xs: Sequence[T], f: Callable[[Writer, T], None]) -> bytes:
+    w = Writer()
+    w.uint(len(xs))
+    for x in xs:
+        f(w, x)
+    return w.getvalue()
+
+type Decoder[T, I] = Callable[[Reader, list[str], list[I]], T]
+
+def decode[T, I](data: bytes, f: Decoder[T, I], mkIdent: Callable[[str], I]) -> T:
+    """
+    Decodes a value encoded by encode. Identifiers are constructed once per string with
+    mkIdent. Raises ValueError if data is not a valid encoding.
+    """
+    return _decode(data, lambda r, strs, idents: f(r, strs, idents), mkIdent)
+
+def decodeList[T, I](data: bytes, f: Decoder[T, I], mkIdent: Callable[[str], I]) -> list[T]:
+    return _decode(data, lambda r, strs, idents: [f(r, strs, idents) for _ in range(uint(r))],
+                   mkIdent)
+
+def _decode[T, I](data: bytes, f: Decoder[T, I], mkIdent: Callable[[str], I]) -> T:
+    # The decoded nodes form a tree, so there is nothing for the cyclic garbage collector
+    # to find. Collections triggered by the allocations would traverse all nodes decoded
+    # so far, again and again.
+    gcEnabled = gc.isenabled()
+    gc.disable()
+    try:
+        (strs, pos) = strings(data)
+        r = iter(memoryview(data)[pos:]).__next__
+        x = f(r, strs, [mkIdent(s) for s in strs])
+    except (StopIteration, IndexError, UnicodeDecodeError) as err:
+        raise ValueError(f'Invalid encoded ASDL value: {err!r}')
+    finally:
+        if gcEnabled:
+            gc.enable()
+    try:
+        r()
+    except StopIteration:
+        return x
+    raise ValueError('Trailing data after encoded ASDL value')
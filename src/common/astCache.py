@@ -0,0 +1,128 @@
+from typing import *
+import hashlib
+import os
+import pickle
+import sys
+import common.log as log
+import common.utils as utils
+
+# On-disk cache for ASTs produced by genericParser.parseFile. Entries are keyed by the
+# hash of the source code, the name of the AST module, and a version stamp of the AST
+# module and of the translation code. The cache is disabled if no directory is configured.
+# fun_tychecker stores the typechecked function definitions of lang_fun in the same cache.
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_cacheDir: Optional[str] = None
+_maxBytes: int = DEFAULT_MAX_BYTES
+_versionStamps: dict[str, str] = {}
+
+def configure(cacheDir: Optional[str], maxBytes: int = DEFAULT_MAX_BYTES):
+    """
+    Enables the cache in cacheDir (or disables it if cacheDir is None). If the size
+    of all entries exceeds maxBytes, the least recently used entries are evicted.
+    """
+    global _cacheDir, _maxBytes
+    _cacheDir = cacheDir
+    _maxBytes = maxBytes
+
+def isEnabled() -> bool:
+    return _cacheDir is not None
+
+def versionStamp(m: Any) -> str:
+    """
+    Hash of the source file of module m.
+    """
+    path: str = m.__file__
+    stamp = _versionStamps.get(path)
+    if stamp is None:
+        stamp = utils.md5(path)
+        _versionStamps[path] = stamp
+    return stamp
+
+def astModules(m: Any) -> list[Any]:
+    """
+    Module m and the modules of the same package defining classes exported by m (e.g. the
+    --common module of a generated AST module).
+    """
+    pkg = m.__name__.split('.')[0]
+    names = {m.__name__}
+    defs: dict[str, Any] = m.__dict__
+    for x in defs.values():
+        if isinstance(x, type) and x.__module__.split('.')[0] == pkg:
+            names.add(x.__module__)
+    return [sys.modules[n] for n in sorted(names)]
+
+def cacheKey(src: str, m: Any, translator: Any) -> str:
+    h = hashlib.sha256()
+    stamps = [versionStamp(x) for x in astModules(m)]
+    for x in [m.__name__, *stamps, versionStamp(translator), src]:
+        h.update(x.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+def _path(key: str) -> str:
+    return os.path.join(utils.assertNotNone(_cacheDir), key + '.ast.pickle')
+
+def lookup(key: str) -> Optional[Any]:
+    if _cacheDir is None:
+        return None
+    path = _path(key)
+    try:
+        with open(path, 'rb') as f:
+            x = pickle.load(f)
+        # The modification time records the last use for LRU eviction
+        os.utime(path)
+        log.debug(f'AST cache hit: {path}')
+        return x
+    except FileNotFoundError:
+        return None
+    except Exception as err:
+        log.debug(f'Ignoring broken AST cache file {path}: {err}')
+        return None
+
+def store(key: str, x: Any):
+    storeAll([(key, x)])
+
+def storeAll(entries: Sequence[tuple[str, Any]]):
+    """
+    Stores several entries, evicting old entries only once at the end.
+    """
+    if _cacheDir is None or not entries:
+        return
+    try:
+        os.makedirs(_cacheDir, exist_ok=True)
+        for (key, x) in entries:
+            path = _path(key)
+            # Write to a temporary file first to avoid races between concurrent test runs
+            tmp = f'{path}.{os.getpid()}.tmp'
+            with open(tmp, 'wb') as f:
+                pickle.dump(x, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        evict(_cacheDir, _maxBytes)
+    except OSError as err:
+        log.debug(f'Could not store AST in cache directory {_cacheDir}: {err}')
+
+def evict(cacheDir: str, maxBytes: int):
+    """
+    Removes the least recently used entries until the total size is at most maxBytes.
+    """
+    entries: list[tuple[float, int, str]] = []
+    total = 0
+    with os.scandir(cacheDir) as it:
+        for e in it:
+            if e.name.endswith('.ast.pickle'):
+                st = e.stat()
+                entries.append((st.st_mtime, st.st_size, e.path))
+                total += st.st_size
+    if total <= maxBytes:
+        return
+    entries.sort()
+    for (_mtime, size, path) in entries:
+        if total <= maxBytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
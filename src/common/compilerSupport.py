@@ -4,6 +4,7 @@ import common.constants as constants
 import common.log as log
 import sys
 import traceback
+from collections import deque
 
 def wasmImports(maxMemSize: int) -> list[WasmImport]: return [
     WasmImport("env", "memory", WasmImportMemory(maxMemSize, None)),
@@ -35,3 +36,15 @@ class CompilerConfig:
     maxArraySize: int # (in bytes)
     defaultMaxArraySize = 50 * 1024 * 1024 # 50MB
 
+def concatInstrs(left: deque[WasmInstr], right: deque[WasmInstr]) -> deque[WasmInstr]:
+    """
+    Concatenates the instructions of two subexpressions by adding the shorter sequence to
+    the longer one. Compiling an expression bottom-up this way takes linear time for
+    deeply nested expressions, concatenating lists would take quadratic time.
+    """
+    if len(left) >= len(right):
+        left.extend(right)
+        return left
+    else:
+        right.extendleft(reversed(left))
+        return right
@@ -3,11 +3,19 @@ import ast
 import common.utils as utils
 from common.utils import abort
 import common.log as log
-import pprint
 import common.constants as constants
 from common.constants import Language
 import parsers.common as p
 import dataclasses
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import importlib
+import os
+import time
+import sys
+import common.astCache as astCache
+import common.traversal as traversal
 
 # Display the AST of some python code:
 # print(ast.dump(ast.parse('5 * [1]', mode='eval'), indent=4))    # or mode='exec'
@@ -15,7 +23,7 @@ import dataclasses
 def pp(x: Any):
     return ast.dump(x)
 
-def unsupported(x: str):
+def unsupported(x: str) -> Never:
     raise Exception(f'Parser does not support the following construct: {x}')
 
 def transUnOp(op: ast.unaryop, m: Any) -> Any:
@@ -55,13 +63,21 @@ def transBoolOp(op: ast.boolop, m: Any) -> Any:
             unsupported(f'bool operator {pp(op)}')
 
 def transExp(e: ast.expr, m: Any, lang: Language) -> Any:
+    # Without recursion, deeply nested expressions must not exceed the recursion limit
+    return traversal.foldParts(e, lambda x: expParts(x, m, lang))
+
+def expParts(e: ast.expr, m: Any, lang: Language) -> traversal.Parts[ast.expr, Any]:
+    """
+    Returns the subexpressions of e and a function constructing the translation of e
+    from the translations of the subexpressions.
+    """
     # log.debug(f'Parsing {pp(e)}')
     match e:
         case ast.Constant(c):
             if type(c) is int:
-                return m.IntConst(c)
+                return ([], lambda _: m.IntConst(c))
             elif type(c) is bool:
-                return m.BoolConst(c)
+                return ([], lambda _: m.BoolConst(c))
             elif type(c) is str:
                 unsupported(f'string constant {repr(c)}')
             elif type(c) is float:
@@ -69,33 +85,32 @@ def transExp(e: ast.expr, m: Any, lang: Language) -> Any:
             else:
                 unsupported(f'constant {c}')
         case ast.Name(v, _):
-            return m.Name(m.Ident(v))
+            return ([], lambda _: m.Name(m.Ident(v)))
         case ast.Call(ast.Name(f, _), args, []) if lang != 'fun':
             fun = m.Ident(f)
-            return m.Call(fun, [transExp(e, m, lang) for e in args])
+            return (args, lambda xs: m.Call(fun, xs))
         case ast.Call(exp, args, []) if lang == 'fun':
-            fun = transExp(exp, m, lang)
-            return m.Call(fun, [transExp(e, m, lang) for e in args])
+            return ([exp, *args], lambda xs: m.Call(xs[0], xs[1:]))
         case ast.UnaryOp(op, e):
-            return m.UnOp(transUnOp(op, m), transExp(e, m, lang))
+            return ([e], lambda xs: m.UnOp(transUnOp(op, m), xs[0]))
         case ast.BinOp(size, ast.Mult(), ast.List(l)):
             match l:
                 case [e]:
-                    return m.ArrayInitDyn(transExp(size, m, lang), transExp(e, m, lang))
+                    return ([size, e], lambda xs: m.ArrayInitDyn(xs[0], xs[1]))
                 case _:
                     unsupported(f'dynamic array initialization with not exactly one initial value')
         case ast.BinOp(left, op, right):
-            return m.BinOp(transExp(left, m, lang), transBinOp(op, m), transExp(right, m, lang))
+            return ([left, right], lambda xs: m.BinOp(xs[0], transBinOp(op, m), xs[1]))
         case ast.IfExp(cond, thenExp, elseExp):
-            return m.CondExp(transExp(cond, m, lang), transExp(thenExp, m, lang), transExp(elseExp, m, lang))
+            return ([cond, thenExp, elseExp], lambda xs: m.CondExp(xs[0], xs[1], xs[2]))
         case ast.Compare(left, [op], [right]):
-            return m.BinOp(transExp(left, m, lang), transCompOp(op, m), transExp(right, m, lang))
+            return ([left, right], lambda xs: m.BinOp(xs[0], transCompOp(op, m), xs[1]))
         case ast.BoolOp(op, [left, right]):
-            return m.BinOp(transExp(left, m, lang), transBoolOp(op, m), transExp(right, m, lang))
+            return ([left, right], lambda xs: m.BinOp(xs[0], transBoolOp(op, m), xs[1]))
         case ast.List(es):
-            return m.ArrayInitStatic([transExp(e, m, lang) for e in es])
+            return (es, lambda xs: m.ArrayInitStatic(xs))
         case ast.Subscript(e, idx):
-            return m.Subscript(transExp(e, m, lang), transExp(idx, m, lang))
+            return ([e, idx], lambda xs: m.Subscript(xs[0], xs[1]))
         case _:
             unsupported(f'expression {pp(e)}')
 
@@ -193,11 +208,19 @@ def parseFile(filename: str, m: Any) -> Any:
     lang = constants.asLanguage(l)
     with open(filename, 'r') as f:
         src = f.read()
-        module = ast.parse(src, filename)
-        w = ModWrapper(m, lang)
-        x = transModule(module, w, lang)
-        log.debug(f'AST: {pprint.pformat(x)}')
-        return x
+    key = None
+    if astCache.isEnabled():
+        key = astCache.cacheKey(src, m, sys.modules[__name__])
+        x = astCache.lookup(key)
+        if x is not None:
+            return x
+    module = ast.parse(src, filename)
+    w = ModWrapper(m, lang)
+    x = transModule(module, w, lang)
+    log.debugPretty('AST: ', x)
+    if key is not None:
+        astCache.store(key, x)
+    return x
 
 ParserArgs = p.ParserArgs
 
@@ -216,3 +239,101 @@ def parseWithOwnParser(filename: str, args: ParserArgs, astMod: Any,
         print('AST from owner parser matches the AST obtained via the python parser')
     else:
         print('ERROR: mismatch between AST from owner parser and AST from python parser')
+
+def structuralHash(x: Any) -> str:
+    """
+    Hash of the structure of an AST. Two ASTs are equal iff their structural hashes are
+    equal (modulo hash collisions). The hash is computed by a traversal over the fields
+    of the AST nodes, lists and tuples are both treated as sequences.
+    """
+    h = hashlib.sha256()
+    _hashInto(h.update, x)
+    return h.hexdigest()
+
+def _hashInto(update: Callable[[bytes], None], x: Any):
+    match x:
+        case list() | tuple():
+            items = cast(Sequence[Any], x)
+            update(b'[%d' % len(items))
+            for y in items:
+                _hashInto(update, y)
+        case str():
+            update(b's%d:' % len(x))
+            update(x.encode('utf-8'))
+        case None | bool() | int() | float():
+            update(f'{repr(x)};'.encode('ascii'))
+        case _ if dataclasses.is_dataclass(x):
+            update(type(x).__qualname__.encode('utf-8'))
+            update(b'(')
+            for f in dataclasses.fields(x):
+                _hashInto(update, getattr(x, f.name))
+            update(b')')
+        case _:
+            raise ValueError(f'Cannot hash value of type {type(x).__name__}')
+
+@dataclass(frozen=True)
+class CorpusResult:
+    filename: str
+    ok: bool
+    error: Optional[str]
+
+def _checkCorpusFile(task: tuple[str, ParserArgs, str, Callable[[ParserArgs], Any]]) -> CorpusResult:
+    (filename, args, astModName, parseFun) = task
+    astMod = importlib.import_module(astModName)
+    try:
+        code = utils.readTextFile(filename)
+        ownHash = structuralHash(parseFun(dataclasses.replace(args, code=code)))
+    except Exception as err:
+        return CorpusResult(filename, False, f'own parser failed: {err}')
+    try:
+        pyHash = structuralHash(parseFile(filename, astMod))
+    except (Exception, SystemExit) as err:
+        # SystemExit is raised by abort
+        return CorpusResult(filename, False, f'python parser failed: {err}')
+    if ownHash == pyHash:
+        return CorpusResult(filename, True, None)
+    else:
+        return CorpusResult(filename, False, 'AST mismatch')
+
+def collectCorpus(dir: str) -> list[str]:
+    files: list[str] = []
+    for root, _dirs, names in os.walk(dir):
+        for n in names:
+            if n.endswith('.py') and not n.startswith('.'):
+                files.append(os.path.join(root, n))
+    files.sort()
+    return files
+
+def parseCorpus(dir: str, args: ParserArgs, astModName: str, parseModName: str,
+                jobs: int) -> list[CorpusResult]:
+    """
+    Checks for all .py files in dir that our own parser (parseModule in module parseModName)
+    and the python parser produce the same AST. The files are processed by a pool of
+    jobs processes. Only structural hashes of the ASTs are sent back from the workers.
+    """
+    try:
+        importlib.import_module(astModName)
+        parseMod = importlib.import_module(parseModName)
+    except ImportError as err:
+        abort(f'Cannot parse corpus {dir}: {err}')
+    parseFun: Optional[Callable[[ParserArgs], Any]] = getattr(parseMod, 'parseModule', None)
+    if parseFun is None:
+        abort(f'Cannot parse corpus {dir}: module {parseModName} does not define parseModule')
+    files = collectCorpus(dir)
+    # functions are pickled by reference, so workers import the parser module themselves
+    tasks = [(f, args, astModName, parseFun) for f in files]
+    start = time.perf_counter()
+    if jobs <= 1:
+        results = [_checkCorpusFile(t) for t in tasks]
+    else:
+        chunksize = max(1, len(tasks) // (4 * jobs))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_checkCorpusFile, tasks, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+    failed = [r for r in results if not r.ok]
+    for r in failed:
+        print(f'MISMATCH {r.filename}: {r.error}')
+    rate = len(results) / elapsed if elapsed > 0 else float('inf')
+    print(f'Checked {len(results)} files with {jobs} job(s) in {elapsed:.2f}s ' \
+        f'({rate:.1f} files/sec), {len(failed)} mismatch(es)')
+    return results
@@ -0,0 +1,132 @@
+from typing import *
+import ast
+from dataclasses import dataclass
+import common.constants as constants
+import common.genericParser as genericParser
+import common.log as log
+import common.utils as utils
+
+# Incremental parsing for long-lived processes (e.g. behind an editor). The parser
+# remembers the previous source, the line span of each top-level statement, and the
+# translated AST nodes. After an edit, only the top-level statements touching the changed
+# lines are parsed and translated again; all others are reused.
+
+@dataclass
+class _Chunk:
+    # Lines [start, end) of the source (0-based). Blank lines and comments before a
+    # statement belong to the chunk of the statement.
+    start: int
+    end: int
+    isPass: bool
+    node: Any # the translated statement, None if isPass
+
+class IncrementalParser:
+    """
+    Usage: create one parser per file and call update with the full source after each
+    edit. update returns the same AST as genericParser.parseFile.
+    """
+    def __init__(self, m: Any, filename: str = '<incremental>'):
+        modName: str = m.__name__
+        self.lang: constants.Language = constants.asLanguage(utils.stripPrefix('lang_', modName[:modName.index('.')]))
+        self.m = genericParser.ModWrapper(m, self.lang)
+        self.filename = filename
+        self.lines: list[str] = []
+        self.chunks: list[_Chunk] = []
+        # number of statements translated by the last call to update
+        self.lastTranslated = 0
+
+    def update(self, src: str) -> Any:
+        """
+        Parses src, reusing the results for the unchanged top-level statements of
+        the previous source. If parsing fails, the state of the parser is not changed.
+        """
+        newLines = src.splitlines(keepends=True)
+        if not self.chunks:
+            chunks = self._parseRegion(newLines, 0, len(newLines))
+        else:
+            chunks = self._reparse(newLines)
+        mod = self._mkModule(chunks)
+        self.lines = newLines
+        self.chunks = chunks
+        return mod
+
+    def _reparse(self, newLines: list[str]) -> list[_Chunk]:
+        oldLines = self.lines
+        n = min(len(oldLines), len(newLines))
+        prefix = 0
+        while prefix < n and oldLines[prefix] == newLines[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < n - prefix and oldLines[-1 - suffix] == newLines[-1 - suffix]:
+            suffix += 1
+        oldEnd = len(oldLines) - suffix
+        # Find the chunks overlapping the changed lines [prefix, oldEnd). We also reparse
+        # one chunk on each side, because an edit might extend a neighbouring statement
+        # (e.g. a new line in the body of a preceding while loop).
+        first = 0
+        while first < len(self.chunks) and self.chunks[first].end <= prefix:
+            first += 1
+        last = first
+        while last < len(self.chunks) and self.chunks[last].start < oldEnd:
+            last += 1
+        first = max(0, first - 1)
+        last = min(len(self.chunks), last + 1)
+        regionStart = self.chunks[first].start if first < len(self.chunks) else \
+            (self.chunks[-1].end if self.chunks else 0)
+        regionStart = min(regionStart, prefix)
+        oldRegionEnd = self.chunks[last - 1].end if last > first else regionStart
+        if last == len(self.chunks):
+            # also covers lines after the last statement
+            oldRegionEnd = len(oldLines)
+        oldRegionEnd = max(oldRegionEnd, oldEnd)
+        delta = len(newLines) - len(oldLines)
+        try:
+            newChunks = self._parseRegion(newLines, regionStart, oldRegionEnd + delta)
+        except SyntaxError:
+            # The region might not consist of complete statements in the new source,
+            # parse everything to get the right result or the right error.
+            log.debug('Incremental parse failed, parsing the whole file')
+            return self._parseRegion(newLines, 0, len(newLines))
+        shifted = [_Chunk(c.start + delta, c.end + delta, c.isPass, c.node)
+                   for c in self.chunks[last:]]
+        log.debug(f'Incremental parse: reused {first + len(shifted)} statements, ' \
+            f'translated {self.lastTranslated}')
+        return self.chunks[:first] + newChunks + shifted
+
+    def _parseRegion(self, lines: list[str], start: int, end: int) -> list[_Chunk]:
+        """
+        Parses and translates lines [start, end), which must consist of complete
+        top-level statements.
+        """
+        text = ''.join(lines[start:end])
+        module = ast.parse(text, self.filename)
+        chunks: list[_Chunk] = []
+        prevEnd = start
+        for s in module.body:
+            # line numbers of the ast module are 1-based and inclusive
+            stmtEnd = start + utils.assertNotNone(s.end_lineno)
+            if isinstance(s, ast.Pass):
+                node = None
+            else:
+                node = genericParser.transStmt(s, self.m, self.lang)
+            chunks.append(_Chunk(prevEnd, stmtEnd, isinstance(s, ast.Pass), node))
+            prevEnd = stmtEnd
+        self.lastTranslated = len(chunks)
+        return chunks
+
+    def _mkModule(self, chunks: list[_Chunk]) -> Any:
+        m = self.m
+        if len(chunks) == 1 and chunks[0].isPass:
+            stmts: list[Any] = []
+        else:
+            stmts = []
+            for c in chunks:
+                if c.isPass:
+                    genericParser.unsupported('statement pass')
+                stmts.append(c.node)
+        if self.lang == 'fun':
+            funDefs = [s for s in stmts if isinstance(s, m.FunDef)]
+            others = [s for s in stmts if not isinstance(s, m.FunDef)]
+            return m.Module(funDefs, others)
+        else:
+            return m.Module(stmts)
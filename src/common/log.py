@@ -1,5 +1,7 @@
 import logging
+import pprint
 import sys
+from typing import Any
 import common.utils as utils
 import lark
 
@@ -52,6 +54,19 @@ STACKLEVEL=2
 def debug(s: str):
     _log.debug(s, stacklevel=STACKLEVEL)
 
+def debugPretty(prefix: str, x: Any):
+    """
+    Logs the pretty-printed value x. pprint is recursive, values nested too deeply for it
+    (such as the AST of a long generated expression) are not printed.
+    """
+    if not any([h.level <= logging.DEBUG for h in _log.handlers]):
+        return
+    try:
+        s = pprint.pformat(x)
+    except RecursionError:
+        s = f'<{type(x).__name__} nested too deeply to display>'
+    _log.debug(f'{prefix}{s}', stacklevel=STACKLEVEL)
+
 def info(s: str):
     _log.info(s, stacklevel=STACKLEVEL)
 
@@ -0,0 +1,158 @@
+from __future__ import annotations
+from typing import *
+
+# A persistent hash map: a hash array mapped trie whose nodes are small dicts indexed by
+# 5-bit chunks of the hash. Updates copy only the nodes on the path to the key (at most
+# 13 nodes of at most 32 entries), all other nodes are shared with the old map. Keys
+# whose hashes agree on all 64 bits end up in a list at the bottom of the trie.
+#
+# An entry of a node is either a leaf (key, hash, value), a node (dict), or a list of
+# leaves with the same hash.
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_BITS = 64
+
+type _Leaf = tuple[Any, int, Any]
+type _Node = dict[int, Any]
+
+def _hash(k: object) -> int:
+    return hash(k) & ((1 << _HASH_BITS) - 1)
+
+class PMap[K, V]:
+    """
+    An immutable map. set returns a new map and leaves the old map unchanged. get and set
+    take O(log n) time.
+    """
+    __slots__ = ('_root', '_size')
+
+    def __init__(self, root: _Node = {}, size: int = 0):
+        self._root = root
+        self._size = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self):
+        return f'PMap({dict(self.items())})'
+
+    def __contains__(self, k: K) -> bool:
+        return self.get(k, _missing) is not _missing
+
+    def get[D](self, k: K, default: D = None) -> V | D:
+        h = _hash(k)
+        node = self._root
+        shift = 0
+        while True:
+            e = node.get((h >> shift) & _MASK)
+            if e is None:
+                return default
+            if type(e) is tuple:
+                (k2, h2, v) = cast(_Leaf, e)
+                return v if h2 == h and k2 == k else default
+            if type(e) is list:
+                for (k2, _, v) in cast(list[_Leaf], e):
+                    if k2 == k:
+                        return v
+                return default
+            node = e
+            shift += _BITS
+
+    def set(self, k: K, v: V) -> PMap[K, V]:
+        (root, added) = _set(self._root, 0, (k, _hash(k), v))
+        return PMap(root, self._size + 1 if added else self._size)
+
+    def update(self, entries: Iterable[tuple[K, V]]) -> PMap[K, V]:
+        """
+        Like calling set for all entries, but the nodes on the paths to the keys are only
+        copied once.
+        """
+        root = dict(self._root)
+        # ids of the nodes copied by this update, they can be changed in place
+        owned = {id(root)}
+        size = self._size
+        for (k, v) in entries:
+            if _update(root, 0, (k, _hash(k), v), owned):
+                size += 1
+        return PMap(root, size)
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        """
+        Iterates over the entries of the map in no particular order.
+        """
+        stack: list[Any] = [self._root]
+        while stack:
+            node = stack.pop()
+            for e in node.values():
+                if type(e) is tuple:
+                    yield (e[0], e[2])
+                elif type(e) is list:
+                    for (k, _, v) in cast(list[_Leaf], e):
+                        yield (k, v)
+                else:
+                    stack.append(e)
+
+    def keys(self) -> Iterator[K]:
+        return (k for (k, _) in self.items())
+
+_missing = object()
+
+def _set(node: _Node, shift: int, leaf: _Leaf) -> tuple[_Node, bool]:
+    """
+    Returns a copy of node with leaf inserted and whether the key of leaf is new.
+    """
+    (k, h, _) = leaf
+    i = (h >> shift) & _MASK
+    e = node.get(i)
+    new = dict(node)
+    added = False
+    if e is None:
+        new[i] = leaf
+        added = True
+    elif type(e) is tuple:
+        old = cast(_Leaf, e)
+        if old[1] == h and old[0] == k:
+            new[i] = leaf
+        else:
+            new[i] = _pair(old, leaf, shift + _BITS)
+            added = True
+    elif type(e) is list:
+        old = cast(list[_Leaf], e)
+        leaves = [l for l in old if l[0] != k]
+        added = len(leaves) == len(old)
+        leaves.append(leaf)
+        new[i] = leaves
+    else:
+        (new[i], added) = _set(e, shift + _BITS, leaf)
+    return (new, added)
+
+def _update(node: _Node, shift: int, leaf: _Leaf, owned: set[int]) -> bool:
+    """
+    Inserts leaf into node, which must be owned. Returns whether the key of leaf is new.
+    """
+    while True:
+        i = (leaf[1] >> shift) & _MASK
+        e = node.get(i)
+        if type(e) is not dict:
+            (new, added) = _set({i: e} if e is not None else {}, shift, leaf)
+            node[i] = new[i]
+            return added
+        child = cast(_Node, e)
+        if id(child) not in owned:
+            child = dict(child)
+            owned.add(id(child))
+            node[i] = child
+        node = child
+        shift += _BITS
+
+def _pair(l1: _Leaf, l2: _Leaf, shift: int) -> Any:
+    """
+    Returns the entry holding two leaves with distinct keys at the given depth.
+    """
+    if shift >= _HASH_BITS:
+        return [l1, l2]
+    i1 = (l1[1] >> shift) & _MASK
+    i2 = (l2[1] >> shift) & _MASK
+    if i1 == i2:
+        return {i1: _pair(l1, l2, shift + _BITS)}
+    return {i1: l1, i2: l2}
@@ -2,7 +2,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from common.compilerSupport import CompileError
 import common.log as log
+import itertools
 import pprint
+from common.pmap import PMap
 from typing import *
 
 # Scoping rules:
@@ -43,45 +45,110 @@ class VarInfo[T]:
     definitelyAssigned: bool
     scope: Scope
 
+# Symtabs are persistent maps, so copy takes constant time. A symtab remembers the map it
+# was copied from and the variables assigned since then. Merging two copies of a symtab back
+# into it (see mergeBack) only looks at these variables.
+#
+# Each entry carries a sequence number from the time the variable was first added. items
+# and types return the variables ordered by these numbers, that is in the order of their
+# first assignment.
+
+_seq = itertools.count()
+
+# sequence number and info of a variable
+type _Entry[T] = tuple[int, VarInfo[T]]
+
 class Symtab[K, T]:
     def __init__(self):
-        self.__vars: dict[K, VarInfo[T]] = {}
+        self.__vars: PMap[K, _Entry[T]] = PMap()
+        # the map this symtab was copied from, None if unknown
+        self.__base: Optional[PMap[K, _Entry[T]]] = None
+        self.__changed: set[K] = set()
     def __repr__(self):
-        return f'Symtab({self.__vars})'
+        return f'Symtab({dict(self.items())})'
     def assign(self, var: K, ty: T, scope: Scope = 'var'):
-        info = self.__vars.get(var)
-        if info and ty != info.ty:
+        entry = self.__vars.get(var)
+        if entry is None:
+            self.__vars = self.__vars.set(var, (next(_seq), VarInfo(ty, True, scope)))
+            self.__changed.add(var)
+            return
+        (n, info) = entry
+        if ty != info.ty:
             raise CompileError.typeError(
                 f'Inconsistent types for variable {var}: {info.ty} and {ty}')
-        if info and info.scope == 'fun':
+        if info.scope == 'fun':
             raise CompileError.typeError(f'Cannot re-assign global function variable {var}')
-        self.__vars[var] = VarInfo(ty, True, scope)
+        if info.definitelyAssigned and info.scope == scope:
+            return
+        self.__vars = self.__vars.set(var, (n, VarInfo(ty, True, scope)))
+        self.__changed.add(var)
     def use(self, var: K) -> T:
         return self.info(var).ty
     def scope(self, var: K) -> Scope:
         return self.info(var).scope
     def unsafeInfo(self, var: K) -> VarInfo[T]:
-        return self.__vars[var]
+        entry = self.__vars.get(var)
+        if entry is None:
+            raise KeyError(var)
+        return entry[1]
     def items(self) -> Iterable[tuple[K, VarInfo[T]]]:
-        return self.__vars.items()
+        entries = sorted(self.__vars.items(), key=lambda kv: kv[1][0])
+        return [(x, info) for (x, (_, info)) in entries]
     def info(self, var: K) -> VarInfo[T]:
-        if var not in self.__vars:
-            log.debug(f"Symtab: {pprint.pformat(self.__vars)}")
+        entry = self.__vars.get(var)
+        if entry is None:
+            log.debug(f"Symtab: {pprint.pformat(dict(self.items()))}")
             raise CompileError.typeError(f'Unknown variable: {var}')
-        info = self.__vars[var]
+        info = entry[1]
         if not info.definitelyAssigned:
             raise CompileError.typeError(f'Variable {var} might not have been initialized')
         return info
-    def types(self, scope: Optional[Scope] = None) -> list[tuple[K, T]]:
-        return [(x, info.ty) for x, info in self.__vars.items()
+    def types(self, scope: Optional[Scope] = None, onlyNew: bool = False) -> list[tuple[K, T]]:
+        """
+        Returns the variables of the given scope with their types. With onlyNew, only the
+        variables added since this symtab was copied are returned. The time is then
+        proportional to the number of variables assigned since the copy.
+        """
+        base = self.__base
+        if onlyNew and base is not None:
+            entries = [(x, e) for x in self.__changed
+                       if x not in base and (e := self.__vars.get(x)) is not None]
+        else:
+            entries = list(self.__vars.items())
+        entries.sort(key=lambda kv: kv[1][0])
+        return [(x, info.ty) for (x, (_, info)) in entries
                 if scope is None or info.scope == scope]
     def hasVar(self, var: K):
         return var in self.__vars
     def copy(self) -> Symtab[K, T]:
         st = Symtab[K, T]()
-        st.__vars.update(self.__vars)
+        st.__vars = self.__vars
+        st.__base = self.__vars
         return st
     def mergeBack(self, st1: Symtab[K, T], st2: Symtab[K, T]):
+        """
+        Replaces the content of this symtab with the merge of st1 and st2. If both are
+        copies of this symtab, the time is proportional to the number of variables assigned
+        in st1 and st2.
+        """
         import common.symtab_merge as symtab_merge
-        merged = symtab_merge.merge(st1, st2)
-        self.__vars = merged
+        if st1.__base is not self.__vars or st2.__base is not self.__vars:
+            self.__vars = PMap[K, _Entry[T]]().update(
+                [(x, (next(_seq), info)) for x, info in symtab_merge.merge(st1, st2).items()])
+            self.__base = None
+            return
+        changed = st1.__changed | st2.__changed
+        entries = [(x, st1.__vars.get(x), st2.__vars.get(x)) for x in changed]
+        # in the order of the variables, so that errors are reported deterministically
+        entries.sort(key=lambda e: min([d[0] for d in (e[1], e[2]) if d is not None]))
+        merged: list[tuple[K, _Entry[T]]] = []
+        for (x, e1, e2) in entries:
+            if e1 is None:
+                assert e2 is not None
+                merged.append((x, (e2[0], symtab_merge.mergeVar(x, e2[1], None))))
+            elif e2 is None:
+                merged.append((x, (e1[0], symtab_merge.mergeVar(x, e1[1], None))))
+            elif e1 is not e2:
+                merged.append((x, (min(e1[0], e2[0]), symtab_merge.mergeVar(x, e1[1], e2[1]))))
+        self.__vars = self.__vars.update(merged)
+        self.__changed |= changed
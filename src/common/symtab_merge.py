@@ -1,32 +1,27 @@
 from common.symtab import Symtab, VarInfo
 from common.compilerSupport import CompileError
+from typing import *
 
-def isDefinitelyAssigned[K, T](x: K, nested: list[Symtab[K, T]]) -> bool:
-    for st in nested:
-        if not st.hasVar(x):
-            return False
-        if not st.unsafeInfo(x).definitelyAssigned:
-            return False
-    return True
+def mergeVar[T](x: object, v1: VarInfo[T], v2: Optional[VarInfo[T]]) -> VarInfo[T]:
+    """
+    Merges the infos of variable x from two symtabs, v2 is None if x is missing in the
+    second symtab.
+    """
+    if v2 is None:
+        return VarInfo(v1.ty, False, v1.scope)
+    if v2.ty != v1.ty:
+        raise CompileError.typeError(f'Inconsistent types for variable {x}')
+    if v2.scope != v1.scope:
+        raise CompileError.typeError(f'Inconsistent scope for variable {x}')
+    if v1 is v2:
+        return v1
+    return VarInfo(v1.ty, v1.definitelyAssigned and v2.definitelyAssigned, v1.scope)
 
 def merge[K, T](st1: Symtab[K, T], st2: Symtab[K, T]) -> dict[K, VarInfo[T]]:
-    envs = [st1, st2]
-    union: dict[K, list[VarInfo[T]]] = {}
-    for st in envs:
-        for k, v in st.items():
-            old = union.get(k)
-            if old:
-                old.append(v)
-            else:
-                union[k] = [v]
     res: dict[K, VarInfo[T]] = {}
-    for x, l in union.items():
-        first = l[0]
-        rest = l[1:]
-        for v in rest:
-            if v.ty != first.ty:
-                raise CompileError.typeError(f'Inconsistent types for variable {x}')
-            if v.scope != first.scope:
-                raise CompileError.typeError(f'Inconsistent scope for variable {x}')
-        res[x] = VarInfo(first.ty, isDefinitelyAssigned(x, [st1, st2]), first.scope)
+    for k, v in st1.items():
+        res[k] = mergeVar(k, v, st2.unsafeInfo(k) if st2.hasVar(k) else None)
+    for k, v in st2.items():
+        if k not in res:
+            res[k] = mergeVar(k, v, None)
     return res
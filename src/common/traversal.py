@@ -0,0 +1,69 @@
+from typing import *
+
+# Bottom-up traversals with an explicit stack. The depth of the traversed tree is not
+# limited by the recursion limit of python, and the time is linear in the number of nodes.
+# The generated fold and transform functions of asdl2py --folds are built on top of fold.
+
+def fold[N, R](root: N, children: Callable[[N], Sequence[N]], f: Callable[[N, list[R]], R]) -> R:
+    """
+    Folds the tree rooted at root bottom-up: f is called for each node with the results of
+    its children, in the order given by children. Children are visited left to right.
+    """
+    results: list[R] = []
+    # a node with -1 has not been expanded yet, otherwise the number of its children
+    stack: list[tuple[N, int]] = [(root, -1)]
+    push = stack.append
+    pop = stack.pop
+    while stack:
+        (x, n) = pop()
+        if n < 0:
+            cs = children(x)
+            if not cs:
+                results.append(f(x, []))
+                continue
+            push((x, len(cs)))
+            for c in reversed(cs):
+                push((c, -1))
+        else:
+            rs = results[-n:]
+            del results[-n:]
+            results.append(f(x, rs))
+    return results[0]
+
+def transform[N](root: N, children: Callable[[N], Sequence[N]],
+                 rebuild: Callable[[N, list[N]], N], f: Callable[[N], N]) -> N:
+    """
+    Rewrites the tree rooted at root bottom-up: f is called for each node after its children
+    have been rewritten. rebuild copies a node with new children, it is only called if some
+    child changed, so unchanged subtrees are shared with the input.
+    """
+    def g(x: N, cs: list[N]) -> N:
+        if any([c is not d for (c, d) in zip(cs, children(x))]):
+            x = rebuild(x, cs)
+        return f(x)
+    return fold(root, children, g)
+
+type Parts[N, R] = tuple[Sequence[N], Callable[[list[R]], R]]
+
+def foldParts[N, R](root: N, parts: Callable[[N], Parts[N, R]]) -> R:
+    """
+    Like fold, but parts returns the children of a node together with a function computing
+    the result of the node from the results of the children. Useful if the children and
+    the result are determined by the same case distinction, see genericParser.transExp.
+    """
+    results: list[R] = []
+    stack: list[tuple[N, Optional[Callable[[list[R]], R]], int]] = [(root, None, 0)]
+    while stack:
+        (x, combine, n) = stack.pop()
+        if combine is None:
+            (cs, combine) = parts(x)
+            stack.append((x, combine, len(cs)))
+            for c in reversed(cs):
+                stack.append((c, None, 0))
+        elif n == 0:
+            results.append(combine([]))
+        else:
+            rs = results[-n:]
+            del results[-n:]
+            results.append(combine(rs))
+    return results[0]
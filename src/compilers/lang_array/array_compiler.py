@@ -6,6 +6,7 @@ import lang_array.array_transform as array_transform
 from lang_array.array_compilerSupport import *
 from common.compilerSupport import *
 import common.utils as utils
+from collections import deque
 
 #! I added comments throughout the code to explain my thought process and understanding.
 #! Applied code review feedback from Assignment 1&2
@@ -67,7 +68,7 @@ def identToWasmId(x: Ident) -> WasmId:
     return WasmId(f"${x.name}")
 
 
-def compileStmts(stmts: list[stmt], cfg: CompilerConfig) -> list[WasmInstr]:
+def compileStmts(stmts: Sequence[stmt], cfg: CompilerConfig) -> list[WasmInstr]:
     """Compiles a list of Lvar statements into a list of Wasm instructions."""
     instructions: list[WasmInstr] = []
 
@@ -329,236 +330,264 @@ def arrayOffsetInstrs(
     return instrs
 
 
-def compileExp(e: exp, cfg: CompilerConfig) -> list[WasmInstr]:
-    """Compiles an Lvar expression into Wasm instructions that leave the result on the stack."""
-
-    match e:
-        case AtomExp(BoolConst(n)):
-            # Push an i32 constant onto the stack
-            return [WasmInstrConst("i32", int(bool(n)))]
-
-        case AtomExp(IntConst(n)):
-            # Push an i64 constant onto the stack
-            return [WasmInstrConst("i64", n)]
-
-        case AtomExp(Name(name)):
-            # Get the value of a local variable and push it onto the stack
-            return [WasmInstrVarLocal("get", identToWasmId(name))]
-
-        case UnOp(USub(), arg):
-            # Compile unary negation (0 - arg)
-            # 1. Compile the argument
-            instrs = compileExp(arg, cfg)
-            # 2. Prepend 0
-            instrs.insert(0, WasmInstrConst("i64", 0))
-            # 3. Subtract (stack is now: 0, arg_value)
-            instrs.append(WasmInstrNumBinOp("i64", "sub"))
-            return instrs
+class _ExpCompiler(ExpVisitor[deque[WasmInstr], list[deque[WasmInstr]]]):
+    """
+    Compiles a single expression node, see compileExp. The ctx argument holds the
+    instructions of the subexpressions.
+    """
+
+    def __init__(self, cfg: CompilerConfig):
+        self.cfg = cfg
+
+    def visitAtomExp(self, x: AtomExp, ctx: list[deque[WasmInstr]]) -> deque[WasmInstr]:
+        match x.e:
+            case BoolConst(n):
+                # Push an i32 constant onto the stack
+                return deque([WasmInstrConst("i32", int(bool(n)))])
+
+            case IntConst(n):
+                # Push an i64 constant onto the stack
+                return deque([WasmInstrConst("i64", n)])
+
+            case Name(name):
+                # Get the value of a local variable and push it onto the stack
+                return deque([WasmInstrVarLocal("get", identToWasmId(name))])
+
+    def visitUnOp(self, x: UnOp, ctx: list[deque[WasmInstr]]) -> deque[WasmInstr]:
+        match x:
+            case UnOp(USub(), _):
+                # Compile unary negation (0 - arg)
+                # 1. The compiled argument
+                instrs = ctx[0]
+                # 2. Prepend 0
+                instrs.appendleft(WasmInstrConst("i64", 0))
+                # 3. Subtract (stack is now: 0, arg_value)
+                instrs.append(WasmInstrNumBinOp("i64", "sub"))
+                return instrs
+
+            case UnOp(Not(), _):
+                # Compile logical negation
+                # 1. The compiled argument
+                instrs = ctx[0]
+                # 2. Prepend 0 (boolean)
+                instrs.appendleft(WasmInstrConst("i32", 0))
+                # 3. Apply equality compparison with 0
+                instrs.append(WasmInstrIntRelOp("i32", "eq"))
+                return instrs
+
+            case _:
+                raise Exception(f"Unsupported expression: {x}")
+
+    def visitBinOp(self, x: BinOp, ctx: list[deque[WasmInstr]]) -> deque[WasmInstr]:
+        left, op = x.left, x.op
+        # Compile binary operations
+        # 1. The compiled left operand
+        instrsLeft = ctx[0]
+        # 2. The compiled right operand (stack: left_val, right_val)
+        instrsRight = ctx[1]
+        # 3. Perform the operation for Numeric Binary Operation Instruction & Integer Relational Operation
+        match op:
+            # Arithmetic Ops (Int -> Int, use i64, result i64)
+            case Add():
+                instr = WasmInstrNumBinOp("i64", "add")
+            case Sub():
+                instr = WasmInstrNumBinOp("i64", "sub")
+            case Mul():
+                instr = WasmInstrNumBinOp("i64", "mul")
+
+            # Comparison Ops (Int -> Bool, use i64 comparison, result i32)
+            case Less():
+                instr = WasmInstrIntRelOp("i64", "lt_s")
+            case LessEq():
+                instr = WasmInstrIntRelOp("i64", "le_s")
+            case Greater():
+                instr = WasmInstrIntRelOp("i64", "gt_s")
+            case GreaterEq():
+                instr = WasmInstrIntRelOp("i64", "ge_s")
+
+            # Equality Ops (Int -> Bool OR Bool -> Bool, use i64 or i32, result i32)
+            case Is():
+                instr = WasmInstrIntRelOp("i32", "eq")
+            case Eq():
+                # Create instruction for the correct type
+                instr = WasmInstrIntRelOp(tyToWasmValueType(tyOfExp(left)), "eq")
+            case NotEq():
+                # create instruction for the correct type
+                instr = WasmInstrIntRelOp(tyToWasmValueType(tyOfExp(left)), "ne")
+            case And():
+                # Short-circuiting And: left && right
+                ifInstr = WasmInstrIf(
+                    "i32",
+                    list(instrsRight),  # then block: if left is true, evaluate right
+                    [
+                        WasmInstrConst("i32", 0)
+                    ],  # else block: if left is false, return 0
+                )
+                instrsLeft.append(ifInstr)
+                return instrsLeft
+            case Or():
+                # short-circuiting Or: left || right
+                ifInstr = WasmInstrIf(
+                    "i32",
+                    [WasmInstrConst("i32", 1)],  # if left is true , result is 1
+                    list(instrsRight),  # If left is false (0), result is right's value
+                )
+                instrsLeft.append(ifInstr)
+                return instrsLeft
+        instrs = concatInstrs(instrsLeft, instrsRight)
+        instrs.append(instr)
+        return instrs
+
+    def visitArrayInitDyn(self, x: ArrayInitDyn, ctx: list[deque[WasmInstr]]) -> deque[WasmInstr]:
+        lenExp, elemInit, ty = x.len, x.elemInit, x.ty
+        match utils.assertNotNone(ty):
+            case NotVoid(t):
+                instrs = compileInitArray(lenExp, t, self.cfg)
+
+                instrs.extend(
+                    [
+                        WasmInstrVarLocal("tee", WasmId("$@tmp_i32")),
+                        WasmInstrVarLocal("get", WasmId("$@tmp_i32")),
+                        WasmInstrConst("i32", 4),  # header offset
+                        WasmInstrNumBinOp("i32", "add"),
+                        WasmInstrVarLocal("set", WasmId("$@tmp_i32")),
+                    ]
+                )
 
-        case UnOp(Not(), arg):
-            # Compile logical negation
-            # 1. Compile the argument
-            instrs = compileExp(arg, cfg)
-            # 2. Prepend 0 (boolean)
-            instrs.insert(0, WasmInstrConst("i32", 0))
-            # 3. Apply equality compparison with 0
-            instrs.append(WasmInstrIntRelOp("i32", "eq"))
-            return instrs
+                blockLabel = WasmId(f"$while_block")
+                loopLabel = WasmId(f"$while_loop")
 
-        case BinOp(left, op, right):
-            # Compile binary operations
-            # 1. Compile left operand
-            instrsLeft = compileExp(left, cfg)
-            # 2. Compile right operand (stack: left_val, right_val)
-            instrsRight = compileExp(right, cfg)
-            # 3. Perform the operation for Numeric Binary Operation Instruction & Integer Relational Operation
-            match op:
-                # Arithmetic Ops (Int -> Int, use i64, result i64)
-                case Add():
-                    instr = WasmInstrNumBinOp("i64", "add")
-                case Sub():
-                    instr = WasmInstrNumBinOp("i64", "sub")
-                case Mul():
-                    instr = WasmInstrNumBinOp("i64", "mul")
-
-                # Comparison Ops (Int -> Bool, use i64 comparison, result i32)
-                case Less():
-                    instr = WasmInstrIntRelOp("i64", "lt_s")
-                case LessEq():
-                    instr = WasmInstrIntRelOp("i64", "le_s")
-                case Greater():
-                    instr = WasmInstrIntRelOp("i64", "gt_s")
-                case GreaterEq():
-                    instr = WasmInstrIntRelOp("i64", "ge_s")
-
-                # Equality Ops (Int -> Bool OR Bool -> Bool, use i64 or i32, result i32)
-                case Is():
-                    instr = WasmInstrIntRelOp("i32", "eq")
-                case Eq():
-                    # Create instruction for the correct type
-                    instr = WasmInstrIntRelOp(tyToWasmValueType(tyOfExp(left)), "eq")
-                case NotEq():
-                    # create instruction for the correct type
-                    instr = WasmInstrIntRelOp(tyToWasmValueType(tyOfExp(left)), "ne")
-                case And():
-                    # Short-circuiting And: left && right
-                    ifInstr = WasmInstrIf(
-                        "i32",
-                        instrsRight,  # then block: if left is true, evaluate right
-                        [
-                            WasmInstrConst("i32", 0)
-                        ],  # else block: if left is false, return 0
+                if isinstance(t, Array):
+                    elemSize = tyToWasmValueSize(t.elemTy)
+                    elemType = tyToWasmValueType(t.elemTy)
+                else:
+                    raise Exception(
+                        f"Compiler Error: 'elemTy' is not valid for type {t}"
                     )
-                    return instrsLeft + [ifInstr]
-                case Or():
-                    # short-circuiting Or: left || right
-                    ifInstr = WasmInstrIf(
-                        "i32",
-                        [WasmInstrConst("i32", 1)],  # if left is true , result is 1
-                        instrsRight,  # If left is false (0), result is right's value
+
+                loopBodyInstrs: list[WasmInstr] = [
+                    WasmInstrVarLocal("get", WasmId("$@tmp_i32")),
+                    WasmInstrVarGlobal("get", WasmId("$@free_ptr")),
+                    WasmInstrIntRelOp("i32", "ge_u"),
+                    # current >= end ? (result is i32: 1 or 0)
+                    WasmInstrBranch(
+                        target=blockLabel, conditional=True
+                    ),  # Exit if true
+                    # initialize element
+                    WasmInstrVarLocal("get", WasmId("$@tmp_i32")),
+                    *compileExp(AtomExp(elemInit), self.cfg),
+                    WasmInstrMem(elemType, "store"),  # store value at address
+                    # increment current address by element size
+                    WasmInstrVarLocal("get", WasmId("$@tmp_i32")),
+                    WasmInstrConst("i32", elemSize),
+                    WasmInstrNumBinOp("i32", "add"),
+                    WasmInstrVarLocal("set", WasmId("$@tmp_i32")),
+                    WasmInstrBranch(
+                        target=loopLabel, conditional=False
+                    ),  # back to loop start
+                ]
+
+                loopInstr = WasmInstrLoop(loopLabel, loopBodyInstrs)
+                blockInstr = WasmInstrBlock(blockLabel, None, [loopInstr])
+
+                instrs.append(blockInstr)
+
+            case Void():
+                raise Exception(f"Compiler Error")
+
+        return deque(instrs)
+
+    def visitArrayInitStatic(self, x: ArrayInitStatic, ctx: list[deque[WasmInstr]]) -> deque[WasmInstr]:
+        elemInit, ty = x.elemInit, x.ty
+        match utils.assertNotNone(ty):
+            case NotVoid(t):
+                instrs = compileInitArray(
+                    IntConst(len(elemInit)), t, self.cfg
+                )  # Allocate space for array
+
+                if isinstance(t, Array):
+                    elemSize = tyToWasmValueSize(t.elemTy)
+                    elemType = tyToWasmValueType(t.elemTy)
+                else:
+                    raise Exception(
+                        f"Compiler Error: 'elemTy' is not valid for type {t}"
                     )
-                    return instrsLeft + [ifInstr]
-            return instrsLeft + instrsRight + [instr]
 
-        case ArrayInitDyn(lenExp, elemInit, ty):
-            match utils.assertNotNone(ty):
-                case NotVoid(t):
-                    instrs = compileInitArray(lenExp, t, cfg)
+                for index, elem in enumerate(elemInit):
+
+                    # Offset = Header Size + Index * Element Size
+                    offset = 4 + index * elemSize
 
                     instrs.extend(
                         [
                             WasmInstrVarLocal("tee", WasmId("$@tmp_i32")),
                             WasmInstrVarLocal("get", WasmId("$@tmp_i32")),
-                            WasmInstrConst("i32", 4),  # header offset
+                            WasmInstrConst("i32", offset),
                             WasmInstrNumBinOp("i32", "add"),
-                            WasmInstrVarLocal("set", WasmId("$@tmp_i32")),
+                            *compileExp(AtomExp(elem), self.cfg),
+                            WasmInstrMem(
+                                elemType, "store"
+                            ),  # Store element at address
                         ]
                     )
 
-                    blockLabel = WasmId(f"$while_block")
-                    loopLabel = WasmId(f"$while_loop")
-
-                    if isinstance(t, Array):
-                        elemSize = tyToWasmValueSize(t.elemTy)
-                        elemType = tyToWasmValueType(t.elemTy)
-                    else:
-                        raise Exception(
-                            f"Compiler Error: 'elemTy' is not valid for type {t}"
-                        )
-
-                    loopBodyInstrs: list[WasmInstr] = [
-                        WasmInstrVarLocal("get", WasmId("$@tmp_i32")),
-                        WasmInstrVarGlobal("get", WasmId("$@free_ptr")),
-                        WasmInstrIntRelOp("i32", "ge_u"),
-                        # current >= end ? (result is i32: 1 or 0)
-                        WasmInstrBranch(
-                            target=blockLabel, conditional=True
-                        ),  # Exit if true
-                        # initialize element
-                        WasmInstrVarLocal("get", WasmId("$@tmp_i32")),
-                        *compileExp(AtomExp(elemInit), cfg),
-                        WasmInstrMem(elemType, "store"),  # store value at address
-                        # increment current address by element size
-                        WasmInstrVarLocal("get", WasmId("$@tmp_i32")),
-                        WasmInstrConst("i32", elemSize),
-                        WasmInstrNumBinOp("i32", "add"),
-                        WasmInstrVarLocal("set", WasmId("$@tmp_i32")),
-                        WasmInstrBranch(
-                            target=loopLabel, conditional=False
-                        ),  # back to loop start
-                    ]
-
-                    loopInstr = WasmInstrLoop(loopLabel, loopBodyInstrs)
-                    blockInstr = WasmInstrBlock(blockLabel, None, [loopInstr])
-
-                    instrs.append(blockInstr)
-
-                case Void():
-                    raise Exception(f"Compiler Error")
+            case Void():
+                raise Exception(f"Compiler Error")
 
-            return instrs
+        return deque(instrs)
 
-        case ArrayInitStatic(elemInit, ty):
-            match utils.assertNotNone(ty):
-                case NotVoid(t):
-                    instrs = compileInitArray(
-                        IntConst(len(elemInit)), t, cfg
-                    )  # Allocate space for array
-
-                    if isinstance(t, Array):
-                        elemSize = tyToWasmValueSize(t.elemTy)
-                        elemType = tyToWasmValueType(t.elemTy)
-                    else:
-                        raise Exception(
-                            f"Compiler Error: 'elemTy' is not valid for type {t}"
-                        )
-
-                    for index, elem in enumerate(elemInit):
-
-                        # Offset = Header Size + Index * Element Size
-                        offset = 4 + index * elemSize
-
-                        instrs.extend(
-                            [
-                                WasmInstrVarLocal("tee", WasmId("$@tmp_i32")),
-                                WasmInstrVarLocal("get", WasmId("$@tmp_i32")),
-                                WasmInstrConst("i32", offset),
-                                WasmInstrNumBinOp("i32", "add"),
-                                *compileExp(AtomExp(elem), cfg),
-                                WasmInstrMem(
-                                    elemType, "store"
-                                ),  # Store element at address
-                            ]
-                        )
+    def visitSubscript(self, x: Subscript, ctx: list[deque[WasmInstr]]) -> deque[WasmInstr]:
+        array, index = x.array, x.index
+        instrs: list[WasmInstr] = []
 
-                case Void():
-                    raise Exception(f"Compiler Error")
-
-            return instrs
+        if isinstance(array.ty, Array):
+            elemType = tyToWasmValueType(array.ty.elemTy)
+        else:
+            raise Exception(f"Compiler Error")
 
-        case Subscript(array, index):
-            instrs: list[WasmInstr] = []
+        instrs.extend(
+            arrayOffsetInstrs(array, index, self.cfg)
+        )  # compute address of array[index]
+        instrs.extend(
+            [
+                WasmInstrMem(elemType, "load"),  # Load value from computed address
+            ]
+        )
 
-            if isinstance(array.ty, Array):
-                elemType = tyToWasmValueType(array.ty.elemTy)
-            else:
-                raise Exception(f"Compiler Error")
+        return deque(instrs)
 
-            instrs.extend(
-                arrayOffsetInstrs(array, index, cfg)
-            )  # compute address of array[index]
-            instrs.extend(
-                [
-                    WasmInstrMem(elemType, "load"),  # Load value from computed address
-                ]
-            )
+    def visitCall(self, x: Call, ctx: list[deque[WasmInstr]]) -> deque[WasmInstr]:
+        match x:
+            case Call(Ident("print"), [arg]):
+                instrs = ctx[0]
+                argTy = tyOfExp(arg)
 
-            return instrs
+                match argTy:
+                    case Int():
+                        instrs.append(WasmInstrCall(WasmId("$print_i64")))  # Print integer
+                    case Bool():
+                        instrs.append(WasmInstrCall(WasmId("$print_bool")))  # Print boolean
+                    case Array():
+                        instrs.append(WasmInstrCall(WasmId("$print_i32")))  # Print array
 
-        case Call(Ident("print"), [arg]):
-            instrs = compileExp(arg, cfg)
-            argTy = tyOfExp(arg)
+                return instrs
 
-            match argTy:
-                case Int():
-                    instrs.append(WasmInstrCall(WasmId("$print_i64")))  # Print integer
-                case Bool():
-                    instrs.append(WasmInstrCall(WasmId("$print_bool")))  # Print boolean
-                case Array():
-                    instrs.append(WasmInstrCall(WasmId("$print_i32")))  # Print array
+            case Call(Ident("input_int"), []):
+                # $input_i64 takes nothing, returns i64. It pushes a value.
+                return deque([WasmInstrCall(WasmId("$input_i64"))])
 
-            return instrs
+            case Call(Ident("len"), [_]):
+                instrs = ctx[0]  # Stack: Array Base Address (i32)
+                # expects the array's base address i32 to be on top of the stack and leave the i64 length value on the stack.
+                instrs.extend(arrayLenInstrs())
 
-        case Call(Ident("input_int"), []):
-            # $input_i64 takes nothing, returns i64. It pushes a value.
-            return [WasmInstrCall(WasmId("$input_i64"))]
+                return instrs  # Return the instructions that compute and leave the length
 
-        case Call(Ident("len"), [arg]):
-            instrs = compileExp(arg, cfg)  # Stack: Array Base Address (i32)
-            # expects the array's base address i32 to be on top of the stack and leave the i64 length value on the stack.
-            instrs.extend(arrayLenInstrs())
+            case _:
+                raise Exception(f"Unsupported expression: {x}")
 
-            return instrs  # Return the instructions that compute and leave the length
 
-        case _:
-            raise Exception(f"Unsupported expression: {e}")
+def compileExp(e: exp, cfg: CompilerConfig) -> list[WasmInstr]:
+    """Compiles an Lvar expression into Wasm instructions that leave the result on the stack."""
+    # bottom-up without recursion, the expression might be deeply nested
+    return list(foldExp(e, _ExpCompiler(cfg).visitExp))
@@ -2,6 +2,7 @@ from lang_loop.loop_ast import *
 from common.wasm import *
 import lang_loop.loop_tychecker as loop_tychecker
 from common.compilerSupport import *
+from collections import deque
 
 #! I added comments throughout the code to explain my thought process and understanding.
 
@@ -40,7 +41,7 @@ def identToWasmId(x: Ident) -> WasmId:
     return WasmId(f"${x.name}")
 
 
-def compileStmts(stmts: list[stmt]) -> list[WasmInstr]:
+def compileStmts(stmts: Sequence[stmt]) -> list[WasmInstr]:
     """Compiles a list of Lvar statements into a list of Wasm instructions."""
     instructions: list[WasmInstr] = []
 
@@ -148,45 +149,51 @@ def compileExpValue(e: exp) -> tuple[list[WasmInstr], bool]:
 
 def compileExp(e: exp) -> list[WasmInstr]:
     """Compiles an Lvar expression into Wasm instructions that leave the result on the stack."""
+    # bottom-up without recursion, the expression might be deeply nested
+    return list(foldExp(e, compileExpNode))
+
+
+def compileExpNode(e: exp, subInstrs: list[deque[WasmInstr]]) -> deque[WasmInstr]:
+    """Compiles a single expression node, given the instructions of its subexpressions."""
     match e:
         case BoolConst(n):
             # Push an i32 constant onto the stack
-            return [WasmInstrConst("i32", int(bool(n)))]
+            return deque([WasmInstrConst("i32", int(bool(n)))])
 
         case IntConst(n):
             # Push an i64 constant onto the stack
-            return [WasmInstrConst("i64", n)]
+            return deque([WasmInstrConst("i64", n)])
 
         case Name(name):
             # Get the value of a local variable and push it onto the stack
-            return [WasmInstrVarLocal("get", identToWasmId(name))]
+            return deque([WasmInstrVarLocal("get", identToWasmId(name))])
 
-        case UnOp(USub(), arg):
+        case UnOp(USub(), _):
             # Compile unary negation (0 - arg)
-            # 1. Compile the argument
-            instrs = compileExp(arg)
+            # 1. The compiled argument
+            instrs = subInstrs[0]
             # 2. Prepend 0
-            instrs.insert(0, WasmInstrConst("i64", 0))
+            instrs.appendleft(WasmInstrConst("i64", 0))
             # 3. Subtract (stack is now: 0, arg_value)
             instrs.append(WasmInstrNumBinOp("i64", "sub"))
             return instrs
 
-        case UnOp(Not(), arg):
+        case UnOp(Not(), _):
             # Compile logical negation
-            # 1. Compile the argument
-            instrs = compileExp(arg)
+            # 1. The compiled argument
+            instrs = subInstrs[0]
             # 2. Prepend 0 (boolean)
-            instrs.insert(0, WasmInstrConst("i32", 0))
+            instrs.appendleft(WasmInstrConst("i32", 0))
             # 3. Apply equality compparison with 0
             instrs.append(WasmInstrIntRelOp("i32", "eq"))
             return instrs
 
-        case BinOp(left, op, right):
+        case BinOp(left, op, _):
             # Compile binary operations
-            # 1. Compile left operand
-            instrsLeft = compileExp(left)
-            # 2. Compile right operand (stack: left_val, right_val)
-            instrsRight = compileExp(right)
+            # 1. The compiled left operand
+            instrsLeft = subInstrs[0]
+            # 2. The compiled right operand (stack: left_val, right_val)
+            instrsRight = subInstrs[1]
             # 3. Perform the operation for Numeric Binary Operation Instruction & Integer Relational Operation
             match op:
                 # Arithmetic Ops (Int -> Int, use i64, result i64)
@@ -218,25 +225,29 @@ def compileExp(e: exp) -> list[WasmInstr]:
                     # Short-circuiting And: left && right
                     if_instr = WasmInstrIf(
                         "i32",
-                        instrsRight,  # then block: if left is true, evaluate right
+                        list(instrsRight),  # then block: if left is true, evaluate right
                         [
                             WasmInstrConst("i32", 0)
                         ],  # else block: if left is false, return 0
                     )
-                    return instrsLeft + [if_instr]
+                    instrsLeft.append(if_instr)
+                    return instrsLeft
                 case Or():
                     # short-circuiting Or: left || right
                     if_instr = WasmInstrIf(
                         "i32",
                         [WasmInstrConst("i32", 1)],  # if left is true , result is 1
-                        instrsRight,  # If left is false (0), result is right's value
+                        list(instrsRight),  # If left is false (0), result is right's value
                     )
-                    return instrsLeft + [if_instr]
-            return instrsLeft + instrsRight + [instrs]
+                    instrsLeft.append(if_instr)
+                    return instrsLeft
+            res = concatInstrs(instrsLeft, instrsRight)
+            res.append(instrs)
+            return res
 
         case Call(Ident("print"), [arg]):
-            # 1. Compile the argument
-            instrs = compileExp(arg)
+            # 1. The compiled argument
+            instrs = subInstrs[0]
             # 2. determine the type of the argument
             argTy = tyOfExp(arg)
             # 3. Choose the correct print function based on the type
@@ -250,7 +261,7 @@ def compileExp(e: exp) -> list[WasmInstr]:
         case Call(Ident("input_int"), []):
             # Call the input function
             # $input_i64 takes nothing, returns i64. It pushes a value.
-            return [WasmInstrCall(WasmId("$input_i64"))]
+            return deque([WasmInstrCall(WasmId("$input_i64"))])
 
         case Call(name, args):
             # only 'print' and 'input_int' are known functions
@@ -12,7 +12,10 @@ def compileModule(m: mod, cfg: CompilerConfig) -> WasmModule:
     vars = var_tychecker.tycheckModule(m)
     instrs = compileStmts(m.stmts)
     idMain = WasmId("$main")
-    locals: list[tuple[WasmId, WasmValtype]] = [(identToWasmId(x), "i64") for x in vars]
+    # identifiers hash by identity, sort to get the same output in every run
+    locals: list[tuple[WasmId, WasmValtype]] = [
+        (identToWasmId(x), "i64") for x in sorted(vars, key=lambda x: x.name)
+    ]
     return WasmModule(
         imports=wasmImports(cfg.maxMemSize),
         exports=[WasmExport("main", WasmExportFunc(idMain))],
@@ -28,7 +31,7 @@ def identToWasmId(x: Ident) -> WasmId:
     return WasmId(f"${x.name}")
 
 
-def compileStmts(stmts: list[stmt]) -> list[WasmInstr]:
+def compileStmts(stmts: Sequence[stmt]) -> list[WasmInstr]:
     """Compiles a list of Lvar statements into a list of Wasm instructions."""
     instructions: list[WasmInstr] = []
 
@@ -2,6 +2,7 @@ from lang_array.array_ast import *
 import lang_array.array_astAtom as atom
 from common.compilerSupport import *
 import common.utils as utils
+import common.traversal as traversal
 
 type Temporaries = list[tuple[atom.Ident, atom.exp]]
 
@@ -25,9 +26,12 @@ def transExpAtomic(e: exp, ctx: Ctx) -> tuple[atom.atomExp, Temporaries]:
     Translates e to an atomic expression. Essentially a shortcut for transExp(e, True, ctx).
     """
     (res, ts) = transExp(e, True, ctx)
+    return (atomOf(res, e), ts)
+
+def atomOf(res: atom.exp, e: exp) -> atom.atomExp:
     match res:
         case atom.AtomExp(a):
-            return (a, ts)
+            return a
         case _:
             utils.abort(f'transExp with needAtom=True failed to return an atomic expression: {e}')
 
@@ -43,16 +47,18 @@ def assertExpNotVoid(e: exp | atom.exp) -> ty:
         case NotVoid(t):
             return t
 
-def atomic(needAtomic: bool, e: atom.exp, tmps: Temporaries, ctx: Ctx) -> tuple[atom.exp, Temporaries]:
+def atomic(needAtomic: bool, e: atom.exp, tmps: Temporaries, ctx: Ctx) -> atom.exp:
     """
-    Converts e to an atomic expression of needAtomic is True.
+    Converts e to an atomic expression of needAtomic is True. The temporary variable
+    is appended to tmps.
     """
     if needAtomic:
         t = assertExpNotVoid(e)
         tmp = ctx.newVar(t)
-        return (atom.AtomExp(atom.Name(tmp, t), e.ty), tmps + [(tmp, e)])
+        tmps.append((tmp, e))
+        return atom.AtomExp(atom.Name(tmp, t), e.ty)
     else:
-        return (e, tmps)
+        return e
 
 def transExp(e: exp, needAtomic: bool, ctx: Ctx) -> tuple[atom.exp, Temporaries]:
     """
@@ -62,37 +68,59 @@ def transExp(e: exp, needAtomic: bool, ctx: Ctx) -> tuple[atom.exp, Temporaries]
 
     If the flag needAtomic is True, then the translated expression is an atomic expression,
     that is something of the form array_astAtom.AtomExp(...).
+
+    The translation works bottom-up without recursion. Subexpressions are translated from
+    left to right, so their temporaries are appended to a single list in the order in
+    which they must be evaluated.
+    """
+    tmps: Temporaries = []
+    res = traversal.fold((e, needAtomic), subExps,
+                         lambda x, args: transExpNode(x[0], x[1], args, tmps, ctx))
+    return (res, tmps)
+
+def subExps(x: tuple[exp, bool]) -> list[tuple[exp, bool]]:
+    """
+    The subexpressions of an expression, together with the flag whether they must be
+    translated to atomic expressions.
+    """
+    e = x[0]
+    match e:
+        case ArrayInitDyn() | ArrayInitStatic() | Subscript():
+            return [(sub, True) for sub in expChildren(e)]
+        case _:
+            return [(sub, False) for sub in expChildren(e)]
+
+def transExpNode(e: exp, needAtomic: bool, args: list[atom.exp], tmps: Temporaries,
+                 ctx: Ctx) -> atom.exp:
+    """
+    Translates e, given the translations args of its subexpressions.
     """
     t = e.ty
     match e:
         case IntConst(v):
-            return (atom.AtomExp(atom.IntConst(v, Int()), t), [])
+            return atom.AtomExp(atom.IntConst(v, Int()), t)
         case BoolConst(v):
-            return (atom.AtomExp(atom.BoolConst(v, Bool()), t), [])
-        case Call(id, args):
-            (atomArgs, tmps) = utils.unzip([transExp(a, False, ctx) for a in args])
-            return atomic(needAtomic, atom.Call(id, atomArgs, t), utils.flatten(tmps), ctx)
-        case UnOp(op, sub):
-            (atomSub, tmps) = transExp(sub, False, ctx)
-            return atomic(needAtomic, atom.UnOp(op, atomSub, t), tmps, ctx)
-        case BinOp(left, op, right):
-            (l, tmps1) = transExp(left, False, ctx)
-            (r, tmps2) = transExp(right, False, ctx)
-            return atomic(needAtomic, atom.BinOp(l, op, r, t), tmps1 + tmps2, ctx)
+            return atom.AtomExp(atom.BoolConst(v, Bool()), t)
+        case Call(id, _):
+            return atomic(needAtomic, atom.Call(id, args, t), tmps, ctx)
+        case UnOp(op, _):
+            return atomic(needAtomic, atom.UnOp(op, args[0], t), tmps, ctx)
+        case BinOp(_, op, _):
+            return atomic(needAtomic, atom.BinOp(args[0], op, args[1], t), tmps, ctx)
         case Name(x):
             xt = assertExpNotVoid(e)
-            return (atom.AtomExp(atom.Name(x, xt), t), [])
+            return atom.AtomExp(atom.Name(x, xt), t)
         case ArrayInitDyn(lenExp, elemInit):
-            (atomLen, tmps1) = transExpAtomic(lenExp, ctx)
-            (atomElem, tmps2) = transExpAtomic(elemInit, ctx)
-            return atomic(needAtomic, atom.ArrayInitDyn(atomLen, atomElem, t), tmps1 + tmps2, ctx)
+            atomLen = atomOf(args[0], lenExp)
+            atomElem = atomOf(args[1], elemInit)
+            return atomic(needAtomic, atom.ArrayInitDyn(atomLen, atomElem, t), tmps, ctx)
         case ArrayInitStatic(initExps):
-            (atomArgs, tmps) = utils.unzip([transExpAtomic(i, ctx) for i in initExps])
-            return atomic(needAtomic, atom.ArrayInitStatic(atomArgs, t), utils.flatten(tmps), ctx)
+            atomArgs = [atomOf(a, i) for (a, i) in zip(args, initExps)]
+            return atomic(needAtomic, atom.ArrayInitStatic(atomArgs, t), tmps, ctx)
         case Subscript(arrExp, indexExp):
-            (atomArr, tmps1) = transExpAtomic(arrExp, ctx)
-            (atomIndex, tmps2) = transExpAtomic(indexExp, ctx)
-            return atomic(needAtomic, atom.Subscript(atomArr, atomIndex, t), tmps1 + tmps2, ctx)
+            atomArr = atomOf(args[0], arrExp)
+            atomIndex = atomOf(args[1], indexExp)
+            return atomic(needAtomic, atom.Subscript(atomArr, atomIndex, t), tmps, ctx)
 
 def mkAssigns(tmps: Temporaries) -> list[atom.stmt]:
     """
@@ -127,7 +155,7 @@ def transStmt(s: stmt, ctx: Ctx) -> list[atom.stmt]:
             (r, tmps3) = transExp(rightExp, False, ctx)
             return mkAssigns(tmps1 + tmps2 + tmps3) + [atom.SubscriptAssign(l, i, r)]
 
-def transStmts(stmts: list[stmt], ctx: Ctx) -> list[atom.stmt]:
+def transStmts(stmts: Sequence[stmt], ctx: Ctx) -> list[atom.stmt]:
     """
     Main entry point, transforming a list of statements.
     This function is called from compilers.array_compiler.compileModule.
@@ -4,7 +4,6 @@ from typing import *
 from common.compilerSupport import *
 import common.log as log
 import common.symtab as symtab
-import pprint
 
 type Symtab = symtab.Symtab[ident, ty]
 
@@ -47,30 +46,48 @@ def assertNotVoid(given: resultTy, what: str) -> ty:
 
 def tycheckExpNotVoid(e: exp, st: Symtab) -> ty:
     t = tycheckExp(e, st)
-    return assertNotVoid(t, str(e))
+    return notVoid(t, e)
 
-def tycheckFuncall(id: ident, args: list[exp], st: Symtab) -> resultTy:
+def notVoid(t: resultTy, e: exp) -> ty:
+    match t:
+        case NotVoid(u):
+            return u
+        case Void():
+            # only format the error message if needed, the expression might be large
+            return assertNotVoid(t, str(e))
+
+def tycheckFuncall(id: ident, args: Sequence[exp], argTys: list[resultTy]) -> resultTy:
     match (id.name, args):
         case ('input_int', []):
             return NotVoid(Int())
         case ('print', [e]):
-            t = tycheckExpNotVoid(e, st)
+            t = notVoid(argTys[0], e)
             if t not in [Int(), Bool()]:
                 raise CompileError.typeError(f'{e} should have type int or bool but has type {t}')
             return Void()
         case ('len', [e]):
-            t = tycheckExpNotVoid(e, st)
+            t = notVoid(argTys[0], e)
             assertArrayTy(t, str(e))
             return NotVoid(Int())
         case _:
             raise CompileError.typeError(f'Invalid function call of {id.name} with {len(args)} arguments')
 
 def tycheckExp(e: exp, st: Symtab) -> resultTy:
-    t = _tycheckExp(e, st)
+    """
+    Typechecks e and sets the ty attribute of e and of all its subexpressions. Works
+    bottom-up without recursion, so the nesting depth of e is not limited.
+    """
+    return foldExp(e, lambda x, subTys: _tycheckExp(x, subTys, st))
+
+def _tycheckExp(e: exp, subTys: list[resultTy], st: Symtab) -> resultTy:
+    t = _tycheckExpTy(e, subTys, st)
     e.ty = t
     return t
 
-def _tycheckExp(e: exp, st: Symtab) -> resultTy:
+def _tycheckExpTy(e: exp, subTys: list[resultTy], st: Symtab) -> resultTy:
+    """
+    Computes the type of e, given the types subTys of its subexpressions.
+    """
     match e:
         case IntConst(v):
             if v < -2**63 or v > 2.**63 - 1:
@@ -79,27 +96,32 @@ def _tycheckExp(e: exp, st: Symtab) -> resultTy:
         case BoolConst(_):
             return NotVoid(Bool())
         case Call(id, args):
-            return tycheckFuncall(id, args, st)
-        case UnOp(op, sub):
-            subTy = tycheckExp(sub, st)
+            return tycheckFuncall(id, args, subTys)
+        case UnOp(op, _):
+            [subTy] = subTys
             match op:
                 case USub():
                     expectedTy = Int()
                 case Not():
                     expectedTy = Bool()
-            assertTy(expectedTy, subTy, f'Expression {e}')
+            if subTy != NotVoid(expectedTy):
+                assertTy(expectedTy, subTy, f'Expression {e}')
             return NotVoid(expectedTy)
         case BinOp(left, op, right):
-            leftTy = tycheckExpNotVoid(left, st)
-            rightTy = tycheckExpNotVoid(right, st)
+            leftTy = notVoid(subTys[0], left)
+            rightTy = notVoid(subTys[1], right)
             match op:
                 case Add() | Sub() | Mul():
-                    assertTy(Int(), leftTy, f'Expression {left}')
-                    assertTy(Int(), rightTy, f'Expression {right}')
+                    if leftTy != Int():
+                        assertTy(Int(), leftTy, f'Expression {left}')
+                    if rightTy != Int():
+                        assertTy(Int(), rightTy, f'Expression {right}')
                     return NotVoid(Int())
                 case Less() | LessEq() | Greater() | GreaterEq():
-                    assertTy(Int(), leftTy, f'Expression {left}')
-                    assertTy(Int(), rightTy, f'Expression {right}')
+                    if leftTy != Int():
+                        assertTy(Int(), leftTy, f'Expression {left}')
+                    if rightTy != Int():
+                        assertTy(Int(), rightTy, f'Expression {right}')
                     return NotVoid(Bool())
                 case Eq() | NotEq():
                     if leftTy == rightTy and isBaseTy(leftTy):
@@ -112,29 +134,34 @@ def _tycheckExp(e: exp, st: Symtab) -> resultTy:
                     else:
                         raise CompileError.typeError(f'Invalid types for operands of {op}')
                 case And() | Or():
-                    assertTy(Bool(), leftTy, f'Expression {left}')
-                    assertTy(Bool(), rightTy, f'Expression {right}')
+                    if leftTy != Bool():
+                        assertTy(Bool(), leftTy, f'Expression {left}')
+                    if rightTy != Bool():
+                        assertTy(Bool(), rightTy, f'Expression {right}')
                     return NotVoid(Bool())
         case Name(x):
             return NotVoid(st.use(x))
         case ArrayInitDyn(lenExp, initExp):
-            lenTy = tycheckExp(lenExp, st)
-            assertTy(Int(), lenTy, f'Length expression {lenExp} in array initialization')
-            elemTy = assertSomeTy(tycheckExp(initExp, st),
-                                  f'Element expression {initExp} in array initialization')
-            return NotVoid(Array(elemTy))
+            [lenTy, initTy] = subTys
+            if lenTy != NotVoid(Int()):
+                assertTy(Int(), lenTy, f'Length expression {lenExp} in array initialization')
+            match initTy:
+                case NotVoid(elemTy):
+                    return NotVoid(Array(elemTy))
+                case Void():
+                    assertSomeTy(initTy, f'Element expression {initExp} in array initialization')
         case ArrayInitStatic([]):
             raise CompileError.typeError(f'Cannot construct empty array')
         case ArrayInitStatic(es):
-            elemTys: list[ty]= [tycheckExpNotVoid(e, st) for e in es]
+            elemTys: list[ty]= [notVoid(t, e) for (t, e) in zip(subTys, es)]
             elemTy = elemTys[0]
             for t in elemTys[1:]:
                 if t != elemTy:
                     raise CompileError.typeError(f'All array elements must have the same type: {es}')
             return NotVoid(Array(elemTy))
         case Subscript(arrayExp, indexExp):
-            arrayTy = tycheckExpNotVoid(arrayExp, st)
-            indexTy = tycheckExpNotVoid(indexExp, st)
+            arrayTy = notVoid(subTys[0], arrayExp)
+            indexTy = notVoid(subTys[1], indexExp)
             assertTy(Int(), indexTy, f'Index of subscript expression')
             match arrayTy:
                 case Array(elemTy):
@@ -185,7 +212,7 @@ def tycheckStmt(s: stmt, st: Symtab):
                     raise CompileError.typeError(f'Left-hand side of subscript assignment must ' \
                         'be an array')
 
-def tycheckStmts(stmts: list[stmt], st: Symtab):
+def tycheckStmts(stmts: Sequence[stmt], st: Symtab):
     for s in stmts:
         tycheckStmt(s, st)
 
@@ -197,5 +224,5 @@ def tycheckModule(m: mod) -> Symtab:
     st: Symtab = symtab.Symtab()
     tycheckStmts(m.stmts, st)
     log.debug(f'Symtab after typechecking: {st}')
-    log.debug(f'AST after typechecking: {pprint.pformat(m)}')
+    log.debugPretty('AST after typechecking: ', m)
     return st
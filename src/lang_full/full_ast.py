@@ -1,279 +1,1705 @@
-# AUTOMATICALLY GENERATED (2024-07-23 16:01:08)
+# AUTOMATICALLY GENERATED (2026-10-17 09:05:20)
 from __future__ import annotations
 from dataclasses import dataclass
+from abc import ABC, abstractmethod
+from typing import Any, Callable, ClassVar, Sequence
+from weakref import WeakValueDictionary
+from common.asdlCodec import Reader, Writer, readUint, uint
+import common.asdlCodec as asdlCodec
+import common.traversal as traversal
 
 type optional[T] = T | None
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Ident:
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Ident]] = WeakValueDictionary()
     name: str
 
+    def __new__(cls, name: str) -> Ident:
+        key = (name,)
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            object.__setattr__(x, 'name', name)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), (self.name,))
+
 type ident = Ident
 type string = str
 
-@dataclass
+@dataclass(slots=True)
 class USub:
-    pass
+    tag: ClassVar[int] = 0
 
-@dataclass
+@dataclass(slots=True)
 class Not:
-    pass
+    tag: ClassVar[int] = 1
 
 type unaryop = USub | Not
 
-@dataclass
+class UnaryopVisitor[R, C](ABC):
+    _unaryopTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._unaryopTable = (cls.visitUSub, cls.visitNot)
+
+    def visitUnaryop(self, x: unaryop, ctx: C) -> R:
+        return self._unaryopTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitUSub(self, x: USub, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitNot(self, x: Not, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class Add:
-    pass
+    tag: ClassVar[int] = 0
 
-@dataclass
+@dataclass(slots=True)
 class Sub:
-    pass
+    tag: ClassVar[int] = 1
 
-@dataclass
+@dataclass(slots=True)
 class Mul:
-    pass
+    tag: ClassVar[int] = 2
 
-@dataclass
+@dataclass(slots=True)
 class Less:
-    pass
+    tag: ClassVar[int] = 3
 
-@dataclass
+@dataclass(slots=True)
 class LessEq:
-    pass
+    tag: ClassVar[int] = 4
 
-@dataclass
+@dataclass(slots=True)
 class Greater:
-    pass
+    tag: ClassVar[int] = 5
 
-@dataclass
+@dataclass(slots=True)
 class GreaterEq:
-    pass
+    tag: ClassVar[int] = 6
 
-@dataclass
+@dataclass(slots=True)
 class Eq:
-    pass
+    tag: ClassVar[int] = 7
 
-@dataclass
+@dataclass(slots=True)
 class NotEq:
-    pass
+    tag: ClassVar[int] = 8
 
-@dataclass
+@dataclass(slots=True)
 class Is:
-    pass
+    tag: ClassVar[int] = 9
 
-@dataclass
+@dataclass(slots=True)
 class And:
-    pass
+    tag: ClassVar[int] = 10
 
-@dataclass
+@dataclass(slots=True)
 class Or:
-    pass
+    tag: ClassVar[int] = 11
 
 type binaryop = Add | Sub | Mul | Less | LessEq | Greater | GreaterEq | Eq | NotEq | Is | And | Or
 
-@dataclass
+class BinaryopVisitor[R, C](ABC):
+    _binaryopTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._binaryopTable = (cls.visitAdd, cls.visitSub, cls.visitMul, cls.visitLess, cls.visitLessEq, cls.visitGreater, cls.visitGreaterEq, cls.visitEq, cls.visitNotEq, cls.visitIs, cls.visitAnd, cls.visitOr)
+
+    def visitBinaryop(self, x: binaryop, ctx: C) -> R:
+        return self._binaryopTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitAdd(self, x: Add, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitSub(self, x: Sub, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitMul(self, x: Mul, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitLess(self, x: Less, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitLessEq(self, x: LessEq, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitGreater(self, x: Greater, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitGreaterEq(self, x: GreaterEq, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitEq(self, x: Eq, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitNotEq(self, x: NotEq, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitIs(self, x: Is, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitAnd(self, x: And, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitOr(self, x: Or, ctx: C) -> R: ...
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Int:
-    pass
+    tag: ClassVar[int] = 0
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Int]] = WeakValueDictionary()
 
-@dataclass
+    def __new__(cls) -> Int:
+        key = ()
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), ())
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Bool:
-    pass
+    tag: ClassVar[int] = 1
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Bool]] = WeakValueDictionary()
+
+    def __new__(cls) -> Bool:
+        key = ()
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            cls._instances[key] = x
+        return x
 
-@dataclass
+    def __reduce__(self):
+        return (type(self), ())
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Array:
+    tag: ClassVar[int] = 2
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Array]] = WeakValueDictionary()
     elemTy: ty
 
-@dataclass
+    def __new__(cls, elemTy: ty) -> Array:
+        key = (elemTy,)
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            object.__setattr__(x, 'elemTy', elemTy)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), (self.elemTy,))
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Fun:
-    params: list[ty]
+    tag: ClassVar[int] = 3
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Fun]] = WeakValueDictionary()
+    params: Sequence[ty]
     result: resultTy
 
-@dataclass
+    def __new__(cls, params: Sequence[ty], result: resultTy) -> Fun:
+        params = tuple(params)
+        key = (params, result)
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            object.__setattr__(x, 'params', params)
+            object.__setattr__(x, 'result', result)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), (self.params, self.result))
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Class:
+    tag: ClassVar[int] = 4
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Class]] = WeakValueDictionary()
     name: ident
 
-@dataclass
+    def __new__(cls, name: ident) -> Class:
+        key = (name,)
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            object.__setattr__(x, 'name', name)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), (self.name,))
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Interface:
+    tag: ClassVar[int] = 5
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Interface]] = WeakValueDictionary()
     name: ident
 
+    def __new__(cls, name: ident) -> Interface:
+        key = (name,)
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            object.__setattr__(x, 'name', name)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), (self.name,))
+
 type ty = Int | Bool | Array | Fun | Class | Interface
 
-@dataclass
+class TyVisitor[R, C](ABC):
+    _tyTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._tyTable = (cls.visitInt, cls.visitBool, cls.visitArray, cls.visitFun, cls.visitClass, cls.visitInterface)
+
+    def visitTy(self, x: ty, ctx: C) -> R:
+        return self._tyTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitInt(self, x: Int, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitBool(self, x: Bool, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitArray(self, x: Array, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitFun(self, x: Fun, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitClass(self, x: Class, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitInterface(self, x: Interface, ctx: C) -> R: ...
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class NotVoid:
+    tag: ClassVar[int] = 0
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], NotVoid]] = WeakValueDictionary()
     ty: ty
 
-@dataclass
+    def __new__(cls, ty: ty) -> NotVoid:
+        key = (ty,)
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            object.__setattr__(x, 'ty', ty)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), (self.ty,))
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Void:
-    pass
+    tag: ClassVar[int] = 1
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Void]] = WeakValueDictionary()
+
+    def __new__(cls) -> Void:
+        key = ()
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), ())
 
 type resultTy = NotVoid | Void
 
-@dataclass
+class ResultTyVisitor[R, C](ABC):
+    _resultTyTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._resultTyTable = (cls.visitNotVoid, cls.visitVoid)
+
+    def visitResultTy(self, x: resultTy, ctx: C) -> R:
+        return self._resultTyTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitNotVoid(self, x: NotVoid, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitVoid(self, x: Void, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class Var:
-    pass
+    tag: ClassVar[int] = 0
 
-@dataclass
+@dataclass(slots=True)
 class UserFun:
-    pass
+    tag: ClassVar[int] = 1
 
-@dataclass
+@dataclass(slots=True)
 class BuiltinFun:
-    pass
+    tag: ClassVar[int] = 2
 
 type scope = Var | UserFun | BuiltinFun
 
-@dataclass
+class ScopeVisitor[R, C](ABC):
+    _scopeTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._scopeTable = (cls.visitVar, cls.visitUserFun, cls.visitBuiltinFun)
+
+    def visitScope(self, x: scope, ctx: C) -> R:
+        return self._scopeTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitVar(self, x: Var, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitUserFun(self, x: UserFun, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitBuiltinFun(self, x: BuiltinFun, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class FunParam:
+    tag: ClassVar[int] = 0
     var: ident
     ty: ty
 
 type funParam = FunParam
 
-@dataclass
+@dataclass(slots=True)
 class IntConst:
+    tag: ClassVar[int] = 0
     value: int
     ty: optional[resultTy] = None
 
-@dataclass
+@dataclass(slots=True)
 class BoolConst:
+    tag: ClassVar[int] = 1
     value: bool
     ty: optional[resultTy] = None
 
-@dataclass
+@dataclass(slots=True)
 class Name:
+    tag: ClassVar[int] = 2
     var: ident
     scope: optional[scope] = None
     ty: optional[resultTy] = None
 
-@dataclass
+@dataclass(slots=True)
 class Call:
+    tag: ClassVar[int] = 3
     fun: exp
-    args: list[exp]
+    args: Sequence[exp]
     ty: optional[resultTy] = None
 
-@dataclass
+    def __post_init__(self):
+        self.args = tuple(self.args)
+
+@dataclass(slots=True)
 class UnOp:
+    tag: ClassVar[int] = 4
     op: unaryop
     arg: exp
     ty: optional[resultTy] = None
 
-@dataclass
+@dataclass(slots=True)
 class BinOp:
+    tag: ClassVar[int] = 5
     left: exp
     op: binaryop
     right: exp
     ty: optional[resultTy] = None
 
-@dataclass
+@dataclass(slots=True)
 class ArrayInitDyn:
+    tag: ClassVar[int] = 6
     len: exp
     elemInit: exp
     ty: optional[resultTy] = None
 
-@dataclass
+@dataclass(slots=True)
 class ArrayInitStatic:
-    elemInit: list[exp]
+    tag: ClassVar[int] = 7
+    elemInit: Sequence[exp]
     ty: optional[resultTy] = None
 
-@dataclass
+    def __post_init__(self):
+        self.elemInit = tuple(self.elemInit)
+
+@dataclass(slots=True)
 class Subscript:
+    tag: ClassVar[int] = 8
     array: exp
     index: exp
     ty: optional[resultTy] = None
 
-@dataclass
+@dataclass(slots=True)
 class Closure:
-    params: list[funParam]
+    tag: ClassVar[int] = 9
+    params: Sequence[funParam]
     body: exp
     ty: optional[resultTy] = None
 
+    def __post_init__(self):
+        self.params = tuple(self.params)
+
 type exp = IntConst | BoolConst | Name | Call | UnOp | BinOp | ArrayInitDyn | ArrayInitStatic | Subscript | Closure
 
-@dataclass
+class ExpVisitor[R, C](ABC):
+    _expTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._expTable = (cls.visitIntConst, cls.visitBoolConst, cls.visitName, cls.visitCall, cls.visitUnOp, cls.visitBinOp, cls.visitArrayInitDyn, cls.visitArrayInitStatic, cls.visitSubscript, cls.visitClosure)
+
+    def visitExp(self, x: exp, ctx: C) -> R:
+        return self._expTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitIntConst(self, x: IntConst, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitBoolConst(self, x: BoolConst, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitName(self, x: Name, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitCall(self, x: Call, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitUnOp(self, x: UnOp, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitBinOp(self, x: BinOp, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitArrayInitDyn(self, x: ArrayInitDyn, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitArrayInitStatic(self, x: ArrayInitStatic, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitSubscript(self, x: Subscript, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitClosure(self, x: Closure, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class StmtExp:
+    tag: ClassVar[int] = 0
     exp: exp
 
-@dataclass
+@dataclass(slots=True)
 class Assign:
+    tag: ClassVar[int] = 1
     var: ident
     right: exp
 
-@dataclass
+@dataclass(slots=True)
 class IfStmt:
+    tag: ClassVar[int] = 2
     cond: exp
-    thenBody: list[stmt]
-    elseBody: list[stmt]
+    thenBody: Sequence[stmt]
+    elseBody: Sequence[stmt]
+
+    def __post_init__(self):
+        self.thenBody = tuple(self.thenBody)
+        self.elseBody = tuple(self.elseBody)
 
-@dataclass
+@dataclass(slots=True)
 class WhileStmt:
+    tag: ClassVar[int] = 3
     cond: exp
-    body: list[stmt]
+    body: Sequence[stmt]
+
+    def __post_init__(self):
+        self.body = tuple(self.body)
 
-@dataclass
+@dataclass(slots=True)
 class SubscriptAssign:
+    tag: ClassVar[int] = 4
     left: exp
     index: exp
     right: exp
 
-@dataclass
+@dataclass(slots=True)
 class Return:
+    tag: ClassVar[int] = 5
     result: optional[exp] = None
 
 type stmt = StmtExp | Assign | IfStmt | WhileStmt | SubscriptAssign | Return
 
-@dataclass
+class StmtVisitor[R, C](ABC):
+    _stmtTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._stmtTable = (cls.visitStmtExp, cls.visitAssign, cls.visitIfStmt, cls.visitWhileStmt, cls.visitSubscriptAssign, cls.visitReturn)
+
+    def visitStmt(self, x: stmt, ctx: C) -> R:
+        return self._stmtTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitStmtExp(self, x: StmtExp, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitAssign(self, x: Assign, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitIfStmt(self, x: IfStmt, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitWhileStmt(self, x: WhileStmt, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitSubscriptAssign(self, x: SubscriptAssign, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitReturn(self, x: Return, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class FunDef:
+    tag: ClassVar[int] = 0
     name: ident
-    params: list[funParam]
+    params: Sequence[funParam]
     result: resultTy
-    body: list[stmt]
+    body: Sequence[stmt]
+
+    def __post_init__(self):
+        self.params = tuple(self.params)
+        self.body = tuple(self.body)
 
 type fun = FunDef
 
-@dataclass
+@dataclass(slots=True)
 class FieldDecl:
+    tag: ClassVar[int] = 0
     ty: ty
     name: ident
 
 type fieldDecl = FieldDecl
 
-@dataclass
+@dataclass(slots=True)
 class MethodSig:
+    tag: ClassVar[int] = 0
     name: ident
-    params: list[funParam]
+    params: Sequence[funParam]
     result: resultTy
 
+    def __post_init__(self):
+        self.params = tuple(self.params)
+
 type methodSig = MethodSig
 
-@dataclass
+@dataclass(slots=True)
 class MethodDecl:
+    tag: ClassVar[int] = 0
     sig: methodSig
-    body: list[stmt]
+    body: Sequence[stmt]
+
+    def __post_init__(self):
+        self.body = tuple(self.body)
 
 type methodDecl = MethodDecl
 
-@dataclass
+@dataclass(slots=True)
 class ClassDecl:
+    tag: ClassVar[int] = 0
     name: ident
     extends: optional[ident]
-    implements: list[ident]
-    fields: list[fieldDecl]
-    methods: list[methodDecl]
+    implements: Sequence[ident]
+    fields: Sequence[fieldDecl]
+    methods: Sequence[methodDecl]
+
+    def __post_init__(self):
+        self.implements = tuple(self.implements)
+        self.fields = tuple(self.fields)
+        self.methods = tuple(self.methods)
 
 type classDecl = ClassDecl
 
-@dataclass
+@dataclass(slots=True)
 class InterfaceDecl:
+    tag: ClassVar[int] = 0
     name: ident
-    methods: list[methodSig]
+    methods: Sequence[methodSig]
+
+    def __post_init__(self):
+        self.methods = tuple(self.methods)
 
 type interfaceDecl = InterfaceDecl
 
-@dataclass
+@dataclass(slots=True)
 class Module:
-    interfaces: list[interfaceDecl]
-    classes: list[classDecl]
-    funs: list[fun]
-    stmts: list[stmt]
+    tag: ClassVar[int] = 0
+    interfaces: Sequence[interfaceDecl]
+    classes: Sequence[classDecl]
+    funs: Sequence[fun]
+    stmts: Sequence[stmt]
+
+    def __post_init__(self):
+        self.interfaces = tuple(self.interfaces)
+        self.classes = tuple(self.classes)
+        self.funs = tuple(self.funs)
+        self.stmts = tuple(self.stmts)
+
+type mod = Module
+
+def _encodeUSub(w: Writer, x: USub):
+    w.buf.append(0)
+
+def _encodeNot(w: Writer, x: Not):
+    w.buf.append(1)
+
+def _decodeUSub(r: Reader, strs: list[str], idents: list[Ident]) -> USub:
+    return USub()
+
+def _decodeNot(r: Reader, strs: list[str], idents: list[Ident]) -> Not:
+    return Not()
+
+_unaryopEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    USub: _encodeUSub,
+    Not: _encodeNot,
+}
+
+_unaryopDecoders: tuple[Callable[[Reader, list[str], list[Ident]], unaryop], ...] = (
+    _decodeUSub,
+    _decodeNot,
+)
+
+def encodeUnaryopTo(w: Writer, x: unaryop):
+    _unaryopEncoders[type(x)](w, x)
+
+def decodeUnaryopFrom(r: Reader, strs: list[str], idents: list[Ident]) -> unaryop:
+    return _unaryopDecoders[r()](r, strs, idents)
+
+def encodeUnaryop(x: unaryop) -> bytes:
+    return asdlCodec.encode(x, encodeUnaryopTo)
+
+def decodeUnaryop(data: bytes) -> unaryop:
+    return asdlCodec.decode(data, decodeUnaryopFrom, Ident)
+
+def encodeUnaryopList(xs: Sequence[unaryop]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeUnaryopTo)
+
+def decodeUnaryopList(data: bytes) -> list[unaryop]:
+    return asdlCodec.decodeList(data, decodeUnaryopFrom, Ident)
+
+def _encodeAdd(w: Writer, x: Add):
+    w.buf.append(0)
+
+def _encodeSub(w: Writer, x: Sub):
+    w.buf.append(1)
+
+def _encodeMul(w: Writer, x: Mul):
+    w.buf.append(2)
+
+def _encodeLess(w: Writer, x: Less):
+    w.buf.append(3)
+
+def _encodeLessEq(w: Writer, x: LessEq):
+    w.buf.append(4)
+
+def _encodeGreater(w: Writer, x: Greater):
+    w.buf.append(5)
+
+def _encodeGreaterEq(w: Writer, x: GreaterEq):
+    w.buf.append(6)
+
+def _encodeEq(w: Writer, x: Eq):
+    w.buf.append(7)
+
+def _encodeNotEq(w: Writer, x: NotEq):
+    w.buf.append(8)
+
+def _encodeIs(w: Writer, x: Is):
+    w.buf.append(9)
+
+def _encodeAnd(w: Writer, x: And):
+    w.buf.append(10)
+
+def _encodeOr(w: Writer, x: Or):
+    w.buf.append(11)
+
+def _decodeAdd(r: Reader, strs: list[str], idents: list[Ident]) -> Add:
+    return Add()
+
+def _decodeSub(r: Reader, strs: list[str], idents: list[Ident]) -> Sub:
+    return Sub()
+
+def _decodeMul(r: Reader, strs: list[str], idents: list[Ident]) -> Mul:
+    return Mul()
+
+def _decodeLess(r: Reader, strs: list[str], idents: list[Ident]) -> Less:
+    return Less()
+
+def _decodeLessEq(r: Reader, strs: list[str], idents: list[Ident]) -> LessEq:
+    return LessEq()
+
+def _decodeGreater(r: Reader, strs: list[str], idents: list[Ident]) -> Greater:
+    return Greater()
+
+def _decodeGreaterEq(r: Reader, strs: list[str], idents: list[Ident]) -> GreaterEq:
+    return GreaterEq()
+
+def _decodeEq(r: Reader, strs: list[str], idents: list[Ident]) -> Eq:
+    return Eq()
+
+def _decodeNotEq(r: Reader, strs: list[str], idents: list[Ident]) -> NotEq:
+    return NotEq()
+
+def _decodeIs(r: Reader, strs: list[str], idents: list[Ident]) -> Is:
+    return Is()
+
+def _decodeAnd(r: Reader, strs: list[str], idents: list[Ident]) -> And:
+    return And()
+
+def _decodeOr(r: Reader, strs: list[str], idents: list[Ident]) -> Or:
+    return Or()
+
+_binaryopEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Add: _encodeAdd,
+    Sub: _encodeSub,
+    Mul: _encodeMul,
+    Less: _encodeLess,
+    LessEq: _encodeLessEq,
+    Greater: _encodeGreater,
+    GreaterEq: _encodeGreaterEq,
+    Eq: _encodeEq,
+    NotEq: _encodeNotEq,
+    Is: _encodeIs,
+    And: _encodeAnd,
+    Or: _encodeOr,
+}
+
+_binaryopDecoders: tuple[Callable[[Reader, list[str], list[Ident]], binaryop], ...] = (
+    _decodeAdd,
+    _decodeSub,
+    _decodeMul,
+    _decodeLess,
+    _decodeLessEq,
+    _decodeGreater,
+    _decodeGreaterEq,
+    _decodeEq,
+    _decodeNotEq,
+    _decodeIs,
+    _decodeAnd,
+    _decodeOr,
+)
+
+def encodeBinaryopTo(w: Writer, x: binaryop):
+    _binaryopEncoders[type(x)](w, x)
+
+def decodeBinaryopFrom(r: Reader, strs: list[str], idents: list[Ident]) -> binaryop:
+    return _binaryopDecoders[r()](r, strs, idents)
+
+def encodeBinaryop(x: binaryop) -> bytes:
+    return asdlCodec.encode(x, encodeBinaryopTo)
+
+def decodeBinaryop(data: bytes) -> binaryop:
+    return asdlCodec.decode(data, decodeBinaryopFrom, Ident)
+
+def encodeBinaryopList(xs: Sequence[binaryop]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeBinaryopTo)
+
+def decodeBinaryopList(data: bytes) -> list[binaryop]:
+    return asdlCodec.decodeList(data, decodeBinaryopFrom, Ident)
+
+def _encodeInt(w: Writer, x: Int):
+    w.buf.append(0)
+
+def _encodeBool(w: Writer, x: Bool):
+    w.buf.append(1)
+
+def _encodeArray(w: Writer, x: Array):
+    w.buf.append(2)
+    encodeTyTo(w, x.elemTy)
+
+def _encodeFun(w: Writer, x: Fun):
+    w.buf.append(3)
+    params = x.params
+    w.uint(len(params))
+    for y in params:
+        encodeTyTo(w, y)
+    encodeResultTyTo(w, x.result)
+
+def _encodeClass(w: Writer, x: Class):
+    w.buf.append(4)
+    w.str(x.name.name)
+
+def _encodeInterface(w: Writer, x: Interface):
+    w.buf.append(5)
+    w.str(x.name.name)
+
+def _decodeInt(r: Reader, strs: list[str], idents: list[Ident]) -> Int:
+    return Int()
+
+def _decodeBool(r: Reader, strs: list[str], idents: list[Ident]) -> Bool:
+    return Bool()
+
+def _decodeArray(r: Reader, strs: list[str], idents: list[Ident]) -> Array:
+    return Array(_tyDecoders[r()](r, strs, idents))
+
+def _decodeFun(r: Reader, strs: list[str], idents: list[Ident]) -> Fun:
+    return Fun([_tyDecoders[r()](r, strs, idents) for _ in range(uint(r))], _resultTyDecoders[r()](r, strs, idents))
+
+def _decodeClass(r: Reader, strs: list[str], idents: list[Ident]) -> Class:
+    return Class(idents[(b if (b := r()) < 128 else readUint(b, r))])
+
+def _decodeInterface(r: Reader, strs: list[str], idents: list[Ident]) -> Interface:
+    return Interface(idents[(b if (b := r()) < 128 else readUint(b, r))])
+
+_tyEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Int: _encodeInt,
+    Bool: _encodeBool,
+    Array: _encodeArray,
+    Fun: _encodeFun,
+    Class: _encodeClass,
+    Interface: _encodeInterface,
+}
+
+_tyDecoders: tuple[Callable[[Reader, list[str], list[Ident]], ty], ...] = (
+    _decodeInt,
+    _decodeBool,
+    _decodeArray,
+    _decodeFun,
+    _decodeClass,
+    _decodeInterface,
+)
+
+def encodeTyTo(w: Writer, x: ty):
+    _tyEncoders[type(x)](w, x)
+
+def decodeTyFrom(r: Reader, strs: list[str], idents: list[Ident]) -> ty:
+    return _tyDecoders[r()](r, strs, idents)
+
+def encodeTy(x: ty) -> bytes:
+    return asdlCodec.encode(x, encodeTyTo)
+
+def decodeTy(data: bytes) -> ty:
+    return asdlCodec.decode(data, decodeTyFrom, Ident)
+
+def encodeTyList(xs: Sequence[ty]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeTyTo)
+
+def decodeTyList(data: bytes) -> list[ty]:
+    return asdlCodec.decodeList(data, decodeTyFrom, Ident)
+
+def _encodeNotVoid(w: Writer, x: NotVoid):
+    w.buf.append(0)
+    encodeTyTo(w, x.ty)
+
+def _encodeVoid(w: Writer, x: Void):
+    w.buf.append(1)
+
+def _decodeNotVoid(r: Reader, strs: list[str], idents: list[Ident]) -> NotVoid:
+    return NotVoid(_tyDecoders[r()](r, strs, idents))
+
+def _decodeVoid(r: Reader, strs: list[str], idents: list[Ident]) -> Void:
+    return Void()
+
+_resultTyEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    NotVoid: _encodeNotVoid,
+    Void: _encodeVoid,
+}
+
+_resultTyDecoders: tuple[Callable[[Reader, list[str], list[Ident]], resultTy], ...] = (
+    _decodeNotVoid,
+    _decodeVoid,
+)
+
+def encodeResultTyTo(w: Writer, x: resultTy):
+    _resultTyEncoders[type(x)](w, x)
+
+def decodeResultTyFrom(r: Reader, strs: list[str], idents: list[Ident]) -> resultTy:
+    return _resultTyDecoders[r()](r, strs, idents)
+
+def encodeResultTy(x: resultTy) -> bytes:
+    return asdlCodec.encode(x, encodeResultTyTo)
+
+def decodeResultTy(data: bytes) -> resultTy:
+    return asdlCodec.decode(data, decodeResultTyFrom, Ident)
+
+def encodeResultTyList(xs: Sequence[resultTy]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeResultTyTo)
+
+def decodeResultTyList(data: bytes) -> list[resultTy]:
+    return asdlCodec.decodeList(data, decodeResultTyFrom, Ident)
+
+def _encodeVar(w: Writer, x: Var):
+    w.buf.append(0)
+
+def _encodeUserFun(w: Writer, x: UserFun):
+    w.buf.append(1)
+
+def _encodeBuiltinFun(w: Writer, x: BuiltinFun):
+    w.buf.append(2)
+
+def _decodeVar(r: Reader, strs: list[str], idents: list[Ident]) -> Var:
+    return Var()
+
+def _decodeUserFun(r: Reader, strs: list[str], idents: list[Ident]) -> UserFun:
+    return UserFun()
+
+def _decodeBuiltinFun(r: Reader, strs: list[str], idents: list[Ident]) -> BuiltinFun:
+    return BuiltinFun()
+
+_scopeEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Var: _encodeVar,
+    UserFun: _encodeUserFun,
+    BuiltinFun: _encodeBuiltinFun,
+}
+
+_scopeDecoders: tuple[Callable[[Reader, list[str], list[Ident]], scope], ...] = (
+    _decodeVar,
+    _decodeUserFun,
+    _decodeBuiltinFun,
+)
+
+def encodeScopeTo(w: Writer, x: scope):
+    _scopeEncoders[type(x)](w, x)
+
+def decodeScopeFrom(r: Reader, strs: list[str], idents: list[Ident]) -> scope:
+    return _scopeDecoders[r()](r, strs, idents)
+
+def encodeScope(x: scope) -> bytes:
+    return asdlCodec.encode(x, encodeScopeTo)
+
+def decodeScope(data: bytes) -> scope:
+    return asdlCodec.decode(data, decodeScopeFrom, Ident)
+
+def encodeScopeList(xs: Sequence[scope]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeScopeTo)
+
+def decodeScopeList(data: bytes) -> list[scope]:
+    return asdlCodec.decodeList(data, decodeScopeFrom, Ident)
+
+def _encodeFunParam(w: Writer, x: FunParam):
+    w.buf.append(0)
+    w.str(x.var.name)
+    encodeTyTo(w, x.ty)
+
+def _decodeFunParam(r: Reader, strs: list[str], idents: list[Ident]) -> FunParam:
+    return FunParam(idents[(b if (b := r()) < 128 else readUint(b, r))], _tyDecoders[r()](r, strs, idents))
+
+_funParamEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    FunParam: _encodeFunParam,
+}
+
+_funParamDecoders: tuple[Callable[[Reader, list[str], list[Ident]], funParam], ...] = (
+    _decodeFunParam,
+)
+
+def encodeFunParamTo(w: Writer, x: funParam):
+    _funParamEncoders[type(x)](w, x)
+
+def decodeFunParamFrom(r: Reader, strs: list[str], idents: list[Ident]) -> funParam:
+    return _funParamDecoders[r()](r, strs, idents)
+
+def encodeFunParam(x: funParam) -> bytes:
+    return asdlCodec.encode(x, encodeFunParamTo)
+
+def decodeFunParam(data: bytes) -> funParam:
+    return asdlCodec.decode(data, decodeFunParamFrom, Ident)
+
+def encodeFunParamList(xs: Sequence[funParam]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeFunParamTo)
+
+def decodeFunParamList(data: bytes) -> list[funParam]:
+    return asdlCodec.decodeList(data, decodeFunParamFrom, Ident)
+
+def _encodeIntConst(w: Writer, x: IntConst):
+    w.buf.append(0)
+    w.int(x.value)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _encodeBoolConst(w: Writer, x: BoolConst):
+    w.buf.append(1)
+    w.buf.append(1 if x.value else 0)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _encodeName(w: Writer, x: Name):
+    w.buf.append(2)
+    w.str(x.var.name)
+    scope = x.scope
+    if scope is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeScopeTo(w, scope)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _encodeCall(w: Writer, x: Call):
+    w.buf.append(3)
+    encodeExpTo(w, x.fun)
+    args = x.args
+    w.uint(len(args))
+    for y in args:
+        encodeExpTo(w, y)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _encodeUnOp(w: Writer, x: UnOp):
+    w.buf.append(4)
+    encodeUnaryopTo(w, x.op)
+    encodeExpTo(w, x.arg)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _encodeBinOp(w: Writer, x: BinOp):
+    w.buf.append(5)
+    encodeExpTo(w, x.left)
+    encodeBinaryopTo(w, x.op)
+    encodeExpTo(w, x.right)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _encodeArrayInitDyn(w: Writer, x: ArrayInitDyn):
+    w.buf.append(6)
+    encodeExpTo(w, x.len)
+    encodeExpTo(w, x.elemInit)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _encodeArrayInitStatic(w: Writer, x: ArrayInitStatic):
+    w.buf.append(7)
+    elemInit = x.elemInit
+    w.uint(len(elemInit))
+    for y in elemInit:
+        encodeExpTo(w, y)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _encodeSubscript(w: Writer, x: Subscript):
+    w.buf.append(8)
+    encodeExpTo(w, x.array)
+    encodeExpTo(w, x.index)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _encodeClosure(w: Writer, x: Closure):
+    w.buf.append(9)
+    params = x.params
+    w.uint(len(params))
+    for y in params:
+        encodeFunParamTo(w, y)
+    encodeExpTo(w, x.body)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _decodeIntConst(r: Reader, strs: list[str], idents: list[Ident]) -> IntConst:
+    return IntConst(((n := (b if (b := r()) < 128 else readUint(b, r))) >> 1) ^ -(n & 1), _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+def _decodeBoolConst(r: Reader, strs: list[str], idents: list[Ident]) -> BoolConst:
+    return BoolConst(r() == 1, _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+def _decodeName(r: Reader, strs: list[str], idents: list[Ident]) -> Name:
+    return Name(idents[(b if (b := r()) < 128 else readUint(b, r))], _scopeDecoders[r()](r, strs, idents) if r() else None, _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+def _decodeCall(r: Reader, strs: list[str], idents: list[Ident]) -> Call:
+    return Call(_expDecoders[r()](r, strs, idents), [_expDecoders[r()](r, strs, idents) for _ in range(uint(r))], _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+def _decodeUnOp(r: Reader, strs: list[str], idents: list[Ident]) -> UnOp:
+    return UnOp(_unaryopDecoders[r()](r, strs, idents), _expDecoders[r()](r, strs, idents), _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+def _decodeBinOp(r: Reader, strs: list[str], idents: list[Ident]) -> BinOp:
+    return BinOp(_expDecoders[r()](r, strs, idents), _binaryopDecoders[r()](r, strs, idents), _expDecoders[r()](r, strs, idents), _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+def _decodeArrayInitDyn(r: Reader, strs: list[str], idents: list[Ident]) -> ArrayInitDyn:
+    return ArrayInitDyn(_expDecoders[r()](r, strs, idents), _expDecoders[r()](r, strs, idents), _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+def _decodeArrayInitStatic(r: Reader, strs: list[str], idents: list[Ident]) -> ArrayInitStatic:
+    return ArrayInitStatic([_expDecoders[r()](r, strs, idents) for _ in range(uint(r))], _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+def _decodeSubscript(r: Reader, strs: list[str], idents: list[Ident]) -> Subscript:
+    return Subscript(_expDecoders[r()](r, strs, idents), _expDecoders[r()](r, strs, idents), _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+def _decodeClosure(r: Reader, strs: list[str], idents: list[Ident]) -> Closure:
+    return Closure([_funParamDecoders[r()](r, strs, idents) for _ in range(uint(r))], _expDecoders[r()](r, strs, idents), _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+_expEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    IntConst: _encodeIntConst,
+    BoolConst: _encodeBoolConst,
+    Name: _encodeName,
+    Call: _encodeCall,
+    UnOp: _encodeUnOp,
+    BinOp: _encodeBinOp,
+    ArrayInitDyn: _encodeArrayInitDyn,
+    ArrayInitStatic: _encodeArrayInitStatic,
+    Subscript: _encodeSubscript,
+    Closure: _encodeClosure,
+}
+
+_expDecoders: tuple[Callable[[Reader, list[str], list[Ident]], exp], ...] = (
+    _decodeIntConst,
+    _decodeBoolConst,
+    _decodeName,
+    _decodeCall,
+    _decodeUnOp,
+    _decodeBinOp,
+    _decodeArrayInitDyn,
+    _decodeArrayInitStatic,
+    _decodeSubscript,
+    _decodeClosure,
+)
+
+def encodeExpTo(w: Writer, x: exp):
+    _expEncoders[type(x)](w, x)
+
+def decodeExpFrom(r: Reader, strs: list[str], idents: list[Ident]) -> exp:
+    return _expDecoders[r()](r, strs, idents)
+
+def encodeExp(x: exp) -> bytes:
+    return asdlCodec.encode(x, encodeExpTo)
+
+def decodeExp(data: bytes) -> exp:
+    return asdlCodec.decode(data, decodeExpFrom, Ident)
+
+def encodeExpList(xs: Sequence[exp]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeExpTo)
+
+def decodeExpList(data: bytes) -> list[exp]:
+    return asdlCodec.decodeList(data, decodeExpFrom, Ident)
+
+def _encodeStmtExp(w: Writer, x: StmtExp):
+    w.buf.append(0)
+    encodeExpTo(w, x.exp)
+
+def _encodeAssign(w: Writer, x: Assign):
+    w.buf.append(1)
+    w.str(x.var.name)
+    encodeExpTo(w, x.right)
+
+def _encodeIfStmt(w: Writer, x: IfStmt):
+    w.buf.append(2)
+    encodeExpTo(w, x.cond)
+    thenBody = x.thenBody
+    w.uint(len(thenBody))
+    for y in thenBody:
+        encodeStmtTo(w, y)
+    elseBody = x.elseBody
+    w.uint(len(elseBody))
+    for y in elseBody:
+        encodeStmtTo(w, y)
+
+def _encodeWhileStmt(w: Writer, x: WhileStmt):
+    w.buf.append(3)
+    encodeExpTo(w, x.cond)
+    body = x.body
+    w.uint(len(body))
+    for y in body:
+        encodeStmtTo(w, y)
+
+def _encodeSubscriptAssign(w: Writer, x: SubscriptAssign):
+    w.buf.append(4)
+    encodeExpTo(w, x.left)
+    encodeExpTo(w, x.index)
+    encodeExpTo(w, x.right)
+
+def _encodeReturn(w: Writer, x: Return):
+    w.buf.append(5)
+    result = x.result
+    if result is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeExpTo(w, result)
+
+def _decodeStmtExp(r: Reader, strs: list[str], idents: list[Ident]) -> StmtExp:
+    return StmtExp(_expDecoders[r()](r, strs, idents))
+
+def _decodeAssign(r: Reader, strs: list[str], idents: list[Ident]) -> Assign:
+    return Assign(idents[(b if (b := r()) < 128 else readUint(b, r))], _expDecoders[r()](r, strs, idents))
+
+def _decodeIfStmt(r: Reader, strs: list[str], idents: list[Ident]) -> IfStmt:
+    return IfStmt(_expDecoders[r()](r, strs, idents), [_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))], [_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+def _decodeWhileStmt(r: Reader, strs: list[str], idents: list[Ident]) -> WhileStmt:
+    return WhileStmt(_expDecoders[r()](r, strs, idents), [_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+def _decodeSubscriptAssign(r: Reader, strs: list[str], idents: list[Ident]) -> SubscriptAssign:
+    return SubscriptAssign(_expDecoders[r()](r, strs, idents), _expDecoders[r()](r, strs, idents), _expDecoders[r()](r, strs, idents))
+
+def _decodeReturn(r: Reader, strs: list[str], idents: list[Ident]) -> Return:
+    return Return(_expDecoders[r()](r, strs, idents) if r() else None)
+
+_stmtEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    StmtExp: _encodeStmtExp,
+    Assign: _encodeAssign,
+    IfStmt: _encodeIfStmt,
+    WhileStmt: _encodeWhileStmt,
+    SubscriptAssign: _encodeSubscriptAssign,
+    Return: _encodeReturn,
+}
+
+_stmtDecoders: tuple[Callable[[Reader, list[str], list[Ident]], stmt], ...] = (
+    _decodeStmtExp,
+    _decodeAssign,
+    _decodeIfStmt,
+    _decodeWhileStmt,
+    _decodeSubscriptAssign,
+    _decodeReturn,
+)
+
+def encodeStmtTo(w: Writer, x: stmt):
+    _stmtEncoders[type(x)](w, x)
+
+def decodeStmtFrom(r: Reader, strs: list[str], idents: list[Ident]) -> stmt:
+    return _stmtDecoders[r()](r, strs, idents)
+
+def encodeStmt(x: stmt) -> bytes:
+    return asdlCodec.encode(x, encodeStmtTo)
+
+def decodeStmt(data: bytes) -> stmt:
+    return asdlCodec.decode(data, decodeStmtFrom, Ident)
+
+def encodeStmtList(xs: Sequence[stmt]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeStmtTo)
+
+def decodeStmtList(data: bytes) -> list[stmt]:
+    return asdlCodec.decodeList(data, decodeStmtFrom, Ident)
+
+def _encodeFunDef(w: Writer, x: FunDef):
+    w.buf.append(0)
+    w.str(x.name.name)
+    params = x.params
+    w.uint(len(params))
+    for y in params:
+        encodeFunParamTo(w, y)
+    encodeResultTyTo(w, x.result)
+    body = x.body
+    w.uint(len(body))
+    for y in body:
+        encodeStmtTo(w, y)
+
+def _decodeFunDef(r: Reader, strs: list[str], idents: list[Ident]) -> FunDef:
+    return FunDef(idents[(b if (b := r()) < 128 else readUint(b, r))], [_funParamDecoders[r()](r, strs, idents) for _ in range(uint(r))], _resultTyDecoders[r()](r, strs, idents), [_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+_funEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    FunDef: _encodeFunDef,
+}
+
+_funDecoders: tuple[Callable[[Reader, list[str], list[Ident]], fun], ...] = (
+    _decodeFunDef,
+)
+
+def encodeFunTo(w: Writer, x: fun):
+    _funEncoders[type(x)](w, x)
+
+def decodeFunFrom(r: Reader, strs: list[str], idents: list[Ident]) -> fun:
+    return _funDecoders[r()](r, strs, idents)
+
+def encodeFun(x: fun) -> bytes:
+    return asdlCodec.encode(x, encodeFunTo)
+
+def decodeFun(data: bytes) -> fun:
+    return asdlCodec.decode(data, decodeFunFrom, Ident)
+
+def encodeFunList(xs: Sequence[fun]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeFunTo)
+
+def decodeFunList(data: bytes) -> list[fun]:
+    return asdlCodec.decodeList(data, decodeFunFrom, Ident)
+
+def _encodeFieldDecl(w: Writer, x: FieldDecl):
+    w.buf.append(0)
+    encodeTyTo(w, x.ty)
+    w.str(x.name.name)
+
+def _decodeFieldDecl(r: Reader, strs: list[str], idents: list[Ident]) -> FieldDecl:
+    return FieldDecl(_tyDecoders[r()](r, strs, idents), idents[(b if (b := r()) < 128 else readUint(b, r))])
+
+_fieldDeclEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    FieldDecl: _encodeFieldDecl,
+}
+
+_fieldDeclDecoders: tuple[Callable[[Reader, list[str], list[Ident]], fieldDecl], ...] = (
+    _decodeFieldDecl,
+)
+
+def encodeFieldDeclTo(w: Writer, x: fieldDecl):
+    _fieldDeclEncoders[type(x)](w, x)
+
+def decodeFieldDeclFrom(r: Reader, strs: list[str], idents: list[Ident]) -> fieldDecl:
+    return _fieldDeclDecoders[r()](r, strs, idents)
+
+def encodeFieldDecl(x: fieldDecl) -> bytes:
+    return asdlCodec.encode(x, encodeFieldDeclTo)
+
+def decodeFieldDecl(data: bytes) -> fieldDecl:
+    return asdlCodec.decode(data, decodeFieldDeclFrom, Ident)
+
+def encodeFieldDeclList(xs: Sequence[fieldDecl]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeFieldDeclTo)
+
+def decodeFieldDeclList(data: bytes) -> list[fieldDecl]:
+    return asdlCodec.decodeList(data, decodeFieldDeclFrom, Ident)
+
+def _encodeMethodSig(w: Writer, x: MethodSig):
+    w.buf.append(0)
+    w.str(x.name.name)
+    params = x.params
+    w.uint(len(params))
+    for y in params:
+        encodeFunParamTo(w, y)
+    encodeResultTyTo(w, x.result)
+
+def _decodeMethodSig(r: Reader, strs: list[str], idents: list[Ident]) -> MethodSig:
+    return MethodSig(idents[(b if (b := r()) < 128 else readUint(b, r))], [_funParamDecoders[r()](r, strs, idents) for _ in range(uint(r))], _resultTyDecoders[r()](r, strs, idents))
+
+_methodSigEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    MethodSig: _encodeMethodSig,
+}
+
+_methodSigDecoders: tuple[Callable[[Reader, list[str], list[Ident]], methodSig], ...] = (
+    _decodeMethodSig,
+)
+
+def encodeMethodSigTo(w: Writer, x: methodSig):
+    _methodSigEncoders[type(x)](w, x)
+
+def decodeMethodSigFrom(r: Reader, strs: list[str], idents: list[Ident]) -> methodSig:
+    return _methodSigDecoders[r()](r, strs, idents)
+
+def encodeMethodSig(x: methodSig) -> bytes:
+    return asdlCodec.encode(x, encodeMethodSigTo)
+
+def decodeMethodSig(data: bytes) -> methodSig:
+    return asdlCodec.decode(data, decodeMethodSigFrom, Ident)
+
+def encodeMethodSigList(xs: Sequence[methodSig]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeMethodSigTo)
+
+def decodeMethodSigList(data: bytes) -> list[methodSig]:
+    return asdlCodec.decodeList(data, decodeMethodSigFrom, Ident)
+
+def _encodeMethodDecl(w: Writer, x: MethodDecl):
+    w.buf.append(0)
+    encodeMethodSigTo(w, x.sig)
+    body = x.body
+    w.uint(len(body))
+    for y in body:
+        encodeStmtTo(w, y)
+
+def _decodeMethodDecl(r: Reader, strs: list[str], idents: list[Ident]) -> MethodDecl:
+    return MethodDecl(_methodSigDecoders[r()](r, strs, idents), [_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+_methodDeclEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    MethodDecl: _encodeMethodDecl,
+}
+
+_methodDeclDecoders: tuple[Callable[[Reader, list[str], list[Ident]], methodDecl], ...] = (
+    _decodeMethodDecl,
+)
+
+def encodeMethodDeclTo(w: Writer, x: methodDecl):
+    _methodDeclEncoders[type(x)](w, x)
+
+def decodeMethodDeclFrom(r: Reader, strs: list[str], idents: list[Ident]) -> methodDecl:
+    return _methodDeclDecoders[r()](r, strs, idents)
+
+def encodeMethodDecl(x: methodDecl) -> bytes:
+    return asdlCodec.encode(x, encodeMethodDeclTo)
+
+def decodeMethodDecl(data: bytes) -> methodDecl:
+    return asdlCodec.decode(data, decodeMethodDeclFrom, Ident)
 
-type mod = Module
\ No newline at end of file
+def encodeMethodDeclList(xs: Sequence[methodDecl]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeMethodDeclTo)
+
+def decodeMethodDeclList(data: bytes) -> list[methodDecl]:
+    return asdlCodec.decodeList(data, decodeMethodDeclFrom, Ident)
+
+def _encodeClassDecl(w: Writer, x: ClassDecl):
+    w.buf.append(0)
+    w.str(x.name.name)
+    extends = x.extends
+    if extends is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        w.str(extends.name)
+    implements = x.implements
+    w.uint(len(implements))
+    for y in implements:
+        w.str(y.name)
+    fields = x.fields
+    w.uint(len(fields))
+    for y in fields:
+        encodeFieldDeclTo(w, y)
+    methods = x.methods
+    w.uint(len(methods))
+    for y in methods:
+        encodeMethodDeclTo(w, y)
+
+def _decodeClassDecl(r: Reader, strs: list[str], idents: list[Ident]) -> ClassDecl:
+    return ClassDecl(idents[(b if (b := r()) < 128 else readUint(b, r))], idents[(b if (b := r()) < 128 else readUint(b, r))] if r() else None, [idents[(b if (b := r()) < 128 else readUint(b, r))] for _ in range(uint(r))], [_fieldDeclDecoders[r()](r, strs, idents) for _ in range(uint(r))], [_methodDeclDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+_classDeclEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    ClassDecl: _encodeClassDecl,
+}
+
+_classDeclDecoders: tuple[Callable[[Reader, list[str], list[Ident]], classDecl], ...] = (
+    _decodeClassDecl,
+)
+
+def encodeClassDeclTo(w: Writer, x: classDecl):
+    _classDeclEncoders[type(x)](w, x)
+
+def decodeClassDeclFrom(r: Reader, strs: list[str], idents: list[Ident]) -> classDecl:
+    return _classDeclDecoders[r()](r, strs, idents)
+
+def encodeClassDecl(x: classDecl) -> bytes:
+    return asdlCodec.encode(x, encodeClassDeclTo)
+
+def decodeClassDecl(data: bytes) -> classDecl:
+    return asdlCodec.decode(data, decodeClassDeclFrom, Ident)
+
+def encodeClassDeclList(xs: Sequence[classDecl]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeClassDeclTo)
+
+def decodeClassDeclList(data: bytes) -> list[classDecl]:
+    return asdlCodec.decodeList(data, decodeClassDeclFrom, Ident)
+
+def _encodeInterfaceDecl(w: Writer, x: InterfaceDecl):
+    w.buf.append(0)
+    w.str(x.name.name)
+    methods = x.methods
+    w.uint(len(methods))
+    for y in methods:
+        encodeMethodSigTo(w, y)
+
+def _decodeInterfaceDecl(r: Reader, strs: list[str], idents: list[Ident]) -> InterfaceDecl:
+    return InterfaceDecl(idents[(b if (b := r()) < 128 else readUint(b, r))], [_methodSigDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+_interfaceDeclEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    InterfaceDecl: _encodeInterfaceDecl,
+}
+
+_interfaceDeclDecoders: tuple[Callable[[Reader, list[str], list[Ident]], interfaceDecl], ...] = (
+    _decodeInterfaceDecl,
+)
+
+def encodeInterfaceDeclTo(w: Writer, x: interfaceDecl):
+    _interfaceDeclEncoders[type(x)](w, x)
+
+def decodeInterfaceDeclFrom(r: Reader, strs: list[str], idents: list[Ident]) -> interfaceDecl:
+    return _interfaceDeclDecoders[r()](r, strs, idents)
+
+def encodeInterfaceDecl(x: interfaceDecl) -> bytes:
+    return asdlCodec.encode(x, encodeInterfaceDeclTo)
+
+def decodeInterfaceDecl(data: bytes) -> interfaceDecl:
+    return asdlCodec.decode(data, decodeInterfaceDeclFrom, Ident)
+
+def encodeInterfaceDeclList(xs: Sequence[interfaceDecl]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeInterfaceDeclTo)
+
+def decodeInterfaceDeclList(data: bytes) -> list[interfaceDecl]:
+    return asdlCodec.decodeList(data, decodeInterfaceDeclFrom, Ident)
+
+def _encodeModule(w: Writer, x: Module):
+    w.buf.append(0)
+    interfaces = x.interfaces
+    w.uint(len(interfaces))
+    for y in interfaces:
+        encodeInterfaceDeclTo(w, y)
+    classes = x.classes
+    w.uint(len(classes))
+    for y in classes:
+        encodeClassDeclTo(w, y)
+    funs = x.funs
+    w.uint(len(funs))
+    for y in funs:
+        encodeFunTo(w, y)
+    stmts = x.stmts
+    w.uint(len(stmts))
+    for y in stmts:
+        encodeStmtTo(w, y)
+
+def _decodeModule(r: Reader, strs: list[str], idents: list[Ident]) -> Module:
+    return Module([_interfaceDeclDecoders[r()](r, strs, idents) for _ in range(uint(r))], [_classDeclDecoders[r()](r, strs, idents) for _ in range(uint(r))], [_funDecoders[r()](r, strs, idents) for _ in range(uint(r))], [_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+_modEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Module: _encodeModule,
+}
+
+_modDecoders: tuple[Callable[[Reader, list[str], list[Ident]], mod], ...] = (
+    _decodeModule,
+)
+
+def encodeModTo(w: Writer, x: mod):
+    _modEncoders[type(x)](w, x)
+
+def decodeModFrom(r: Reader, strs: list[str], idents: list[Ident]) -> mod:
+    return _modDecoders[r()](r, strs, idents)
+
+def encodeMod(x: mod) -> bytes:
+    return asdlCodec.encode(x, encodeModTo)
+
+def decodeMod(data: bytes) -> mod:
+    return asdlCodec.decode(data, decodeModFrom, Ident)
+
+def encodeModList(xs: Sequence[mod]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeModTo)
+
+def decodeModList(data: bytes) -> list[mod]:
+    return asdlCodec.decodeList(data, decodeModFrom, Ident)
+
+_tyChildren: tuple[Callable[[Any], Sequence[ty]], ...] = (
+    lambda x: (),
+    lambda x: (),
+    lambda x: (x.elemTy,),
+    lambda x: x.params,
+    lambda x: (),
+    lambda x: (),
+)
+
+_tyRebuild: tuple[Callable[[Any, list[ty]], ty], ...] = (
+    lambda x, cs: x,
+    lambda x, cs: x,
+    lambda x, cs: Array(cs[0]),
+    lambda x, cs: Fun(cs[0:len(x.params)], x.result),
+    lambda x, cs: x,
+    lambda x, cs: x,
+)
+
+def tyChildren(x: ty) -> Sequence[ty]:
+    return _tyChildren[x.tag](x)
+
+def _rebuildTy(x: ty, cs: list[ty]) -> ty:
+    return _tyRebuild[x.tag](x, cs)
+
+def foldTy[R](x: ty, f: Callable[[ty, list[R]], R]) -> R:
+    return traversal.fold(x, tyChildren, f)
+
+def transformTy(x: ty, f: Callable[[ty], ty]) -> ty:
+    return traversal.transform(x, tyChildren, _rebuildTy, f)
+
+_expChildren: tuple[Callable[[Any], Sequence[exp]], ...] = (
+    lambda x: (),
+    lambda x: (),
+    lambda x: (),
+    lambda x: (x.fun, *x.args),
+    lambda x: (x.arg,),
+    lambda x: (x.left, x.right),
+    lambda x: (x.len, x.elemInit),
+    lambda x: x.elemInit,
+    lambda x: (x.array, x.index),
+    lambda x: (x.body,),
+)
+
+_expRebuild: tuple[Callable[[Any, list[exp]], exp], ...] = (
+    lambda x, cs: x,
+    lambda x, cs: x,
+    lambda x, cs: x,
+    lambda x, cs: Call(cs[0], cs[1:1 + len(x.args)], x.ty),
+    lambda x, cs: UnOp(x.op, cs[0], x.ty),
+    lambda x, cs: BinOp(cs[0], x.op, cs[1], x.ty),
+    lambda x, cs: ArrayInitDyn(cs[0], cs[1], x.ty),
+    lambda x, cs: ArrayInitStatic(cs[0:len(x.elemInit)], x.ty),
+    lambda x, cs: Subscript(cs[0], cs[1], x.ty),
+    lambda x, cs: Closure(x.params, cs[0], x.ty),
+)
+
+def expChildren(x: exp) -> Sequence[exp]:
+    return _expChildren[x.tag](x)
+
+def _rebuildExp(x: exp, cs: list[exp]) -> exp:
+    return _expRebuild[x.tag](x, cs)
+
+def foldExp[R](x: exp, f: Callable[[exp, list[R]], R]) -> R:
+    return traversal.fold(x, expChildren, f)
+
+def transformExp(x: exp, f: Callable[[exp], exp]) -> exp:
+    return traversal.transform(x, expChildren, _rebuildExp, f)
+
+_stmtChildren: tuple[Callable[[Any], Sequence[stmt]], ...] = (
+    lambda x: (),
+    lambda x: (),
+    lambda x: (*x.thenBody, *x.elseBody),
+    lambda x: x.body,
+    lambda x: (),
+    lambda x: (),
+)
+
+_stmtRebuild: tuple[Callable[[Any, list[stmt]], stmt], ...] = (
+    lambda x, cs: x,
+    lambda x, cs: x,
+    lambda x, cs: IfStmt(x.cond, cs[0:len(x.thenBody)], cs[len(x.thenBody):len(x.thenBody) + len(x.elseBody)]),
+    lambda x, cs: WhileStmt(x.cond, cs[0:len(x.body)]),
+    lambda x, cs: x,
+    lambda x, cs: x,
+)
+
+def stmtChildren(x: stmt) -> Sequence[stmt]:
+    return _stmtChildren[x.tag](x)
+
+def _rebuildStmt(x: stmt, cs: list[stmt]) -> stmt:
+    return _stmtRebuild[x.tag](x, cs)
+
+def foldStmt[R](x: stmt, f: Callable[[stmt, list[R]], R]) -> R:
+    return traversal.fold(x, stmtChildren, f)
+
+def transformStmt(x: stmt, f: Callable[[stmt], stmt]) -> stmt:
+    return traversal.transform(x, stmtChildren, _rebuildStmt, f)
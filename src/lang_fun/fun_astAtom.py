@@ -1,134 +1,753 @@
-# AUTOMATICALLY GENERATED (2024-02-28 14:03:04)
+# AUTOMATICALLY GENERATED (2026-10-17 09:05:19)
 from __future__ import annotations
 from dataclasses import dataclass
+from abc import ABC, abstractmethod
+from typing import Any, Callable, ClassVar, Sequence
+from common.asdlCodec import Reader, Writer, readUint, uint
+import common.asdlCodec as asdlCodec
+import common.traversal as traversal
 
 from lang_fun.fun_astCommon import *
 
-@dataclass
+@dataclass(slots=True)
 class IntConst:
+    tag: ClassVar[int] = 0
     value: int
     ty: ty
 
-@dataclass
+@dataclass(slots=True)
 class BoolConst:
+    tag: ClassVar[int] = 1
     value: bool
     ty: ty
 
-@dataclass
+@dataclass(slots=True)
 class VarName:
+    tag: ClassVar[int] = 2
     var: ident
     ty: ty
 
-@dataclass
+@dataclass(slots=True)
 class FunName:
+    tag: ClassVar[int] = 3
     fun: ident
     ty: ty
 
 type atomExp = IntConst | BoolConst | VarName | FunName
 
-@dataclass
+class AtomExpVisitor[R, C](ABC):
+    _atomExpTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._atomExpTable = (cls.visitIntConst, cls.visitBoolConst, cls.visitVarName, cls.visitFunName)
+
+    def visitAtomExp(self, x: atomExp, ctx: C) -> R:
+        return self._atomExpTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitIntConst(self, x: IntConst, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitBoolConst(self, x: BoolConst, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitVarName(self, x: VarName, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitFunName(self, x: FunName, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class CallTargetBuiltin:
+    tag: ClassVar[int] = 0
     var: ident
 
-@dataclass
+@dataclass(slots=True)
 class CallTargetDirect:
+    tag: ClassVar[int] = 1
     var: ident
 
-@dataclass
+@dataclass(slots=True)
 class CallTargetIndirect:
+    tag: ClassVar[int] = 2
     var: ident
-    params: list[ty]
+    params: Sequence[ty]
     result: resultTy
 
+    def __post_init__(self):
+        self.params = tuple(self.params)
+
 type callTarget = CallTargetBuiltin | CallTargetDirect | CallTargetIndirect
 
-@dataclass
+class CallTargetVisitor[R, C](ABC):
+    _callTargetTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._callTargetTable = (cls.visitCallTargetBuiltin, cls.visitCallTargetDirect, cls.visitCallTargetIndirect)
+
+    def visitCallTarget(self, x: callTarget, ctx: C) -> R:
+        return self._callTargetTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitCallTargetBuiltin(self, x: CallTargetBuiltin, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitCallTargetDirect(self, x: CallTargetDirect, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitCallTargetIndirect(self, x: CallTargetIndirect, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class AtomExp:
+    tag: ClassVar[int] = 0
     e: atomExp
     ty: resultTy
 
-@dataclass
+@dataclass(slots=True)
 class Call:
+    tag: ClassVar[int] = 1
     fun: callTarget
-    args: list[exp]
+    args: Sequence[exp]
     ty: resultTy
 
-@dataclass
+    def __post_init__(self):
+        self.args = tuple(self.args)
+
+@dataclass(slots=True)
 class UnOp:
+    tag: ClassVar[int] = 2
     op: unaryop
     arg: exp
     ty: resultTy
 
-@dataclass
+@dataclass(slots=True)
 class BinOp:
+    tag: ClassVar[int] = 3
     left: exp
     op: binaryop
     right: exp
     ty: resultTy
 
-@dataclass
+@dataclass(slots=True)
 class ArrayInitDyn:
+    tag: ClassVar[int] = 4
     len: atomExp
     elemInit: atomExp
     ty: resultTy
 
-@dataclass
+@dataclass(slots=True)
 class ArrayInitStatic:
-    elemInit: list[atomExp]
+    tag: ClassVar[int] = 5
+    elemInit: Sequence[atomExp]
     ty: resultTy
 
-@dataclass
+    def __post_init__(self):
+        self.elemInit = tuple(self.elemInit)
+
+@dataclass(slots=True)
 class Subscript:
+    tag: ClassVar[int] = 6
     array: atomExp
     index: atomExp
     ty: resultTy
 
 type exp = AtomExp | Call | UnOp | BinOp | ArrayInitDyn | ArrayInitStatic | Subscript
 
-@dataclass
+class ExpVisitor[R, C](ABC):
+    _expTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._expTable = (cls.visitAtomExp, cls.visitCall, cls.visitUnOp, cls.visitBinOp, cls.visitArrayInitDyn, cls.visitArrayInitStatic, cls.visitSubscript)
+
+    def visitExp(self, x: exp, ctx: C) -> R:
+        return self._expTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitAtomExp(self, x: AtomExp, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitCall(self, x: Call, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitUnOp(self, x: UnOp, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitBinOp(self, x: BinOp, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitArrayInitDyn(self, x: ArrayInitDyn, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitArrayInitStatic(self, x: ArrayInitStatic, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitSubscript(self, x: Subscript, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class StmtExp:
+    tag: ClassVar[int] = 0
     exp: exp
 
-@dataclass
+@dataclass(slots=True)
 class Assign:
+    tag: ClassVar[int] = 1
     var: ident
     right: exp
 
-@dataclass
+@dataclass(slots=True)
 class IfStmt:
+    tag: ClassVar[int] = 2
     cond: exp
-    thenBody: list[stmt]
-    elseBody: list[stmt]
+    thenBody: Sequence[stmt]
+    elseBody: Sequence[stmt]
+
+    def __post_init__(self):
+        self.thenBody = tuple(self.thenBody)
+        self.elseBody = tuple(self.elseBody)
 
-@dataclass
+@dataclass(slots=True)
 class WhileStmt:
+    tag: ClassVar[int] = 3
     cond: exp
-    body: list[stmt]
+    body: Sequence[stmt]
 
-@dataclass
+    def __post_init__(self):
+        self.body = tuple(self.body)
+
+@dataclass(slots=True)
 class SubscriptAssign:
+    tag: ClassVar[int] = 4
     left: atomExp
     index: atomExp
     right: exp
 
-@dataclass
+@dataclass(slots=True)
 class Return:
+    tag: ClassVar[int] = 5
     result: optional[exp] = None
 
 type stmt = StmtExp | Assign | IfStmt | WhileStmt | SubscriptAssign | Return
 
-@dataclass
+class StmtVisitor[R, C](ABC):
+    _stmtTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._stmtTable = (cls.visitStmtExp, cls.visitAssign, cls.visitIfStmt, cls.visitWhileStmt, cls.visitSubscriptAssign, cls.visitReturn)
+
+    def visitStmt(self, x: stmt, ctx: C) -> R:
+        return self._stmtTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitStmtExp(self, x: StmtExp, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitAssign(self, x: Assign, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitIfStmt(self, x: IfStmt, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitWhileStmt(self, x: WhileStmt, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitSubscriptAssign(self, x: SubscriptAssign, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitReturn(self, x: Return, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class FunDef:
+    tag: ClassVar[int] = 0
     name: ident
-    params: list[funParam]
+    params: Sequence[funParam]
     result: resultTy
-    body: list[stmt]
+    body: Sequence[stmt]
+
+    def __post_init__(self):
+        self.params = tuple(self.params)
+        self.body = tuple(self.body)
 
 type fun = FunDef
 
-@dataclass
+@dataclass(slots=True)
 class Module:
-    funs: list[fun]
-    stmts: list[stmt]
+    tag: ClassVar[int] = 0
+    funs: Sequence[fun]
+    stmts: Sequence[stmt]
+
+    def __post_init__(self):
+        self.funs = tuple(self.funs)
+        self.stmts = tuple(self.stmts)
+
+type mod = Module
+
+def _encodeIntConst(w: Writer, x: IntConst):
+    w.buf.append(0)
+    w.int(x.value)
+    encodeTyTo(w, x.ty)
+
+def _encodeBoolConst(w: Writer, x: BoolConst):
+    w.buf.append(1)
+    w.buf.append(1 if x.value else 0)
+    encodeTyTo(w, x.ty)
+
+def _encodeVarName(w: Writer, x: VarName):
+    w.buf.append(2)
+    w.str(x.var.name)
+    encodeTyTo(w, x.ty)
+
+def _encodeFunName(w: Writer, x: FunName):
+    w.buf.append(3)
+    w.str(x.fun.name)
+    encodeTyTo(w, x.ty)
+
+def _decodeIntConst(r: Reader, strs: list[str], idents: list[Ident]) -> IntConst:
+    return IntConst(((n := (b if (b := r()) < 128 else readUint(b, r))) >> 1) ^ -(n & 1), decodeTyFrom(r, strs, idents))
+
+def _decodeBoolConst(r: Reader, strs: list[str], idents: list[Ident]) -> BoolConst:
+    return BoolConst(r() == 1, decodeTyFrom(r, strs, idents))
+
+def _decodeVarName(r: Reader, strs: list[str], idents: list[Ident]) -> VarName:
+    return VarName(idents[(b if (b := r()) < 128 else readUint(b, r))], decodeTyFrom(r, strs, idents))
+
+def _decodeFunName(r: Reader, strs: list[str], idents: list[Ident]) -> FunName:
+    return FunName(idents[(b if (b := r()) < 128 else readUint(b, r))], decodeTyFrom(r, strs, idents))
+
+_atomExpEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    IntConst: _encodeIntConst,
+    BoolConst: _encodeBoolConst,
+    VarName: _encodeVarName,
+    FunName: _encodeFunName,
+}
+
+_atomExpDecoders: tuple[Callable[[Reader, list[str], list[Ident]], atomExp], ...] = (
+    _decodeIntConst,
+    _decodeBoolConst,
+    _decodeVarName,
+    _decodeFunName,
+)
+
+def encodeAtomExpTo(w: Writer, x: atomExp):
+    _atomExpEncoders[type(x)](w, x)
+
+def decodeAtomExpFrom(r: Reader, strs: list[str], idents: list[Ident]) -> atomExp:
+    return _atomExpDecoders[r()](r, strs, idents)
+
+def encodeAtomExp(x: atomExp) -> bytes:
+    return asdlCodec.encode(x, encodeAtomExpTo)
+
+def decodeAtomExp(data: bytes) -> atomExp:
+    return asdlCodec.decode(data, decodeAtomExpFrom, Ident)
+
+def encodeAtomExpList(xs: Sequence[atomExp]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeAtomExpTo)
+
+def decodeAtomExpList(data: bytes) -> list[atomExp]:
+    return asdlCodec.decodeList(data, decodeAtomExpFrom, Ident)
+
+def _encodeCallTargetBuiltin(w: Writer, x: CallTargetBuiltin):
+    w.buf.append(0)
+    w.str(x.var.name)
+
+def _encodeCallTargetDirect(w: Writer, x: CallTargetDirect):
+    w.buf.append(1)
+    w.str(x.var.name)
+
+def _encodeCallTargetIndirect(w: Writer, x: CallTargetIndirect):
+    w.buf.append(2)
+    w.str(x.var.name)
+    params = x.params
+    w.uint(len(params))
+    for y in params:
+        encodeTyTo(w, y)
+    encodeResultTyTo(w, x.result)
+
+def _decodeCallTargetBuiltin(r: Reader, strs: list[str], idents: list[Ident]) -> CallTargetBuiltin:
+    return CallTargetBuiltin(idents[(b if (b := r()) < 128 else readUint(b, r))])
+
+def _decodeCallTargetDirect(r: Reader, strs: list[str], idents: list[Ident]) -> CallTargetDirect:
+    return CallTargetDirect(idents[(b if (b := r()) < 128 else readUint(b, r))])
+
+def _decodeCallTargetIndirect(r: Reader, strs: list[str], idents: list[Ident]) -> CallTargetIndirect:
+    return CallTargetIndirect(idents[(b if (b := r()) < 128 else readUint(b, r))], [decodeTyFrom(r, strs, idents) for _ in range(uint(r))], decodeResultTyFrom(r, strs, idents))
+
+_callTargetEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    CallTargetBuiltin: _encodeCallTargetBuiltin,
+    CallTargetDirect: _encodeCallTargetDirect,
+    CallTargetIndirect: _encodeCallTargetIndirect,
+}
+
+_callTargetDecoders: tuple[Callable[[Reader, list[str], list[Ident]], callTarget], ...] = (
+    _decodeCallTargetBuiltin,
+    _decodeCallTargetDirect,
+    _decodeCallTargetIndirect,
+)
+
+def encodeCallTargetTo(w: Writer, x: callTarget):
+    _callTargetEncoders[type(x)](w, x)
+
+def decodeCallTargetFrom(r: Reader, strs: list[str], idents: list[Ident]) -> callTarget:
+    return _callTargetDecoders[r()](r, strs, idents)
+
+def encodeCallTarget(x: callTarget) -> bytes:
+    return asdlCodec.encode(x, encodeCallTargetTo)
+
+def decodeCallTarget(data: bytes) -> callTarget:
+    return asdlCodec.decode(data, decodeCallTargetFrom, Ident)
+
+def encodeCallTargetList(xs: Sequence[callTarget]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeCallTargetTo)
+
+def decodeCallTargetList(data: bytes) -> list[callTarget]:
+    return asdlCodec.decodeList(data, decodeCallTargetFrom, Ident)
+
+def _encodeAtomExp(w: Writer, x: AtomExp):
+    w.buf.append(0)
+    encodeAtomExpTo(w, x.e)
+    encodeResultTyTo(w, x.ty)
+
+def _encodeCall(w: Writer, x: Call):
+    w.buf.append(1)
+    encodeCallTargetTo(w, x.fun)
+    args = x.args
+    w.uint(len(args))
+    for y in args:
+        encodeExpTo(w, y)
+    encodeResultTyTo(w, x.ty)
+
+def _encodeUnOp(w: Writer, x: UnOp):
+    w.buf.append(2)
+    encodeUnaryopTo(w, x.op)
+    encodeExpTo(w, x.arg)
+    encodeResultTyTo(w, x.ty)
+
+def _encodeBinOp(w: Writer, x: BinOp):
+    w.buf.append(3)
+    encodeExpTo(w, x.left)
+    encodeBinaryopTo(w, x.op)
+    encodeExpTo(w, x.right)
+    encodeResultTyTo(w, x.ty)
+
+def _encodeArrayInitDyn(w: Writer, x: ArrayInitDyn):
+    w.buf.append(4)
+    encodeAtomExpTo(w, x.len)
+    encodeAtomExpTo(w, x.elemInit)
+    encodeResultTyTo(w, x.ty)
+
+def _encodeArrayInitStatic(w: Writer, x: ArrayInitStatic):
+    w.buf.append(5)
+    elemInit = x.elemInit
+    w.uint(len(elemInit))
+    for y in elemInit:
+        encodeAtomExpTo(w, y)
+    encodeResultTyTo(w, x.ty)
+
+def _encodeSubscript(w: Writer, x: Subscript):
+    w.buf.append(6)
+    encodeAtomExpTo(w, x.array)
+    encodeAtomExpTo(w, x.index)
+    encodeResultTyTo(w, x.ty)
+
+def _decodeAtomExp(r: Reader, strs: list[str], idents: list[Ident]) -> AtomExp:
+    return AtomExp(_atomExpDecoders[r()](r, strs, idents), decodeResultTyFrom(r, strs, idents))
+
+def _decodeCall(r: Reader, strs: list[str], idents: list[Ident]) -> Call:
+    return Call(_callTargetDecoders[r()](r, strs, idents), [_expDecoders[r()](r, strs, idents) for _ in range(uint(r))], decodeResultTyFrom(r, strs, idents))
+
+def _decodeUnOp(r: Reader, strs: list[str], idents: list[Ident]) -> UnOp:
+    return UnOp(decodeUnaryopFrom(r, strs, idents), _expDecoders[r()](r, strs, idents), decodeResultTyFrom(r, strs, idents))
+
+def _decodeBinOp(r: Reader, strs: list[str], idents: list[Ident]) -> BinOp:
+    return BinOp(_expDecoders[r()](r, strs, idents), decodeBinaryopFrom(r, strs, idents), _expDecoders[r()](r, strs, idents), decodeResultTyFrom(r, strs, idents))
+
+def _decodeArrayInitDyn(r: Reader, strs: list[str], idents: list[Ident]) -> ArrayInitDyn:
+    return ArrayInitDyn(_atomExpDecoders[r()](r, strs, idents), _atomExpDecoders[r()](r, strs, idents), decodeResultTyFrom(r, strs, idents))
+
+def _decodeArrayInitStatic(r: Reader, strs: list[str], idents: list[Ident]) -> ArrayInitStatic:
+    return ArrayInitStatic([_atomExpDecoders[r()](r, strs, idents) for _ in range(uint(r))], decodeResultTyFrom(r, strs, idents))
+
+def _decodeSubscript(r: Reader, strs: list[str], idents: list[Ident]) -> Subscript:
+    return Subscript(_atomExpDecoders[r()](r, strs, idents), _atomExpDecoders[r()](r, strs, idents), decodeResultTyFrom(r, strs, idents))
+
+_expEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    AtomExp: _encodeAtomExp,
+    Call: _encodeCall,
+    UnOp: _encodeUnOp,
+    BinOp: _encodeBinOp,
+    ArrayInitDyn: _encodeArrayInitDyn,
+    ArrayInitStatic: _encodeArrayInitStatic,
+    Subscript: _encodeSubscript,
+}
+
+_expDecoders: tuple[Callable[[Reader, list[str], list[Ident]], exp], ...] = (
+    _decodeAtomExp,
+    _decodeCall,
+    _decodeUnOp,
+    _decodeBinOp,
+    _decodeArrayInitDyn,
+    _decodeArrayInitStatic,
+    _decodeSubscript,
+)
+
+def encodeExpTo(w: Writer, x: exp):
+    _expEncoders[type(x)](w, x)
+
+def decodeExpFrom(r: Reader, strs: list[str], idents: list[Ident]) -> exp:
+    return _expDecoders[r()](r, strs, idents)
+
+def encodeExp(x: exp) -> bytes:
+    return asdlCodec.encode(x, encodeExpTo)
+
+def decodeExp(data: bytes) -> exp:
+    return asdlCodec.decode(data, decodeExpFrom, Ident)
+
+def encodeExpList(xs: Sequence[exp]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeExpTo)
+
+def decodeExpList(data: bytes) -> list[exp]:
+    return asdlCodec.decodeList(data, decodeExpFrom, Ident)
+
+def _encodeStmtExp(w: Writer, x: StmtExp):
+    w.buf.append(0)
+    encodeExpTo(w, x.exp)
+
+def _encodeAssign(w: Writer, x: Assign):
+    w.buf.append(1)
+    w.str(x.var.name)
+    encodeExpTo(w, x.right)
+
+def _encodeIfStmt(w: Writer, x: IfStmt):
+    w.buf.append(2)
+    encodeExpTo(w, x.cond)
+    thenBody = x.thenBody
+    w.uint(len(thenBody))
+    for y in thenBody:
+        encodeStmtTo(w, y)
+    elseBody = x.elseBody
+    w.uint(len(elseBody))
+    for y in elseBody:
+        encodeStmtTo(w, y)
+
+def _encodeWhileStmt(w: Writer, x: WhileStmt):
+    w.buf.append(3)
+    encodeExpTo(w, x.cond)
+    body = x.body
+    w.uint(len(body))
+    for y in body:
+        encodeStmtTo(w, y)
+
+def _encodeSubscriptAssign(w: Writer, x: SubscriptAssign):
+    w.buf.append(4)
+    encodeAtomExpTo(w, x.left)
+    encodeAtomExpTo(w, x.index)
+    encodeExpTo(w, x.right)
+
+def _encodeReturn(w: Writer, x: Return):
+    w.buf.append(5)
+    result = x.result
+    if result is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeExpTo(w, result)
+
+def _decodeStmtExp(r: Reader, strs: list[str], idents: list[Ident]) -> StmtExp:
+    return StmtExp(_expDecoders[r()](r, strs, idents))
+
+def _decodeAssign(r: Reader, strs: list[str], idents: list[Ident]) -> Assign:
+    return Assign(idents[(b if (b := r()) < 128 else readUint(b, r))], _expDecoders[r()](r, strs, idents))
+
+def _decodeIfStmt(r: Reader, strs: list[str], idents: list[Ident]) -> IfStmt:
+    return IfStmt(_expDecoders[r()](r, strs, idents), [_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))], [_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+def _decodeWhileStmt(r: Reader, strs: list[str], idents: list[Ident]) -> WhileStmt:
+    return WhileStmt(_expDecoders[r()](r, strs, idents), [_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+def _decodeSubscriptAssign(r: Reader, strs: list[str], idents: list[Ident]) -> SubscriptAssign:
+    return SubscriptAssign(_atomExpDecoders[r()](r, strs, idents), _atomExpDecoders[r()](r, strs, idents), _expDecoders[r()](r, strs, idents))
+
+def _decodeReturn(r: Reader, strs: list[str], idents: list[Ident]) -> Return:
+    return Return(_expDecoders[r()](r, strs, idents) if r() else None)
+
+_stmtEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    StmtExp: _encodeStmtExp,
+    Assign: _encodeAssign,
+    IfStmt: _encodeIfStmt,
+    WhileStmt: _encodeWhileStmt,
+    SubscriptAssign: _encodeSubscriptAssign,
+    Return: _encodeReturn,
+}
+
+_stmtDecoders: tuple[Callable[[Reader, list[str], list[Ident]], stmt], ...] = (
+    _decodeStmtExp,
+    _decodeAssign,
+    _decodeIfStmt,
+    _decodeWhileStmt,
+    _decodeSubscriptAssign,
+    _decodeReturn,
+)
+
+def encodeStmtTo(w: Writer, x: stmt):
+    _stmtEncoders[type(x)](w, x)
+
+def decodeStmtFrom(r: Reader, strs: list[str], idents: list[Ident]) -> stmt:
+    return _stmtDecoders[r()](r, strs, idents)
+
+def encodeStmt(x: stmt) -> bytes:
+    return asdlCodec.encode(x, encodeStmtTo)
+
+def decodeStmt(data: bytes) -> stmt:
+    return asdlCodec.decode(data, decodeStmtFrom, Ident)
+
+def encodeStmtList(xs: Sequence[stmt]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeStmtTo)
+
+def decodeStmtList(data: bytes) -> list[stmt]:
+    return asdlCodec.decodeList(data, decodeStmtFrom, Ident)
+
+def _encodeFunDef(w: Writer, x: FunDef):
+    w.buf.append(0)
+    w.str(x.name.name)
+    params = x.params
+    w.uint(len(params))
+    for y in params:
+        encodeFunParamTo(w, y)
+    encodeResultTyTo(w, x.result)
+    body = x.body
+    w.uint(len(body))
+    for y in body:
+        encodeStmtTo(w, y)
+
+def _decodeFunDef(r: Reader, strs: list[str], idents: list[Ident]) -> FunDef:
+    return FunDef(idents[(b if (b := r()) < 128 else readUint(b, r))], [decodeFunParamFrom(r, strs, idents) for _ in range(uint(r))], decodeResultTyFrom(r, strs, idents), [_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+_funEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    FunDef: _encodeFunDef,
+}
+
+_funDecoders: tuple[Callable[[Reader, list[str], list[Ident]], fun], ...] = (
+    _decodeFunDef,
+)
+
+def encodeFunTo(w: Writer, x: fun):
+    _funEncoders[type(x)](w, x)
+
+def decodeFunFrom(r: Reader, strs: list[str], idents: list[Ident]) -> fun:
+    return _funDecoders[r()](r, strs, idents)
+
+def encodeFun(x: fun) -> bytes:
+    return asdlCodec.encode(x, encodeFunTo)
+
+def decodeFun(data: bytes) -> fun:
+    return asdlCodec.decode(data, decodeFunFrom, Ident)
+
+def encodeFunList(xs: Sequence[fun]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeFunTo)
+
+def decodeFunList(data: bytes) -> list[fun]:
+    return asdlCodec.decodeList(data, decodeFunFrom, Ident)
+
+def _encodeModule(w: Writer, x: Module):
+    w.buf.append(0)
+    funs = x.funs
+    w.uint(len(funs))
+    for y in funs:
+        encodeFunTo(w, y)
+    stmts = x.stmts
+    w.uint(len(stmts))
+    for y in stmts:
+        encodeStmtTo(w, y)
+
+def _decodeModule(r: Reader, strs: list[str], idents: list[Ident]) -> Module:
+    return Module([_funDecoders[r()](r, strs, idents) for _ in range(uint(r))], [_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+_modEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Module: _encodeModule,
+}
+
+_modDecoders: tuple[Callable[[Reader, list[str], list[Ident]], mod], ...] = (
+    _decodeModule,
+)
+
+def encodeModTo(w: Writer, x: mod):
+    _modEncoders[type(x)](w, x)
+
+def decodeModFrom(r: Reader, strs: list[str], idents: list[Ident]) -> mod:
+    return _modDecoders[r()](r, strs, idents)
+
+def encodeMod(x: mod) -> bytes:
+    return asdlCodec.encode(x, encodeModTo)
+
+def decodeMod(data: bytes) -> mod:
+    return asdlCodec.decode(data, decodeModFrom, Ident)
+
+def encodeModList(xs: Sequence[mod]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeModTo)
+
+def decodeModList(data: bytes) -> list[mod]:
+    return asdlCodec.decodeList(data, decodeModFrom, Ident)
+
+_expChildren: tuple[Callable[[Any], Sequence[exp]], ...] = (
+    lambda x: (),
+    lambda x: x.args,
+    lambda x: (x.arg,),
+    lambda x: (x.left, x.right),
+    lambda x: (),
+    lambda x: (),
+    lambda x: (),
+)
+
+_expRebuild: tuple[Callable[[Any, list[exp]], exp], ...] = (
+    lambda x, cs: x,
+    lambda x, cs: Call(x.fun, cs[0:len(x.args)], x.ty),
+    lambda x, cs: UnOp(x.op, cs[0], x.ty),
+    lambda x, cs: BinOp(cs[0], x.op, cs[1], x.ty),
+    lambda x, cs: x,
+    lambda x, cs: x,
+    lambda x, cs: x,
+)
+
+def expChildren(x: exp) -> Sequence[exp]:
+    return _expChildren[x.tag](x)
+
+def _rebuildExp(x: exp, cs: list[exp]) -> exp:
+    return _expRebuild[x.tag](x, cs)
+
+def foldExp[R](x: exp, f: Callable[[exp, list[R]], R]) -> R:
+    return traversal.fold(x, expChildren, f)
+
+def transformExp(x: exp, f: Callable[[exp], exp]) -> exp:
+    return traversal.transform(x, expChildren, _rebuildExp, f)
+
+_stmtChildren: tuple[Callable[[Any], Sequence[stmt]], ...] = (
+    lambda x: (),
+    lambda x: (),
+    lambda x: (*x.thenBody, *x.elseBody),
+    lambda x: x.body,
+    lambda x: (),
+    lambda x: (),
+)
+
+_stmtRebuild: tuple[Callable[[Any, list[stmt]], stmt], ...] = (
+    lambda x, cs: x,
+    lambda x, cs: x,
+    lambda x, cs: IfStmt(x.cond, cs[0:len(x.thenBody)], cs[len(x.thenBody):len(x.thenBody) + len(x.elseBody)]),
+    lambda x, cs: WhileStmt(x.cond, cs[0:len(x.body)]),
+    lambda x, cs: x,
+    lambda x, cs: x,
+)
+
+def stmtChildren(x: stmt) -> Sequence[stmt]:
+    return _stmtChildren[x.tag](x)
+
+def _rebuildStmt(x: stmt, cs: list[stmt]) -> stmt:
+    return _stmtRebuild[x.tag](x, cs)
+
+def foldStmt[R](x: stmt, f: Callable[[stmt, list[R]], R]) -> R:
+    return traversal.fold(x, stmtChildren, f)
 
-type mod = Module
\ No newline at end of file
+def transformStmt(x: stmt, f: Callable[[stmt], stmt]) -> stmt:
+    return traversal.transform(x, stmtChildren, _rebuildStmt, f)
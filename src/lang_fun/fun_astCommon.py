@@ -1,122 +1,712 @@
-# AUTOMATICALLY GENERATED (2024-03-13 15:00:05)
+# AUTOMATICALLY GENERATED (2026-10-17 09:05:19)
 from __future__ import annotations
 from dataclasses import dataclass
+from abc import ABC, abstractmethod
+from typing import Any, Callable, ClassVar, Sequence
+from weakref import WeakValueDictionary
+from common.asdlCodec import Reader, Writer, readUint, uint
+import common.asdlCodec as asdlCodec
+import common.traversal as traversal
 
 type optional[T] = T | None
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Ident:
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Ident]] = WeakValueDictionary()
     name: str
 
+    def __new__(cls, name: str) -> Ident:
+        key = (name,)
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            object.__setattr__(x, 'name', name)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), (self.name,))
+
 type ident = Ident
 type string = str
 
-@dataclass
+@dataclass(slots=True)
 class USub:
-    pass
+    tag: ClassVar[int] = 0
 
-@dataclass
+@dataclass(slots=True)
 class Not:
-    pass
+    tag: ClassVar[int] = 1
 
 type unaryop = USub | Not
 
-@dataclass
+class UnaryopVisitor[R, C](ABC):
+    _unaryopTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._unaryopTable = (cls.visitUSub, cls.visitNot)
+
+    def visitUnaryop(self, x: unaryop, ctx: C) -> R:
+        return self._unaryopTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitUSub(self, x: USub, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitNot(self, x: Not, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class Add:
-    pass
+    tag: ClassVar[int] = 0
 
-@dataclass
+@dataclass(slots=True)
 class Sub:
-    pass
+    tag: ClassVar[int] = 1
 
-@dataclass
+@dataclass(slots=True)
 class Mul:
-    pass
+    tag: ClassVar[int] = 2
 
-@dataclass
+@dataclass(slots=True)
 class Less:
-    pass
+    tag: ClassVar[int] = 3
 
-@dataclass
+@dataclass(slots=True)
 class LessEq:
-    pass
+    tag: ClassVar[int] = 4
 
-@dataclass
+@dataclass(slots=True)
 class Greater:
-    pass
+    tag: ClassVar[int] = 5
 
-@dataclass
+@dataclass(slots=True)
 class GreaterEq:
-    pass
+    tag: ClassVar[int] = 6
 
-@dataclass
+@dataclass(slots=True)
 class Eq:
-    pass
+    tag: ClassVar[int] = 7
 
-@dataclass
+@dataclass(slots=True)
 class NotEq:
-    pass
+    tag: ClassVar[int] = 8
 
-@dataclass
+@dataclass(slots=True)
 class Is:
-    pass
+    tag: ClassVar[int] = 9
 
-@dataclass
+@dataclass(slots=True)
 class And:
-    pass
+    tag: ClassVar[int] = 10
 
-@dataclass
+@dataclass(slots=True)
 class Or:
-    pass
+    tag: ClassVar[int] = 11
 
 type binaryop = Add | Sub | Mul | Less | LessEq | Greater | GreaterEq | Eq | NotEq | Is | And | Or
 
-@dataclass
+class BinaryopVisitor[R, C](ABC):
+    _binaryopTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._binaryopTable = (cls.visitAdd, cls.visitSub, cls.visitMul, cls.visitLess, cls.visitLessEq, cls.visitGreater, cls.visitGreaterEq, cls.visitEq, cls.visitNotEq, cls.visitIs, cls.visitAnd, cls.visitOr)
+
+    def visitBinaryop(self, x: binaryop, ctx: C) -> R:
+        return self._binaryopTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitAdd(self, x: Add, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitSub(self, x: Sub, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitMul(self, x: Mul, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitLess(self, x: Less, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitLessEq(self, x: LessEq, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitGreater(self, x: Greater, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitGreaterEq(self, x: GreaterEq, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitEq(self, x: Eq, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitNotEq(self, x: NotEq, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitIs(self, x: Is, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitAnd(self, x: And, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitOr(self, x: Or, ctx: C) -> R: ...
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Int:
-    pass
+    tag: ClassVar[int] = 0
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Int]] = WeakValueDictionary()
+
+    def __new__(cls) -> Int:
+        key = ()
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            cls._instances[key] = x
+        return x
 
-@dataclass
+    def __reduce__(self):
+        return (type(self), ())
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Bool:
-    pass
+    tag: ClassVar[int] = 1
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Bool]] = WeakValueDictionary()
+
+    def __new__(cls) -> Bool:
+        key = ()
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            cls._instances[key] = x
+        return x
 
-@dataclass
+    def __reduce__(self):
+        return (type(self), ())
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Array:
+    tag: ClassVar[int] = 2
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Array]] = WeakValueDictionary()
     elemTy: ty
 
-@dataclass
+    def __new__(cls, elemTy: ty) -> Array:
+        key = (elemTy,)
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            object.__setattr__(x, 'elemTy', elemTy)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), (self.elemTy,))
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Fun:
-    params: list[ty]
+    tag: ClassVar[int] = 3
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Fun]] = WeakValueDictionary()
+    params: Sequence[ty]
     result: resultTy
 
+    def __new__(cls, params: Sequence[ty], result: resultTy) -> Fun:
+        params = tuple(params)
+        key = (params, result)
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            object.__setattr__(x, 'params', params)
+            object.__setattr__(x, 'result', result)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), (self.params, self.result))
+
 type ty = Int | Bool | Array | Fun
 
-@dataclass
+class TyVisitor[R, C](ABC):
+    _tyTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._tyTable = (cls.visitInt, cls.visitBool, cls.visitArray, cls.visitFun)
+
+    def visitTy(self, x: ty, ctx: C) -> R:
+        return self._tyTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitInt(self, x: Int, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitBool(self, x: Bool, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitArray(self, x: Array, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitFun(self, x: Fun, ctx: C) -> R: ...
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class NotVoid:
+    tag: ClassVar[int] = 0
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], NotVoid]] = WeakValueDictionary()
     ty: ty
 
-@dataclass
+    def __new__(cls, ty: ty) -> NotVoid:
+        key = (ty,)
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            object.__setattr__(x, 'ty', ty)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), (self.ty,))
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Void:
-    pass
+    tag: ClassVar[int] = 1
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Void]] = WeakValueDictionary()
+
+    def __new__(cls) -> Void:
+        key = ()
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), ())
 
 type resultTy = NotVoid | Void
 
-@dataclass
+class ResultTyVisitor[R, C](ABC):
+    _resultTyTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._resultTyTable = (cls.visitNotVoid, cls.visitVoid)
+
+    def visitResultTy(self, x: resultTy, ctx: C) -> R:
+        return self._resultTyTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitNotVoid(self, x: NotVoid, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitVoid(self, x: Void, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class Var:
-    pass
+    tag: ClassVar[int] = 0
 
-@dataclass
+@dataclass(slots=True)
 class UserFun:
-    pass
+    tag: ClassVar[int] = 1
 
-@dataclass
+@dataclass(slots=True)
 class BuiltinFun:
-    pass
+    tag: ClassVar[int] = 2
 
 type scope = Var | UserFun | BuiltinFun
 
-@dataclass
+class ScopeVisitor[R, C](ABC):
+    _scopeTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._scopeTable = (cls.visitVar, cls.visitUserFun, cls.visitBuiltinFun)
+
+    def visitScope(self, x: scope, ctx: C) -> R:
+        return self._scopeTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitVar(self, x: Var, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitUserFun(self, x: UserFun, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitBuiltinFun(self, x: BuiltinFun, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class FunParam:
+    tag: ClassVar[int] = 0
     var: ident
     ty: ty
 
-type funParam = FunParam
\ No newline at end of file
+type funParam = FunParam
+
+def _encodeUSub(w: Writer, x: USub):
+    w.buf.append(0)
+
+def _encodeNot(w: Writer, x: Not):
+    w.buf.append(1)
+
+def _decodeUSub(r: Reader, strs: list[str], idents: list[Ident]) -> USub:
+    return USub()
+
+def _decodeNot(r: Reader, strs: list[str], idents: list[Ident]) -> Not:
+    return Not()
+
+_unaryopEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    USub: _encodeUSub,
+    Not: _encodeNot,
+}
+
+_unaryopDecoders: tuple[Callable[[Reader, list[str], list[Ident]], unaryop], ...] = (
+    _decodeUSub,
+    _decodeNot,
+)
+
+def encodeUnaryopTo(w: Writer, x: unaryop):
+    _unaryopEncoders[type(x)](w, x)
+
+def decodeUnaryopFrom(r: Reader, strs: list[str], idents: list[Ident]) -> unaryop:
+    return _unaryopDecoders[r()](r, strs, idents)
+
+def encodeUnaryop(x: unaryop) -> bytes:
+    return asdlCodec.encode(x, encodeUnaryopTo)
+
+def decodeUnaryop(data: bytes) -> unaryop:
+    return asdlCodec.decode(data, decodeUnaryopFrom, Ident)
+
+def encodeUnaryopList(xs: Sequence[unaryop]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeUnaryopTo)
+
+def decodeUnaryopList(data: bytes) -> list[unaryop]:
+    return asdlCodec.decodeList(data, decodeUnaryopFrom, Ident)
+
+def _encodeAdd(w: Writer, x: Add):
+    w.buf.append(0)
+
+def _encodeSub(w: Writer, x: Sub):
+    w.buf.append(1)
+
+def _encodeMul(w: Writer, x: Mul):
+    w.buf.append(2)
+
+def _encodeLess(w: Writer, x: Less):
+    w.buf.append(3)
+
+def _encodeLessEq(w: Writer, x: LessEq):
+    w.buf.append(4)
+
+def _encodeGreater(w: Writer, x: Greater):
+    w.buf.append(5)
+
+def _encodeGreaterEq(w: Writer, x: GreaterEq):
+    w.buf.append(6)
+
+def _encodeEq(w: Writer, x: Eq):
+    w.buf.append(7)
+
+def _encodeNotEq(w: Writer, x: NotEq):
+    w.buf.append(8)
+
+def _encodeIs(w: Writer, x: Is):
+    w.buf.append(9)
+
+def _encodeAnd(w: Writer, x: And):
+    w.buf.append(10)
+
+def _encodeOr(w: Writer, x: Or):
+    w.buf.append(11)
+
+def _decodeAdd(r: Reader, strs: list[str], idents: list[Ident]) -> Add:
+    return Add()
+
+def _decodeSub(r: Reader, strs: list[str], idents: list[Ident]) -> Sub:
+    return Sub()
+
+def _decodeMul(r: Reader, strs: list[str], idents: list[Ident]) -> Mul:
+    return Mul()
+
+def _decodeLess(r: Reader, strs: list[str], idents: list[Ident]) -> Less:
+    return Less()
+
+def _decodeLessEq(r: Reader, strs: list[str], idents: list[Ident]) -> LessEq:
+    return LessEq()
+
+def _decodeGreater(r: Reader, strs: list[str], idents: list[Ident]) -> Greater:
+    return Greater()
+
+def _decodeGreaterEq(r: Reader, strs: list[str], idents: list[Ident]) -> GreaterEq:
+    return GreaterEq()
+
+def _decodeEq(r: Reader, strs: list[str], idents: list[Ident]) -> Eq:
+    return Eq()
+
+def _decodeNotEq(r: Reader, strs: list[str], idents: list[Ident]) -> NotEq:
+    return NotEq()
+
+def _decodeIs(r: Reader, strs: list[str], idents: list[Ident]) -> Is:
+    return Is()
+
+def _decodeAnd(r: Reader, strs: list[str], idents: list[Ident]) -> And:
+    return And()
+
+def _decodeOr(r: Reader, strs: list[str], idents: list[Ident]) -> Or:
+    return Or()
+
+_binaryopEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Add: _encodeAdd,
+    Sub: _encodeSub,
+    Mul: _encodeMul,
+    Less: _encodeLess,
+    LessEq: _encodeLessEq,
+    Greater: _encodeGreater,
+    GreaterEq: _encodeGreaterEq,
+    Eq: _encodeEq,
+    NotEq: _encodeNotEq,
+    Is: _encodeIs,
+    And: _encodeAnd,
+    Or: _encodeOr,
+}
+
+_binaryopDecoders: tuple[Callable[[Reader, list[str], list[Ident]], binaryop], ...] = (
+    _decodeAdd,
+    _decodeSub,
+    _decodeMul,
+    _decodeLess,
+    _decodeLessEq,
+    _decodeGreater,
+    _decodeGreaterEq,
+    _decodeEq,
+    _decodeNotEq,
+    _decodeIs,
+    _decodeAnd,
+    _decodeOr,
+)
+
+def encodeBinaryopTo(w: Writer, x: binaryop):
+    _binaryopEncoders[type(x)](w, x)
+
+def decodeBinaryopFrom(r: Reader, strs: list[str], idents: list[Ident]) -> binaryop:
+    return _binaryopDecoders[r()](r, strs, idents)
+
+def encodeBinaryop(x: binaryop) -> bytes:
+    return asdlCodec.encode(x, encodeBinaryopTo)
+
+def decodeBinaryop(data: bytes) -> binaryop:
+    return asdlCodec.decode(data, decodeBinaryopFrom, Ident)
+
+def encodeBinaryopList(xs: Sequence[binaryop]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeBinaryopTo)
+
+def decodeBinaryopList(data: bytes) -> list[binaryop]:
+    return asdlCodec.decodeList(data, decodeBinaryopFrom, Ident)
+
+def _encodeInt(w: Writer, x: Int):
+    w.buf.append(0)
+
+def _encodeBool(w: Writer, x: Bool):
+    w.buf.append(1)
+
+def _encodeArray(w: Writer, x: Array):
+    w.buf.append(2)
+    encodeTyTo(w, x.elemTy)
+
+def _encodeFun(w: Writer, x: Fun):
+    w.buf.append(3)
+    params = x.params
+    w.uint(len(params))
+    for y in params:
+        encodeTyTo(w, y)
+    encodeResultTyTo(w, x.result)
+
+def _decodeInt(r: Reader, strs: list[str], idents: list[Ident]) -> Int:
+    return Int()
+
+def _decodeBool(r: Reader, strs: list[str], idents: list[Ident]) -> Bool:
+    return Bool()
+
+def _decodeArray(r: Reader, strs: list[str], idents: list[Ident]) -> Array:
+    return Array(_tyDecoders[r()](r, strs, idents))
+
+def _decodeFun(r: Reader, strs: list[str], idents: list[Ident]) -> Fun:
+    return Fun([_tyDecoders[r()](r, strs, idents) for _ in range(uint(r))], _resultTyDecoders[r()](r, strs, idents))
+
+_tyEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Int: _encodeInt,
+    Bool: _encodeBool,
+    Array: _encodeArray,
+    Fun: _encodeFun,
+}
+
+_tyDecoders: tuple[Callable[[Reader, list[str], list[Ident]], ty], ...] = (
+    _decodeInt,
+    _decodeBool,
+    _decodeArray,
+    _decodeFun,
+)
+
+def encodeTyTo(w: Writer, x: ty):
+    _tyEncoders[type(x)](w, x)
+
+def decodeTyFrom(r: Reader, strs: list[str], idents: list[Ident]) -> ty:
+    return _tyDecoders[r()](r, strs, idents)
+
+def encodeTy(x: ty) -> bytes:
+    return asdlCodec.encode(x, encodeTyTo)
+
+def decodeTy(data: bytes) -> ty:
+    return asdlCodec.decode(data, decodeTyFrom, Ident)
+
+def encodeTyList(xs: Sequence[ty]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeTyTo)
+
+def decodeTyList(data: bytes) -> list[ty]:
+    return asdlCodec.decodeList(data, decodeTyFrom, Ident)
+
+def _encodeNotVoid(w: Writer, x: NotVoid):
+    w.buf.append(0)
+    encodeTyTo(w, x.ty)
+
+def _encodeVoid(w: Writer, x: Void):
+    w.buf.append(1)
+
+def _decodeNotVoid(r: Reader, strs: list[str], idents: list[Ident]) -> NotVoid:
+    return NotVoid(_tyDecoders[r()](r, strs, idents))
+
+def _decodeVoid(r: Reader, strs: list[str], idents: list[Ident]) -> Void:
+    return Void()
+
+_resultTyEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    NotVoid: _encodeNotVoid,
+    Void: _encodeVoid,
+}
+
+_resultTyDecoders: tuple[Callable[[Reader, list[str], list[Ident]], resultTy], ...] = (
+    _decodeNotVoid,
+    _decodeVoid,
+)
+
+def encodeResultTyTo(w: Writer, x: resultTy):
+    _resultTyEncoders[type(x)](w, x)
+
+def decodeResultTyFrom(r: Reader, strs: list[str], idents: list[Ident]) -> resultTy:
+    return _resultTyDecoders[r()](r, strs, idents)
+
+def encodeResultTy(x: resultTy) -> bytes:
+    return asdlCodec.encode(x, encodeResultTyTo)
+
+def decodeResultTy(data: bytes) -> resultTy:
+    return asdlCodec.decode(data, decodeResultTyFrom, Ident)
+
+def encodeResultTyList(xs: Sequence[resultTy]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeResultTyTo)
+
+def decodeResultTyList(data: bytes) -> list[resultTy]:
+    return asdlCodec.decodeList(data, decodeResultTyFrom, Ident)
+
+def _encodeVar(w: Writer, x: Var):
+    w.buf.append(0)
+
+def _encodeUserFun(w: Writer, x: UserFun):
+    w.buf.append(1)
+
+def _encodeBuiltinFun(w: Writer, x: BuiltinFun):
+    w.buf.append(2)
+
+def _decodeVar(r: Reader, strs: list[str], idents: list[Ident]) -> Var:
+    return Var()
+
+def _decodeUserFun(r: Reader, strs: list[str], idents: list[Ident]) -> UserFun:
+    return UserFun()
+
+def _decodeBuiltinFun(r: Reader, strs: list[str], idents: list[Ident]) -> BuiltinFun:
+    return BuiltinFun()
+
+_scopeEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Var: _encodeVar,
+    UserFun: _encodeUserFun,
+    BuiltinFun: _encodeBuiltinFun,
+}
+
+_scopeDecoders: tuple[Callable[[Reader, list[str], list[Ident]], scope], ...] = (
+    _decodeVar,
+    _decodeUserFun,
+    _decodeBuiltinFun,
+)
+
+def encodeScopeTo(w: Writer, x: scope):
+    _scopeEncoders[type(x)](w, x)
+
+def decodeScopeFrom(r: Reader, strs: list[str], idents: list[Ident]) -> scope:
+    return _scopeDecoders[r()](r, strs, idents)
+
+def encodeScope(x: scope) -> bytes:
+    return asdlCodec.encode(x, encodeScopeTo)
+
+def decodeScope(data: bytes) -> scope:
+    return asdlCodec.decode(data, decodeScopeFrom, Ident)
+
+def encodeScopeList(xs: Sequence[scope]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeScopeTo)
+
+def decodeScopeList(data: bytes) -> list[scope]:
+    return asdlCodec.decodeList(data, decodeScopeFrom, Ident)
+
+def _encodeFunParam(w: Writer, x: FunParam):
+    w.buf.append(0)
+    w.str(x.var.name)
+    encodeTyTo(w, x.ty)
+
+def _decodeFunParam(r: Reader, strs: list[str], idents: list[Ident]) -> FunParam:
+    return FunParam(idents[(b if (b := r()) < 128 else readUint(b, r))], _tyDecoders[r()](r, strs, idents))
+
+_funParamEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    FunParam: _encodeFunParam,
+}
+
+_funParamDecoders: tuple[Callable[[Reader, list[str], list[Ident]], funParam], ...] = (
+    _decodeFunParam,
+)
+
+def encodeFunParamTo(w: Writer, x: funParam):
+    _funParamEncoders[type(x)](w, x)
+
+def decodeFunParamFrom(r: Reader, strs: list[str], idents: list[Ident]) -> funParam:
+    return _funParamDecoders[r()](r, strs, idents)
+
+def encodeFunParam(x: funParam) -> bytes:
+    return asdlCodec.encode(x, encodeFunParamTo)
+
+def decodeFunParam(data: bytes) -> funParam:
+    return asdlCodec.decode(data, decodeFunParamFrom, Ident)
+
+def encodeFunParamList(xs: Sequence[funParam]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeFunParamTo)
+
+def decodeFunParamList(data: bytes) -> list[funParam]:
+    return asdlCodec.decodeList(data, decodeFunParamFrom, Ident)
+
+_tyChildren: tuple[Callable[[Any], Sequence[ty]], ...] = (
+    lambda x: (),
+    lambda x: (),
+    lambda x: (x.elemTy,),
+    lambda x: x.params,
+)
+
+_tyRebuild: tuple[Callable[[Any, list[ty]], ty], ...] = (
+    lambda x, cs: x,
+    lambda x, cs: x,
+    lambda x, cs: Array(cs[0]),
+    lambda x, cs: Fun(cs[0:len(x.params)], x.result),
+)
+
+def tyChildren(x: ty) -> Sequence[ty]:
+    return _tyChildren[x.tag](x)
+
+def _rebuildTy(x: ty, cs: list[ty]) -> ty:
+    return _tyRebuild[x.tag](x, cs)
+
+def foldTy[R](x: ty, f: Callable[[ty, list[R]], R]) -> R:
+    return traversal.fold(x, tyChildren, f)
+
+def transformTy(x: ty, f: Callable[[ty], ty]) -> ty:
+    return traversal.transform(x, tyChildren, _rebuildTy, f)
@@ -37,7 +37,7 @@ class Store:
     def __repr__(self):
         return f'Store({self.content})'
 
-def interpFuncall(fun: exp, args: list[exp], env: Env, store: Store) -> Optional[TyValue]:
+def interpFuncall(fun: exp, args: Sequence[exp], env: Env, store: Store) -> Optional[TyValue]:
     match (fun, args):
         case (Name(Ident('input_int')), []):
             return int(utils.inputInt('Enter some int: '))
@@ -134,7 +134,7 @@ def interpExp(e: exp, env: Env, store: Store) -> Optional[TyValue]:
             return l[i]
     raise Exception(f'No match for expression {e}')
 
-def interpStmt(s: stmt, env: Env, store: Store, cont: list[stmt]) -> None:
+def interpStmt(s: stmt, env: Env, store: Store, cont: Sequence[stmt]) -> None:
     match s:
         case StmtExp(e):
             interpExp(e, env, store)
@@ -146,13 +146,13 @@ def interpStmt(s: stmt, env: Env, store: Store, cont: list[stmt]) -> None:
         case IfStmt(cond, thenBody, elseBody):
             v = asBool(interpExp(cond, env, store))
             if v:
-                interpStmts(thenBody + cont, env, store)
+                interpStmts([*thenBody, *cont], env, store)
             else:
-                interpStmts(elseBody + cont, env, store)
+                interpStmts([*elseBody, *cont], env, store)
         case WhileStmt(cond, body):
             v = asBool(interpExp(cond, env, store))
             if v:
-                interpStmts(body + [s] + cont, env, store)
+                interpStmts([*body, s, *cont], env, store)
             else:
                 interpStmts(cont, env, store)
         case SubscriptAssign(leftExp, idxExp, rightExp):
@@ -168,7 +168,7 @@ def interpStmt(s: stmt, env: Env, store: Store, cont: list[stmt]) -> None:
                 x = None
             raise ReturnException(x)
 
-def interpStmts(stmts: list[stmt], env: Env, store: Store) -> None:
+def interpStmts(stmts: Sequence[stmt], env: Env, store: Store) -> None:
     if len(stmts) > 0:
         interpStmt(stmts[0], env, store, stmts[1:])
 
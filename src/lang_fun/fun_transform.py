@@ -2,6 +2,7 @@ from lang_fun.fun_ast import *
 import lang_fun.fun_astAtom as atom
 from common.compilerSupport import *
 import common.utils as utils
+import common.traversal as traversal
 
 type Temporaries = list[tuple[atom.Ident, atom.exp]]
 
@@ -32,21 +33,28 @@ def assertTy(t: optional[resultTy]) -> ty:
 
 def transExpAtomic(e: exp, ctx: Ctx) -> tuple[atom.atomExp, Temporaries]:
     (res, ts) = transExp(e, True, ctx)
+    return (atomOf(res, e), ts)
+
+def atomOf(res: atom.exp, e: exp) -> atom.atomExp:
     match res:
         case atom.AtomExp(a):
-            return (a, ts)
+            return a
         case _:
             utils.abort(f'transExp with needAtom=True failed to return an atomic expression: {e}')
 
-def atomic(needAtomic: bool, e: atom.exp, tmps: Temporaries, ctx: Ctx) -> tuple[atom.exp, Temporaries]:
+def atomic(needAtomic: bool, e: atom.exp, tmps: Temporaries, ctx: Ctx) -> atom.exp:
     if needAtomic:
         t = assertTy(e.ty)
         tmp = ctx.newVar(t)
-        return (atom.AtomExp(atom.VarName(tmp, t), NotVoid(t)), tmps + [(tmp, e)])
+        tmps.append((tmp, e))
+        return atom.AtomExp(atom.VarName(tmp, t), NotVoid(t))
     else:
-        return (e, tmps)
+        return e
 
-def callTarget(e: exp, ctx: Ctx) -> tuple[atom.callTarget, Temporaries]:
+def callTarget(e: exp, res: Optional[atom.exp]) -> atom.callTarget:
+    """
+    Translates the target e of a call. res is the translation of e if e is not a name.
+    """
     match e.ty:
         case NotVoid(Fun(paramTys, resultTy)):
             pass
@@ -54,38 +62,67 @@ def callTarget(e: exp, ctx: Ctx) -> tuple[atom.callTarget, Temporaries]:
             utils.abort(f'Invalid type of call target {e}: {t}')
     match e:
         case Name(x, BuiltinFun()):
-            return (atom.CallTargetBuiltin(x), [])
+            return atom.CallTargetBuiltin(x)
         case Name(x, UserFun()):
-            return (atom.CallTargetDirect(x), [])
+            return atom.CallTargetDirect(x)
         case Name(x, Var()):
-            return (atom.CallTargetIndirect(x, paramTys, resultTy), [])
+            return atom.CallTargetIndirect(x, paramTys, resultTy)
         case _:
-            (atomTarget, tmps) = transExpAtomic(e, ctx)
-            match atomTarget:
-                case atom.VarName(x):
-                    return (atom.CallTargetIndirect(x, paramTys, resultTy), tmps)
+            match res:
+                case atom.AtomExp(atom.VarName(x)):
+                    return atom.CallTargetIndirect(x, paramTys, resultTy)
                 case _:
                     utils.abort(f'Invalid call target after type checking: {e}')
 
 def transExp(e: exp, needAtomic: bool, ctx: Ctx) -> tuple[atom.exp, Temporaries]:
+    """
+    Translates e bottom-up without recursion. Subexpressions are translated in evaluation
+    order, their temporaries are appended to a single list.
+    """
+    tmps: Temporaries = []
+    res = traversal.fold((e, needAtomic), subExps,
+                         lambda x, args: transExpNode(x[0], x[1], args, tmps, ctx))
+    return (res, tmps)
+
+def subExps(x: tuple[exp, bool]) -> list[tuple[exp, bool]]:
+    """
+    The subexpressions of an expression that need a translation, together with the flag
+    whether they must be translated to atomic expressions. The arguments of a call are
+    evaluated before the target, a name as target is not translated.
+    """
+    e = x[0]
+    match e:
+        case Call(target, args):
+            subs = [(a, False) for a in args]
+            match target:
+                case Name(_, BuiltinFun() | UserFun() | Var()):
+                    return subs
+                case _:
+                    return subs + [(target, True)]
+        case ArrayInitDyn() | ArrayInitStatic() | Subscript():
+            return [(sub, True) for sub in expChildren(e)]
+        case _:
+            return [(sub, False) for sub in expChildren(e)]
+
+def transExpNode(e: exp, needAtomic: bool, args: list[atom.exp], tmps: Temporaries,
+                 ctx: Ctx) -> atom.exp:
+    """
+    Translates e, given the translations args of the subexpressions returned by subExps.
+    """
     t = assertResultTy(e.ty)
     match e:
         case IntConst(v):
-            return (atom.AtomExp(atom.IntConst(v, assertTy(t)), t), [])
+            return atom.AtomExp(atom.IntConst(v, assertTy(t)), t)
         case BoolConst(v):
-            return (atom.AtomExp(atom.BoolConst(v, assertTy(t)), t), [])
-        case Call(target, args):
-            (atomArgs, tmps) = utils.unzip([transExp(a, False, ctx) for a in args])
-            (atomTarget, tmps2) = callTarget(target, ctx)
-            return atomic(needAtomic, atom.Call(atomTarget, atomArgs, t),
-                          utils.flatten(tmps) + tmps2, ctx)
-        case UnOp(op, sub):
-            (atomSub, tmps) = transExp(sub, False, ctx)
-            return atomic(needAtomic, atom.UnOp(op, atomSub, t), tmps, ctx)
-        case BinOp(left, op, right):
-            (l, tmps1) = transExp(left, False, ctx)
-            (r, tmps2) = transExp(right, False, ctx)
-            return atomic(needAtomic, atom.BinOp(l, op, r, t), tmps1 + tmps2, ctx)
+            return atom.AtomExp(atom.BoolConst(v, assertTy(t)), t)
+        case Call(target, callArgs):
+            n = len(callArgs)
+            atomTarget = callTarget(target, args[n] if len(args) > n else None)
+            return atomic(needAtomic, atom.Call(atomTarget, args[:n], t), tmps, ctx)
+        case UnOp(op, _):
+            return atomic(needAtomic, atom.UnOp(op, args[0], t), tmps, ctx)
+        case BinOp(_, op, _):
+            return atomic(needAtomic, atom.BinOp(args[0], op, args[1], t), tmps, ctx)
         case Name(x, scope):
             match scope:
                 case None:
@@ -96,18 +133,18 @@ def transExp(e: exp, needAtomic: bool, ctx: Ctx) -> tuple[atom.exp, Temporaries]
                     name = atom.FunName(x, assertTy(t))
                 case BuiltinFun():
                     utils.abort(f'Free-standing reference to builtin function {e} found after type checking')
-            return (atom.AtomExp(name, t), [])
+            return atom.AtomExp(name, t)
         case ArrayInitDyn(lenExp, elemInit):
-            (atomLen, tmps1) = transExpAtomic(lenExp, ctx)
-            (atomElem, tmps2) = transExpAtomic(elemInit, ctx)
-            return atomic(needAtomic, atom.ArrayInitDyn(atomLen, atomElem, t), tmps1 + tmps2, ctx)
+            atomLen = atomOf(args[0], lenExp)
+            atomElem = atomOf(args[1], elemInit)
+            return atomic(needAtomic, atom.ArrayInitDyn(atomLen, atomElem, t), tmps, ctx)
         case ArrayInitStatic(initExps):
-            (atomArgs, tmps) = utils.unzip([transExpAtomic(i, ctx) for i in initExps])
-            return atomic(needAtomic, atom.ArrayInitStatic(atomArgs, t), utils.flatten(tmps), ctx)
+            atomArgs = [atomOf(a, i) for (a, i) in zip(args, initExps)]
+            return atomic(needAtomic, atom.ArrayInitStatic(atomArgs, t), tmps, ctx)
         case Subscript(arrExp, indexExp):
-            (atomArr, tmps1) = transExpAtomic(arrExp, ctx)
-            (atomIndex, tmps2) = transExpAtomic(indexExp, ctx)
-            return atomic(needAtomic, atom.Subscript(atomArr, atomIndex, t), tmps1 + tmps2, ctx)
+            atomArr = atomOf(args[0], arrExp)
+            atomIndex = atomOf(args[1], indexExp)
+            return atomic(needAtomic, atom.Subscript(atomArr, atomIndex, t), tmps, ctx)
 
 def mkAssigns(tmps: Temporaries) -> list[atom.stmt]:
     return [atom.Assign(x, e) for (x, e) in tmps]
@@ -142,7 +179,7 @@ def transStmt(s: stmt, ctx: Ctx) -> list[atom.stmt]:
                     (a, tmps) = transExp(exp, False, ctx)
                     return mkAssigns(tmps) + [atom.Return(a)]
 
-def transStmts(stmts: list[stmt], ctx: Ctx) -> list[atom.stmt]:
+def transStmts(stmts: Sequence[stmt], ctx: Ctx) -> list[atom.stmt]:
     result: list[atom.stmt] = []
     for s in stmts:
         result.extend(transStmt(s, ctx))
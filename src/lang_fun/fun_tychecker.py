@@ -2,10 +2,13 @@ from __future__ import annotations
 from lang_fun.fun_ast import *
 from typing import *
 from common.compilerSupport import *
+import common.asdlCodec as asdlCodec
+import common.astCache as astCache
 import common.log as log
 import common.symtab as symtab
 import common.utils as utils
-import pprint
+import hashlib
+import sys
 
 type Symtab = symtab.Symtab[ident, ty]
 
@@ -44,7 +47,7 @@ def tycheckExpNotVoid(e: exp, st: Symtab) -> ty:
 
 builtinFunNames = ['input_int', 'print', 'len']
 
-def tycheckBuiltinFuncall(target: exp, args: list[exp], st: Symtab) -> optional[ty]:
+def tycheckBuiltinFuncall(target: exp, args: Sequence[exp], st: Symtab) -> optional[ty]:
     """
     Return the *function* type for a call of a builtin function. Our type language cannot
     express the types of all builtin functions in general because print and len are overloaded.
@@ -65,7 +68,7 @@ def tycheckBuiltinFuncall(target: exp, args: list[exp], st: Symtab) -> optional[
         case _:
             return None
 
-def tycheckUserDefinedFuncall(tfun: ty|None, args: list[exp], st: Symtab) -> resultTy:
+def tycheckUserDefinedFuncall(tfun: ty|None, args: Sequence[exp], st: Symtab) -> resultTy:
     match tfun:
         case Fun(params, result):
             if len(params) != len(args):
@@ -80,7 +83,7 @@ def tycheckUserDefinedFuncall(tfun: ty|None, args: list[exp], st: Symtab) -> res
         case _:
             raise CompileError.typeError(f'Not a function: {tfun}')
 
-def tycheckFuncall(target: exp, args: list[exp], st: Symtab) -> resultTy:
+def tycheckFuncall(target: exp, args: Sequence[exp], st: Symtab) -> resultTy:
     match tycheckBuiltinFuncall(target, args, st):
         case None:
             funTy = tycheckExpNotVoid(target, st)
@@ -98,7 +101,7 @@ def tycheckFuncall(target: exp, args: list[exp], st: Symtab) -> resultTy:
 
 
 def tycheckExp(e: exp, st: Symtab) -> resultTy:
-    t = _tycheckExp(e, st)
+    t = _expTychecker.visitExp(e, st)
     e.ty = t
     match e:
         case Name(x):
@@ -112,82 +115,101 @@ def tycheckExp(e: exp, st: Symtab) -> resultTy:
             pass
     return t
 
-def _tycheckExp(e: exp, st: Symtab) -> resultTy:
-    match e:
-        case IntConst(v):
-            if v < -2**63 or v > 2.**63 - 1:
-                raise CompileError.typeError(f'int constant too large: {v}')
-            return NotVoid(Int())
-        case BoolConst(_):
-            return NotVoid(Bool())
-        case Call(e, args):
-            return tycheckFuncall(e, args, st)
-        case UnOp(op, sub):
-            subTy = tycheckExpNotVoid(sub, st)
-            match op:
-                case USub():
-                    expectedTy = Int()
-                case Not():
-                    expectedTy = Bool()
-            assertTy(expectedTy, subTy, f'Expression {e}')
-            return NotVoid(expectedTy)
-        case BinOp(left, op, right):
-            leftTy = tycheckExpNotVoid(left, st)
-            rightTy = tycheckExpNotVoid(right, st)
-            match op:
-                case Add() | Sub() | Mul():
-                    assertTy(Int(), leftTy, f'Expression {left}')
-                    assertTy(Int(), rightTy, f'Expression {right}')
-                    return NotVoid(Int())
-                case Less() | LessEq() | Greater() | GreaterEq():
-                    assertTy(Int(), leftTy, f'Expression {left}')
-                    assertTy(Int(), rightTy, f'Expression {right}')
+class _ExpTychecker(ExpVisitor[resultTy, Symtab]):
+    """
+    Computes the type of an expression. Subexpressions are checked with tycheckExp, so
+    that their types and scopes are recorded in the AST.
+    """
+    def visitIntConst(self, x: IntConst, ctx: Symtab) -> resultTy:
+        if x.value < -2**63 or x.value > 2.**63 - 1:
+            raise CompileError.typeError(f'int constant too large: {x.value}')
+        return NotVoid(Int())
+
+    def visitBoolConst(self, x: BoolConst, ctx: Symtab) -> resultTy:
+        return NotVoid(Bool())
+
+    def visitCall(self, x: Call, ctx: Symtab) -> resultTy:
+        return tycheckFuncall(x.fun, x.args, ctx)
+
+    def visitUnOp(self, x: UnOp, ctx: Symtab) -> resultTy:
+        subTy = tycheckExpNotVoid(x.arg, ctx)
+        match x.op:
+            case USub():
+                expectedTy = Int()
+            case Not():
+                expectedTy = Bool()
+        assertTy(expectedTy, subTy, f'Expression {x}')
+        return NotVoid(expectedTy)
+
+    def visitBinOp(self, x: BinOp, ctx: Symtab) -> resultTy:
+        left = x.left
+        right = x.right
+        op = x.op
+        leftTy = tycheckExpNotVoid(left, ctx)
+        rightTy = tycheckExpNotVoid(right, ctx)
+        match op:
+            case Add() | Sub() | Mul():
+                assertTy(Int(), leftTy, f'Expression {left}')
+                assertTy(Int(), rightTy, f'Expression {right}')
+                return NotVoid(Int())
+            case Less() | LessEq() | Greater() | GreaterEq():
+                assertTy(Int(), leftTy, f'Expression {left}')
+                assertTy(Int(), rightTy, f'Expression {right}')
+                return NotVoid(Bool())
+            case Eq() | NotEq():
+                if leftTy == rightTy and isBaseTy(leftTy):
                     return NotVoid(Bool())
-                case Eq() | NotEq():
-                    if leftTy == rightTy and isBaseTy(leftTy):
-                        return NotVoid(Bool())
-                    else:
-                        raise CompileError.typeError(f'Invalid types for operands of {op}')
-                case Is():
-                    if leftTy == rightTy and isArrayTy(leftTy):
-                        return NotVoid(Bool())
-                    else:
-                        raise CompileError.typeError(f'Invalid types for operands of {op}')
-                case And() | Or():
-                    assertTy(Bool(), leftTy, f'Expression {left}')
-                    assertTy(Bool(), rightTy, f'Expression {right}')
+                else:
+                    raise CompileError.typeError(f'Invalid types for operands of {op}')
+            case Is():
+                if leftTy == rightTy and isArrayTy(leftTy):
                     return NotVoid(Bool())
-        case Name(x):
-            if not st.hasVar(x) and x.name in builtinFunNames:
-                raise CompileError.typeError(f'Invalid use of builtin function {x}')
-            t = st.use(x)
-            return NotVoid(t)
-        case ArrayInitDyn(lenExp, initExp):
-            lenTy = tycheckExpNotVoid(lenExp, st)
-            assertTy(Int(), lenTy, f'Length expression {lenExp} in array initialization')
-            elemTy = assertSomeTy(tycheckExpNotVoid(initExp, st),
-                                  f'Element expression {initExp} in array initialization')
-            return NotVoid(Array(elemTy))
-        case ArrayInitStatic([]):
+                else:
+                    raise CompileError.typeError(f'Invalid types for operands of {op}')
+            case And() | Or():
+                assertTy(Bool(), leftTy, f'Expression {left}')
+                assertTy(Bool(), rightTy, f'Expression {right}')
+                return NotVoid(Bool())
+
+    def visitName(self, x: Name, ctx: Symtab) -> resultTy:
+        if not ctx.hasVar(x.var) and x.var.name in builtinFunNames:
+            raise CompileError.typeError(f'Invalid use of builtin function {x.var}')
+        t = ctx.use(x.var)
+        return NotVoid(t)
+
+    def visitArrayInitDyn(self, x: ArrayInitDyn, ctx: Symtab) -> resultTy:
+        lenExp = x.len
+        initExp = x.elemInit
+        lenTy = tycheckExpNotVoid(lenExp, ctx)
+        assertTy(Int(), lenTy, f'Length expression {lenExp} in array initialization')
+        elemTy = assertSomeTy(tycheckExpNotVoid(initExp, ctx),
+                              f'Element expression {initExp} in array initialization')
+        return NotVoid(Array(elemTy))
+
+    def visitArrayInitStatic(self, x: ArrayInitStatic, ctx: Symtab) -> resultTy:
+        es = x.elemInit
+        if not es:
             raise CompileError.typeError(f'Cannot construct empty array')
-        case ArrayInitStatic(es):
-            elemTys: list[ty | None]= [tycheckExpNotVoid(e, st) for e in es]
-            elemTy = assertSomeTy(elemTys[0],
-                                  f'Element expression {es[0]} in array initialization')
-            for t in elemTys[1:]:
-                if t != elemTy:
-                    raise CompileError.typeError(f'All array elements must have the same type: {es}')
-            return NotVoid(Array(elemTy))
-        case Subscript(arrayExp, indexExp):
-            arrayTy = tycheckExpNotVoid(arrayExp, st)
-            indexTy = tycheckExpNotVoid(indexExp, st)
-            assertTy(Int(), indexTy, f'Index of subscript expression')
-            match arrayTy:
-                case Array(elemTy):
-                    return NotVoid(elemTy)
-                case _:
-                    raise CompileError.typeError(f'Left-hand side {arrayExp} of subscript must be an array')
-    raise Exception(f'No match for expression {e} ({e.__module__})')
+        elemTys: list[ty | None]= [tycheckExpNotVoid(e, ctx) for e in es]
+        elemTy = assertSomeTy(elemTys[0],
+                              f'Element expression {es[0]} in array initialization')
+        for t in elemTys[1:]:
+            if t != elemTy:
+                raise CompileError.typeError(f'All array elements must have the same type: {es}')
+        return NotVoid(Array(elemTy))
+
+    def visitSubscript(self, x: Subscript, ctx: Symtab) -> resultTy:
+        arrayExp = x.array
+        arrayTy = tycheckExpNotVoid(arrayExp, ctx)
+        indexTy = tycheckExpNotVoid(x.index, ctx)
+        assertTy(Int(), indexTy, f'Index of subscript expression')
+        match arrayTy:
+            case Array(elemTy):
+                return NotVoid(elemTy)
+            case _:
+                raise CompileError.typeError(f'Left-hand side {arrayExp} of subscript must be an array')
+
+_expTychecker = _ExpTychecker()
 
 @dataclass
 class ReturnType:
@@ -270,7 +292,7 @@ def tycheckStmt(s: stmt, st: Symtab) -> ReturnType | None:
                     ty = tycheckExpNotVoid(e, st)
                     return ReturnType(NotVoid(ty), 'definite')
 
-def tycheckStmts(stmts: list[stmt], st: Symtab) -> ReturnType | None:
+def tycheckStmts(stmts: Sequence[stmt], st: Symtab) -> ReturnType | None:
     res: list[ReturnType] = []
     for s in stmts:
         ty = tycheckStmt(s, st)
@@ -316,9 +338,62 @@ class TycheckResult:
     funLocals: dict[ident, list[LocalVar]]
     toplevelLocals: list[LocalVar]
 
-def localsFromSymtab(st: Symtab, params: list[funParam]) -> list[LocalVar]:
+def localsFromSymtab(st: Symtab, params: Sequence[funParam]) -> list[LocalVar]:
     paramNames = [p.var for p in params]
-    return [LocalVar(x, t) for x, t in st.types('var') if x not in paramNames]
+    # The symtab of a function is a copy of the global symtab, which contains only functions
+    return [LocalVar(x, t) for x, t in st.types('var', onlyNew=True) if x not in paramNames]
+
+def funCacheKey(f: FunDef, st: Symtab, version: str) -> str:
+    """
+    Key of the typechecked definition of f in the AST cache. The key covers the AST of f, the
+    signatures of the global functions whose names occur in f, and the version stamps of the
+    typechecker (see tycheckerVersion). Hence, a function must be checked again if it changes
+    or if the signature of a function it references changes.
+    """
+    data = encodeFun(f)
+    (names, _) = asdlCodec.strings(data)
+    h = hashlib.sha256(version.encode('utf-8'))
+    h.update(data)
+    for x in sorted(set(names)):
+        i = Ident(x)
+        if st.hasVar(i):
+            h.update(f'\0{x}: {st.unsafeInfo(i).ty}'.encode('utf-8'))
+    return h.hexdigest()
+
+def tycheckerVersion() -> str:
+    import common.symtab_merge as symtab_merge
+    mods = [sys.modules[__name__], symtab, symtab_merge,
+            *astCache.astModules(sys.modules[FunDef.__module__])]
+    return ' '.join([astCache.versionStamp(x) for x in mods])
+
+def tycheckFunDefs(funs: Sequence[FunDef], st: Symtab) -> list[tuple[FunDef, list[LocalVar]]]:
+    """
+    Typechecks the given functions in the global symtab st. Returns the annotated function
+    definitions together with their locals. If the AST cache is enabled, functions whose
+    cache key did not change are not checked again.
+    """
+    res: list[tuple[FunDef, list[LocalVar]]] = []
+    # Cache entries hold the encoded annotated definition and the names and types of the
+    # locals. Decoding is much faster than unpickling the AST.
+    toStore: list[tuple[str, tuple[bytes, list[tuple[str, ty]]]]] = []
+    version = tycheckerVersion() if astCache.isEnabled() else None
+    for f in funs:
+        key = None
+        if version is not None:
+            key = funCacheKey(f, st, version)
+            cached = astCache.lookup(key)
+            if cached is not None:
+                (data, locals) = cached
+                res.append((decodeFun(data), [LocalVar(Ident(x), t) for (x, t) in locals]))
+                continue
+        funSt = st.copy()
+        tycheckFunDef(f, funSt)
+        locals = localsFromSymtab(funSt, f.params)
+        res.append((f, locals))
+        if key is not None:
+            toStore.append((key, (encodeFun(f), [(x.name.name, x.ty) for x in locals])))
+    astCache.storeAll(toStore)
+    return res
 
 def tycheckModule(m: mod) -> TycheckResult:
     """
@@ -330,13 +405,13 @@ def tycheckModule(m: mod) -> TycheckResult:
         ty = Fun([p.ty for p in f.params], f.result)
         st.assign(f.name, ty, 'fun')
     funLocalsDict: dict[ident, list[LocalVar]] = {}
-    for f in m.funs:
-        funSt = st.copy()
-        tycheckFunDef(f, funSt)
-        funLocalsDict[f.name] = localsFromSymtab(funSt, f.params)
+    checked = tycheckFunDefs(m.funs, st)
+    m.funs = tuple([f for (f, _) in checked])
+    for (f, locals) in checked:
+        funLocalsDict[f.name] = locals
     t = tycheckStmts(m.stmts, st)
     if t is not None:
         raise CompileError.typeError(f'Return is only allowed inside a function')
     log.debug(f'Symtab after typechecking: {st}')
-    log.debug(f'AST after typechecking: {pprint.pformat(m)}')
+    log.debugPretty('AST after typechecking: ', m)
     return TycheckResult(funLocalsDict, localsFromSymtab(st, []))
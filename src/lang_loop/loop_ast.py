@@ -1,121 +1,290 @@
-# AUTOMATICALLY GENERATED (2024-03-13 15:00:03)
+# AUTOMATICALLY GENERATED (2026-10-17 09:05:19)
 from __future__ import annotations
 from dataclasses import dataclass
+from abc import ABC, abstractmethod
+from typing import Any, Callable, ClassVar, Sequence
+from weakref import WeakValueDictionary
+from common.asdlCodec import Reader, Writer, readUint, uint
+import common.asdlCodec as asdlCodec
+import common.traversal as traversal
 
 type optional[T] = T | None
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Ident:
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Ident]] = WeakValueDictionary()
     name: str
 
+    def __new__(cls, name: str) -> Ident:
+        key = (name,)
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            object.__setattr__(x, 'name', name)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), (self.name,))
+
 type ident = Ident
 type string = str
 
-@dataclass
+@dataclass(slots=True)
 class USub:
-    pass
+    tag: ClassVar[int] = 0
 
-@dataclass
+@dataclass(slots=True)
 class Not:
-    pass
+    tag: ClassVar[int] = 1
 
 type unaryop = USub | Not
 
-@dataclass
+class UnaryopVisitor[R, C](ABC):
+    _unaryopTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._unaryopTable = (cls.visitUSub, cls.visitNot)
+
+    def visitUnaryop(self, x: unaryop, ctx: C) -> R:
+        return self._unaryopTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitUSub(self, x: USub, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitNot(self, x: Not, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class Add:
-    pass
+    tag: ClassVar[int] = 0
 
-@dataclass
+@dataclass(slots=True)
 class Sub:
-    pass
+    tag: ClassVar[int] = 1
 
-@dataclass
+@dataclass(slots=True)
 class Mul:
-    pass
+    tag: ClassVar[int] = 2
 
-@dataclass
+@dataclass(slots=True)
 class Less:
-    pass
+    tag: ClassVar[int] = 3
 
-@dataclass
+@dataclass(slots=True)
 class LessEq:
-    pass
+    tag: ClassVar[int] = 4
 
-@dataclass
+@dataclass(slots=True)
 class Greater:
-    pass
+    tag: ClassVar[int] = 5
 
-@dataclass
+@dataclass(slots=True)
 class GreaterEq:
-    pass
+    tag: ClassVar[int] = 6
 
-@dataclass
+@dataclass(slots=True)
 class Eq:
-    pass
+    tag: ClassVar[int] = 7
 
-@dataclass
+@dataclass(slots=True)
 class NotEq:
-    pass
+    tag: ClassVar[int] = 8
 
-@dataclass
+@dataclass(slots=True)
 class And:
-    pass
+    tag: ClassVar[int] = 9
 
-@dataclass
+@dataclass(slots=True)
 class Or:
-    pass
+    tag: ClassVar[int] = 10
 
 type binaryop = Add | Sub | Mul | Less | LessEq | Greater | GreaterEq | Eq | NotEq | And | Or
 
-@dataclass
+class BinaryopVisitor[R, C](ABC):
+    _binaryopTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._binaryopTable = (cls.visitAdd, cls.visitSub, cls.visitMul, cls.visitLess, cls.visitLessEq, cls.visitGreater, cls.visitGreaterEq, cls.visitEq, cls.visitNotEq, cls.visitAnd, cls.visitOr)
+
+    def visitBinaryop(self, x: binaryop, ctx: C) -> R:
+        return self._binaryopTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitAdd(self, x: Add, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitSub(self, x: Sub, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitMul(self, x: Mul, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitLess(self, x: Less, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitLessEq(self, x: LessEq, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitGreater(self, x: Greater, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitGreaterEq(self, x: GreaterEq, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitEq(self, x: Eq, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitNotEq(self, x: NotEq, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitAnd(self, x: And, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitOr(self, x: Or, ctx: C) -> R: ...
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Int:
-    pass
+    tag: ClassVar[int] = 0
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Int]] = WeakValueDictionary()
+
+    def __new__(cls) -> Int:
+        key = ()
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            cls._instances[key] = x
+        return x
 
-@dataclass
+    def __reduce__(self):
+        return (type(self), ())
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Bool:
-    pass
+    tag: ClassVar[int] = 1
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Bool]] = WeakValueDictionary()
+
+    def __new__(cls) -> Bool:
+        key = ()
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), ())
 
 type ty = Int | Bool
 
-@dataclass
+class TyVisitor[R, C](ABC):
+    _tyTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._tyTable = (cls.visitInt, cls.visitBool)
+
+    def visitTy(self, x: ty, ctx: C) -> R:
+        return self._tyTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitInt(self, x: Int, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitBool(self, x: Bool, ctx: C) -> R: ...
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class NotVoid:
+    tag: ClassVar[int] = 0
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], NotVoid]] = WeakValueDictionary()
     ty: ty
 
-@dataclass
+    def __new__(cls, ty: ty) -> NotVoid:
+        key = (ty,)
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            object.__setattr__(x, 'ty', ty)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), (self.ty,))
+
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Void:
-    pass
+    tag: ClassVar[int] = 1
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Void]] = WeakValueDictionary()
+
+    def __new__(cls) -> Void:
+        key = ()
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), ())
 
 type resultTy = NotVoid | Void
 
-@dataclass
+class ResultTyVisitor[R, C](ABC):
+    _resultTyTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._resultTyTable = (cls.visitNotVoid, cls.visitVoid)
+
+    def visitResultTy(self, x: resultTy, ctx: C) -> R:
+        return self._resultTyTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitNotVoid(self, x: NotVoid, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitVoid(self, x: Void, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class IntConst:
+    tag: ClassVar[int] = 0
     value: int
     ty: optional[resultTy] = None
 
-@dataclass
+@dataclass(slots=True)
 class BoolConst:
+    tag: ClassVar[int] = 1
     value: bool
     ty: optional[resultTy] = None
 
-@dataclass
+@dataclass(slots=True)
 class Name:
+    tag: ClassVar[int] = 2
     name: ident
     ty: optional[resultTy] = None
 
-@dataclass
+@dataclass(slots=True)
 class Call:
+    tag: ClassVar[int] = 3
     name: ident
-    args: list[exp]
+    args: Sequence[exp]
     ty: optional[resultTy] = None
 
-@dataclass
+    def __post_init__(self):
+        self.args = tuple(self.args)
+
+@dataclass(slots=True)
 class UnOp:
+    tag: ClassVar[int] = 4
     op: unaryop
     arg: exp
     ty: optional[resultTy] = None
 
-@dataclass
+@dataclass(slots=True)
 class BinOp:
+    tag: ClassVar[int] = 5
     left: exp
     op: binaryop
     right: exp
@@ -123,30 +292,614 @@ class BinOp:
 
 type exp = IntConst | BoolConst | Name | Call | UnOp | BinOp
 
-@dataclass
+class ExpVisitor[R, C](ABC):
+    _expTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._expTable = (cls.visitIntConst, cls.visitBoolConst, cls.visitName, cls.visitCall, cls.visitUnOp, cls.visitBinOp)
+
+    def visitExp(self, x: exp, ctx: C) -> R:
+        return self._expTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitIntConst(self, x: IntConst, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitBoolConst(self, x: BoolConst, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitName(self, x: Name, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitCall(self, x: Call, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitUnOp(self, x: UnOp, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitBinOp(self, x: BinOp, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class StmtExp:
+    tag: ClassVar[int] = 0
     exp: exp
 
-@dataclass
+@dataclass(slots=True)
 class Assign:
+    tag: ClassVar[int] = 1
     var: ident
     right: exp
 
-@dataclass
+@dataclass(slots=True)
 class IfStmt:
+    tag: ClassVar[int] = 2
     cond: exp
-    thenBody: list[stmt]
-    elseBody: list[stmt]
+    thenBody: Sequence[stmt]
+    elseBody: Sequence[stmt]
+
+    def __post_init__(self):
+        self.thenBody = tuple(self.thenBody)
+        self.elseBody = tuple(self.elseBody)
 
-@dataclass
+@dataclass(slots=True)
 class WhileStmt:
+    tag: ClassVar[int] = 3
     cond: exp
-    body: list[stmt]
+    body: Sequence[stmt]
+
+    def __post_init__(self):
+        self.body = tuple(self.body)
 
 type stmt = StmtExp | Assign | IfStmt | WhileStmt
 
-@dataclass
+class StmtVisitor[R, C](ABC):
+    _stmtTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._stmtTable = (cls.visitStmtExp, cls.visitAssign, cls.visitIfStmt, cls.visitWhileStmt)
+
+    def visitStmt(self, x: stmt, ctx: C) -> R:
+        return self._stmtTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitStmtExp(self, x: StmtExp, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitAssign(self, x: Assign, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitIfStmt(self, x: IfStmt, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitWhileStmt(self, x: WhileStmt, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class Module:
-    stmts: list[stmt]
+    tag: ClassVar[int] = 0
+    stmts: Sequence[stmt]
+
+    def __post_init__(self):
+        self.stmts = tuple(self.stmts)
+
+type mod = Module
+
+def _encodeUSub(w: Writer, x: USub):
+    w.buf.append(0)
+
+def _encodeNot(w: Writer, x: Not):
+    w.buf.append(1)
+
+def _decodeUSub(r: Reader, strs: list[str], idents: list[Ident]) -> USub:
+    return USub()
+
+def _decodeNot(r: Reader, strs: list[str], idents: list[Ident]) -> Not:
+    return Not()
+
+_unaryopEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    USub: _encodeUSub,
+    Not: _encodeNot,
+}
+
+_unaryopDecoders: tuple[Callable[[Reader, list[str], list[Ident]], unaryop], ...] = (
+    _decodeUSub,
+    _decodeNot,
+)
+
+def encodeUnaryopTo(w: Writer, x: unaryop):
+    _unaryopEncoders[type(x)](w, x)
+
+def decodeUnaryopFrom(r: Reader, strs: list[str], idents: list[Ident]) -> unaryop:
+    return _unaryopDecoders[r()](r, strs, idents)
+
+def encodeUnaryop(x: unaryop) -> bytes:
+    return asdlCodec.encode(x, encodeUnaryopTo)
+
+def decodeUnaryop(data: bytes) -> unaryop:
+    return asdlCodec.decode(data, decodeUnaryopFrom, Ident)
+
+def encodeUnaryopList(xs: Sequence[unaryop]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeUnaryopTo)
+
+def decodeUnaryopList(data: bytes) -> list[unaryop]:
+    return asdlCodec.decodeList(data, decodeUnaryopFrom, Ident)
+
+def _encodeAdd(w: Writer, x: Add):
+    w.buf.append(0)
+
+def _encodeSub(w: Writer, x: Sub):
+    w.buf.append(1)
+
+def _encodeMul(w: Writer, x: Mul):
+    w.buf.append(2)
+
+def _encodeLess(w: Writer, x: Less):
+    w.buf.append(3)
+
+def _encodeLessEq(w: Writer, x: LessEq):
+    w.buf.append(4)
+
+def _encodeGreater(w: Writer, x: Greater):
+    w.buf.append(5)
+
+def _encodeGreaterEq(w: Writer, x: GreaterEq):
+    w.buf.append(6)
+
+def _encodeEq(w: Writer, x: Eq):
+    w.buf.append(7)
+
+def _encodeNotEq(w: Writer, x: NotEq):
+    w.buf.append(8)
+
+def _encodeAnd(w: Writer, x: And):
+    w.buf.append(9)
+
+def _encodeOr(w: Writer, x: Or):
+    w.buf.append(10)
+
+def _decodeAdd(r: Reader, strs: list[str], idents: list[Ident]) -> Add:
+    return Add()
+
+def _decodeSub(r: Reader, strs: list[str], idents: list[Ident]) -> Sub:
+    return Sub()
+
+def _decodeMul(r: Reader, strs: list[str], idents: list[Ident]) -> Mul:
+    return Mul()
+
+def _decodeLess(r: Reader, strs: list[str], idents: list[Ident]) -> Less:
+    return Less()
+
+def _decodeLessEq(r: Reader, strs: list[str], idents: list[Ident]) -> LessEq:
+    return LessEq()
+
+def _decodeGreater(r: Reader, strs: list[str], idents: list[Ident]) -> Greater:
+    return Greater()
+
+def _decodeGreaterEq(r: Reader, strs: list[str], idents: list[Ident]) -> GreaterEq:
+    return GreaterEq()
+
+def _decodeEq(r: Reader, strs: list[str], idents: list[Ident]) -> Eq:
+    return Eq()
+
+def _decodeNotEq(r: Reader, strs: list[str], idents: list[Ident]) -> NotEq:
+    return NotEq()
+
+def _decodeAnd(r: Reader, strs: list[str], idents: list[Ident]) -> And:
+    return And()
+
+def _decodeOr(r: Reader, strs: list[str], idents: list[Ident]) -> Or:
+    return Or()
+
+_binaryopEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Add: _encodeAdd,
+    Sub: _encodeSub,
+    Mul: _encodeMul,
+    Less: _encodeLess,
+    LessEq: _encodeLessEq,
+    Greater: _encodeGreater,
+    GreaterEq: _encodeGreaterEq,
+    Eq: _encodeEq,
+    NotEq: _encodeNotEq,
+    And: _encodeAnd,
+    Or: _encodeOr,
+}
+
+_binaryopDecoders: tuple[Callable[[Reader, list[str], list[Ident]], binaryop], ...] = (
+    _decodeAdd,
+    _decodeSub,
+    _decodeMul,
+    _decodeLess,
+    _decodeLessEq,
+    _decodeGreater,
+    _decodeGreaterEq,
+    _decodeEq,
+    _decodeNotEq,
+    _decodeAnd,
+    _decodeOr,
+)
+
+def encodeBinaryopTo(w: Writer, x: binaryop):
+    _binaryopEncoders[type(x)](w, x)
+
+def decodeBinaryopFrom(r: Reader, strs: list[str], idents: list[Ident]) -> binaryop:
+    return _binaryopDecoders[r()](r, strs, idents)
+
+def encodeBinaryop(x: binaryop) -> bytes:
+    return asdlCodec.encode(x, encodeBinaryopTo)
+
+def decodeBinaryop(data: bytes) -> binaryop:
+    return asdlCodec.decode(data, decodeBinaryopFrom, Ident)
+
+def encodeBinaryopList(xs: Sequence[binaryop]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeBinaryopTo)
+
+def decodeBinaryopList(data: bytes) -> list[binaryop]:
+    return asdlCodec.decodeList(data, decodeBinaryopFrom, Ident)
+
+def _encodeInt(w: Writer, x: Int):
+    w.buf.append(0)
+
+def _encodeBool(w: Writer, x: Bool):
+    w.buf.append(1)
+
+def _decodeInt(r: Reader, strs: list[str], idents: list[Ident]) -> Int:
+    return Int()
+
+def _decodeBool(r: Reader, strs: list[str], idents: list[Ident]) -> Bool:
+    return Bool()
+
+_tyEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Int: _encodeInt,
+    Bool: _encodeBool,
+}
+
+_tyDecoders: tuple[Callable[[Reader, list[str], list[Ident]], ty], ...] = (
+    _decodeInt,
+    _decodeBool,
+)
+
+def encodeTyTo(w: Writer, x: ty):
+    _tyEncoders[type(x)](w, x)
+
+def decodeTyFrom(r: Reader, strs: list[str], idents: list[Ident]) -> ty:
+    return _tyDecoders[r()](r, strs, idents)
+
+def encodeTy(x: ty) -> bytes:
+    return asdlCodec.encode(x, encodeTyTo)
+
+def decodeTy(data: bytes) -> ty:
+    return asdlCodec.decode(data, decodeTyFrom, Ident)
+
+def encodeTyList(xs: Sequence[ty]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeTyTo)
+
+def decodeTyList(data: bytes) -> list[ty]:
+    return asdlCodec.decodeList(data, decodeTyFrom, Ident)
+
+def _encodeNotVoid(w: Writer, x: NotVoid):
+    w.buf.append(0)
+    encodeTyTo(w, x.ty)
+
+def _encodeVoid(w: Writer, x: Void):
+    w.buf.append(1)
+
+def _decodeNotVoid(r: Reader, strs: list[str], idents: list[Ident]) -> NotVoid:
+    return NotVoid(_tyDecoders[r()](r, strs, idents))
+
+def _decodeVoid(r: Reader, strs: list[str], idents: list[Ident]) -> Void:
+    return Void()
+
+_resultTyEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    NotVoid: _encodeNotVoid,
+    Void: _encodeVoid,
+}
+
+_resultTyDecoders: tuple[Callable[[Reader, list[str], list[Ident]], resultTy], ...] = (
+    _decodeNotVoid,
+    _decodeVoid,
+)
+
+def encodeResultTyTo(w: Writer, x: resultTy):
+    _resultTyEncoders[type(x)](w, x)
+
+def decodeResultTyFrom(r: Reader, strs: list[str], idents: list[Ident]) -> resultTy:
+    return _resultTyDecoders[r()](r, strs, idents)
+
+def encodeResultTy(x: resultTy) -> bytes:
+    return asdlCodec.encode(x, encodeResultTyTo)
+
+def decodeResultTy(data: bytes) -> resultTy:
+    return asdlCodec.decode(data, decodeResultTyFrom, Ident)
+
+def encodeResultTyList(xs: Sequence[resultTy]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeResultTyTo)
+
+def decodeResultTyList(data: bytes) -> list[resultTy]:
+    return asdlCodec.decodeList(data, decodeResultTyFrom, Ident)
+
+def _encodeIntConst(w: Writer, x: IntConst):
+    w.buf.append(0)
+    w.int(x.value)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _encodeBoolConst(w: Writer, x: BoolConst):
+    w.buf.append(1)
+    w.buf.append(1 if x.value else 0)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _encodeName(w: Writer, x: Name):
+    w.buf.append(2)
+    w.str(x.name.name)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _encodeCall(w: Writer, x: Call):
+    w.buf.append(3)
+    w.str(x.name.name)
+    args = x.args
+    w.uint(len(args))
+    for y in args:
+        encodeExpTo(w, y)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _encodeUnOp(w: Writer, x: UnOp):
+    w.buf.append(4)
+    encodeUnaryopTo(w, x.op)
+    encodeExpTo(w, x.arg)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _encodeBinOp(w: Writer, x: BinOp):
+    w.buf.append(5)
+    encodeExpTo(w, x.left)
+    encodeBinaryopTo(w, x.op)
+    encodeExpTo(w, x.right)
+    ty = x.ty
+    if ty is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        encodeResultTyTo(w, ty)
+
+def _decodeIntConst(r: Reader, strs: list[str], idents: list[Ident]) -> IntConst:
+    return IntConst(((n := (b if (b := r()) < 128 else readUint(b, r))) >> 1) ^ -(n & 1), _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+def _decodeBoolConst(r: Reader, strs: list[str], idents: list[Ident]) -> BoolConst:
+    return BoolConst(r() == 1, _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+def _decodeName(r: Reader, strs: list[str], idents: list[Ident]) -> Name:
+    return Name(idents[(b if (b := r()) < 128 else readUint(b, r))], _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+def _decodeCall(r: Reader, strs: list[str], idents: list[Ident]) -> Call:
+    return Call(idents[(b if (b := r()) < 128 else readUint(b, r))], [_expDecoders[r()](r, strs, idents) for _ in range(uint(r))], _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+def _decodeUnOp(r: Reader, strs: list[str], idents: list[Ident]) -> UnOp:
+    return UnOp(_unaryopDecoders[r()](r, strs, idents), _expDecoders[r()](r, strs, idents), _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+def _decodeBinOp(r: Reader, strs: list[str], idents: list[Ident]) -> BinOp:
+    return BinOp(_expDecoders[r()](r, strs, idents), _binaryopDecoders[r()](r, strs, idents), _expDecoders[r()](r, strs, idents), _resultTyDecoders[r()](r, strs, idents) if r() else None)
+
+_expEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    IntConst: _encodeIntConst,
+    BoolConst: _encodeBoolConst,
+    Name: _encodeName,
+    Call: _encodeCall,
+    UnOp: _encodeUnOp,
+    BinOp: _encodeBinOp,
+}
+
+_expDecoders: tuple[Callable[[Reader, list[str], list[Ident]], exp], ...] = (
+    _decodeIntConst,
+    _decodeBoolConst,
+    _decodeName,
+    _decodeCall,
+    _decodeUnOp,
+    _decodeBinOp,
+)
+
+def encodeExpTo(w: Writer, x: exp):
+    _expEncoders[type(x)](w, x)
+
+def decodeExpFrom(r: Reader, strs: list[str], idents: list[Ident]) -> exp:
+    return _expDecoders[r()](r, strs, idents)
+
+def encodeExp(x: exp) -> bytes:
+    return asdlCodec.encode(x, encodeExpTo)
+
+def decodeExp(data: bytes) -> exp:
+    return asdlCodec.decode(data, decodeExpFrom, Ident)
+
+def encodeExpList(xs: Sequence[exp]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeExpTo)
+
+def decodeExpList(data: bytes) -> list[exp]:
+    return asdlCodec.decodeList(data, decodeExpFrom, Ident)
+
+def _encodeStmtExp(w: Writer, x: StmtExp):
+    w.buf.append(0)
+    encodeExpTo(w, x.exp)
+
+def _encodeAssign(w: Writer, x: Assign):
+    w.buf.append(1)
+    w.str(x.var.name)
+    encodeExpTo(w, x.right)
+
+def _encodeIfStmt(w: Writer, x: IfStmt):
+    w.buf.append(2)
+    encodeExpTo(w, x.cond)
+    thenBody = x.thenBody
+    w.uint(len(thenBody))
+    for y in thenBody:
+        encodeStmtTo(w, y)
+    elseBody = x.elseBody
+    w.uint(len(elseBody))
+    for y in elseBody:
+        encodeStmtTo(w, y)
+
+def _encodeWhileStmt(w: Writer, x: WhileStmt):
+    w.buf.append(3)
+    encodeExpTo(w, x.cond)
+    body = x.body
+    w.uint(len(body))
+    for y in body:
+        encodeStmtTo(w, y)
+
+def _decodeStmtExp(r: Reader, strs: list[str], idents: list[Ident]) -> StmtExp:
+    return StmtExp(_expDecoders[r()](r, strs, idents))
+
+def _decodeAssign(r: Reader, strs: list[str], idents: list[Ident]) -> Assign:
+    return Assign(idents[(b if (b := r()) < 128 else readUint(b, r))], _expDecoders[r()](r, strs, idents))
+
+def _decodeIfStmt(r: Reader, strs: list[str], idents: list[Ident]) -> IfStmt:
+    return IfStmt(_expDecoders[r()](r, strs, idents), [_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))], [_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+def _decodeWhileStmt(r: Reader, strs: list[str], idents: list[Ident]) -> WhileStmt:
+    return WhileStmt(_expDecoders[r()](r, strs, idents), [_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+_stmtEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    StmtExp: _encodeStmtExp,
+    Assign: _encodeAssign,
+    IfStmt: _encodeIfStmt,
+    WhileStmt: _encodeWhileStmt,
+}
+
+_stmtDecoders: tuple[Callable[[Reader, list[str], list[Ident]], stmt], ...] = (
+    _decodeStmtExp,
+    _decodeAssign,
+    _decodeIfStmt,
+    _decodeWhileStmt,
+)
+
+def encodeStmtTo(w: Writer, x: stmt):
+    _stmtEncoders[type(x)](w, x)
+
+def decodeStmtFrom(r: Reader, strs: list[str], idents: list[Ident]) -> stmt:
+    return _stmtDecoders[r()](r, strs, idents)
+
+def encodeStmt(x: stmt) -> bytes:
+    return asdlCodec.encode(x, encodeStmtTo)
+
+def decodeStmt(data: bytes) -> stmt:
+    return asdlCodec.decode(data, decodeStmtFrom, Ident)
+
+def encodeStmtList(xs: Sequence[stmt]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeStmtTo)
+
+def decodeStmtList(data: bytes) -> list[stmt]:
+    return asdlCodec.decodeList(data, decodeStmtFrom, Ident)
+
+def _encodeModule(w: Writer, x: Module):
+    w.buf.append(0)
+    stmts = x.stmts
+    w.uint(len(stmts))
+    for y in stmts:
+        encodeStmtTo(w, y)
+
+def _decodeModule(r: Reader, strs: list[str], idents: list[Ident]) -> Module:
+    return Module([_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+_modEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Module: _encodeModule,
+}
+
+_modDecoders: tuple[Callable[[Reader, list[str], list[Ident]], mod], ...] = (
+    _decodeModule,
+)
+
+def encodeModTo(w: Writer, x: mod):
+    _modEncoders[type(x)](w, x)
+
+def decodeModFrom(r: Reader, strs: list[str], idents: list[Ident]) -> mod:
+    return _modDecoders[r()](r, strs, idents)
+
+def encodeMod(x: mod) -> bytes:
+    return asdlCodec.encode(x, encodeModTo)
+
+def decodeMod(data: bytes) -> mod:
+    return asdlCodec.decode(data, decodeModFrom, Ident)
+
+def encodeModList(xs: Sequence[mod]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeModTo)
+
+def decodeModList(data: bytes) -> list[mod]:
+    return asdlCodec.decodeList(data, decodeModFrom, Ident)
+
+_expChildren: tuple[Callable[[Any], Sequence[exp]], ...] = (
+    lambda x: (),
+    lambda x: (),
+    lambda x: (),
+    lambda x: x.args,
+    lambda x: (x.arg,),
+    lambda x: (x.left, x.right),
+)
+
+_expRebuild: tuple[Callable[[Any, list[exp]], exp], ...] = (
+    lambda x, cs: x,
+    lambda x, cs: x,
+    lambda x, cs: x,
+    lambda x, cs: Call(x.name, cs[0:len(x.args)], x.ty),
+    lambda x, cs: UnOp(x.op, cs[0], x.ty),
+    lambda x, cs: BinOp(cs[0], x.op, cs[1], x.ty),
+)
+
+def expChildren(x: exp) -> Sequence[exp]:
+    return _expChildren[x.tag](x)
+
+def _rebuildExp(x: exp, cs: list[exp]) -> exp:
+    return _expRebuild[x.tag](x, cs)
+
+def foldExp[R](x: exp, f: Callable[[exp, list[R]], R]) -> R:
+    return traversal.fold(x, expChildren, f)
+
+def transformExp(x: exp, f: Callable[[exp], exp]) -> exp:
+    return traversal.transform(x, expChildren, _rebuildExp, f)
+
+_stmtChildren: tuple[Callable[[Any], Sequence[stmt]], ...] = (
+    lambda x: (),
+    lambda x: (),
+    lambda x: (*x.thenBody, *x.elseBody),
+    lambda x: x.body,
+)
+
+_stmtRebuild: tuple[Callable[[Any, list[stmt]], stmt], ...] = (
+    lambda x, cs: x,
+    lambda x, cs: x,
+    lambda x, cs: IfStmt(x.cond, cs[0:len(x.thenBody)], cs[len(x.thenBody):len(x.thenBody) + len(x.elseBody)]),
+    lambda x, cs: WhileStmt(x.cond, cs[0:len(x.body)]),
+)
+
+def stmtChildren(x: stmt) -> Sequence[stmt]:
+    return _stmtChildren[x.tag](x)
+
+def _rebuildStmt(x: stmt, cs: list[stmt]) -> stmt:
+    return _stmtRebuild[x.tag](x, cs)
+
+def foldStmt[R](x: stmt, f: Callable[[stmt, list[R]], R]) -> R:
+    return traversal.fold(x, stmtChildren, f)
 
-type mod = Module
\ No newline at end of file
+def transformStmt(x: stmt, f: Callable[[stmt], stmt]) -> stmt:
+    return traversal.transform(x, stmtChildren, _rebuildStmt, f)
@@ -6,7 +6,7 @@ from typing import *
 type Environ = dict[Ident, TyValue]
 type TyValue = int | bool
 
-def interpFuncall(id: ident, args: list[exp], env: Environ) -> Optional[TyValue]:
+def interpFuncall(id: ident, args: Sequence[exp], env: Environ) -> Optional[TyValue]:
     match (id.name, args):
         case ('input_int', []):
             return int(utils.inputInt('Enter some int: '))
@@ -56,7 +56,7 @@ def interpExp(e: exp, env: Environ) -> Optional[TyValue]:
             return env[name]
     raise Exception(f'No match for expression {e}')
 
-def interpStmt(s: stmt, env: Environ, cont: list[stmt]) -> None:
+def interpStmt(s: stmt, env: Environ, cont: Sequence[stmt]) -> None:
     match s:
         case StmtExp(e):
             interpExp(e, env)
@@ -68,17 +68,17 @@ def interpStmt(s: stmt, env: Environ, cont: list[stmt]) -> None:
         case IfStmt(cond, thenBody, elseBody):
             v: Any = interpExp(cond, env)
             if v:
-                interpStmts(thenBody + cont, env)
+                interpStmts([*thenBody, *cont], env)
             else:
-                interpStmts(elseBody + cont, env)
+                interpStmts([*elseBody, *cont], env)
         case WhileStmt(cond, body):
             v: Any = interpExp(cond, env)
             if v:
-                interpStmts(body + [s] + cont, env)
+                interpStmts([*body, s, *cont], env)
             else:
                 interpStmts(cont, env)
 
-def interpStmts(stmts: list[stmt], env: Environ) -> None:
+def interpStmts(stmts: Sequence[stmt], env: Environ) -> None:
     if len(stmts) > 0:
         interpStmt(stmts[0], env, stmts[1:])
 
@@ -4,7 +4,6 @@ from lang_loop.loop_ast import *
 from common.compilerSupport import *
 import common.log as log
 import common.symtab as symtab
-import pprint
 
 type Symtab = symtab.Symtab[ident, ty]
 
@@ -23,7 +22,7 @@ def assertTy(expected: ty, given: resultTy, what: str):
             if expected != t:
                 raise CompileError.typeError(f'{what} should have type {expected} but has type {t}')
 
-def tycheckFuncall(id: ident, args: list[exp], st: Symtab) -> resultTy:
+def tycheckFuncall(id: ident, args: Sequence[exp], st: Symtab) -> resultTy:
     match (id.name, args):
         case ('input_int', []):
             return NotVoid(Int())
@@ -113,7 +112,7 @@ def tycheckStmt(s: stmt, st: Symtab):
             tycheckStmts(body, nested)
             st.mergeBack(nested, untaken)
 
-def tycheckStmts(stmts: list[stmt], st: Symtab):
+def tycheckStmts(stmts: Sequence[stmt], st: Symtab):
     for s in stmts:
         tycheckStmt(s, st)
 
@@ -125,5 +124,5 @@ def tycheckModule(m: mod) -> Symtab:
     st: Symtab = symtab.Symtab()
     tycheckStmts(m.stmts, st)
     log.debug(f'Symtab after typechecking: {st}')
-    log.debug(f'AST after typechecking: {pprint.pformat(m)}')
+    log.debugPretty('AST after typechecking: ', m)
     return st
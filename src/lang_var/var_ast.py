@@ -1,75 +1,431 @@
-# AUTOMATICALLY GENERATED (2024-03-13 15:00:03)
+# AUTOMATICALLY GENERATED (2026-10-17 09:05:18)
 from __future__ import annotations
 from dataclasses import dataclass
+from abc import ABC, abstractmethod
+from typing import Any, Callable, ClassVar, Sequence
+from weakref import WeakValueDictionary
+from common.asdlCodec import Reader, Writer, readUint, uint
+import common.asdlCodec as asdlCodec
+import common.traversal as traversal
 
 type optional[T] = T | None
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False, init=False, slots=True, weakref_slot=True)
 class Ident:
+    _instances: ClassVar[WeakValueDictionary[tuple[Any, ...], Ident]] = WeakValueDictionary()
     name: str
 
+    def __new__(cls, name: str) -> Ident:
+        key = (name,)
+        x = cls._instances.get(key)
+        if x is None:
+            x = object.__new__(cls)
+            object.__setattr__(x, 'name', name)
+            cls._instances[key] = x
+        return x
+
+    def __reduce__(self):
+        return (type(self), (self.name,))
+
 type ident = Ident
 type string = str
 
-@dataclass
+@dataclass(slots=True)
 class USub:
-    pass
+    tag: ClassVar[int] = 0
 
 type unaryop = USub
 
-@dataclass
+@dataclass(slots=True)
 class Add:
-    pass
+    tag: ClassVar[int] = 0
 
-@dataclass
+@dataclass(slots=True)
 class Sub:
-    pass
+    tag: ClassVar[int] = 1
 
-@dataclass
+@dataclass(slots=True)
 class Mul:
-    pass
+    tag: ClassVar[int] = 2
 
 type binaryop = Add | Sub | Mul
 
-@dataclass
+class BinaryopVisitor[R, C](ABC):
+    _binaryopTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._binaryopTable = (cls.visitAdd, cls.visitSub, cls.visitMul)
+
+    def visitBinaryop(self, x: binaryop, ctx: C) -> R:
+        return self._binaryopTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitAdd(self, x: Add, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitSub(self, x: Sub, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitMul(self, x: Mul, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class IntConst:
+    tag: ClassVar[int] = 0
     value: int
 
-@dataclass
+@dataclass(slots=True)
 class Name:
+    tag: ClassVar[int] = 1
     name: ident
 
-@dataclass
+@dataclass(slots=True)
 class Call:
+    tag: ClassVar[int] = 2
     name: ident
-    args: list[exp]
+    args: Sequence[exp]
+
+    def __post_init__(self):
+        self.args = tuple(self.args)
 
-@dataclass
+@dataclass(slots=True)
 class UnOp:
+    tag: ClassVar[int] = 3
     op: unaryop
     arg: exp
 
-@dataclass
+@dataclass(slots=True)
 class BinOp:
+    tag: ClassVar[int] = 4
     left: exp
     op: binaryop
     right: exp
 
 type exp = IntConst | Name | Call | UnOp | BinOp
 
-@dataclass
+class ExpVisitor[R, C](ABC):
+    _expTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._expTable = (cls.visitIntConst, cls.visitName, cls.visitCall, cls.visitUnOp, cls.visitBinOp)
+
+    def visitExp(self, x: exp, ctx: C) -> R:
+        return self._expTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitIntConst(self, x: IntConst, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitName(self, x: Name, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitCall(self, x: Call, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitUnOp(self, x: UnOp, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitBinOp(self, x: BinOp, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class StmtExp:
+    tag: ClassVar[int] = 0
     exp: exp
 
-@dataclass
+@dataclass(slots=True)
 class Assign:
+    tag: ClassVar[int] = 1
     var: ident
     right: exp
 
 type stmt = StmtExp | Assign
 
-@dataclass
+class StmtVisitor[R, C](ABC):
+    _stmtTable: ClassVar[tuple[Callable[..., Any], ...]]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._stmtTable = (cls.visitStmtExp, cls.visitAssign)
+
+    def visitStmt(self, x: stmt, ctx: C) -> R:
+        return self._stmtTable[x.tag](self, x, ctx)
+
+    @abstractmethod
+    def visitStmtExp(self, x: StmtExp, ctx: C) -> R: ...
+
+    @abstractmethod
+    def visitAssign(self, x: Assign, ctx: C) -> R: ...
+
+@dataclass(slots=True)
 class Module:
-    stmts: list[stmt]
+    tag: ClassVar[int] = 0
+    stmts: Sequence[stmt]
+
+    def __post_init__(self):
+        self.stmts = tuple(self.stmts)
 
 type mod = Module
+
+def _encodeUSub(w: Writer, x: USub):
+    w.buf.append(0)
+
+def _decodeUSub(r: Reader, strs: list[str], idents: list[Ident]) -> USub:
+    return USub()
+
+_unaryopEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    USub: _encodeUSub,
+}
+
+_unaryopDecoders: tuple[Callable[[Reader, list[str], list[Ident]], unaryop], ...] = (
+    _decodeUSub,
+)
+
+def encodeUnaryopTo(w: Writer, x: unaryop):
+    _unaryopEncoders[type(x)](w, x)
+
+def decodeUnaryopFrom(r: Reader, strs: list[str], idents: list[Ident]) -> unaryop:
+    return _unaryopDecoders[r()](r, strs, idents)
+
+def encodeUnaryop(x: unaryop) -> bytes:
+    return asdlCodec.encode(x, encodeUnaryopTo)
+
+def decodeUnaryop(data: bytes) -> unaryop:
+    return asdlCodec.decode(data, decodeUnaryopFrom, Ident)
+
+def encodeUnaryopList(xs: Sequence[unaryop]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeUnaryopTo)
+
+def decodeUnaryopList(data: bytes) -> list[unaryop]:
+    return asdlCodec.decodeList(data, decodeUnaryopFrom, Ident)
+
+def _encodeAdd(w: Writer, x: Add):
+    w.buf.append(0)
+
+def _encodeSub(w: Writer, x: Sub):
+    w.buf.append(1)
+
+def _encodeMul(w: Writer, x: Mul):
+    w.buf.append(2)
+
+def _decodeAdd(r: Reader, strs: list[str], idents: list[Ident]) -> Add:
+    return Add()
+
+def _decodeSub(r: Reader, strs: list[str], idents: list[Ident]) -> Sub:
+    return Sub()
+
+def _decodeMul(r: Reader, strs: list[str], idents: list[Ident]) -> Mul:
+    return Mul()
+
+_binaryopEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Add: _encodeAdd,
+    Sub: _encodeSub,
+    Mul: _encodeMul,
+}
+
+_binaryopDecoders: tuple[Callable[[Reader, list[str], list[Ident]], binaryop], ...] = (
+    _decodeAdd,
+    _decodeSub,
+    _decodeMul,
+)
+
+def encodeBinaryopTo(w: Writer, x: binaryop):
+    _binaryopEncoders[type(x)](w, x)
+
+def decodeBinaryopFrom(r: Reader, strs: list[str], idents: list[Ident]) -> binaryop:
+    return _binaryopDecoders[r()](r, strs, idents)
+
+def encodeBinaryop(x: binaryop) -> bytes:
+    return asdlCodec.encode(x, encodeBinaryopTo)
+
+def decodeBinaryop(data: bytes) -> binaryop:
+    return asdlCodec.decode(data, decodeBinaryopFrom, Ident)
+
+def encodeBinaryopList(xs: Sequence[binaryop]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeBinaryopTo)
+
+def decodeBinaryopList(data: bytes) -> list[binaryop]:
+    return asdlCodec.decodeList(data, decodeBinaryopFrom, Ident)
+
+def _encodeIntConst(w: Writer, x: IntConst):
+    w.buf.append(0)
+    w.int(x.value)
+
+def _encodeName(w: Writer, x: Name):
+    w.buf.append(1)
+    w.str(x.name.name)
+
+def _encodeCall(w: Writer, x: Call):
+    w.buf.append(2)
+    w.str(x.name.name)
+    args = x.args
+    w.uint(len(args))
+    for y in args:
+        encodeExpTo(w, y)
+
+def _encodeUnOp(w: Writer, x: UnOp):
+    w.buf.append(3)
+    encodeUnaryopTo(w, x.op)
+    encodeExpTo(w, x.arg)
+
+def _encodeBinOp(w: Writer, x: BinOp):
+    w.buf.append(4)
+    encodeExpTo(w, x.left)
+    encodeBinaryopTo(w, x.op)
+    encodeExpTo(w, x.right)
+
+def _decodeIntConst(r: Reader, strs: list[str], idents: list[Ident]) -> IntConst:
+    return IntConst(((n := (b if (b := r()) < 128 else readUint(b, r))) >> 1) ^ -(n & 1))
+
+def _decodeName(r: Reader, strs: list[str], idents: list[Ident]) -> Name:
+    return Name(idents[(b if (b := r()) < 128 else readUint(b, r))])
+
+def _decodeCall(r: Reader, strs: list[str], idents: list[Ident]) -> Call:
+    return Call(idents[(b if (b := r()) < 128 else readUint(b, r))], [_expDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+def _decodeUnOp(r: Reader, strs: list[str], idents: list[Ident]) -> UnOp:
+    return UnOp(_unaryopDecoders[r()](r, strs, idents), _expDecoders[r()](r, strs, idents))
+
+def _decodeBinOp(r: Reader, strs: list[str], idents: list[Ident]) -> BinOp:
+    return BinOp(_expDecoders[r()](r, strs, idents), _binaryopDecoders[r()](r, strs, idents), _expDecoders[r()](r, strs, idents))
+
+_expEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    IntConst: _encodeIntConst,
+    Name: _encodeName,
+    Call: _encodeCall,
+    UnOp: _encodeUnOp,
+    BinOp: _encodeBinOp,
+}
+
+_expDecoders: tuple[Callable[[Reader, list[str], list[Ident]], exp], ...] = (
+    _decodeIntConst,
+    _decodeName,
+    _decodeCall,
+    _decodeUnOp,
+    _decodeBinOp,
+)
+
+def encodeExpTo(w: Writer, x: exp):
+    _expEncoders[type(x)](w, x)
+
+def decodeExpFrom(r: Reader, strs: list[str], idents: list[Ident]) -> exp:
+    return _expDecoders[r()](r, strs, idents)
+
+def encodeExp(x: exp) -> bytes:
+    return asdlCodec.encode(x, encodeExpTo)
+
+def decodeExp(data: bytes) -> exp:
+    return asdlCodec.decode(data, decodeExpFrom, Ident)
+
+def encodeExpList(xs: Sequence[exp]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeExpTo)
+
+def decodeExpList(data: bytes) -> list[exp]:
+    return asdlCodec.decodeList(data, decodeExpFrom, Ident)
+
+def _encodeStmtExp(w: Writer, x: StmtExp):
+    w.buf.append(0)
+    encodeExpTo(w, x.exp)
+
+def _encodeAssign(w: Writer, x: Assign):
+    w.buf.append(1)
+    w.str(x.var.name)
+    encodeExpTo(w, x.right)
+
+def _decodeStmtExp(r: Reader, strs: list[str], idents: list[Ident]) -> StmtExp:
+    return StmtExp(_expDecoders[r()](r, strs, idents))
+
+def _decodeAssign(r: Reader, strs: list[str], idents: list[Ident]) -> Assign:
+    return Assign(idents[(b if (b := r()) < 128 else readUint(b, r))], _expDecoders[r()](r, strs, idents))
+
+_stmtEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    StmtExp: _encodeStmtExp,
+    Assign: _encodeAssign,
+}
+
+_stmtDecoders: tuple[Callable[[Reader, list[str], list[Ident]], stmt], ...] = (
+    _decodeStmtExp,
+    _decodeAssign,
+)
+
+def encodeStmtTo(w: Writer, x: stmt):
+    _stmtEncoders[type(x)](w, x)
+
+def decodeStmtFrom(r: Reader, strs: list[str], idents: list[Ident]) -> stmt:
+    return _stmtDecoders[r()](r, strs, idents)
+
+def encodeStmt(x: stmt) -> bytes:
+    return asdlCodec.encode(x, encodeStmtTo)
+
+def decodeStmt(data: bytes) -> stmt:
+    return asdlCodec.decode(data, decodeStmtFrom, Ident)
+
+def encodeStmtList(xs: Sequence[stmt]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeStmtTo)
+
+def decodeStmtList(data: bytes) -> list[stmt]:
+    return asdlCodec.decodeList(data, decodeStmtFrom, Ident)
+
+def _encodeModule(w: Writer, x: Module):
+    w.buf.append(0)
+    stmts = x.stmts
+    w.uint(len(stmts))
+    for y in stmts:
+        encodeStmtTo(w, y)
+
+def _decodeModule(r: Reader, strs: list[str], idents: list[Ident]) -> Module:
+    return Module([_stmtDecoders[r()](r, strs, idents) for _ in range(uint(r))])
+
+_modEncoders: dict[type[Any], Callable[[Writer, Any], None]] = {
+    Module: _encodeModule,
+}
+
+_modDecoders: tuple[Callable[[Reader, list[str], list[Ident]], mod], ...] = (
+    _decodeModule,
+)
+
+def encodeModTo(w: Writer, x: mod):
+    _modEncoders[type(x)](w, x)
+
+def decodeModFrom(r: Reader, strs: list[str], idents: list[Ident]) -> mod:
+    return _modDecoders[r()](r, strs, idents)
+
+def encodeMod(x: mod) -> bytes:
+    return asdlCodec.encode(x, encodeModTo)
+
+def decodeMod(data: bytes) -> mod:
+    return asdlCodec.decode(data, decodeModFrom, Ident)
+
+def encodeModList(xs: Sequence[mod]) -> bytes:
+    return asdlCodec.encodeList(xs, encodeModTo)
+
+def decodeModList(data: bytes) -> list[mod]:
+    return asdlCodec.decodeList(data, decodeModFrom, Ident)
+
+_expChildren: tuple[Callable[[Any], Sequence[exp]], ...] = (
+    lambda x: (),
+    lambda x: (),
+    lambda x: x.args,
+    lambda x: (x.arg,),
+    lambda x: (x.left, x.right),
+)
+
+_expRebuild: tuple[Callable[[Any, list[exp]], exp], ...] = (
+    lambda x, cs: x,
+    lambda x, cs: x,
+    lambda x, cs: Call(x.name, cs[0:len(x.args)]),
+    lambda x, cs: UnOp(x.op, cs[0]),
+    lambda x, cs: BinOp(cs[0], x.op, cs[1]),
+)
+
+def expChildren(x: exp) -> Sequence[exp]:
+    return _expChildren[x.tag](x)
+
+def _rebuildExp(x: exp, cs: list[exp]) -> exp:
+    return _expRebuild[x.tag](x, cs)
+
+def foldExp[R](x: exp, f: Callable[[exp, list[R]], R]) -> R:
+    return traversal.fold(x, expChildren, f)
+
+def transformExp(x: exp, f: Callable[[exp], exp]) -> exp:
+    return traversal.transform(x, expChildren, _rebuildExp, f)
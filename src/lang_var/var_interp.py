@@ -6,7 +6,7 @@ from typing import *
 type Env = dict[Ident, TyValue]
 type TyValue = int
 
-def interpFuncall(id: ident, args: list[exp], env: Env) -> TyValue | None:
+def interpFuncall(id: ident, args: Sequence[exp], env: Env) -> TyValue | None:
     match (id.name, args):
         case ('input_int', []):
             return int(utils.inputInt('Enter some int: '))
@@ -45,7 +45,7 @@ def interpStmt(s: stmt, env: Env) -> None:
             v: Any = interpExp(e, env)
             env[x] = v
 
-def interpStmts(stmts: list[stmt], env: Env) -> None:
+def interpStmts(stmts: Sequence[stmt], env: Env) -> None:
     for stmt in stmts:
         interpStmt(stmt, env)
 
@@ -9,7 +9,7 @@ def assertTy(expected: ty, given: ty, what: str):
     if expected != given:
         raise CompileError.typeError(f'{what} should have type {expected} but has type {given}')
 
-def tycheckFuncall(id: ident, args: list[exp], vars: set[ident]) -> ty:
+def tycheckFuncall(id: ident, args: Sequence[exp], vars: set[ident]) -> ty:
     match (id.name, args):
         case ('input_int', []):
             return 'Int'
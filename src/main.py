@@ -3,6 +3,7 @@ from typing import *
 import common.genericCompiler as genericCompiler
 import common.genericInterp as genericInterp
 import common.genericParser as genericParser
+import common.astCache as astCache
 import common.utils as utils
 import common.log as log
 import common.constants as constants
@@ -16,12 +17,16 @@ import os
 import typing
 
 DEFAULT_OUTPUT = 'out.wasm'
+AST_CACHE_ENV = 'MINIPY_AST_CACHE'
 
 def parseArgs():
     parser = argparse.ArgumentParser(description=f'Run the compiler or interpreter for some language')
     parser.add_argument('--lang', choices=['simple', 'var', 'loop', 'array', 'fun', 'tinyJson'],
                         help='The language (guessed from path of input file if not given)')
     parser.add_argument('--level', help='The loglevel (debug, info, warn)')
+    parser.add_argument('--ast-cache', metavar='DIR', default=os.environ.get(AST_CACHE_ENV),
+                        help=f'Directory for caching parsed ASTs (default: ${AST_CACHE_ENV}, ' \
+                            'no caching if unset)')
     subparsers = parser.add_subparsers(help='Commands', dest='cmd')
 
     helpCompiler = f'''Compiles the given input file. Depending on the extension of the output file,
@@ -81,13 +86,20 @@ exit codes signal a bug in the compiler itself.'''
                    help='Optional .lark grammar')
     p.add_argument('--png', type=str, metavar='FILE',
                    help='Optional .png for for parse tree visualization')
-    p.add_argument('input', help='Input file .py')
+    p.add_argument('--corpus', type=str, metavar='DIR',
+                   help='Check all .py files in DIR: compare the ASTs of our own parser and ' \
+                       'of the python parser')
+    p.add_argument('--jobs', type=int, default=1, metavar='N',
+                   help='Number of processes for --corpus (default: 1)')
+    p.add_argument('input', nargs='?', help='Input file .py')
 
     args = parser.parse_args()
     if args.cmd is None:
         utils.abort(f'No command given')
     if args.lang == 'simple' and args.cmd != 'parse':
         utils.abort('Language simple only available when parsing')
+    if args.cmd == 'parse' and args.corpus is None and args.input is None:
+        utils.abort('Either an input file or --corpus must be given')
     return args
 
 def importModule(lang: str, kind: Literal['compile', 'interp', 'ast', 'parse']):
@@ -138,15 +150,18 @@ def main():
     args = parseArgs()
     level = log.resolveLevelName(args.level or 'warn')
     log.init(level, 'minipy.log')
+    if args.ast_cache:
+        astCache.configure(args.ast_cache)
     if args.lang:
         lang = args.lang
     else:
         lang = None
-        for x in args.input.split(os.sep):
+        path = args.input if args.input is not None else args.corpus
+        for x in path.split(os.sep):
             if x.startswith('lang_'):
                 lang = x[len('lang_'):]
         if lang is None:
-            if args.input.endswith('.json'):
+            if path.endswith('.json'):
                 lang = 'tinyJson'
             else:
                 utils.abort(f'Language not given with --lang and input file does not allow guessing '\
@@ -171,6 +186,14 @@ def main():
             genericInterp.interpMain(interpArgs, interpFun, ast)
         case "pyrun":
             runWithPython(args.input)
+        case "parse" if args.corpus is not None:
+            if lang in ['simple', 'tinyJson']:
+                utils.abort(f'--corpus not supported for language {lang}')
+            parserArgs = genericParser.ParserArgs('', args.alg, None, args.grammar)
+            results = genericParser.parseCorpus(args.corpus, parserArgs, f'lang_{lang}.{lang}_ast',
+                                                f'parsers.lang_{lang}.{lang}_parser', args.jobs)
+            if not all(r.ok for r in results):
+                sys.exit(1)
         case "parse":
             parserArgs = genericParser.ParserArgs(utils.readTextFile(args.input),
                                                   args.alg, args.png, args.grammar)
@@ -1,22 +1,37 @@
 from typing import *
-from lark import Lark, Token, Tree, ParseTree, tree, exceptions
+import lark
+from lark import Lark, Token, Tree, ParseTree, Transformer, tree, exceptions
 import pydot
 import common.log as log
 import common.utils as utils
 from dataclasses import dataclass
 import os
+import hashlib
 
 type ParseAlg = Literal['earley', 'lalr']
 
+class LexToken(NamedTuple):
+    """
+    Compact token produced by parsers.fastLexer. Like lark's Token, it provides the type
+    and the value attributes. start and end are offsets into the source code.
+    """
+    type: str
+    value: str
+    start: int
+    end: int
+
+type AnyToken = Token | LexToken
+
 class TokenStream:
     """
-    Essentially an iterator with lookahead functionality.
+    Essentially an iterator with lookahead functionality. Works with lark tokens and with
+    the compact tokens of parsers.fastLexer.
     """
     eof = Token('$END', '')
-    def __init__(self, tokens: Iterable[Token]):
+    def __init__(self, tokens: Iterable[AnyToken]):
         self.tokenIter = iter(tokens)
         self._lookahead = None
-    def next(self) -> Token:
+    def next(self) -> AnyToken:
         """
         Returns the next token, thereby consuming the token.
         """
@@ -28,14 +43,14 @@ class TokenStream:
             return next(self.tokenIter)
         except StopIteration:
             return TokenStream.eof
-    def lookahead(self):
+    def lookahead(self) -> AnyToken:
         """
         Returns the next token without consuming it.
         """
         if self._lookahead is None:
             self._lookahead = self.next()
         return self._lookahead
-    def ensureNext(self, tokenType: str) -> Token:
+    def ensureNext(self, tokenType: str) -> AnyToken:
         """
         Consumes the next token, but only if it has the given type.
         Otherwise, ensureNext throws a ParseError
@@ -46,16 +61,28 @@ class TokenStream:
         else:
             self.next()
             return t
+    def dispatch[T](self, ruleName: str, table: dict[str, Callable[['TokenStream'], T]]) -> T:
+        """
+        Calls the parsing function registered for the type of the next token.
+        Throws a ParseError if there is no such function.
+        """
+        t = self.lookahead()
+        f = table.get(t.type)
+        if f is None:
+            expected = ', '.join(sorted(table))
+            raise ParseError(f'Unexpected token {t} (token type: {t.type}) for rule {ruleName}. ' \
+                f'Expected: {expected}')
+        return f(self)
     def ensureEof(self, code: str):
         """
         Ensures that the next token is end-of-file.
         """
         t = self.lookahead()
-        if t != TokenStream.eof:
+        if t.type != TokenStream.eof.type:
             raise ParseError(f'Parsing {code} did not consume all tokens. ' \
                 f'Tokens left: {[t] + self._list()}')
-    def _list(self) -> list[Token]:
-        l: list[Token] = []
+    def _list(self) -> list[AnyToken]:
+        l: list[AnyToken] = []
         if self._lookahead:
             l.append(self._lookahead)
         return l + list(self.tokenIter)
@@ -121,19 +148,98 @@ class ParseError(Exception):
     def __init__(self, msg: str):
         super().__init__(msg)
 
-def mkLexer(grammarFile: str) -> Lark:
-    return mkParser('earley', grammarFile, 'start')
+def mkLexer(grammarFile: str, start: str = 'start') -> Lark:
+    """
+    Returns a lark object that is only used for its lexer. No parser is constructed, so
+    grammars with LALR conflicts or ambiguities can be lexed as well. Lexers are cached
+    in-process.
+    """
+    grammar = utils.readTextFile(grammarFile)
+    key = (grammar, start)
+    lexer = _lexerCache.get(key)
+    if lexer is None:
+        try:
+            lexer = Lark(grammar, start=start, parser=None, lexer='basic')
+        except exceptions.LarkError as err:
+            raise ParseError(f'Error constructing lexer from grammar in {grammarFile}: {err}')
+        _lexerCache[key] = lexer
+    return lexer
+
+# Directory for serialized parsers. Set to None to disable the on-disk cache.
+PARSER_CACHE_DIR: Optional[str] = '.parser_cache'
 
-def mkParser(alg: ParseAlg, grammarFile: str, start: str) -> Lark:
+_parserCache: dict[tuple[str, ParseAlg, str, str], Lark] = {}
+_lexerCache: dict[tuple[str, str], Lark] = {}
+
+type InlineTransformer = Transformer[Token, Any]
+
+def parserCacheKey(grammar: str, alg: ParseAlg, start: str) -> str:
+    """
+    Hash identifying a parser constructed from the given grammar, algorithm and start symbol.
+    """
+    h = hashlib.sha256()
+    for x in [lark.__version__, alg, start, grammar]:
+        h.update(x.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+def clearParserCache():
+    """
+    Clears the in-process parser cache (the on-disk cache is left untouched).
+    """
+    _parserCache.clear()
+    _lexerCache.clear()
+
+def _cacheFile(key: str) -> str | bool:
+    """
+    Returns the file for lark's cache option, or False if the on-disk cache is disabled.
+    """
+    if PARSER_CACHE_DIR is None:
+        return False
+    try:
+        os.makedirs(PARSER_CACHE_DIR, exist_ok=True)
+    except OSError as err:
+        log.debug(f'Not caching parsers in {PARSER_CACHE_DIR}: {err}')
+        return False
+    return os.path.join(PARSER_CACHE_DIR, key + '.lark')
+
+def mkParser(alg: ParseAlg, grammarFile: str, start: str,
+             transformer: Optional[InlineTransformer] = None) -> Lark:
+    """
+    Constructs a parser for the given grammar. Parsers are cached in-process, keyed by the
+    content of the grammar, the algorithm and the start symbol. LALR parsers are additionally
+    cached on disk in PARSER_CACHE_DIR (lark cannot serialize earley parsers).
+
+    If transformer is given, the parser runs the transformer inline while parsing instead
+    of building a parse tree. This only works with LALR. The in-process cache is keyed by the
+    class of the transformer, so transformers must not carry any state.
+    """
+    if transformer is not None and alg != 'lalr':
+        raise ParseError(f'Inline transformers are only supported by lalr, not by {alg}')
     grammar = utils.readTextFile(grammarFile)
+    key = parserCacheKey(grammar, alg, start)
+    transformerKey = '' if transformer is None else \
+        f'{type(transformer).__module__}.{type(transformer).__qualname__}'
+    memKey = (key, alg, start, transformerKey)
+    parser = _parserCache.get(memKey)
+    if parser is None:
+        parser = _buildParser(alg, grammar, grammarFile, start, transformer, key)
+        _parserCache[memKey] = parser
+    return parser
+
+def _buildParser(alg: ParseAlg, grammar: str, grammarFile: str, start: str,
+                 transformer: Optional[InlineTransformer], key: str) -> Lark:
     try:
         match alg:
             case 'earley':
                 return Lark(grammar, start=start, ambiguity='explicit', parser='earley',
                             lexer='basic', debug=True)
             case 'lalr':
+                # lark's cache does not depend on the transformer, it is passed to the
+                # parser when loading from the cache.
                 return Lark(grammar, start=start, parser='lalr', strict=True,
-                            debug=False, lexer='basic')
+                            debug=False, lexer='basic', transformer=transformer,
+                            cache=_cacheFile(key))
     except exceptions.LarkError as err:
         if alg == 'lalr':
             # lark does not output details about conflicts if running with strict=True.
@@ -169,9 +275,95 @@ def parseAsTree(args: ParserArgs, defaultGrammarFile: str, startSym: str) -> Par
     parseTree = _parseAsParseTree(parser, args.code, args.parseTreePng)
     return parseTree
 
-def unexpectedToken(t: Token, expected: str) -> Never:
+def parseInline[T](args: ParserArgs, defaultGrammarFile: str, startSym: str,
+                   transformer: Transformer[Token, T]) -> T:
+    """
+    Parses args.code with LALR, running transformer as a callback while parsing. No parse
+    tree is built, so the result of the transformer for the start symbol is returned directly.
+    The transformer is responsible for skipping NEWLINE tokens.
+    """
+    if args.grammarFile is None:
+        grammarFile = defaultGrammarFile
+    else:
+        grammarFile = args.grammarFile
+    parser = mkParser('lalr', grammarFile, startSym, transformer)
+    s = args.code.rstrip() + '\n' # ensure there is one trailing newline
+    try:
+        return cast(T, parser.parse(s))
+    except exceptions.LarkError as err:
+        raise ParseError(str(err))
+
+def isNewline(x: Any) -> bool:
+    return isinstance(x, Token) and x.type == 'NEWLINE'
+
+def unexpectedToken(t: AnyToken, expected: str) -> Never:
     raise ParseError(f'Unexpected token {t} (token type: {t.type}). Expected: {expected}')
 
+# If False, alternatives ignores FIRST sets and always backtracks via exceptions.
+PREDICTIVE_DISPATCH = True
+
+_FIRST_ATTR = '_firstTokenTypes'
+
+def startsWith[F: Callable[..., Any]](*tokenTypes: str) -> Callable[[F], F]:
+    """
+    Decorator declaring the FIRST set of a parsing function, i.e. the token types
+    the rule can start with. alternatives uses this information to pick the right
+    alternative by looking at the next token only.
+    """
+    def decorate(f: F) -> F:
+        setattr(f, _FIRST_ATTR, frozenset(tokenTypes))
+        return f
+    return decorate
+
+def firstSet(f: Callable[..., Any]) -> Optional[frozenset[str]]:
+    return getattr(f, _FIRST_ATTR, None)
+
+type DispatchTable[T] = dict[str, Callable[[TokenStream], T]]
+
+# Attribute of the first alternative holding the dispatch tables built for it
+_TABLES_ATTR = '_dispatchTables'
+
+def mkDispatchTable[T](ruleName: str, funs: list[Callable[[TokenStream], T]]) -> Optional[DispatchTable[T]]:
+    """
+    Builds a table mapping token types to the alternative starting with this token type.
+    Returns None if some alternative does not declare its FIRST set.
+    """
+    table: DispatchTable[T] = {}
+    for f in funs:
+        first = firstSet(f)
+        if first is None:
+            return None
+        for tokType in first:
+            if tokType in table:
+                raise ValueError(f'Alternatives for rule {ruleName} are not predictive: ' \
+                    f'token type {tokType} starts more than one alternative')
+            table[tokType] = f
+    return table
+
+def _cachedDispatchTable[T](ruleName: str, funs: list[Callable[[TokenStream], T]]) -> Optional[DispatchTable[T]]:
+    """
+    Like mkDispatchTable, but caches the table. The cache is stored on the first
+    alternative, so it is freed together with the alternatives (e.g. for closures).
+    """
+    if not funs or any(firstSet(f) is None for f in funs):
+        return None
+    tables: Optional[dict[tuple[Callable[[TokenStream], T], ...], DispatchTable[T]]] = \
+        getattr(funs[0], _TABLES_ATTR, None)
+    key = tuple(funs[1:])
+    if tables is not None and key in tables:
+        return tables[key]
+    table = mkDispatchTable(ruleName, funs)
+    if table is not None:
+        if tables is None:
+            tables = {}
+            try:
+                setattr(funs[0], _TABLES_ATTR, tables)
+            except AttributeError:
+                # e.g. bound methods, the table is rebuilt on each call
+                pass
+        tables[key] = table
+    return table
+
 def alternatives[T](ruleName: str, toks: TokenStream, funs: list[Callable[[TokenStream], T]]) -> T:
     """
     funs is a list of alternative parsing functions. alternatives returns the result
@@ -179,7 +371,14 @@ def alternatives[T](ruleName: str, toks: TokenStream, funs: list[Callable[[Token
 
     Important requirement: each of the alternative parsing functions must fail
     on the first token if it is not applicable.
+
+    If all alternatives declare their FIRST set (see startsWith), the alternative is
+    chosen from the lookahead token without any backtracking.
     """
+    if PREDICTIVE_DISPATCH:
+        table = _cachedDispatchTable(ruleName, funs)
+        if table is not None:
+            return toks.dispatch(ruleName, table)
     for f in funs:
         try:
             return f(toks)
@@ -0,0 +1,188 @@
+from typing import *
+import importlib
+import re
+import sys
+from lark.lexer import PatternStr, TerminalDef
+from parsers.common import *
+
+# The regex parser of the re module (private, but also used by lark to compute widths)
+_sreParser: Any = importlib.import_module('re._parser' if sys.version_info >= (3, 11) else 'sre_parse')
+_sreCompiler: Any = importlib.import_module('re._compiler' if sys.version_info >= (3, 11) else 'sre_compile')
+_unboundedWidth = int(getattr(_sreParser, 'MAXWIDTH', _sreParser.MAXREPEAT))
+
+def _collectFirstItems(items: Any, flags: int, out: list[tuple[int, Any]]) -> bool:
+    """
+    Collects the single-character items (together with their flags) of a parsed regex
+    that can match the first character of a match. Returns True if items can also
+    match the empty string. Raises ValueError for constructs not supported.
+    """
+    for op, av in items:
+        match str(op):
+            case 'LITERAL' | 'NOT_LITERAL' | 'IN' | 'ANY' | 'CATEGORY':
+                out.append((flags, (op, av)))
+                return False
+            case 'BRANCH':
+                nullable = [_collectFirstItems(alt, flags, out) for alt in av[1]]
+                if not any(nullable):
+                    return False
+            case 'SUBPATTERN':
+                _, addFlags, delFlags, sub = av
+                if not _collectFirstItems(sub, (flags | addFlags) & ~delFlags, out):
+                    return False
+            case 'MAX_REPEAT' | 'MIN_REPEAT' | 'POSSESSIVE_REPEAT':
+                minCount, _, sub = av
+                if not _collectFirstItems(sub, flags, out) and minCount > 0:
+                    return False
+            case 'AT':
+                pass
+            case _:
+                raise ValueError(f'unsupported regex construct {op}')
+    return True
+
+def _firstCharRegexes(regex: re.Pattern[str]) -> Optional[list[re.Pattern[str]]]:
+    """
+    Returns regexes for the characters that can start a match of regex, or None if
+    this cannot be determined.
+    """
+    parsed = _sreParser.parse(regex.pattern, regex.flags)
+    items: list[tuple[int, Any]] = []
+    try:
+        _collectFirstItems(parsed, parsed.state.flags, items)
+    except ValueError:
+        return None
+    return [_sreCompiler.compile(_sreParser.SubPattern(parsed.state, [item]), flags)
+            for flags, item in items]
+
+class FastLexer:
+    """
+    A standalone lexer for the terminals of a .lark grammar. All terminals are compiled
+    into a single regular expression with one named group per terminal. Terminals are
+    ordered as in lark's basic lexer, so the tokens are the same as those of mkLexer.
+    """
+    def __init__(self, terminals: list[TerminalDef], ignore: Iterable[str]):
+        terminals = sorted(terminals,
+                           key=lambda x: (-x.priority, -x.pattern.max_width, -len(x.pattern.value), x.name))
+        # Literal strings also matched by a regex terminal (for example keywords matched by
+        # an identifier terminal) are not part of the alternation. Instead, the
+        # regex terminal is retyped if its value equals the literal string.
+        self.retype: dict[str, dict[str, str]] = {}
+        embedded: set[str] = set()
+        for reTerm in terminals:
+            if isinstance(reTerm.pattern, PatternStr):
+                continue
+            r = re.compile(reTerm.pattern.to_regexp())
+            for strTerm in terminals:
+                if not isinstance(strTerm.pattern, PatternStr) or strTerm.priority != reTerm.priority:
+                    continue
+                s = strTerm.pattern.value
+                if r.fullmatch(s):
+                    self.retype.setdefault(reTerm.name, {})[s] = strTerm.name
+                    if set(strTerm.pattern.flags) <= set(reTerm.pattern.flags):
+                        embedded.add(strTerm.name)
+        self.groupNames: dict[str, str] = {}
+        alts: list[str] = []
+        for i, t in enumerate(terminals):
+            if t.name in embedded:
+                continue
+            # terminal names might not be valid group names
+            g = f't{i}'
+            self.groupNames[g] = t.name
+            alts.append(f'(?P<{g}>{t.pattern.to_regexp()})')
+        self.regex = re.compile('|'.join(alts))
+        self.ignore = frozenset(ignore)
+        # Used by lexChunks: a token starting less than maxWidth characters before the end
+        # of the input seen so far might be superseded by a longer one once more input is
+        # available. Terminals of unbounded width are only a problem if their match
+        # touches the end of the input, which is checked separately.
+        self.maxWidth = max([t.pattern.max_width for t in terminals
+                             if t.pattern.max_width < _unboundedWidth], default=1)
+        self.firstChars = _firstCharRegexes(self.regex)
+
+    def lex(self, code: str) -> Iterator[LexToken]:
+        """
+        Returns an iterator over the tokens of code, skipping tokens of ignored types.
+        """
+        return self._lexBuffer(code, 0, True)
+
+    def lexChunks(self, chunks: Iterable[str]) -> Iterator[LexToken]:
+        """
+        Like lex, but the input is given as a sequence of chunks (for example, blocks read
+        from a file). Only the unfinished token at the end of a chunk is kept in memory.
+        A character that cannot start any token is reported as soon as it is seen.
+        """
+        buf = ''
+        base = 0
+        for chunk in chunks:
+            buf = buf + chunk
+            consumed = yield from self._lexBuffer(buf, base, False)
+            buf = buf[consumed:]
+            base += consumed
+        yield from self._lexBuffer(buf, base, True)
+
+    def _lexBuffer(self, buf: str, base: int, final: bool) -> Generator[LexToken, None, int]:
+        """
+        Yields the tokens of buf, with offsets shifted by base. If final is False, more
+        input might follow, so lexing stops before a token that might still change with
+        more input, or before unmatched characters that might start an unfinished token.
+        Returns the number of characters consumed.
+        """
+        groupNames = self.groupNames
+        retype = self.retype
+        ignore = self.ignore
+        # bypasses the (slow) python-level constructor of the named tuple
+        mkToken: Callable[[type[LexToken], tuple[str, str, int, int]], LexToken] = getattr(tuple, '__new__')
+        n = len(buf)
+        # start offset of the first token that might change with more input
+        limit = n if final else n - self.maxWidth + 1
+        pos = 0
+        # finditer is much faster than calling match repeatedly, but it silently skips
+        # characters not matched by any terminal. We detect this by checking for gaps.
+        for m in self.regex.finditer(buf):
+            start = m.start()
+            if start != pos:
+                if final or not self._mayStartToken(buf[pos]):
+                    self._noMatch(buf, base, pos)
+                return pos
+            end = m.end()
+            if start >= limit or (end == n and not final):
+                return pos
+            pos = end
+            ty = groupNames[m.lastgroup or '']
+            if ty not in ignore:
+                value = m.group()
+                kw = retype.get(ty)
+                if kw is not None:
+                    ty = kw.get(value, ty)
+                yield mkToken(LexToken, (ty, value, base + start, base + end))
+        if pos != n and (final or not self._mayStartToken(buf[pos])):
+            self._noMatch(buf, base, pos)
+        return pos
+
+    def _mayStartToken(self, c: str) -> bool:
+        if self.firstChars is None:
+            return True
+        return any(r.match(c) for r in self.firstChars)
+
+    def _noMatch(self, buf: str, base: int, pos: int) -> Never:
+        if base == 0:
+            line = buf.count('\n', 0, pos) + 1
+            col = pos - buf.rfind('\n', 0, pos)
+            where = f'at line {line} col {col}'
+        else:
+            where = f'at offset {base + pos}'
+        raise ParseError(f'No terminal matches {repr(buf[pos])} in the current parser ' \
+            f'context, {where}')
+
+_fastLexers: dict[Lark, FastLexer] = {}
+
+def mkFastLexer(grammarFile: str, start: str = 'start') -> FastLexer:
+    """
+    Returns a FastLexer for the terminals of the given grammar. Lexers are cached
+    in-process, and the terminal definitions are taken from the (cached) lark parser.
+    """
+    parser = mkLexer(grammarFile, start)
+    lexer = _fastLexers.get(parser)
+    if lexer is None:
+        lexer = FastLexer(list(parser.terminals), parser.lexer_conf.ignore)
+        _fastLexers[parser] = lexer
+    return lexer
@@ -1,4 +1,5 @@
 from parsers.common import *
+from parsers.fastLexer import mkFastLexer
 from parsers.lang_simple.simple_ast import *
 import common.log as log
 
@@ -13,9 +14,8 @@ grammarPath = "./src/parsers/lang_simple/"
 
 def parse(code: str):
     grammarFile = grammarPath + f"simple_grammar.lark"
-    parser = mkParser('earley', grammarFile, 'exp') # only need the lexer
-    lexed = parser.lex(code)
-    toks = TokenStream(lexed)
+    lexer = mkFastLexer(grammarFile, 'exp')
+    toks = TokenStream(lexer.lex(code))
     ast = ruleE(toks)
     toks.ensureEof(code)
     log.debug(f'AST: {ast}')
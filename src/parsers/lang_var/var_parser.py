@@ -1,4 +1,4 @@
-from lark import ParseTree
+from lark import ParseTree, Token, Transformer
 from lang_var.var_ast import *
 from parsers.common import *
 
@@ -84,6 +84,60 @@ def parseTreeToModuleAst(t: ParseTree) -> mod:
     )  # Module with statement list
 
 
+class VarAstBuilder(Transformer[Token, Any]):
+    """
+    Builds the AST while parsing with LALR (see parseInline), so no parse tree is
+    materialized. Each method receives the already translated children of a rule.
+    """
+    def const(self, c: list[Token]) -> exp:
+        return IntConst(value=int(c[0].value))
+
+    def var(self, c: list[Token]) -> exp:
+        return Name(name=Ident(name=c[0].value))
+
+    def call(self, c: list[Any]) -> exp:
+        args: list[exp] = c[1] if len(c) > 1 else []
+        return Call(name=Ident(c[0].value), args=args)
+
+    def uminus(self, c: list[exp]) -> exp:
+        return UnOp(op=USub(), arg=c[0])
+
+    def add(self, c: list[exp]) -> exp:
+        return BinOp(left=c[0], op=Add(), right=c[1])
+
+    def sub(self, c: list[exp]) -> exp:
+        return BinOp(left=c[0], op=Sub(), right=c[1])
+
+    def mul(self, c: list[exp]) -> exp:
+        return BinOp(left=c[0], op=Mul(), right=c[1])
+
+    def args(self, c: list[exp]) -> list[exp]:
+        return c
+
+    def assign(self, c: list[Any]) -> stmt:
+        return Assign(var=Ident(name=c[0].value), right=c[1])
+
+    def expr_stmt(self, c: list[exp]) -> stmt:
+        return StmtExp(exp=c[0])
+
+    def stmt_list(self, c: list[Any]) -> list[stmt]:
+        return [x for x in c if not isNewline(x)]
+
+    def lvar(self, c: list[list[stmt]]) -> mod:
+        return Module(stmts=c[0])
+
+    def _first(self, c: list[Any]) -> Any:
+        return c[0]
+
+    # Rules with a single child. They are bound at the end of the class body, so that
+    # the method names do not shadow the AST types in the annotations above.
+    exp = exp1 = exp2 = stmt = _first
+
+
 def parseModule(args: ParserArgs) -> mod:
-    parseTree = parseAsTree(args, "src/parsers/lang_var/var_grammar.lark", "lvar")
+    grammarFile = "src/parsers/lang_var/var_grammar.lark"
+    if args.parseAlg == 'lalr' and args.parseTreePng is None:
+        # Single pass: build the AST while parsing
+        return parseInline(args, grammarFile, "lvar", VarAstBuilder())
+    parseTree = parseAsTree(args, grammarFile, "lvar")
     return parseTreeToModuleAst(asTree(parseTree))  # Parse and return module
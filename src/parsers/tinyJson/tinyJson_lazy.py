@@ -0,0 +1,194 @@
+from parsers.common import *
+from array import array
+from collections.abc import Mapping
+import re
+
+# On-demand access to tinyJson documents. A single pass over the input records the
+# offsets of all structural characters (braces, colons, commas, and the bounds of strings)
+# in a compact array. Objects are then returned as lazy views that decode a value only
+# when it is accessed.
+#
+# The index pass only checks that braces and quotes are balanced. Other syntax errors are
+# reported when the affected part of the document is accessed.
+
+type Json = str | int | dict[str, Json]
+type LazyJson = str | int | JsonObjectView
+
+# Strings as defined by the STRING terminal of tinyJson_grammar.lark. A single quote
+# only matches if the string is not terminated.
+_structuralRe = re.compile(r'"[^"]*"|[{}:,"]')
+# WHITESPACE and INT as defined in tinyJson_grammar.lark
+_blankRe = re.compile(r'[ \t\r\n]*')
+_intRe = re.compile(r'[ \t\r\n]*(\d+)[ \t\r\n]*')
+
+class StructuralIndex:
+    """
+    offsets[i] is the offset of the i-th structural character in code. For a string, both
+    the opening and the closing quote are recorded. For braces, partner[i] is the position
+    of the matching brace in offsets, for all other characters partner[i] is -1.
+    """
+    def __init__(self, code: str):
+        self.code = code
+        offsets = array('q')
+        partner = array('q')
+        openBraces: list[int] = []
+        for m in _structuralRe.finditer(code):
+            start = m.start()
+            match code[start]:
+                case '"':
+                    end = m.end() - 1
+                    if end == start:
+                        raise ParseError(f'Unterminated string at offset {start}')
+                    offsets.append(start)
+                    offsets.append(end)
+                    partner.append(-1)
+                    partner.append(-1)
+                case '{':
+                    openBraces.append(len(offsets))
+                    offsets.append(start)
+                    partner.append(-1)
+                case '}':
+                    if not openBraces:
+                        raise ParseError(f'Unbalanced "}}" at offset {start}')
+                    i = openBraces.pop()
+                    partner[i] = len(offsets)
+                    offsets.append(start)
+                    partner.append(i)
+                case _:
+                    offsets.append(start)
+                    partner.append(-1)
+        if openBraces:
+            raise ParseError(f'Unbalanced "{{" at offset {offsets[openBraces[-1]]}')
+        self.offsets = offsets
+        self.partner = partner
+
+    def char(self, i: int) -> str:
+        if i >= len(self.offsets):
+            return ''
+        return self.code[self.offsets[i]]
+
+    def valueAt(self, start: int, i: int) -> tuple[LazyJson, int]:
+        """
+        Decodes the value starting at offset start in the code. i must be the position of
+        the first structural character at or after start. Returns the value and the position
+        of the first structural character after the value.
+        """
+        end = self.offsets[i] if i < len(self.offsets) else len(self.code)
+        if not _blankRe.fullmatch(self.code, start, end):
+            # ints are the only values not starting with a structural character
+            m = _intRe.fullmatch(self.code, start, end)
+            if m is None:
+                raise ParseError(f'Invalid value {repr(self.code[start:end].strip())} at offset {start}')
+            return (int(m.group(1)), i)
+        match self.char(i):
+            case '"':
+                self.expectBlank(i + 2)
+                return (self.code[self.offsets[i] + 1:self.offsets[i + 1]], i + 2)
+            case '{':
+                j = self.partner[i] + 1
+                self.expectBlank(j)
+                return (JsonObjectView(self, i), j)
+            case c:
+                raise ParseError(f'Expected a value at offset {start}, got {repr(c)}')
+
+    def skipValue(self, start: int, i: int) -> int:
+        """
+        Like valueAt, but only returns the position after the value. Nested objects
+        are skipped without looking at their content.
+        """
+        if self.char(i) == '{' and _blankRe.fullmatch(self.code, start, self.offsets[i]):
+            j = self.partner[i] + 1
+            self.expectBlank(j)
+            return j
+        return self.valueAt(start, i)[1]
+
+    def expect(self, i: int, c: str):
+        if self.char(i) != c:
+            off = self.offsets[i] if i < len(self.offsets) else len(self.code)
+            raise ParseError(f'Expected {repr(c)} at offset {off}, got {repr(self.char(i))}')
+
+    def expectBlank(self, i: int):
+        """
+        Checks that there is only whitespace between the structural characters at
+        positions i-1 and i (or the end of the code).
+        """
+        start = self.offsets[i - 1] + 1
+        end = self.offsets[i] if i < len(self.offsets) else len(self.code)
+        if not _blankRe.fullmatch(self.code, start, end):
+            raise ParseError(f'Unexpected {repr(self.code[start:end].strip())} at offset {start}')
+
+class JsonObjectView(Mapping[str, LazyJson]):
+    """
+    A read-only view of an object in the document. Keys are decoded on first access,
+    values each time they are accessed.
+    """
+    def __init__(self, index: StructuralIndex, i: int):
+        self._index = index
+        self._start = i
+        # maps keys to the offset where the value starts and the position of the
+        # first structural character of the value
+        self._entries: Optional[dict[str, tuple[int, int]]] = None
+
+    def _getEntries(self) -> dict[str, tuple[int, int]]:
+        if self._entries is not None:
+            return self._entries
+        idx = self._index
+        entries: dict[str, tuple[int, int]] = {}
+        end = idx.partner[self._start]
+        i = self._start + 1
+        if i == end:
+            idx.expectBlank(i)
+        while i < end:
+            idx.expectBlank(i)
+            idx.expect(i, '"')
+            key = idx.code[idx.offsets[i] + 1:idx.offsets[i + 1]]
+            idx.expectBlank(i + 2)
+            idx.expect(i + 2, ':')
+            valueStart = idx.offsets[i + 2] + 1
+            i = i + 3
+            entries[key] = (valueStart, i)
+            i = idx.skipValue(valueStart, i)
+            if i < end:
+                idx.expect(i, ',')
+                i = i + 1
+                if i == end:
+                    idx.expect(i, '"')
+        self._entries = entries
+        return entries
+
+    def __getitem__(self, key: str) -> LazyJson:
+        (start, i) = self._getEntries()[key]
+        return self._index.valueAt(start, i)[0]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._getEntries())
+
+    def __len__(self) -> int:
+        return len(self._getEntries())
+
+    def __repr__(self) -> str:
+        return f'JsonObjectView(offset={self._index.offsets[self._start]})'
+
+    def toJson(self) -> dict[str, Json]:
+        """
+        Decodes the whole object.
+        """
+        return {k: toJson(v) for k, v in self.items()}
+
+def toJson(x: LazyJson) -> Json:
+    match x:
+        case JsonObjectView():
+            return x.toJson()
+        case _:
+            return x
+
+def parseLazy(code: str) -> LazyJson:
+    """
+    Builds the structural index for code and returns the top-level value. If it is an
+    object, the result is a lazy view.
+    """
+    idx = StructuralIndex(code)
+    value, i = idx.valueAt(0, 0)
+    if i < len(idx.offsets):
+        raise ParseError('Parsing did not consume all input')
+    return value
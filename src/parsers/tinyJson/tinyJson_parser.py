@@ -1,4 +1,5 @@
 from parsers.common import *
+from parsers.fastLexer import mkFastLexer
 
 type Json = str | int | dict[str, Json]
 
@@ -12,6 +13,7 @@ def ruleJson(toks: TokenStream) -> Json:
     return alternatives("json", toks, [ruleObject, ruleString, ruleInt]) #Handles trying each parser function
 
 
+@startsWith("LBRACE")
 def ruleObject(toks: TokenStream) -> dict[str, Json]:
     """
     Parses a JSON object:
@@ -64,6 +66,7 @@ def ruleEntry(toks: TokenStream) -> tuple[str, Json]:
     return (key, value)
 
 
+@startsWith("STRING")
 def ruleString(toks: TokenStream) -> str:
     """
     Parses a JSON string value
@@ -73,6 +76,7 @@ def ruleString(toks: TokenStream) -> str:
     return val[1:-1] # Remove qutoes 
 
 
+@startsWith("INT")
 def ruleInt(toks: TokenStream) -> int:
     """
     Parses a JSON integer value
@@ -85,11 +89,9 @@ def parse(code: str) -> Json:
     """
     parse a tinyJson string
     """
-    parser = mkLexer("./src/parsers/tinyJson/tinyJson_grammar.lark")
-    tokens = list(parser.lex(code))
-    log.info(f'Tokens: {tokens}')
+    lexer = mkFastLexer("./src/parsers/tinyJson/tinyJson_grammar.lark")
 
-    toks = TokenStream(tokens) # Create Token Stream
+    toks = TokenStream(lexer.lex(code)) # Create Token Stream, tokens are produced lazily
     res = ruleJson(toks) # Start parsing
     toks.ensureEof(code) # Ensure all tokens used
 
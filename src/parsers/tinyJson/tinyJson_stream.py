@@ -0,0 +1,123 @@
+from parsers.common import *
+from parsers.fastLexer import mkFastLexer
+
+# An iterative parser for tinyJson (see tinyJson_parser.py for the grammar). In contrast
+# to the recursive descent parser, nesting depth is not limited by the python stack, and
+# the input can be processed as a stream of events without building the result in memory.
+
+type Json = str | int | dict[str, Json]
+
+type EventKind = Literal['start_object', 'key', 'value', 'end_object']
+
+class Event(NamedTuple):
+    kind: EventKind
+    value: Optional[str | int] = None
+
+grammarFile = "./src/parsers/tinyJson/tinyJson_grammar.lark"
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+def events(tokens: Iterable[AnyToken]) -> Iterator[Event]:
+    """
+    Yields the SAX-style events for the given tokens. Only the current nesting depth
+    is kept in memory.
+    """
+    toks = TokenStream(tokens)
+    depth = 0
+    # True if a value is expected next, False if a value has just been completed
+    expectValue = True
+    while True:
+        if expectValue:
+            t = toks.next()
+            match t.type:
+                case 'LBRACE':
+                    yield Event('start_object')
+                    if toks.lookahead().type == 'RBRACE':
+                        toks.next()
+                        yield Event('end_object')
+                    else:
+                        depth += 1
+                        yield _ruleKey(toks)
+                        continue
+                case 'STRING':
+                    yield Event('value', t.value[1:-1])
+                case 'INT':
+                    yield Event('value', int(t.value))
+                case _:
+                    unexpectedToken(t, 'object, string or int')
+            expectValue = False
+        else:
+            if depth == 0:
+                break
+            t = toks.next()
+            match t.type:
+                case 'COMMA':
+                    yield _ruleKey(toks)
+                    expectValue = True
+                case 'RBRACE':
+                    depth -= 1
+                    yield Event('end_object')
+                case _:
+                    unexpectedToken(t, '"," or "}"')
+    t = toks.lookahead()
+    if t.type != TokenStream.eof.type:
+        unexpectedToken(t, 'end of input')
+
+def _ruleKey(toks: TokenStream) -> Event:
+    """
+    Parses the key of an entry and the colon following it.
+    """
+    key = toks.ensureNext('STRING')
+    toks.ensureNext('COLON')
+    return Event('key', key.value[1:-1])
+
+def buildJson(evs: Iterable[Event]) -> Json:
+    """
+    Builds the Json value described by the events.
+    """
+    objects: list[dict[str, Json]] = []
+    keys: list[str] = []
+    result: Optional[Json] = None
+    for ev in evs:
+        match ev.kind:
+            case 'start_object':
+                objects.append({})
+                continue
+            case 'key':
+                keys.append(cast(str, ev.value))
+                continue
+            case 'value':
+                x: Json = cast(str | int, ev.value)
+            case 'end_object':
+                x = objects.pop()
+        if objects:
+            objects[-1][keys.pop()] = x
+        else:
+            result = x
+    if result is None:
+        raise ParseError('Empty event stream')
+    return result
+
+def fileChunks(path: str, chunkSize: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    with open(path, 'r') as f:
+        while True:
+            chunk = f.read(chunkSize)
+            if not chunk:
+                return
+            yield chunk
+
+def eventsFromString(code: str) -> Iterator[Event]:
+    return events(mkFastLexer(grammarFile).lex(code))
+
+def eventsFromFile(path: str, chunkSize: int = DEFAULT_CHUNK_SIZE) -> Iterator[Event]:
+    """
+    Yields the events for the content of the file, reading the file in chunks. Memory
+    consumption is independent of the size of the file.
+    """
+    return events(mkFastLexer(grammarFile).lexChunks(fileChunks(path, chunkSize)))
+
+def parse(code: str) -> Json:
+    return buildJson(eventsFromString(code))
+
+def parseFile(path: str, chunkSize: int = DEFAULT_CHUNK_SIZE) -> Json:
+    return buildJson(eventsFromFile(path, chunkSize))
@@ -3,3 +3,83 @@ from typing import *
 
 def test_asdl():
     shell.run(f'make all > /dev/null')
+
+def test_visitorDispatch():
+    import lang_var.var_ast as ast
+    class Partial(ast.ExpVisitor[int, dict[str, int]]):
+        def visitIntConst(self, x: ast.IntConst, ctx: dict[str, int]) -> int:
+            return x.value
+        def visitName(self, x: ast.Name, ctx: dict[str, int]) -> int:
+            return ctx[x.name.name]
+    class Eval(Partial):
+        def visitCall(self, x: ast.Call, ctx: dict[str, int]) -> int:
+            raise ValueError('call')
+        def visitUnOp(self, x: ast.UnOp, ctx: dict[str, int]) -> int:
+            return -self.visitExp(x.arg, ctx)
+        def visitBinOp(self, x: ast.BinOp, ctx: dict[str, int]) -> int:
+            return self.visitExp(x.left, ctx) + self.visitExp(x.right, ctx)
+    e = Eval()
+    assert e.visitExp(ast.IntConst(42), {}) == 42
+    assert e.visitExp(ast.Name(ast.Ident('x')), {'x': 1}) == 1
+    assert e.visitExp(ast.UnOp(ast.USub(), ast.IntConst(1)), {}) == -1
+    # passes must handle all constructors
+    cls = cast(type[Any], Partial)
+    try:
+        cls()
+        assert False, 'expected TypeError'
+    except TypeError as err:
+        assert 'visitUnOp' in str(err)
+
+def test_interning():
+    import gc
+    import pickle
+    import common.symtab as symtab
+    import lang_fun.fun_ast as ast
+    t1 = ast.Fun([ast.Int(), ast.Array(ast.Bool())], ast.NotVoid(ast.Int()))
+    t2 = ast.Fun((ast.Int(), ast.Array(ast.Bool())), ast.NotVoid(ast.Int()))
+    assert t1 is t2 and t1 == t2
+    assert ast.Array(ast.Int()) != ast.Array(ast.Bool())
+    assert ast.Ident('x') is ast.Ident(name='x')
+    # unpickling returns the canonical instances
+    assert pickle.loads(pickle.dumps(t1)) is t1
+    assert pickle.loads(pickle.dumps(ast.Ident('x'))) is ast.Ident('x')
+    st = symtab.Symtab[ast.Ident, ast.ty]()
+    st.assign(ast.Ident('x'), ast.Array(ast.Int()))
+    assert st.use(ast.Ident('x')) is ast.Array(ast.Int())
+    # assigning an equal type is consistent
+    st.assign(ast.Ident('x'), ast.Array(ast.Int()))
+    # instances not referenced elsewhere are dropped from the table
+    instances: Sized = getattr(ast.Ident, '_instances')
+    n = len(instances)
+    ast.Ident('someIdentNotUsedElsewhere')
+    gc.collect()
+    assert len(instances) == n
+
+def test_codec():
+    import common.genericParser as genericParser
+    import assembly.tac_ast as tac
+    import lang_fun.fun_ast as ast
+    import lang_fun.fun_tychecker as fun_tychecker
+    x = tac.Ident('x')
+    instrs: list[tac.instr] = [
+        tac.Assign(x, tac.BinOp(tac.Const(-1), tac.Op('ADD'), tac.Const(2**70))),
+        tac.Call(None, tac.Ident('print'), [tac.Name(x), tac.Const(127), tac.Const(-128)]),
+        tac.Call(x, tac.Ident('input_int'), []),
+        tac.GotoIf(tac.Name(x), 'läbel'),
+        tac.Label('läbel')]
+    data = tac.encodeInstrList(instrs)
+    assert tac.decodeInstrList(data) == instrs
+    assert tac.decodeInstr(tac.encodeInstr(instrs[1])) == instrs[1]
+    # fields with types of the common module, interned types are canonical after decoding
+    m = genericParser.parseFile('test_files/lang_fun/mutual.py', ast)
+    fun_tychecker.tycheckModule(m)
+    decoded = ast.decodeMod(ast.encodeMod(m))
+    assert decoded == m
+    t = ast.Fun([ast.Int()], ast.NotVoid(ast.Array(ast.Bool())))
+    assert ast.decodeTy(ast.encodeTy(t)) is t
+    for invalid in [b'', b'pickle', data[:-1], data + b'\0']:
+        try:
+            tac.decodeInstrList(invalid)
+            assert False, 'expected ValueError'
+        except ValueError:
+            pass
@@ -0,0 +1,90 @@
+import os
+from typing import *
+import common.astCache as astCache
+import common.genericParser as genericParser
+import lang_var.var_ast as var_ast
+import lang_loop.loop_ast as loop_ast
+
+def writeFile(path: str, content: str):
+    with open(path, 'w') as f:
+        f.write(content)
+
+def cacheFiles(d: str) -> list[str]:
+    return [x for x in os.listdir(d) if x.endswith('.ast.pickle')]
+
+def test_astCache(tmp_path: str):
+    cacheDir = os.path.join(tmp_path, 'cache')
+    src = os.path.join(tmp_path, 'prog.py')
+    writeFile(src, 'x = 1\nprint(x + 2)\n')
+    astCache.configure(cacheDir)
+    try:
+        ast1 = genericParser.parseFile(src, var_ast)
+        assert len(cacheFiles(cacheDir)) == 1
+        ast2 = genericParser.parseFile(src, var_ast)
+        assert ast1 == ast2
+        assert ast1 is not ast2
+        # different AST module, different entry
+        genericParser.parseFile(src, loop_ast)
+        assert len(cacheFiles(cacheDir)) == 2
+        # changed source, different entry
+        writeFile(src, 'print(3)\n')
+        ast3 = genericParser.parseFile(src, var_ast)
+        assert ast3 == var_ast.Module([var_ast.StmtExp(var_ast.Call(var_ast.Ident('print'),
+                                                                    [var_ast.IntConst(3)]))])
+        assert len(cacheFiles(cacheDir)) == 3
+    finally:
+        astCache.configure(None)
+
+def test_astCacheEviction(tmp_path: str):
+    for i in range(5):
+        path = os.path.join(tmp_path, f'{i}.ast.pickle')
+        writeFile(path, 100 * 'x')
+        os.utime(path, (i, i))
+    astCache.evict(str(tmp_path), 250)
+    assert sorted(cacheFiles(str(tmp_path))) == ['3.ast.pickle', '4.ast.pickle']
+
+def test_astCacheCommonModule():
+    import lang_array.array_ast as array_ast
+    import lang_array.array_astCommon as array_astCommon
+    assert astCache.astModules(array_ast) == [array_ast, array_astCommon]
+    assert astCache.astModules(var_ast) == [var_ast]
+
+def test_funTycheckCache(tmp_path: str, monkeypatch: Any):
+    import lang_fun.fun_ast as fun_ast
+    import lang_fun.fun_tychecker as fun_tychecker
+    checked: list[str] = []
+    tycheckFunDef = fun_tychecker.tycheckFunDef
+    def countingTycheck(f: fun_ast.FunDef, st: fun_tychecker.Symtab):
+        checked.append(f.name.name)
+        tycheckFunDef(f, st)
+    monkeypatch.setattr(fun_tychecker, 'tycheckFunDef', countingTycheck)
+    src = os.path.join(tmp_path, 'prog.py')
+    def check(fBody: str, fResult: str, hBody: str) -> fun_tychecker.TycheckResult:
+        writeFile(src, f'def f(x: int) -> {fResult}:\n    {fBody}\n' +
+                  'def g(x: int) -> int:\n    y = f(x)\n    return x\n' +
+                  f'def h() -> int:\n    {hBody}\n' +
+                  'print(h())\n')
+        checked.clear()
+        m = genericParser.parseFile(src, fun_ast)
+        res = fun_tychecker.tycheckModule(m)
+        # cached functions are annotated as well
+        call = cast(fun_ast.Call, cast(fun_ast.Assign, m.funs[1].body[0]).right)
+        assert call.ty is not None
+        assert call.fun.ty == fun_ast.NotVoid(fun_ast.Fun([fun_ast.Int()], call.ty))
+        assert cast(fun_ast.Name, call.fun).scope == fun_ast.UserFun()
+        return res
+    astCache.configure(os.path.join(tmp_path, 'cache'))
+    try:
+        res1 = check('return x + 1', 'int', 'return 1')
+        assert checked == ['f', 'g', 'h']
+        res2 = check('return x + 1', 'int', 'return 1')
+        assert checked == []
+        assert res1 == res2
+        # only the changed function
+        check('return x + 1', 'int', 'z = 2\n    return z')
+        assert checked == ['h']
+        # the changed function and the function using it
+        check('return x == 1', 'bool', 'return 1')
+        assert checked == ['f', 'g']
+    finally:
+        astCache.configure(None)
@@ -0,0 +1,78 @@
+import ast
+import pytest
+import common.genericParser as genericParser
+from common.incrementalParser import IncrementalParser
+import lang_loop.loop_ast as loop_ast
+import lang_fun.fun_ast as fun_ast
+from typing import Any
+
+def parseString(src: str, m: Any) -> Any:
+    modName: str = m.__name__
+    lang: Any = modName[len('lang_'):modName.index('.')]
+    return genericParser.transModule(ast.parse(src), genericParser.ModWrapper(m, lang), lang)
+
+loopSrc = '''# comment
+x = input_int()
+i = 0
+
+while i < x:
+    print(i)
+    i = i + 1
+# trailing comment
+print(x)
+y = 2
+print(y)
+'''
+
+def check(p: IncrementalParser, src: str, m: Any, maxTranslated: int | None = None):
+    assert p.update(src) == parseString(src, m)
+    if maxTranslated is not None:
+        assert p.lastTranslated <= maxTranslated
+
+def test_incrementalParser():
+    p = IncrementalParser(loop_ast)
+    check(p, loopSrc, loop_ast)
+    assert p.lastTranslated == 6
+    edits = [
+        # change a single statement at the end
+        (loopSrc.replace('y = 2', 'y = 3'), 3),
+        # change the body of the loop
+        (loopSrc.replace('print(i)', 'print(i + 1)'), 4),
+        # add a line to the body of the loop
+        (loopSrc.replace('    i = i + 1\n', '    i = i + 1\n    print(0)\n'), 4),
+        # insert and delete statements
+        (loopSrc.replace('i = 0\n', 'i = 0\nz = 1\nprint(z)\n'), 5),
+        (loopSrc.replace('i = 0\n', ''), 4),
+        ('print(1)\n' + loopSrc, 3),
+        (loopSrc + 'print(42)', 3),
+    ]
+    for (src, maxTranslated) in edits:
+        check(p, src, loop_ast, maxTranslated)
+        check(p, loopSrc, loop_ast, maxTranslated + 1)
+
+def test_incrementalParserErrors():
+    p = IncrementalParser(loop_ast)
+    check(p, loopSrc, loop_ast)
+    with pytest.raises(SyntaxError):
+        p.update(loopSrc.replace('print(x)', 'print(x'))
+    # an unclosed paren changes the meaning of the following lines
+    with pytest.raises(SyntaxError):
+        p.update(loopSrc.replace('y = 2', 'y = (2'))
+    check(p, loopSrc.replace('print(x)', 'print(x, 1)'), loop_ast, 3)
+
+def test_incrementalParserFun():
+    src = '''def f(x: int) -> int:
+    return x + 1
+
+print(f(1))
+
+def g() -> None:
+    print(2)
+
+g()
+'''
+    p = IncrementalParser(fun_ast)
+    check(p, src, fun_ast)
+    check(p, src.replace('print(2)', 'print(3)'), fun_ast, 3)
+    src = src.replace('print(2)', 'print(3)')
+    check(p, src.replace('print(f(1))', 'print(f(2))'), fun_ast, 3)
@@ -3,8 +3,10 @@ import parsers.lang_simple.simple_ast as ast
 import parsers.lang_simple.simple_recursiveDescentParser as simpleRecDescP
 import parsers.lang_simple.simpleAlternative_recursiveDescentParser as simpleAltRecDescP
 import parsers.common as p
+import parsers.fastLexer as fastLexer
 from common.constants import *
 import pytest
+from typing import Callable, Iterator
 import common.log as log
 
 simpleExp = '1 + 2 + 3 * 4'
@@ -47,3 +49,120 @@ def test_simpleAlternativeRecAscParserManual():
                                    ast.Add(),
                                    ast.BinOp(ast.IntConst(3), ast.Mul(), ast.IntConst(value=4))))
     assert t == expected
+
+grammarFile = 'src/parsers/lang_simple/simple_grammar.lark'
+
+def test_parserCacheInProcess(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(p, 'PARSER_CACHE_DIR', None)
+    p.clearParserCache()
+    p1 = p.mkParser('earley', grammarFile, 'exp')
+    p2 = p.mkParser('earley', grammarFile, 'exp')
+    assert p1 is p2
+    assert p.mkParser('lalr', grammarFile, 'exp') is not p1
+
+def test_parserCacheOnDisk(monkeypatch: pytest.MonkeyPatch, tmp_path: str):
+    monkeypatch.setattr(p, 'PARSER_CACHE_DIR', str(tmp_path))
+    p.clearParserCache()
+    p1 = p.mkParser('lalr', grammarFile, 'exp')
+    p.clearParserCache()
+    p2 = p.mkParser('lalr', grammarFile, 'exp')
+    assert p1 is not p2
+    assert p2.source_path == '<deserialized>'
+    assert p1.parse(simpleExp) == p2.parse(simpleExp)
+    p.clearParserCache()
+
+def test_lexerForConflictingGrammar():
+    # no parser is constructed for lexing, so LALR conflicts do not matter
+    lexer = p.mkLexer('src/parsers/lang_simple/simple_grammar_ambiguous.lark', 'exp')
+    assert [t.type for t in lexer.lex('1 + 2 * 3')] == ['INT', 'PLUS', 'INT', 'STAR', 'INT']
+
+def _tokens(types: list[str]) -> p.TokenStream:
+    return p.TokenStream([p.Token(t, t.lower()) for t in types])
+
+@p.startsWith('INT')
+def _ruleInt(toks: p.TokenStream) -> str:
+    return toks.ensureNext('INT').value
+
+@p.startsWith('LPAR')
+def _rulePar(toks: p.TokenStream) -> str:
+    toks.ensureNext('LPAR')
+    x = _ruleAlt(toks)
+    toks.ensureNext('RPAR')
+    return f'({x})'
+
+def _ruleAlt(toks: p.TokenStream) -> str:
+    return p.alternatives('alt', toks, [_ruleInt, _rulePar])
+
+def test_alternativesPredictive():
+    assert p.mkDispatchTable('alt', [_ruleInt, _rulePar]) == {'INT': _ruleInt, 'LPAR': _rulePar}
+    assert _ruleAlt(_tokens(['LPAR', 'LPAR', 'INT', 'RPAR', 'RPAR'])) == '((int))'
+    with pytest.raises(p.ParseError) as err:
+        _ruleAlt(_tokens(['RPAR']))
+    assert 'Expected: INT, LPAR' in str(err)
+
+def test_alternativesNotPredictive():
+    def noFirst(toks: p.TokenStream) -> str:
+        return toks.ensureNext('STAR').value
+    assert p.mkDispatchTable('alt', [_ruleInt, noFirst]) is None
+    assert p.alternatives('alt', _tokens(['STAR']), [_ruleInt, noFirst]) == 'star'
+    with pytest.raises(ValueError):
+        p.mkDispatchTable('alt', [_ruleInt, _ruleInt])
+
+def test_dispatchTablesFreedWithAlternatives():
+    import gc
+    import weakref
+    def mkAlt() -> Callable[[p.TokenStream], str]:
+        @p.startsWith('STAR')
+        def star(toks: p.TokenStream) -> str:
+            return toks.ensureNext('STAR').value
+        return star
+    star = mkAlt()
+    ref = weakref.ref(star)
+    assert p.alternatives('alt', _tokens(['STAR']), [star, _ruleInt]) == 'star'
+    del star
+    gc.collect()
+    assert ref() is None
+
+def _larkTokens(grammar: str, start: str, code: str) -> list[tuple[str, str]]:
+    return [(t.type, t.value) for t in p.mkLexer(grammar, start).lex(code)]
+
+def _fastTokens(grammar: str, start: str, code: str) -> list[tuple[str, str]]:
+    return [(t.type, t.value) for t in fastLexer.mkFastLexer(grammar, start).lex(code)]
+
+def test_fastLexer():
+    jsonGrammar = './src/parsers/tinyJson/tinyJson_grammar.lark'
+    code = '{"k1": 1, "k2": {"x": "a b"}}\n'
+    assert _fastTokens(jsonGrammar, 'start', code) == _larkTokens(jsonGrammar, 'start', code)
+    assert _fastTokens(grammarFile, 'exp', simpleExp) == _larkTokens(grammarFile, 'exp', simpleExp)
+    toks = list(fastLexer.mkFastLexer(jsonGrammar).lex(' {"k": 42}'))
+    assert toks[0] == p.LexToken('LBRACE', '{', 1, 2)
+    assert toks[3] == p.LexToken('INT', '42', 7, 9)
+    with pytest.raises(p.ParseError):
+        list(fastLexer.mkFastLexer(jsonGrammar).lex('{\n ?}'))
+
+def test_fastLexerChunks(tmp_path: str):
+    jsonGrammar = './src/parsers/tinyJson/tinyJson_grammar.lark'
+    lexer = fastLexer.mkFastLexer(jsonGrammar)
+    code = '{"k1": 1, "k2": {"x": "a b"}, "k3": 123}'
+    for size in [1, 2, 3, 5]:
+        chunks = [code[i:i+size] for i in range(0, len(code), size)]
+        assert list(lexer.lexChunks(chunks)) == list(lexer.lex(code))
+    # the error is reported without consuming the remaining chunks
+    def badInput() -> Iterator[str]:
+        yield '{"a": ?'
+        raise AssertionError('input read after an unmatched character')
+    with pytest.raises(p.ParseError):
+        list(lexer.lexChunks(badInput()))
+    grammar = str(tmp_path) + '/abc.lark'
+    with open(grammar, 'w') as f:
+        f.write('start: ("abc" | "a" | "b" | "c")*\n')
+    lexer = fastLexer.mkFastLexer(grammar)
+    assert [t.value for t in lexer.lexChunks(['ab', 'c'])] == ['abc']
+    assert [t.value for t in lexer.lexChunks(['a', 'b', 'b', 'c'])] == ['a', 'b', 'b', 'c']
+
+def test_fastLexerKeywords(tmp_path: str):
+    grammar = str(tmp_path) + '/kw.lark'
+    with open(grammar, 'w') as f:
+        f.write('%import common (CNAME, WS)\n%ignore WS\nstart: ("if" | CNAME)*\n')
+    code = 'if iff x if'
+    assert _fastTokens(grammar, 'start', code) == _larkTokens(grammar, 'start', code)
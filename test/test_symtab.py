@@ -0,0 +1,90 @@
+from typing import *
+import pytest
+from common.compilerSupport import CompileError
+from common.pmap import PMap
+from common.symtab import Symtab, VarInfo
+
+class Collide:
+    """
+    Keys with the same hash.
+    """
+    def __init__(self, name: str):
+        self.name = name
+    def __hash__(self):
+        return 42
+    def __eq__(self, other: object):
+        return isinstance(other, Collide) and other.name == self.name
+
+def test_pmap():
+    maps: list[PMap[int, int]] = [PMap()]
+    for i in range(2000):
+        maps.append(maps[-1].set(i * 7919, i))
+    # old versions are unchanged
+    for (n, m) in enumerate(maps):
+        assert len(m) == n
+        assert sorted(m.items()) == [(i * 7919, i) for i in range(n)]
+    m = maps[-1].set(0, -1)
+    assert len(m) == 2000 and m.get(0) == -1 and maps[-1].get(0) == 0
+    assert 7919 in m and 1 not in m and m.get(1, 'x') == 'x'
+
+def test_pmapCollisions():
+    a = PMap[Collide, int]().set(Collide('a'), 1)
+    ab = a.set(Collide('b'), 2).set(Collide('a'), 3)
+    assert len(a) == 1 and len(ab) == 2
+    assert a.get(Collide('a')) == 1 and a.get(Collide('b')) is None
+    assert ab.get(Collide('a')) == 3 and ab.get(Collide('b')) == 2
+    assert Collide('c') not in ab
+
+def test_symtabMerge():
+    st = Symtab[str, str]()
+    st.assign('x', 'int')
+    st.assign('f', 'fun', 'fun')
+    st1 = st.copy()
+    st2 = st.copy()
+    st1.assign('y', 'int')
+    st1.assign('z', 'bool')
+    st2.assign('z', 'bool')
+    st2.assign('w', 'int')
+    assert not st.hasVar('y')
+    st.mergeBack(st1, st2)
+    assert list(st.items()) == [('x', VarInfo('int', True, 'var')),
+                                ('f', VarInfo('fun', True, 'fun')),
+                                ('y', VarInfo('int', False, 'var')),
+                                ('z', VarInfo('bool', True, 'var')),
+                                ('w', VarInfo('int', False, 'var'))]
+    assert st.types('var') == [('x', 'int'), ('y', 'int'), ('z', 'bool'), ('w', 'int')]
+    assert st1.types(onlyNew=True) == [('y', 'int'), ('z', 'bool')]
+    assert st.types(onlyNew=True) == st.types()
+    with pytest.raises(CompileError):
+        st.use('y')
+    st.assign('y', 'int')
+    assert st.use('y') == 'int'
+    with pytest.raises(CompileError):
+        st.assign('x', 'bool')
+    with pytest.raises(CompileError):
+        st.assign('f', 'fun')
+
+def test_symtabMergeInconsistent():
+    st = Symtab[str, str]()
+    st1 = st.copy()
+    st2 = st.copy()
+    st1.assign('x', 'int')
+    st2.assign('x', 'bool')
+    with pytest.raises(CompileError):
+        st.mergeBack(st1, st2)
+
+def test_symtabMergeNested():
+    # if ...: (if ...: x = 1 else: x = 1) else: x = 1; the parent is not a copy of st
+    st = Symtab[str, str]()
+    then = st.copy()
+    inner1 = then.copy()
+    inner2 = then.copy()
+    inner1.assign('x', 'int')
+    inner2.assign('x', 'int')
+    then.mergeBack(inner1, inner2)
+    other = Symtab[str, str]()
+    other.assign('x', 'int')
+    st.mergeBack(then, other)
+    assert list(st.items()) == [('x', VarInfo('int', True, 'var'))]
+    st.mergeBack(st.copy(), Symtab())
+    assert list(st.items()) == [('x', VarInfo('int', False, 'var'))]
@@ -29,3 +29,69 @@ def test_object():
 def test_nestedObject():
     parseTest('{"k1": {}}', {'k1': {}})
     parseTest('{"k1": {"k1": 1, "k2": "foo"}}', {'k1': {'k1': 1, 'k2': 'foo'}})
+
+def importModTinyJsonStream() -> Any:
+    return utils.importModuleNotInStudent('parsers.tinyJson.tinyJson_stream')
+
+def test_iterative():
+    m = importModTinyJsonStream()
+    for src in ['1', '"hello"', '{}', '{"k1": "xy", "k2": 42}', '{"k1": {"k1": 1, "k2": {}}, "k2": 2}']:
+        assert m.parse(src) == importModTinyJsonParser().parse(src)
+
+def test_events():
+    m = importModTinyJsonStream()
+    evs = [(e.kind, e.value) for e in m.eventsFromString('{"a": 1, "b": {"c": "x"}}')]
+    assert evs == [('start_object', None), ('key', 'a'), ('value', 1), ('key', 'b'),
+                   ('start_object', None), ('key', 'c'), ('value', 'x'),
+                   ('end_object', None), ('end_object', None)]
+
+def test_iterativeErrors():
+    m = importModTinyJsonStream()
+    p = utils.importModuleNotInStudent('parsers.common')
+    for src in ['', '{', '{"a" 1}', '{"a": 1,}', '{"a": 1} 2', '{1: 2}']:
+        with pytest.raises(p.ParseError):
+            m.parse(src)
+
+def test_iterativeDeep():
+    m = importModTinyJsonStream()
+    depth = 100000
+    res = m.parse(depth * '{"k": ' + '1' + depth * '}')
+    for _ in range(depth):
+        res = res['k']
+    assert res == 1
+
+def test_iterativeFileChunks(tmp_path: str):
+    m = importModTinyJsonStream()
+    src = '{"key1": 12345, "some key": {"x": "a longer string value"}, "k": 7}'
+    path = str(tmp_path) + '/x.json'
+    utils.writeTextFile(path, src)
+    for chunkSize in [1, 2, 3, 7, 100]:
+        assert m.parseFile(path, chunkSize) == m.parse(src)
+
+def importModTinyJsonLazy() -> Any:
+    return utils.importModuleNotInStudent('parsers.tinyJson.tinyJson_lazy')
+
+def test_lazy():
+    m = importModTinyJsonLazy()
+    for src in ['1', ' "hello" ', '{}', '{"k1": "xy", "k2": 42}', '{"k1": {"k1": 1, "k2": {}}, "k2": 2}']:
+        assert m.toJson(m.parseLazy(src)) == importModTinyJsonParser().parse(src)
+    v = m.parseLazy('{"a": {"b": {"c": 3}}, "d": "x,{}:", "e": 5}')
+    assert isinstance(v, m.JsonObjectView)
+    assert v['a']['b']['c'] == 3
+    assert v['d'] == 'x,{}:'
+    assert list(v) == ['a', 'd', 'e']
+    assert len(v['a']) == 1
+
+def test_lazyErrors():
+    m = importModTinyJsonLazy()
+    p = utils.importModuleNotInStudent('parsers.common')
+    for src in ['', '{', '}', '{"a" 1}', '{"a": 1,}', '{"a": 1} 2', '{"a": 1 "b": 2}', '"x', '1 2',
+                '{"a": "x" y}', '{x "a": 1}', '{"a" junk: 1}', '{"a": {} 7}', '{"a": "x", zzz "b": 1}',
+                '{ x }', '"x" y', '{"a": \u00b2}', '\u00a0{}']:
+        with pytest.raises(p.ParseError):
+            m.toJson(m.parseLazy(src))
+    # errors in parts of the document not accessed are not detected
+    v = m.parseLazy('{"a": 1, "b": {"x" 1}}')
+    assert v['a'] == 1
+    with pytest.raises(p.ParseError):
+        v['b']['x']
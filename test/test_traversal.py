@@ -0,0 +1,128 @@
+from typing import *
+import time
+from common.compilerSupport import CompilerConfig
+from common.wasm import *
+import common.traversal as traversal
+
+# Deeper than the recursion limit of python, the passes must not recurse on the nesting depth
+DEPTH = 100_000
+
+def test_foldAndTransform():
+    import lang_fun.fun_ast as ast
+    one = ast.IntConst(1)
+    x = ast.Name(ast.Ident('x'))
+    e = ast.BinOp(ast.Call(x, [one, ast.UnOp(ast.USub(), one)]), ast.Add(), ast.IntConst(2))
+    assert [type(c).__name__ for c in ast.expChildren(e)] == ['Call', 'IntConst']
+    # children are visited left to right, the target of the call before its arguments
+    order: list[str] = []
+    def show(y: ast.exp, subs: list[str]) -> str:
+        match y:
+            case ast.IntConst(v):
+                s = str(v)
+            case ast.Name(v):
+                s = v.name
+            case ast.Call():
+                s = f'{subs[0]}({", ".join(subs[1:])})'
+            case ast.UnOp():
+                s = f'-{subs[0]}'
+            case _:
+                s = f'{subs[0]} + {subs[1]}'
+        order.append(s)
+        return s
+    assert ast.foldExp(e, show) == 'x(1, -1) + 2'
+    assert order == ['x', '1', '1', '-1', 'x(1, -1)', '2', 'x(1, -1) + 2']
+    def incr(y: ast.exp) -> ast.exp:
+        match y:
+            case ast.IntConst(v):
+                return ast.IntConst(v + 1)
+            case _:
+                return y
+    assert ast.foldExp(ast.transformExp(e, incr), show) == 'x(2, -2) + 3'
+    # unchanged subtrees are shared
+    assert ast.transformExp(e, lambda y: y) is e
+    s = ast.IfStmt(x, [ast.StmtExp(e)], [ast.WhileStmt(x, [ast.Return(None)])])
+    assert ast.foldStmt(s, countNodes) == 4
+
+def countNodes(_: object, subs: list[int]) -> int:
+    return 1 + sum(subs)
+
+type Tree = tuple[Any, ...]
+
+def test_foldParts():
+    # a tree given as nested tuples, the result of a node is computed by the parts function
+    def parts(t: Tree) -> traversal.Parts[Tree, int]:
+        return (t, lambda rs: 1 + sum(rs))
+    t: Tree = ((), ((), ()))
+    assert traversal.foldParts(t, parts) == 5
+    for _ in range(DEPTH):
+        t = (t,)
+    assert traversal.foldParts(t, parts) == 5 + DEPTH
+
+def deepArrayModule(depth: int) -> Any:
+    """
+    x = 1 + (1 + (...)), y = ((... - x) - x) - x, print(x + y).
+    """
+    import lang_array.array_ast as ast
+    one = ast.IntConst(1)
+    x = ast.Name(ast.Ident('x'))
+    right: ast.exp = one
+    left: ast.exp = one
+    for _ in range(depth):
+        right = ast.BinOp(one, ast.Add(), right)
+        left = ast.BinOp(left, ast.Sub(), x)
+    return ast.Module([ast.Assign(ast.Ident('x'), right),
+                       ast.Assign(ast.Ident('y'), ast.UnOp(ast.USub(), left)),
+                       ast.StmtExp(ast.Call(ast.Ident('print'),
+                                            [ast.BinOp(x, ast.Add(), ast.Name(ast.Ident('y')))]))])
+
+def compileDeep(depth: int) -> tuple[WasmModule, float]:
+    import compilers.lang_array.array_compiler as array_compiler
+    cfg = CompilerConfig(CompilerConfig.defaultMaxMemSize, CompilerConfig.defaultMaxArraySize)
+    m = deepArrayModule(depth)
+    start = time.perf_counter()
+    res = array_compiler.compileModule(m, cfg)
+    return (res, time.perf_counter() - start)
+
+def test_deepArrayCompile():
+    small = min([compileDeep(DEPTH // 10)[1] for _ in range(3)])
+    (m, large) = compileDeep(DEPTH)
+    instrs = m.funcs[0].instrs
+    # x: two instructions per addition, y: two per subtraction, plus 0 - ...
+    assert len(instrs) == (2 * DEPTH + 1 + 1) + (2 + 2 * DEPTH + 1 + 1) + 4
+    assert instrs[-1] == WasmInstrCall(WasmId('$print_i64'))
+    # linear would be a factor of 10, quadratic a factor of 100
+    assert large < 30 * small
+
+def test_deepParser(tmp_path: str):
+    import os
+    import common.genericParser as genericParser
+    import lang_array.array_ast as ast
+    # the parser of python itself fails for deeper nesting
+    n = 2000
+    src = os.path.join(tmp_path, 'deep.py')
+    with open(src, 'w') as f:
+        f.write('x = ' + ' + '.join(['1'] * n) + '\nprint(x)\n')
+    m = genericParser.parseFile(src, ast)
+    e = m.stmts[0].right
+    assert ast.foldExp(e, countNodes) == 2 * n - 1
+
+def test_deepWasmToTac():
+    import assembly.wasmToTac as wasmToTac
+    import assembly.tac_ast as tac
+    # x = ((1 + 1) + 1) + ...; print(x); followed by many assignments
+    instrs: list[WasmInstr] = [WasmInstrConst('i64', 1)]
+    for _ in range(DEPTH):
+        instrs.extend([WasmInstrConst('i64', 1), WasmInstrNumBinOp('i64', 'add')])
+    instrs.append(WasmInstrVarLocal('set', WasmId('$x')))
+    instrs.append(WasmInstrVarLocal('get', WasmId('$x')))
+    instrs.append(WasmInstrCall(WasmId('$print_i64')))
+    for i in range(DEPTH):
+        instrs.extend([WasmInstrConst('i64', i), WasmInstrVarLocal('set', WasmId('$y'))])
+    (val, tacInstrs) = wasmToTac.wasmToTac(wasmToTac.downcast(instrs))
+    assert val is None
+    assert len(tacInstrs) == DEPTH + 1 + DEPTH
+    x = tac.Ident('$x')
+    assert tacInstrs[DEPTH - 1] == tac.Assign(x, tac.BinOp(tac.Name(tac.Ident(f'%R{DEPTH - 2}')),
+                                                            tac.Op('ADD'), tac.Const(1)))
+    assert tacInstrs[DEPTH] == tac.Call(None, tac.Ident('$print_i64'), [tac.Name(x)])
+    assert tacInstrs[-1] == tac.Assign(tac.Ident('$y'), tac.Prim(tac.Const(DEPTH - 1)))
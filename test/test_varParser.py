@@ -45,3 +45,25 @@ def test_parseError():
     with pytest.raises(p.ParseError) as err:
         parseModule(args)
     assert "Unexpected token Token('RPAR', ')') at line 1, column 9" in str(err)
+
+def test_parseCorpus():
+    args = p.ParserArgs('', 'lalr', None, None)
+    results = genericParser.parseCorpus('test_files/parser/lang_var', args, 'lang_var.var_ast',
+                                        'parsers.lang_var.var_parser', 2)
+    assert len(results) == len(genericParser.collectCorpus('test_files/parser/lang_var'))
+    assert all(r.ok for r in results)
+
+def test_structuralHash():
+    e1 = var_ast.BinOp(var_ast.IntConst(1), var_ast.Add(), var_ast.IntConst(2))
+    e2 = var_ast.BinOp(var_ast.IntConst(1), var_ast.Add(), var_ast.IntConst(2))
+    e3 = var_ast.BinOp(var_ast.IntConst(1), var_ast.Sub(), var_ast.IntConst(2))
+    assert genericParser.structuralHash(e1) == genericParser.structuralHash(e2)
+    assert genericParser.structuralHash(e1) != genericParser.structuralHash(e3)
+    assert genericParser.structuralHash([e1, 12, 3]) != genericParser.structuralHash([e1, 1, 23])
+    assert genericParser.structuralHash([e1, 'a']) == genericParser.structuralHash((e2, 'a'))
+
+def test_parseCorpusWithoutParser():
+    args = p.ParserArgs('', 'lalr', None, None)
+    with pytest.raises(SystemExit):
+        genericParser.parseCorpus('test_files/lang_loop', args, 'lang_loop.loop_ast',
+                                  'parsers.lang_loop.loop_parser', 1)